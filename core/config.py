@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta, timezone
 
@@ -45,31 +45,224 @@ class WindClientConfig(BaseModel):
         },
         description="Rate limiting configuration"
     )
+    retry: Dict[str, float] = Field(
+        default={
+            "base_delay": 60,
+            "max_delay": 1800,
+            "max_attempts": 12
+        },
+        description="Backoff configuration for the missing forecast hour retry queue"
+    )
+    hot_horizon_hours: int = Field(
+        default=180,
+        description="Forecast hours kept resident as arrays (covers the 7-day served range)"
+    )
+    cold_cache_bytes: int = Field(
+        default=256 * 1024 ** 2,
+        description="Byte cap for the LRU of lazily loaded far-range forecast hours"
+    )
+
+class StorageConfig(BaseModel):
+    """GRIB file storage configuration."""
+    retention_runs: int = Field(
+        default=2,
+        description="Number of most recent model runs to keep on disk"
+    )
+    max_bytes: Optional[int] = Field(
+        default=20 * 1024 ** 3,
+        description="Disk byte budget per storage directory (None disables eviction)"
+    )
+
+class SwapConfig(BaseModel):
+    """Model run swap configuration."""
+    memory_ceiling_bytes: Optional[int] = Field(
+        default=None,
+        description="RSS ceiling while building a new model run; above it wind regions swap one at a time"
+    )
+    drain_timeout: float = Field(
+        default=30,
+        description="Seconds to wait for in-flight requests before releasing the previous run"
+    )
+
+class ArchiveConfig(BaseModel):
+    """Archive of past model runs' station forecasts."""
+    enabled: bool = Field(
+        default=True,
+        description="Record each served model run's station forecasts"
+    )
+    directory: str = Field(
+        default="downloaded_data/archive",
+        description="Directory holding one columnar store per dataset"
+    )
+    retention_days: float = Field(
+        default=7,
+        description="Days of model runs to keep"
+    )
+    max_lead_hours: int = Field(
+        default=180,
+        description="Last forecast hour recorded per run (within the resident wind horizon)"
+    )
+
+class VerificationConfig(BaseModel):
+    """Scheduled verification of archived forecasts against NDBC observations."""
+    enabled: bool = Field(
+        default=True,
+        description="Recompute verification scores periodically (needs the archive)"
+    )
+    interval_seconds: int = Field(
+        default=21600,
+        description="Seconds between verification runs"
+    )
+    lead_bin_hours: int = Field(
+        default=6,
+        description="Width of the lead time bins scores are reported for"
+    )
+    match_tolerance_minutes: int = Field(
+        default=30,
+        description="Largest gap between a forecast valid time and the observation matched to it"
+    )
+    concurrency: int = Field(
+        default=8,
+        description="Observation files downloaded at once"
+    )
+
+class NowcastConfig(BaseModel):
+    """Blending of the latest buoy observations into near-term forecasts."""
+    enabled: bool = Field(
+        default=True,
+        description="Correct current conditions with the latest NDBC observations"
+    )
+    refresh_seconds: int = Field(
+        default=600,
+        description="Seconds between polls of the NDBC latest observations file"
+    )
+    decay_hours: float = Field(
+        default=6.0,
+        description="e-folding time of the correction after the observation"
+    )
+    horizon_hours: int = Field(
+        default=24,
+        description="Hours after the observation beyond which forecasts are left uncorrected"
+    )
+    max_observation_age_minutes: int = Field(
+        default=180,
+        description="Observations older than this are not blended"
+    )
+
+class TracingConfig(BaseModel):
+    """Spans over the hot paths (download, decode, extract, serialize)."""
+    exporter: str = Field(
+        default="none",
+        description='"none", "log" (one span tree per sampled trace in the app log) or "otlp" (OpenTelemetry)'
+    )
+    sample_ratio: float = Field(
+        default=0.01,
+        description="Fraction of traces recorded, decided when the root span starts"
+    )
+    slow_threshold_ms: float = Field(
+        default=0,
+        description="Log exporter: also log every trace slower than this, sampled or not (0 disables)"
+    )
+    otlp_endpoint: Optional[str] = Field(
+        default=None,
+        description="OTLP collector (e.g. http://localhost:4317); unset leaves the OpenTelemetry provider as configured"
+    )
+    service_name: str = Field(
+        default="salty-ocean-api",
+        description="service.name resource attribute of exported spans"
+    )
+
+class UpstreamConfig(BaseModel):
+    """Hosts of the NOAA services the app downloads from.
+
+    Every upstream URL setting that still points at the default NOAA host is
+    moved to the host configured here, so a mirror or the local stand-in
+    (scripts/upstream_standin.py) only needs these three values. URL
+    settings overridden to another host are left as they are.
+    """
+    nomads: str = Field(
+        default="https://nomads.ncep.noaa.gov",
+        description="GFS wave/wind GRIB filters, gridded files and station bulletins"
+    )
+    ndbc: str = Field(
+        default="https://www.ndbc.noaa.gov",
+        description="NDBC realtime2 and latest observation files"
+    )
+    coops: str = Field(
+        default="https://api.tidesandcurrents.noaa.gov",
+        description="CO-OPS tide predictions and metadata APIs"
+    )
+
+# URL settings by the upstream host they default to
+UPSTREAM_URL_SETTINGS = {
+    "nomads": ("gfs_wave_base_url", "gfs_wave_filter_url", "base_url", "wind.base_url"),
+    "ndbc": ("ndbc_base_url", "ndbc_latest_obs_url"),
+    "coops": ("coops_metadata_url", "coops_base_url"),
+}
 
 class Settings(BaseSettings):
     """Application settings."""
     
     # Redis settings
     redis_url: str = "redis://localhost:6379"
+
+    # NOAA hosts (e.g. salty_upstream='{"nomads": "http://127.0.0.1:8900", ...}')
+    upstream: UpstreamConfig = Field(default=UpstreamConfig())
     
     # GFS Wave Bulletin settings
     gfs_wave_base_url: str = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod"
     gfs_wave_filter_url: str = "https://nomads.ncep.noaa.gov/cgi-bin"
     gfs_wave_cycles: List[str] = ["00", "06", "12", "18"]
     gfs_wave_bulletin_path: str = "wave/station/bulls.t{hour}z/gfswave.{station_id}.bull"
+    # Bulletins fetched at once when prefetching a cycle for every station
+    gfs_wave_bulletin_concurrency: int = 8
     
     # Data directory
     data_dir: str = "data"
     cache_dir: str = "cache"  # Directory for GRIB file caching
 
+    # GRIB file retention and disk budget
+    storage: StorageConfig = Field(default=StorageConfig())
+
+    # Zero-downtime model run swaps
+    swap: SwapConfig = Field(default=SwapConfig())
+
+    # Station forecasts of past model runs for ?model_run= queries and run diffs
+    archive: ArchiveConfig = Field(default=ArchiveConfig())
+
+    # Forecast skill against buoy observations, from the archive
+    verification: VerificationConfig = Field(default=VerificationConfig())
+
+    # Current conditions corrected toward the latest buoy observations
+    nowcast: NowcastConfig = Field(default=NowcastConfig())
+
+    # Prometheus metrics at /metrics (recorded in process, scraped as text)
+    metrics_enabled: bool = True
+
+    # Tracing spans for slow request analysis (no-op unless an exporter is set)
+    tracing: TracingConfig = Field(default=TracingConfig())
+
+    # Points mode: keep only station cells after decoding each forecast hour
+    # instead of full regional grids (arbitrary lat/lon queries are unavailable)
+    points_mode: bool = False
+
+    # Lat/lon forecasts are interpolated at coordinates snapped to this step so
+    # nearby requests share one cache entry (0.05° is ~5 km)
+    point_forecast_snap_degrees: float = 0.05
+
+    # Feature cache backend: "memory" (per process) or "tiered" (in-process
+    # LRU of l1_max_entries per cached method in front of Redis at redis_url)
     cache: Dict[str, Any] = {
         "enabled": True,
         "backend": "memory",
-        "prefix": "salty_ocean"
+        "prefix": "salty_ocean",
+        "l1_max_entries": 1024,
+        "compression_level": 6
     }
     
     # NDBC settings
     ndbc_base_url: str = "https://www.ndbc.noaa.gov/data/realtime2/"
+    ndbc_latest_obs_url: str = "https://www.ndbc.noaa.gov/data/latest_obs/latest_obs.txt"
     ndbc_data_types: Dict[str, str] = {
         "std": "txt",           # Standard meteorological data
         "spec": "spec",         # Spectral wave summary
@@ -180,6 +373,24 @@ class Settings(BaseSettings):
         }
     }
 
+    @model_validator(mode="after")
+    def apply_upstream_hosts(self) -> "Settings":
+        """Move URL settings still on a default NOAA host to the configured host."""
+        defaults = UpstreamConfig()
+        for name, paths in UPSTREAM_URL_SETTINGS.items():
+            default_host, host = getattr(defaults, name), getattr(self.upstream, name).rstrip("/")
+            if host == default_host:
+                continue
+            for path in paths:
+                *parents, field = path.split(".")
+                target = self
+                for parent in parents:
+                    target = getattr(target, parent)
+                url = getattr(target, field)
+                if url.startswith(default_host):
+                    setattr(target, field, host + url[len(default_host):])
+        return self
+
     def get_cache_ttl(self) -> Dict[str, Optional[int]]:
         """Get cache TTL values. Cache is flushed when new model data is available."""
         return {
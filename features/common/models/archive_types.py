@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+class ArchivedRunsResponse(BaseModel):
+    """Model runs available for time-travel queries and diffs."""
+    current_run: Optional[str]
+    runs: List[str]  # e.g. "20250218_06Z", oldest first
+
+class RunDiffPoint(BaseModel):
+    """Two runs' forecasts for the same valid time."""
+    time: datetime
+    values: Dict[str, Optional[float]]
+    base_values: Dict[str, Optional[float]]
+    delta: Dict[str, Optional[float]]  # values - base_values; directions wrap to -180..180
+
+class RunDiffResponse(BaseModel):
+    """Run-to-run change of a station forecast."""
+    station_id: str
+    model_run: str
+    base_run: str
+    points: List[RunDiffPoint]
@@ -1,10 +1,21 @@
-from typing import Optional, Any, Callable
+import logging
+from typing import Optional, Any, Callable, List, Type
 from aiocache import SimpleMemoryCache, caches
+from aiocache.base import BaseCache
 from aiocache.serializers import PickleSerializer
 
+from features.common.model_run import ModelRun
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
 # Cache expiration times (in seconds)
 MODEL_FORECAST_EXPIRE = 14400  # 4 hours - matches GFS model run frequency
 CURRENT_CONDITIONS_EXPIRE = 900  # 15 minutes - real-time data
+# Hard expiration for stale-while-revalidate caches: past the soft TTL above,
+# entries are still served while a background refresh recomputes them
+MODEL_FORECAST_HARD_EXPIRE = 28800  # 8 hours
+CURRENT_CONDITIONS_HARD_EXPIRE = 3600  # 1 hour
 STATIC_DATA_EXPIRE = None  # No expiration for static data
 
 # Configure default cache
@@ -22,6 +33,107 @@ def get_cache() -> SimpleMemoryCache:
     """Get the default cache instance."""
     return caches.get('default')  # type: ignore
 
+# Model run generation embedded in every feature cache key. It is the served
+# model run, so keys are stable across restarts and shared between instances
+# serving the same run, and a model run switch invalidates every namespace at once.
+_generation = "0"
+
+# Called with the new generation after every switch (used to notify other instances)
+_generation_listeners: List[Callable[[str], None]] = []
+
+def current_generation() -> str:
+    """Get the model run generation used in cache keys."""
+    return _generation
+
+def generation_for(model_run: ModelRun) -> str:
+    """Generation identifier of a model run (YYYYMMDDHH)."""
+    return f"{model_run.run_date:%Y%m%d}{model_run.cycle_hour:02d}"
+
+def add_generation_listener(listener: Callable[[str], None]):
+    """Register a callback for generation switches."""
+    if listener not in _generation_listeners:
+        _generation_listeners.append(listener)
+
+def bump_generation(model_run: ModelRun) -> str:
+    """Start the generation of a newly served model run, invalidating older entries.
+
+    Args:
+        model_run: Model run now being served
+
+    Returns:
+        str: The new generation
+    """
+    global _generation
+    generation = generation_for(model_run)
+    if generation == _generation:
+        return _generation
+    _generation = generation
+    logger.info(f"🗑️ Cache generation switched to {_generation}, previous entries are now unreachable")
+    for listener in _generation_listeners:
+        try:
+            listener(_generation)
+        except Exception as e:
+            logger.error(f"❌ Error notifying cache generation listener: {str(e)}")
+    return _generation
+
+def _generation_tag(generation: str) -> str:
+    return f":g{generation}:"
+
+class ModelRunCache(SimpleMemoryCache):
+    """In-memory cache that reclaims entries from previous model run generations.
+
+    Keys from older generations can never be read again. The first write
+    after a bump drops them in one pass, so no background task is needed
+    and idle caches cost nothing.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._generation = current_generation()
+
+    def reclaim_stale(self) -> int:
+        """Drop entries written under a previous generation.
+
+        Returns:
+            int: Number of entries removed
+        """
+        tag = _generation_tag(current_generation())
+        stale = [key for key in self._cache if tag not in key]
+        for key in stale:
+            handler = self._handlers.pop(key, None)
+            if handler:
+                handler.cancel()
+            self._cache.pop(key, None)
+        self._generation = current_generation()
+        if stale:
+            logger.info(f"♻️ Reclaimed {len(stale)} cache entries from previous generations")
+        return len(stale)
+
+    async def _set(self, key, value, ttl=None, _cas_token=None, _conn=None):
+        if self._generation != current_generation():
+            self.reclaim_stale()
+        return await super()._set(key, value, ttl=ttl, _cas_token=_cas_token, _conn=_conn)
+
+def _extra_key_parts(args: tuple, kwargs: dict, skip: tuple) -> str:
+    """Remaining arguments of a cached call as a key suffix (empty when there are none)."""
+    parts = [str(arg) for arg in args] + [
+        f"{name}={value}" for name, value in sorted(kwargs.items()) if name not in skip
+    ]
+    return "".join(f":{part}" for part in parts)
+
+def feature_cache_class() -> Type[BaseCache]:
+    """Cache class for the @cached feature services, selected by ``settings.cache["backend"]``.
+
+    ``"tiered"`` keeps a bounded in-process LRU in front of Redis; anything
+    else (the default ``"memory"``) keeps entries in this process only.
+    """
+    if settings.cache.get("backend") == "tiered":
+        from features.common.services.tiered_cache import TieredCache, redis_available
+        if redis_available():
+            return TieredCache
+        logger.error("❌ Tiered cache backend needs the redis package, falling back to memory")
+    return ModelRunCache
+
 def feature_cache_key_builder(
     func: Callable,
     namespace: Optional[str] = None,
@@ -37,18 +149,65 @@ def feature_cache_key_builder(
         kwargs: Keyword arguments passed to the function
         
     Returns:
-        str: Cache key in format {namespace}:{station_id}
+        str: Cache key in format {namespace}:g{generation}:station:{station_id}[:{other args}]
     """
     # Get station_id from args if not in kwargs
     station_id = kwargs.get("station_id")
+    extra_args = args
     if not station_id and args:
-        station_id = args[0]  # First arg is station_id
+        station_id, extra_args = args[0], args[1:]  # First arg is station_id
     
     if not station_id:
         raise ValueError("station_id is required for caching")
         
-    if not namespace:
-        namespace = func.__name__
+    # aiocache passes a decorated method's instance in the namespace position
+    if not isinstance(namespace, str):
+        namespace = func.__qualname__
+        
+    # Ensure unique key per station and model run generation
+    extras = _extra_key_parts(extra_args, kwargs, skip=("station_id",))
+    return f"{namespace}{_generation_tag(current_generation())}station:{station_id}{extras}"
+
+def point_cache_key_builder(
+    func: Callable,
+    namespace: Optional[str] = None,
+    *args: Any,
+    **kwargs: Any,
+) -> str:
+    """Cache key builder for lat/lon endpoints.
+    
+    Callers snap coordinates first so nearby requests share an entry.
+    
+    Returns:
+        str: Cache key in format {namespace}:g{generation}:point:{lat}:{lon}[:{other args}]
+    """
+    lat = kwargs.get("lat", args[0] if len(args) > 0 else None)
+    lon = kwargs.get("lon", args[1] if len(args) > 1 else None)
+    extra_args = args[("lat" not in kwargs) + ("lon" not in kwargs):]
+    
+    if lat is None or lon is None:
+        raise ValueError("lat and lon are required for caching")
+        
+    # aiocache passes a decorated method's instance in the namespace position
+    if not isinstance(namespace, str):
+        namespace = func.__qualname__
+        
+    extras = _extra_key_parts(extra_args, kwargs, skip=("lat", "lon"))
+    return f"{namespace}{_generation_tag(current_generation())}point:{lat:.4f}:{lon:.4f}{extras}"
+
+def collection_cache_key_builder(
+    func: Callable,
+    namespace: Optional[str] = None,
+    *args: Any,
+    **kwargs: Any,
+) -> str:
+    """Cache key builder for endpoints without arguments (e.g. all stations).
+    
+    Returns:
+        str: Cache key in format {namespace}:g{generation}:all
+    """
+    # aiocache passes a decorated method's instance in the namespace position
+    if not isinstance(namespace, str):
+        namespace = func.__qualname__
         
-    # Ensure unique key per station
-    return f"{namespace}:station:{station_id}" 
\ No newline at end of file
+    return f"{namespace}{_generation_tag(current_generation())}all"
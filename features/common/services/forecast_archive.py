@@ -0,0 +1,501 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from features.common.model_run import ModelRun
+from features.common.models.archive_types import RunDiffPoint, RunDiffResponse
+from features.common.models.station_types import Station
+
+logger = logging.getLogger(__name__)
+
+# Key columns; every variable column is float32
+STATION_DTYPE = np.dtype("<u2")
+LEAD_DTYPE = np.dtype("<i2")
+VALUE_DTYPE = np.dtype("<f4")
+
+_RUN_PATTERN = re.compile(r"^(\d{8})_?(\d{2})[zZ]?$")
+
+def run_id_for(model_run: ModelRun) -> str:
+    """Archive key of a model run (YYYYMMDDHH)."""
+    return f"{model_run.run_date:%Y%m%d}{model_run.cycle_hour:02d}"
+
+def parse_run_id(value: str) -> str:
+    """Parse a model run given as ``20250218_06Z``, ``20250218_06`` or ``2025021806``.
+
+    Raises:
+        HTTPException: 400 if the value is not a model run
+    """
+    match = _RUN_PATTERN.match(value.strip())
+    if not match:
+        raise HTTPException(status_code=400, detail=f"Invalid model run {value!r}, expected e.g. 20250218_06Z")
+    return f"{match.group(1)}{match.group(2)}"
+
+def format_run_id(run_id: str) -> str:
+    """Display form of a run key, as used in wind responses (``20250218_06Z``)."""
+    return f"{run_id[:8]}_{run_id[8:]}Z"
+
+def run_start(run_id: str) -> datetime:
+    """Cycle start time of a run key in UTC."""
+    return datetime.strptime(run_id, "%Y%m%d%H").replace(tzinfo=timezone.utc)
+
+class RunSeries(NamedTuple):
+    """One station's archived forecast from one run."""
+    times: np.ndarray   # (T,) valid times as epoch seconds, ascending
+    values: np.ndarray  # (T, V) float32
+
+class ArchiveDataset:
+    """Append-only columnar store of station forecasts across model runs.
+
+    Rows are keyed by (run, station, lead hour). Each column lives in its
+    own flat file (``station.u2``, ``lead.i2`` and one ``<variable>.f4`` per
+    variable) that only ever grows by whole runs, and is read through
+    ``np.memmap``. A run's rows are contiguous and sorted by station then
+    lead, so a lookup is a binary search within the run's segment.
+
+    ``manifest.json`` records the station codes, each run's row range and
+    the column file generation, and is replaced atomically after the columns
+    are written, so a crash mid-append leaves at most trailing bytes that
+    the next append truncates. Pruning writes the kept rows to files of the
+    next generation and only then switches the manifest to them, so a crash
+    leaves the previous files and manifest intact, and readers holding the
+    previous manifest keep reading the files it names.
+    """
+
+    def __init__(self, directory: Path, variables: Sequence[str], circular: Sequence[str] = ()):
+        """Open or create a dataset.
+
+        Args:
+            directory: Directory holding the column files
+            variables: Value columns, in the order of the values passed to ``append_run``
+            circular: Variables in degrees, whose run differences wrap at 360
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.variables = tuple(variables)
+        self.circular = np.array([v in circular for v in self.variables])
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._stations = {station_id: code for code, station_id in enumerate(self._manifest["stations"])}
+        # Column maps with the manifest they were opened for, swapped as one reference
+        self._columns: Optional[Tuple[Dict, Dict[str, np.ndarray]]] = None
+        self._remove_stale_columns()
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def _column_path(self, name: str, generation: int = 0) -> Path:
+        # Generation 0 keeps the original file names
+        tag = f".g{generation}" if generation else ""
+        if name == "station":
+            return self.directory / f"station{tag}.u2"
+        if name == "lead":
+            return self.directory / f"lead{tag}.i2"
+        return self.directory / f"{name}{tag}.f4"
+
+    def _remove_stale_columns(self):
+        """Delete column files of other generations (left by a prune or an interrupted one)."""
+        generation = self._manifest.get("generation", 0)
+        current = {self._column_path(name, generation) for name in self._column_dtypes()}
+        for path in self.directory.iterdir():
+            if path.suffix in (".u2", ".i2", ".f4") and path not in current:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not remove stale archive column {path}: {str(e)}")
+
+    def _column_dtypes(self) -> Dict[str, np.dtype]:
+        return {
+            "station": STATION_DTYPE,
+            "lead": LEAD_DTYPE,
+            **{variable: VALUE_DTYPE for variable in self.variables}
+        }
+
+    def _load_manifest(self) -> Dict:
+        try:
+            manifest = json.loads(self._manifest_path.read_text())
+        except FileNotFoundError:
+            return {"variables": list(self.variables), "stations": [], "runs": {}, "rows": 0}
+        if tuple(manifest["variables"]) != self.variables:
+            raise ValueError(f"Archive {self.directory} holds {manifest['variables']}, not {list(self.variables)}")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict):
+        tmp_path = self._manifest_path.with_name(".manifest.json.part")
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self._manifest_path)
+
+    def _open_columns(self, manifest: Dict) -> Dict[str, np.ndarray]:
+        """Memory-map every column up to a manifest's committed row count."""
+        opened = self._columns
+        if opened is None or opened[0] is not manifest:
+            rows = manifest["rows"]
+            generation = manifest.get("generation", 0)
+            columns = {
+                name: (
+                    np.memmap(self._column_path(name, generation), dtype=dtype, mode="r", shape=(rows,))
+                    if rows else np.empty(0, dtype=dtype)
+                )
+                for name, dtype in self._column_dtypes().items()
+            }
+            opened = self._columns = (manifest, columns)
+        return opened[1]
+
+    def runs(self) -> List[str]:
+        """Archived run keys, oldest first."""
+        return sorted(self._manifest["runs"])
+
+    def has_run(self, run_id: str) -> bool:
+        return run_id in self._manifest["runs"]
+
+    @property
+    def station_ids(self) -> List[str]:
+        """Station IDs by station code."""
+        return list(self._manifest["stations"])
+
+    def run_rows(self, run_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Every row of an archived run.
+
+        Returns:
+            Tuple of (station codes (R,), lead hours (R,), values (R, V)), or None if not archived
+        """
+        manifest = self._manifest
+        bounds = manifest["runs"].get(run_id)
+        if bounds is None:
+            return None
+        columns = self._open_columns(manifest)
+        start, stop = bounds
+        values = np.stack([columns[variable][start:stop] for variable in self.variables], axis=1)
+        return (
+            columns["station"][start:stop].astype(np.int64),
+            columns["lead"][start:stop].astype(np.int64),
+            values
+        )
+
+    def append_run(self, run_id: str, series: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> int:
+        """Append one run's station forecasts; a run already archived is skipped.
+
+        Blocking file I/O, meant to run in a worker thread.
+
+        Args:
+            run_id: Run key (YYYYMMDDHH)
+            series: Station ID -> (lead hours (T,), values (T, V))
+
+        Returns:
+            int: Rows written
+        """
+        with self._lock:
+            if self.has_run(run_id):
+                return 0
+
+            stations = list(self._manifest["stations"])
+            codes = dict(self._stations)
+            for station_id in sorted(series):
+                if station_id not in codes:
+                    codes[station_id] = len(stations)
+                    stations.append(station_id)
+
+            columns: Dict[str, List[np.ndarray]] = {name: [] for name in self._column_dtypes()}
+            for station_id in sorted(series, key=codes.get):
+                leads, values = series[station_id]
+                order = np.argsort(leads, kind="stable")
+                columns["station"].append(np.full(len(leads), codes[station_id], dtype=STATION_DTYPE))
+                columns["lead"].append(np.asarray(leads)[order].astype(LEAD_DTYPE))
+                for v, variable in enumerate(self.variables):
+                    columns[variable].append(np.asarray(values)[order, v].astype(VALUE_DTYPE))
+
+            start = self._manifest["rows"]
+            rows = sum(len(part) for part in columns["station"])
+            generation = self._manifest.get("generation", 0)
+            for name, dtype in self._column_dtypes().items():
+                path = self._column_path(name, generation)
+                with open(path, "ab") as f:
+                    # Drop bytes of an append that never reached the manifest
+                    f.truncate(start * dtype.itemsize)
+                    for part in columns[name]:
+                        f.write(part.tobytes())
+
+            manifest = {
+                **self._manifest,
+                "stations": stations,
+                "runs": {**self._manifest["runs"], run_id: [start, start + rows]},
+                "rows": start + rows
+            }
+            self._write_manifest(manifest)
+            # Codes first: readers holding the old manifest never see unknown codes
+            self._stations = codes
+            self._manifest = manifest
+            return rows
+
+    def prune(self, oldest_run_id: str) -> int:
+        """Drop runs older than a run key, rewriting the columns without them.
+
+        The kept rows go to new generation files; the manifest switches to
+        them in one replace before the previous files are deleted.
+
+        Returns:
+            int: Number of runs removed
+        """
+        with self._lock:
+            expired = [run_id for run_id in self._manifest["runs"] if run_id < oldest_run_id]
+            if not expired:
+                return 0
+
+            kept = sorted(
+                (bounds[0], bounds[1], run_id)
+                for run_id, bounds in self._manifest["runs"].items()
+                if run_id >= oldest_run_id
+            )
+            # Readers still holding the current manifest reuse these maps after the switch
+            columns = self._open_columns(self._manifest)
+            runs, offset = {}, 0
+            for start, stop, run_id in kept:
+                runs[run_id] = [offset, offset + stop - start]
+                offset += stop - start
+            generation = self._manifest.get("generation", 0) + 1
+            for name in self._column_dtypes():
+                with open(self._column_path(name, generation), "wb") as f:
+                    for start, stop, _ in kept:
+                        f.write(np.ascontiguousarray(columns[name][start:stop]).tobytes())
+
+            manifest = {**self._manifest, "runs": runs, "rows": offset, "generation": generation}
+            self._write_manifest(manifest)
+            self._manifest = manifest
+            self._remove_stale_columns()
+            return len(expired)
+
+    def series(self, run_id: str, station_id: str) -> Optional[RunSeries]:
+        """A station's forecast from an archived run, or None if it was not archived."""
+        manifest = self._manifest
+        bounds = manifest["runs"].get(run_id)
+        code = self._stations.get(station_id)
+        if bounds is None or code is None:
+            return None
+
+        columns = self._open_columns(manifest)
+        start, stop = bounds
+        station_column = columns["station"][start:stop]
+        first = start + int(np.searchsorted(station_column, code, side="left"))
+        last = start + int(np.searchsorted(station_column, code, side="right"))
+        if first == last:
+            return None
+
+        leads = columns["lead"][first:last].astype(np.int64)
+        values = np.stack([columns[variable][first:last] for variable in self.variables], axis=1)
+        return RunSeries(times=int(run_start(run_id).timestamp()) + leads * 3600, values=values)
+
+    def diff(self, run_id: str, base_run_id: str, station_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Compare two runs at the valid times both forecast.
+
+        Degree variables are differenced the short way round (-180 to 180).
+
+        Returns:
+            Tuple of (valid times (T,), run values (T, V), base run values (T, V)),
+            or None if either run lacks the station
+        """
+        current = self.series(run_id, station_id)
+        base = self.series(base_run_id, station_id)
+        if current is None or base is None:
+            return None
+        times, current_idx, base_idx = np.intersect1d(current.times, base.times, return_indices=True)
+        return times, current.values[current_idx], base.values[base_idx]
+
+    def delta(self, values: np.ndarray, base_values: np.ndarray) -> np.ndarray:
+        """Run minus base run per variable, wrapping degree variables."""
+        delta = values.astype(np.float64) - base_values
+        delta[:, self.circular] = (delta[:, self.circular] + 180) % 360 - 180
+        return delta
+
+    def nbytes(self) -> int:
+        """Bytes of committed rows on disk."""
+        row_bytes = sum(dtype.itemsize for dtype in self._column_dtypes().values())
+        return int(self._manifest["rows"] * row_bytes)
+
+class ForecastArchive:
+    """Datasets of archived station forecasts under one directory."""
+
+    def __init__(self, directory: str, retention_days: float):
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self._datasets: Dict[str, ArchiveDataset] = {}
+
+    def dataset(self, name: str, variables: Sequence[str], circular: Sequence[str] = ()) -> ArchiveDataset:
+        """Get or open a named dataset."""
+        if name not in self._datasets:
+            self._datasets[name] = ArchiveDataset(self.directory / name, variables, circular)
+        return self._datasets[name]
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop runs older than the retention period from every dataset.
+
+        Returns:
+            int: Number of runs removed across datasets
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+        oldest = cutoff.strftime("%Y%m%d%H")
+        removed = sum(dataset.prune(oldest) for dataset in self._datasets.values())
+        if removed:
+            logger.info(f"🗄️ Pruned {removed} archived runs older than {format_run_id(oldest)}")
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Run count and bytes per dataset."""
+        return {
+            name: {"runs": len(dataset.runs()), "bytes": dataset.nbytes()}
+            for name, dataset in self._datasets.items()
+        }
+
+def points_to_columns(
+    forecasts: Sequence[Any],
+    run_id: str,
+    variables: Sequence[str],
+    max_lead_hours: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lead hours and values of response forecast points, up to a maximum lead.
+
+    Returns:
+        Tuple of (lead hours (T,), values (T, V) with None as NaN)
+    """
+    start = run_start(run_id).timestamp()
+    times = np.array([point.time.timestamp() for point in forecasts], dtype=np.float64)
+    leads = np.rint((times - start) / 3600).astype(np.int64)
+    values = np.array(
+        [[getattr(point, variable) for variable in variables] for point in forecasts],
+        dtype=np.float64
+    ).reshape(len(forecasts), len(variables))
+    keep = (leads >= 0) & (leads <= max_lead_hours)
+    return leads[keep], values[keep]
+
+async def record_run(
+    dataset: ArchiveDataset,
+    run_id: str,
+    stations: Sequence[Station],
+    fetch: Callable[[Station], Awaitable[Optional[Sequence[Any]]]],
+    max_lead_hours: int,
+    label: str
+) -> int:
+    """Archive every station's forecast of a run unless the run is already archived.
+
+    Args:
+        dataset: Dataset to append to
+        run_id: Run key of the forecasts ``fetch`` returns
+        stations: Stations to record
+        fetch: Returns a station's response forecast points, or None to skip it
+        max_lead_hours: Last lead hour to keep
+        label: Name used in log messages
+
+    Returns:
+        int: Rows written
+    """
+    if dataset.has_run(run_id):
+        return 0
+
+    series = {}
+    for station in stations:
+        try:
+            forecasts = await fetch(station)
+        except HTTPException:
+            continue
+        except Exception as e:
+            logger.warning(f"⚠️ Not archiving {label} forecast for station {station.station_id}: {str(e)}")
+            continue
+        if forecasts:
+            leads, values = points_to_columns(forecasts, run_id, dataset.variables, max_lead_hours)
+            if len(leads):
+                series[station.station_id] = (leads, values)
+
+    rows = await asyncio.to_thread(dataset.append_run, run_id, series)
+    logger.info(f"🗄️ Archived {label} forecasts of {len(series)} stations for {format_run_id(run_id)} ({rows} rows)")
+    return rows
+
+def _json_values(variables: Sequence[str], row: np.ndarray) -> Dict[str, Optional[float]]:
+    return {variable: (None if np.isnan(value) else float(value)) for variable, value in zip(variables, row)}
+
+def archived_points(
+    dataset: ArchiveDataset,
+    run_id: str,
+    station_id: str,
+    point_factory: Callable[..., Any]
+) -> List[Any]:
+    """Response forecast points of a station from an archived run.
+
+    Raises:
+        HTTPException: 404 if the run or station is not archived
+
+    Args:
+        point_factory: Point model, called with ``time`` and one keyword per variable
+    """
+    series = dataset.series(run_id, station_id)
+    if series is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No archived forecast for station {station_id} from model run {format_run_id(run_id)}"
+        )
+    # Stored as float32; responses carry two decimals
+    values = np.round(series.values.astype(np.float64), 2)
+    return [
+        point_factory(time=datetime.fromtimestamp(epoch, tz=timezone.utc), **_json_values(dataset.variables, row))
+        for epoch, row in zip(series.times.tolist(), values)
+    ]
+
+def resolve_diff_runs(
+    dataset: ArchiveDataset,
+    model_run: Optional[str],
+    base_run: Optional[str],
+    current_run_id: Optional[str]
+) -> Tuple[str, str]:
+    """Run keys to compare: ``model_run`` defaults to the current run, ``base_run`` to the archived run before it.
+
+    Raises:
+        HTTPException: 404 if there is no earlier run to compare with
+    """
+    run_id = parse_run_id(model_run) if model_run else current_run_id
+    if run_id is None:
+        raise HTTPException(status_code=503, detail="No model cycle currently available")
+    if base_run:
+        return run_id, parse_run_id(base_run)
+    earlier = [archived for archived in dataset.runs() if archived < run_id]
+    if not earlier:
+        raise HTTPException(status_code=404, detail=f"No archived model run before {format_run_id(run_id)}")
+    return run_id, earlier[-1]
+
+def run_diff(dataset: ArchiveDataset, station_id: str, run_id: str, base_run_id: str) -> RunDiffResponse:
+    """Difference between two archived runs of a station at their shared valid times.
+
+    Raises:
+        HTTPException: 404 if either run lacks the station
+    """
+    compared = dataset.diff(run_id, base_run_id, station_id)
+    if compared is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Station {station_id} is not archived for both {format_run_id(run_id)} and {format_run_id(base_run_id)}"
+        )
+    times, values, base_values = compared
+    values = np.round(values.astype(np.float64), 2)
+    base_values = np.round(base_values.astype(np.float64), 2)
+    delta = np.round(dataset.delta(values, base_values), 2)
+    variables = dataset.variables
+    return RunDiffResponse(
+        station_id=station_id,
+        model_run=format_run_id(run_id),
+        base_run=format_run_id(base_run_id),
+        points=[
+            RunDiffPoint(
+                time=datetime.fromtimestamp(epoch, tz=timezone.utc),
+                values=_json_values(variables, values[t]),
+                base_values=_json_values(variables, base_values[t]),
+                delta=_json_values(variables, delta[t])
+            )
+            for t, epoch in enumerate(times.tolist())
+        ]
+    )
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from fastapi import HTTPException, Query
+
+from features.common.services.tracing import traced
+
+# Longest window a request can ask for (GFS wind runs out to 16 days)
+MAX_FORECAST_DAYS = 16
+
+# Steps that divide a day, so points stay on the same hours of every day
+# and the default start (now floored to the step) is one of them
+STEP_HOURS = (1, 2, 3, 4, 6, 8, 12, 24)
+
+class ForecastWindow(NamedTuple):
+    """Requested forecast range and resolution."""
+    start: datetime
+    end: datetime
+    step: int  # hours, aligned to 00 UTC
+
+class ForecastSeries(NamedTuple):
+    """A full-range forecast response with the time axis of its points.
+
+    Cached once per station or point; requests slice it with ``select_window``.
+    """
+    response: Any       # Response model whose ``forecasts`` cover the whole cached range
+    times: np.ndarray   # (T,) epoch seconds of each point, floored to the hour, ascending
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def resolve_window(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    days: Optional[float] = None,
+    step: int = 3,
+    default_days: float = 7,
+    now: Optional[datetime] = None
+) -> ForecastWindow:
+    """Resolve query parameters into a forecast window.
+
+    Args:
+        start: First valid time; defaults to now rounded down to the step
+        end: Last valid time; takes precedence over ``days``
+        days: Window length from ``start`` (or from now when ``start`` is omitted)
+        step: Hours between points, aligned to 00 UTC; one of ``STEP_HOURS``
+        default_days: Window length when neither ``end`` nor ``days`` is given
+        now: Current time, for tests
+
+    Raises:
+        HTTPException: 400 if the window is invalid
+
+    Returns:
+        ForecastWindow: The resolved window
+    """
+    if step not in STEP_HOURS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"step must divide 24 hours ({', '.join(str(hours) for hours in STEP_HOURS)})"
+        )
+
+    now = _as_utc(now or datetime.now(timezone.utc))
+    if start is None:
+        floored = now.replace(minute=0, second=0, microsecond=0)
+        start = floored.replace(hour=(floored.hour // step) * step)
+        base = now
+    else:
+        start = base = _as_utc(start)
+
+    if end is not None:
+        end = _as_utc(end)
+    else:
+        end = base + timedelta(days=days if days is not None else default_days)
+
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if end - start > timedelta(days=MAX_FORECAST_DAYS, hours=step):
+        raise HTTPException(status_code=400, detail=f"Window must not exceed {MAX_FORECAST_DAYS} days")
+    return ForecastWindow(start=start, end=end, step=step)
+
+@traced("forecast_window.build_series")
+def build_series(response: Any) -> ForecastSeries:
+    """Sort a full-range response's points and index their valid times."""
+    forecasts = sorted(response.forecasts, key=lambda point: point.time)
+    times = np.array(
+        [int(point.time.replace(minute=0, second=0, microsecond=0).timestamp()) for point in forecasts],
+        dtype=np.int64
+    )
+    return ForecastSeries(response=response.model_copy(update={"forecasts": forecasts}), times=times)
+
+@traced("forecast_window.select")
+def select_window(series: ForecastSeries, window: ForecastWindow) -> Any:
+    """Response restricted to the window, found by binary search on the time axis.
+
+    Only the selected points are touched, so the cost scales with the
+    response size rather than the cached range.
+    """
+    times = series.times
+    first = int(np.searchsorted(times, window.start.timestamp(), side="left"))
+    last = int(np.searchsorted(times, window.end.timestamp(), side="right"))
+    selected = np.arange(first, last)[(times[first:last] // 3600) % window.step == 0]
+    forecasts = series.response.forecasts
+    return series.response.model_copy(update={"forecasts": [forecasts[i] for i in selected]})
+
+class ForecastWindowQuery:
+    """Query parameters selecting a forecast window (use with ``Depends()``)."""
+
+    def __init__(
+        self,
+        start: Optional[datetime] = Query(None, description="First valid time (ISO 8601, UTC if no offset); defaults to now"),
+        end: Optional[datetime] = Query(None, description="Last valid time (ISO 8601, UTC if no offset); overrides days"),
+        days: Optional[float] = Query(None, gt=0, le=MAX_FORECAST_DAYS, description="Window length in days"),
+        step: int = Query(3, ge=1, le=24, description="Hours between points, aligned to 00 UTC: 1, 2, 3, 4, 6, 8, 12 or 24")
+    ):
+        self.start = start
+        self.end = end
+        self.days = days
+        self.step = step
+
+    def resolve(self, default_days: float, default_start: Optional[datetime] = None) -> ForecastWindow:
+        """Resolve the window, starting at ``default_start`` when no start was given."""
+        return resolve_window(self.start or default_start, self.end, self.days, self.step, default_days=default_days)
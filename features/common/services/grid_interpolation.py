@@ -0,0 +1,108 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+def snap_coordinate(value: float, step: float) -> float:
+    """Snap a coordinate to a lattice so nearby queries share a cache entry."""
+    return round(round(value / step) * step, 6)
+
+def _bracket(axis: np.ndarray, value: float) -> Tuple[int, int, float]:
+    """Indices of the two axis points around a value and the fraction towards the upper one.
+
+    Works for ascending and descending axes (GRIB latitudes are usually descending).
+    """
+    if len(axis) < 2:
+        raise ValueError("Axis needs at least two points to interpolate")
+    ascending = axis[-1] >= axis[0]
+    ordered = axis if ascending else axis[::-1]
+    if value < ordered[0] or value > ordered[-1]:
+        raise ValueError(f"{value} is outside the grid ({ordered[0]} to {ordered[-1]})")
+
+    i = int(np.searchsorted(ordered, value, side="right")) - 1
+    i = min(max(i, 0), len(ordered) - 2)
+    fraction = float((value - ordered[i]) / (ordered[i + 1] - ordered[i]))
+    if ascending:
+        return i, i + 1, fraction
+    last = len(axis) - 1
+    return last - i, last - i - 1, fraction
+
+def _bracket_longitude(longitude: np.ndarray, lon: float) -> Tuple[int, int, float]:
+    """Like ``_bracket`` for longitudes, wrapping across the seam of a global grid.
+
+    A global 0-360 grid ends one step short of 360, so a query between the
+    last column and 360 (or just west of 0) interpolates between the last
+    and the first column.
+    """
+    ascending = longitude[-1] >= longitude[0]
+    step = abs(float(longitude[1] - longitude[0])) if len(longitude) > 1 else 0.0
+    span = abs(float(longitude[-1] - longitude[0])) + step
+    if step and ascending and abs(span - 360) < 1e-6:
+        west, east = float(longitude[0]), float(longitude[-1])
+        if lon > east or lon < west:
+            return len(longitude) - 1, 0, float(((lon - east) % 360) / step)
+    return _bracket(longitude, lon)
+
+def bilinear_weights(
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    lat: float,
+    lon: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Corner cells and weights for bilinear interpolation at a point.
+
+    Args:
+        latitude: Grid latitudes
+        longitude: Grid longitudes (0-360 or -180-180)
+        lat: Query latitude
+        lon: Query longitude in either convention
+
+    Returns:
+        Tuple of (latitude indices (4,), longitude indices (4,), weights (4,))
+
+    Raises:
+        ValueError: If the point is outside the grid
+    """
+    if longitude.max() > 180:
+        query_lon = lon % 360
+    else:
+        query_lon = lon if -180 <= lon <= 180 else (lon + 180) % 360 - 180
+    lat_lo, lat_hi, fy = _bracket(latitude, lat)
+    lon_lo, lon_hi, fx = _bracket_longitude(longitude, query_lon)
+    lat_idx = np.array([lat_lo, lat_lo, lat_hi, lat_hi])
+    lon_idx = np.array([lon_lo, lon_hi, lon_lo, lon_hi])
+    weights = np.array([(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx])
+    return lat_idx, lon_idx, weights
+
+def interpolate_corners(
+    corners: np.ndarray,
+    weights: np.ndarray,
+    circular: Sequence[int] = ()
+) -> np.ndarray:
+    """Weighted average of corner values over the whole time axis.
+
+    Corners that are NaN (land) are left out and the remaining weights are
+    renormalized; a step with no valid corner stays NaN. Variables listed in
+    ``circular`` are directions in degrees and are averaged as unit vectors
+    so 350° and 10° give 0°, not 180°.
+
+    Args:
+        corners: Corner values with shape (T, V, K)
+        weights: Corner weights with shape (K,)
+        circular: Variable indices holding directions in degrees
+
+    Returns:
+        np.ndarray: Interpolated values with shape (T, V)
+    """
+    corners = corners.astype(np.float64)
+    valid = ~np.isnan(corners)
+    w = np.where(valid, weights, 0.0)
+    total = w.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = (np.where(valid, corners, 0.0) * w).sum(axis=-1) / total
+        for var in circular:
+            radians = np.radians(np.where(valid[:, var], corners[:, var], 0.0))
+            sin = (np.sin(radians) * w[:, var]).sum(axis=-1)
+            cos = (np.cos(radians) * w[:, var]).sum(axis=-1)
+            result[:, var] = np.round(np.degrees(np.arctan2(sin, cos)), 6) % 360
+    result[total == 0] = np.nan
+    return result
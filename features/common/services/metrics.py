@@ -0,0 +1,241 @@
+import bisect
+import functools
+import math
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Prometheus text exposition format 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DECODE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SWAP_BUCKETS = (5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+class Metric:
+    """A named metric with one series per combination of label values.
+
+    Series are created on first use and kept in a dict keyed by the label
+    value tuple, so recording is a dict lookup and an addition under a
+    lock (decoding reports from worker threads).
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def clear(self):
+        """Drop every series (for gauges whose label values come and go)."""
+        with self._lock:
+            self._series.clear()
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._series.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+class Gauge(Metric):
+    """Current value, usually set by a collector right before a scrape."""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._series[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._series.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+class Histogram(Metric):
+    """Distribution of observations over fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (+Inf last), then sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def timed(self, *labels: str) -> Callable:
+        """Decorator observing the duration of every call of a function."""
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, *labels)
+            return wrapper
+        return decorator
+
+    def samples(self) -> Iterable[str]:
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+_registry: List[Metric] = []
+
+# Called before every scrape to refresh gauges from live state
+_collectors: List[Callable[[], None]] = []
+
+def add_collector(collector: Callable[[], None]):
+    """Register a callback run before each scrape."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+def render_metrics() -> str:
+    """Every metric in the Prometheus text format."""
+    for collector in _collectors:
+        collector()
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+# Metrics of the app
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "salty_http_request_duration_seconds",
+    "Time to respond to API requests by route template",
+    labels=("method", "route", "status")
+)
+CACHE_REQUESTS = Counter(
+    "salty_cache_requests_total",
+    "Feature cache lookups by namespace and result (hit, stale, miss, coalesced)",
+    labels=("namespace", "result")
+)
+UPSTREAM_REQUESTS = Counter(
+    "salty_upstream_requests_total",
+    "Requests to upstream hosts by response status (error when no response)",
+    labels=("host", "status")
+)
+UPSTREAM_BYTES = Counter(
+    "salty_upstream_response_bytes_total",
+    "Response body bytes received from upstream hosts",
+    labels=("host",)
+)
+UPSTREAM_SECONDS = Counter(
+    "salty_upstream_transfer_seconds_total",
+    "Time spent waiting for and receiving upstream responses (throughput is bytes over seconds)",
+    labels=("host",)
+)
+GRIB_DECODE_SECONDS = Histogram(
+    "salty_grib_decode_seconds",
+    "Time to decode one GRIB forecast hour",
+    labels=("dataset",),
+    buckets=DECODE_BUCKETS
+)
+MODEL_RUN_AGE_SECONDS = Gauge(
+    "salty_model_run_age_seconds",
+    "Seconds since the cycle time of the served model run"
+)
+MODEL_RUN_INFO = Gauge(
+    "salty_model_run_info",
+    "Served model run",
+    labels=("run",)
+)
+MODEL_RUN_SWAP_SECONDS = Histogram(
+    "salty_model_run_swap_seconds",
+    "Time to build and swap in a new model run",
+    labels=("outcome",),
+    buckets=SWAP_BUCKETS
+)
+RESIDENT_BYTES = Gauge(
+    "salty_resident_bytes",
+    "Forecast array bytes held in memory per dataset, region and tier",
+    labels=("dataset", "region", "tier")
+)
+
+# Upstream requests
+
+def _host(url) -> str:
+    return urlsplit(str(url)).netloc
+
+async def _on_request_start(session, context: SimpleNamespace, params: aiohttp.TraceRequestStartParams):
+    context.host = _host(params.url)
+    context.last = time.perf_counter()
+
+async def _on_response_chunk(session, context: SimpleNamespace, params: aiohttp.TraceResponseChunkReceivedParams):
+    now = time.perf_counter()
+    UPSTREAM_BYTES.inc(context.host, amount=len(params.chunk))
+    UPSTREAM_SECONDS.inc(context.host, amount=now - context.last)
+    context.last = now
+
+async def _on_request_end(session, context: SimpleNamespace, params: aiohttp.TraceRequestEndParams):
+    now = time.perf_counter()
+    UPSTREAM_SECONDS.inc(context.host, amount=now - context.last)
+    context.last = now
+    UPSTREAM_REQUESTS.inc(context.host, str(params.response.status))
+
+async def _on_request_exception(session, context: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams):
+    UPSTREAM_REQUESTS.inc(context.host, "error")
+
+def upstream_trace_config() -> aiohttp.TraceConfig:
+    """aiohttp trace hooks recording status, bytes and transfer time per upstream host.
+
+    Pass as ``trace_configs=[upstream_trace_config()]`` to every
+    ``ClientSession`` that talks to an upstream.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_response_chunk_received.append(_on_response_chunk)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
@@ -3,6 +3,9 @@ from datetime import datetime, date, timedelta, timezone
 from typing import Optional, Tuple
 from email.utils import parsedate_to_datetime
 from features.common.model_run import ModelRun
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import traced
+from core.config import settings
 
 import aiohttp
 
@@ -57,10 +60,10 @@ class ModelRunService:
         cycle_str = f"{cycle_hour:02d}"
         
         # Check for the first GRIB file directly
-        url = f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/gfs.{date_str}/{cycle_str}/wave/gridded/gfswave.t{cycle_str}z.atlocn.0p16.f000.grib2"
+        url = f"{settings.gfs_wave_base_url}/gfs.{date_str}/{cycle_str}/wave/gridded/gfswave.t{cycle_str}z.atlocn.0p16.f000.grib2"
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[upstream_trace_config()]) as session:
                 # Use proper ClientTimeout object
                 timeout = aiohttp.ClientTimeout(total=30)
                 async with session.head(url, timeout=timeout) as response:
@@ -88,6 +91,7 @@ class ModelRunService:
             logger.error(f"Error checking cycle {cycle_str}Z: {e}")
             return None
 
+    @traced("model_run.latest_cycle")
     async def get_latest_available_cycle(self) -> Optional[ModelRun]:
         """Get the latest available model cycle."""
         # Get current time in both UTC and EST
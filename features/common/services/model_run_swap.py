@@ -0,0 +1,270 @@
+import asyncio
+import gc
+import logging
+import resource
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from features.common.model_run import ModelRun
+from features.common.services.cache_config import bump_generation
+from features.common.services.metrics import MODEL_RUN_SWAP_SECONDS
+from features.common.services.tracing import traced
+from features.wind.services.gfs_wind_client import GFSWindClient
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def current_rss_bytes() -> int:
+    """Current resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        # Peak RSS is the best we can do without /proc (kilobytes on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class Generation:
+    """A version of the served model data with an in-flight request counter."""
+
+    def __init__(self, number: int, model_run: Optional[ModelRun]):
+        self.number = number
+        self.model_run = model_run
+        self.in_flight = 0
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    def enter(self):
+        """Register a request served by this generation."""
+        self.in_flight += 1
+        self._drained.clear()
+
+    def exit(self):
+        """Unregister a finished request."""
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self.in_flight = 0
+            self._drained.set()
+
+    async def wait_drained(self, timeout: float) -> bool:
+        """Wait for in-flight requests to finish.
+
+        Returns:
+            bool: True if drained, False if the timeout expired first
+        """
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+class ModelRunSwapController:
+    """Swaps the served model run without downtime and within a memory ceiling.
+
+    When the new run fits under the ceiling it is built in full next to the
+    old one and swapped in one step. Otherwise the wind regions, which hold
+    nearly all resident data, are built and handed over one at a time so at
+    most one extra region is resident. In both modes the old generation is
+    drained of in-flight requests before its file handles are closed.
+    """
+
+    def __init__(
+        self,
+        app_state: Any,
+        state_factory: Callable[[], Any],
+        memory_ceiling_bytes: Optional[int] = None,
+        drain_timeout: Optional[float] = None
+    ):
+        """Initialize the controller.
+
+        Args:
+            app_state: FastAPI ``app.state`` holding ``active_state`` and the services
+            state_factory: Creates an empty ``ModelRunState``
+            memory_ceiling_bytes: RSS ceiling for building a new run
+            drain_timeout: Seconds to wait for in-flight requests before releasing
+        """
+        self.app_state = app_state
+        self.state_factory = state_factory
+        self.memory_ceiling_bytes = (
+            memory_ceiling_bytes if memory_ceiling_bytes is not None
+            else settings.swap.memory_ceiling_bytes
+        )
+        self.drain_timeout = drain_timeout if drain_timeout is not None else settings.swap.drain_timeout
+        self.staging_state: Optional[Any] = None
+        self._swap_lock = asyncio.Lock()
+        active_state = getattr(app_state, "active_state", None)
+        self.generation = Generation(0, active_state.current_model_run if active_state else None)
+
+    @property
+    def is_swapping(self) -> bool:
+        return self._swap_lock.locked()
+
+    @contextmanager
+    def track_request(self) -> Iterator[Generation]:
+        """Count a request against the generation active when it started."""
+        generation = self.generation
+        generation.enter()
+        try:
+            yield generation
+        finally:
+            generation.exit()
+
+    def _advance_generation(self, model_run: ModelRun, bump_cache: bool = True) -> Generation:
+        """Start a new generation and return the previous one.
+
+        Cached responses are keyed by the cache generation too, so bumping it
+        invalidates them at the same moment the new data starts being served.
+
+        Args:
+            model_run: Model run the new generation serves
+            bump_cache: Also switch the cache generation; only once every
+                service is bound to the new run, or results computed from the
+                old run would be cached under the new run's keys
+        """
+        previous = self.generation
+        self.generation = Generation(previous.number + 1, model_run)
+        if bump_cache:
+            bump_generation(model_run)
+        return previous
+
+    def _bind_services(self, state: Any):
+        """Point the data services at a state's clients."""
+        self.app_state.wave_service.gfs_client = state.gfs_client
+        self.app_state.wave_service_v2.gfs_client = state.gfs_wave_client_v2
+        self.app_state.wind_service.gfs_client = state.gfs_wind_client
+
+    @traced("model_run.retire")
+    async def _retire(self, generation: Generation, release: Callable[[], Awaitable[None]]):
+        """Drain a generation's in-flight requests, then release its resources."""
+        if not await generation.wait_drained(self.drain_timeout):
+            logger.warning(
+                f"⚠️ Generation {generation.number} still has {generation.in_flight} requests "
+                f"after {self.drain_timeout}s, releasing anyway"
+            )
+        await release()
+        gc.collect()
+
+    def _fits_in_memory(self, extra_bytes: int) -> bool:
+        """Check whether extra resident bytes fit under the ceiling."""
+        if not self.memory_ceiling_bytes:
+            return True
+        return current_rss_bytes() + extra_bytes <= self.memory_ceiling_bytes
+
+    @traced("model_run.swap")
+    async def swap(self, new_model_run: ModelRun) -> bool:
+        """Build the new model run and swap it in.
+
+        Returns:
+            bool: True if the new run is now being served
+        """
+        if self._swap_lock.locked():
+            logger.info("⏳ Model run swap already in progress")
+            return False
+
+        async with self._swap_lock:
+            started = time.monotonic()
+            old_state = self.app_state.active_state
+            old_wind = old_state.gfs_wind_client
+            estimate = sum(old_wind.resident_bytes().values()) if old_wind else 0
+
+            try:
+                if self._fits_in_memory(estimate):
+                    swapped = await self._swap_full(new_model_run)
+                else:
+                    logger.info(
+                        f"📉 New run needs ~{estimate} bytes over the {self.memory_ceiling_bytes} byte "
+                        f"ceiling, swapping region by region"
+                    )
+                    swapped = await self._swap_by_region(new_model_run)
+            except Exception as e:
+                logger.error(f"❌ Error swapping model run: {str(e)}")
+                swapped = False
+            finally:
+                if self.staging_state is not None:
+                    await self.staging_state.cleanup()
+                    self.staging_state = None
+
+            MODEL_RUN_SWAP_SECONDS.observe(time.monotonic() - started, "success" if swapped else "failed")
+            if swapped:
+                self.app_state.active_state.cleanup_old_files()
+                logger.info(
+                    f"✅ Swapped to model run {new_model_run.date_str} {new_model_run.cycle_hour:02d}Z "
+                    f"in {time.monotonic() - started:.1f}s (generation {self.generation.number})"
+                )
+            return swapped
+
+    @traced("model_run.swap_full")
+    async def _swap_full(self, new_model_run: ModelRun) -> bool:
+        """Build the complete new state, then swap it in at once."""
+        logger.info(f"🔄 Prefetching data for new model run {new_model_run.date_str} {new_model_run.cycle_hour:02d}Z")
+        self.staging_state = self.state_factory()
+        await self.staging_state.initialize(new_model_run)
+
+        new_state, self.staging_state = self.staging_state, None
+        old_state = self.app_state.active_state
+        self._bind_services(new_state)
+        self.app_state.active_state = new_state
+        old_generation = self._advance_generation(new_model_run)
+
+        await self._retire(old_generation, old_state.cleanup)
+        return True
+
+    @traced("model_run.swap_by_region")
+    async def _swap_by_region(self, new_model_run: ModelRun) -> bool:
+        """Build and hand over one wind region at a time.
+
+        The live wind client keeps serving and takes over each region from a
+        staging client as soon as it is loaded, so only one region of the new
+        run is resident next to the old run at any moment.
+        """
+        old_state = self.app_state.active_state
+        live_wind: GFSWindClient = old_state.gfs_wind_client
+
+        # Wave and bulletin clients hold no gridded data, so they are built in full
+        self.staging_state = self.state_factory()
+        await self.staging_state.initialize(new_model_run, load_wind=False)
+        staging_wind: GFSWindClient = self.staging_state.gfs_wind_client
+
+        await live_wind.stop_retry_worker()
+        adopted = 0
+        for region in settings.wind.regions:
+            if not await staging_wind.load_region(region):
+                logger.warning(f"⚠️ Keeping previous run for {region}, new run failed to load")
+                continue
+
+            previous = live_wind.adopt_region(region, staging_wind)
+            # Other regions and the wave services still serve the old run, so the
+            # cache generation only moves once everything is handed over below
+            old_generation = self._advance_generation(new_model_run, bump_cache=False)
+
+            async def release(stores=previous):
+                GFSWindClient.close_stores(stores)
+
+            await self._retire(old_generation, release)
+            adopted += 1
+            logger.info(f"🔀 Swapped wind region {region} (RSS {current_rss_bytes()} bytes)")
+
+        if adopted == 0:
+            live_wind.start_retry_worker()
+            return False
+
+        live_wind.adopt_run(staging_wind)
+
+        # Move the live wind client into the new state and retire the rest of the old one
+        new_state, self.staging_state = self.staging_state, None
+        new_state.gfs_wind_client = live_wind
+        old_state.gfs_wind_client = None
+        await staging_wind.close()
+
+        self._bind_services(new_state)
+        self.app_state.active_state = new_state
+        old_generation = self._advance_generation(new_model_run)
+        await self._retire(old_generation, old_state.cleanup)
+        return True
+
+    async def close(self):
+        """Release a partially built state on shutdown."""
+        if self.staging_state is not None:
+            await self.staging_state.cleanup()
+            self.staging_state = None
@@ -0,0 +1,125 @@
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from features.common.models.station_types import Station
+from features.common.services.wet_cell_index import get_wet_cell_index
+
+logger = logging.getLogger(__name__)
+
+class StationPointStore:
+    """Forecast values for a fixed set of stations, without the grids they came from.
+
+    Each decoded forecast hour contributes only the station cells and their
+    neighbours (a ``(2 * radius + 1)^2`` block around the nearest cell),
+    stored as a ``(station, time, variable, cell)`` float32 array. Blocks
+    are centred on the nearest ocean cell, so coastal stations whose nearest
+    cell is land still get values; neighbours are kept as a per-step fallback.
+    """
+
+    def __init__(
+        self,
+        stations: Sequence[Station],
+        variables: Sequence[str],
+        radius: int = 1
+    ):
+        self.station_ids = [station.station_id for station in stations]
+        self.lats = np.array([station.location.coordinates[1] for station in stations], dtype=np.float64)
+        self.lons = np.array([station.location.coordinates[0] for station in stations], dtype=np.float64)
+        self.variables = tuple(variables)
+        self.radius = radius
+        self._positions = {station_id: i for i, station_id in enumerate(self.station_ids)}
+        self._cell_lat: Optional[np.ndarray] = None  # (S, K) grid row per cell
+        self._cell_lon: Optional[np.ndarray] = None  # (S, K) grid column per cell
+        self._covered: Optional[np.ndarray] = None   # (S,) station inside the grid
+        self._hours: Dict[np.datetime64, np.ndarray] = {}  # valid time -> (S, V, K)
+        self._stacked: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _build_index(self, latitude: np.ndarray, longitude: np.ndarray, wet: np.ndarray):
+        """Locate each station's cell block on the grid, centred on the nearest wet cell."""
+        query_lons = self.lons % 360 if longitude.max() > 180 else self.lons
+        lat_idx = np.abs(latitude[np.newaxis, :] - self.lats[:, np.newaxis]).argmin(axis=1)
+        lon_idx = np.abs(longitude[np.newaxis, :] - query_lons[:, np.newaxis]).argmin(axis=1)
+
+        # Stations further than one cell outside the grid extent are not served
+        lat_step = np.abs(np.diff(latitude[:2])).item() if len(latitude) > 1 else 0
+        lon_step = np.abs(np.diff(longitude[:2])).item() if len(longitude) > 1 else 0
+        self._covered = (
+            (np.abs(latitude[lat_idx] - self.lats) <= lat_step)
+            & (np.abs(longitude[lon_idx] - query_lons) <= lon_step)
+        )
+
+        lat_idx, lon_idx = get_wet_cell_index(latitude, longitude, wet).remap(lat_idx, lon_idx)
+        offsets = np.arange(-self.radius, self.radius + 1)
+        d_lat, d_lon = np.meshgrid(offsets, offsets, indexing="ij")
+        self._cell_lat = np.clip(lat_idx[:, np.newaxis] + d_lat.ravel(), 0, len(latitude) - 1)
+        self._cell_lon = np.clip(lon_idx[:, np.newaxis] + d_lon.ravel(), 0, len(longitude) - 1)
+        logger.info(f"📍 Indexed {int(self._covered.sum())}/{len(self.station_ids)} stations on grid")
+
+    def add_hour(
+        self,
+        valid_time: np.datetime64,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        values: np.ndarray
+    ):
+        """Extract station cells from one decoded hour.
+
+        Args:
+            valid_time: Valid time of the hour
+            latitude: Grid latitudes
+            longitude: Grid longitudes
+            values: Grid values with shape (V, lat, lon); not retained
+        """
+        if self._cell_lat is None:
+            self._build_index(latitude, longitude, ~np.isnan(values[0]))
+        # (V, S, K) -> (S, V, K)
+        cells = values[:, self._cell_lat, self._cell_lon].astype(np.float32)
+        self._hours[np.datetime64(valid_time, "ns")] = np.transpose(cells, (1, 0, 2))
+        self._stacked = None
+
+    def _stack(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Times (T,) and values (S, T, V, K), sorted by time."""
+        if self._stacked is None:
+            times = np.array(sorted(self._hours), dtype="datetime64[ns]")
+            if len(times):
+                values = np.stack([self._hours[t] for t in times], axis=1)
+            else:
+                values = np.empty((len(self.station_ids), 0, len(self.variables), 0), dtype=np.float32)
+            self._stacked = (times, values)
+        return self._stacked
+
+    def has_station(self, station_id: str) -> bool:
+        position = self._positions.get(station_id)
+        return position is not None and self._covered is not None and bool(self._covered[position])
+
+    def series(self, station_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Time series for a station.
+
+        Uses the centre cell, falling back per time step to the first
+        neighbour with a value when the centre is masked.
+
+        Returns:
+            Tuple of (valid times (T,), values (T, V))
+        """
+        times, values = self._stack()
+        if not self.has_station(station_id):
+            return times[:0], np.empty((0, len(self.variables)), dtype=np.float32)
+
+        block = values[self._positions[station_id]]  # (T, V, K)
+        centre = block.shape[-1] // 2
+        # Centre first, then the neighbours in order
+        order = [centre] + [k for k in range(block.shape[-1]) if k != centre]
+        ordered = block[:, :, order]
+        first_valid = np.argmax(~np.isnan(ordered[:, 0, :]), axis=1)
+        return times, ordered[np.arange(len(times)), :, first_valid]
+
+    def resident_bytes(self) -> int:
+        """Bytes held by extracted station values, including the stacked view."""
+        stacked = self._stacked[1].nbytes if self._stacked is not None else 0
+        return int(sum(cells.nbytes for cells in self._hours.values()) + stacked)
+
+    def clear(self):
+        self._hours.clear()
+        self._stacked = None
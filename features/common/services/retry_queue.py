@@ -0,0 +1,174 @@
+import json
+import os
+import random
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class RetryEntry(BaseModel):
+    """A forecast hour waiting to be downloaded again."""
+    region: str
+    forecast_hour: int
+    file_path: str
+    attempts: int = 0
+    next_attempt: float  # Unix timestamp
+    last_error: Optional[str] = None
+
+class DownloadRetryQueue:
+    """Persistent retry queue with exponential backoff and jitter.
+
+    Entries are keyed by (region, forecast hour) and saved as JSON next to
+    the model run's files, so a restart resumes filling the same holes.
+    """
+
+    def __init__(
+        self,
+        state_file: Path,
+        base_delay: float = 60,
+        max_delay: float = 1800,
+        max_attempts: int = 12
+    ):
+        """Initialize the queue, loading any entries saved for this run.
+
+        Args:
+            state_file: JSON file the queue is persisted to
+            base_delay: Delay in seconds before the first retry
+            max_delay: Upper bound for the backoff delay in seconds
+            max_attempts: Attempts before an entry is dropped
+        """
+        self.state_file = state_file
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._entries: Dict[Tuple[str, int], RetryEntry] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Load persisted entries."""
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file) as f:
+                for item in json.load(f):
+                    entry = RetryEntry(**item)
+                    self._entries[(entry.region, entry.forecast_hour)] = entry
+            if self._entries:
+                logger.info(f"🔁 Loaded {len(self._entries)} pending retries from {self.state_file}")
+        except Exception as e:
+            logger.error(f"Error loading retry queue {self.state_file}: {str(e)}")
+
+    def _save(self) -> None:
+        """Persist entries atomically."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_name(f".{self.state_file.name}.part")
+            with open(tmp_path, "w") as f:
+                json.dump([entry.model_dump() for entry in self._entries.values()], f)
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            logger.error(f"Error saving retry queue {self.state_file}: {str(e)}")
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with equal jitter."""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempts))
+        return random.uniform(delay / 2, delay)
+
+    def add(
+        self,
+        region: str,
+        forecast_hour: int,
+        file_path: Path,
+        not_before: Optional[float] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Queue a forecast hour, keeping the existing schedule if already queued."""
+        self.add_many(region, [(forecast_hour, file_path, not_before)], error=error)
+
+    def add_many(
+        self,
+        region: str,
+        entries: Iterable[Tuple[int, Path, Optional[float]]],
+        error: Optional[str] = None
+    ) -> int:
+        """Queue several forecast hours of a region and save the queue once.
+
+        Args:
+            region: Region of every entry
+            entries: (forecast hour, file path, earliest attempt as a Unix timestamp or None)
+            error: Error recorded on the new entries
+
+        Returns:
+            int: Number of hours newly queued
+        """
+        added = 0
+        for forecast_hour, file_path, not_before in entries:
+            key = (region, forecast_hour)
+            if key in self._entries:
+                continue
+            self._entries[key] = RetryEntry(
+                region=region,
+                forecast_hour=forecast_hour,
+                file_path=str(file_path),
+                next_attempt=max(not_before or 0, time.time() + self._backoff(0)),
+                last_error=error
+            )
+            added += 1
+        if added:
+            self._save()
+        return added
+
+    def record_failure(self, entry: RetryEntry, error: Optional[str] = None) -> None:
+        """Reschedule an entry after a failed attempt, dropping it when exhausted."""
+        key = (entry.region, entry.forecast_hour)
+        entry.attempts += 1
+        entry.last_error = error
+        if entry.attempts >= self.max_attempts:
+            logger.warning(
+                f"⚠️ Giving up on {entry.region} forecast hour {entry.forecast_hour} "
+                f"after {entry.attempts} attempts"
+            )
+            self._entries.pop(key, None)
+        else:
+            entry.next_attempt = time.time() + self._backoff(entry.attempts)
+            self._entries[key] = entry
+        self._save()
+
+    def remove(self, region: str, forecast_hour: int) -> None:
+        """Drop an entry after a successful download."""
+        if self._entries.pop((region, forecast_hour), None):
+            self._save()
+
+    def remove_region(self, region: str) -> int:
+        """Drop every entry of a region.
+
+        Returns:
+            int: Number of entries dropped
+        """
+        keys = [key for key in self._entries if key[0] == region]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self._save()
+        return len(keys)
+
+    def due(self, now: Optional[float] = None) -> List[RetryEntry]:
+        """Entries whose next attempt is due, earliest forecast hour first."""
+        now = now or time.time()
+        return sorted(
+            (e for e in self._entries.values() if e.next_attempt <= now),
+            key=lambda e: (e.forecast_hour, e.region)
+        )
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the next entry is due, or None when empty."""
+        if not self._entries:
+            return None
+        next_attempt = min(e.next_attempt for e in self._entries.values())
+        return max(0.0, next_attempt - time.time())
@@ -0,0 +1,242 @@
+import os
+import shutil
+import time
+import logging
+from pathlib import Path
+from typing import ClassVar, Dict, List, Optional, Set, Tuple
+
+from features.common.model_run import ModelRun
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ModelRunFileStorage:
+    """Stores GRIB files in one directory per model run.
+
+    Layout: ``{base_dir}/{YYYYMMDD}_{HH}z/{region}_f{hour:03d}.grib2``.
+    Dropping a run is a single ``rmtree`` and listing a run reads an
+    in-memory manifest built from one ``scandir`` of its directory.
+    """
+
+    # Manifests are shared by every storage instance pointing at the same run
+    # directory: run dir -> region -> forecast hours on disk
+    _manifests: ClassVar[Dict[Path, Dict[str, Set[int]]]] = {}
+    _last_access: ClassVar[Dict[Path, float]] = {}
+
+    def __init__(
+        self,
+        base_dir: str,
+        label: str = "GRIB",
+        retention_runs: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        """Initialize the file storage with a base directory.
+
+        Args:
+            base_dir: Directory holding one sub-directory per model run
+            label: Name used in log messages (e.g. "wave", "wind")
+            retention_runs: Number of most recent runs to keep on disk
+            max_bytes: Disk byte budget, enforced by evicting least recently used runs
+        """
+        self.base_dir = Path(base_dir)
+        self.label = label
+        self.retention_runs = max(1, retention_runs or settings.storage.retention_runs)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.storage.max_bytes
+        self._ensure_storage_dir()
+
+    def _ensure_storage_dir(self) -> None:
+        """Ensure the storage directory exists."""
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def get_run_name(model_run: ModelRun) -> str:
+        """Directory name for a model run."""
+        return f"{model_run.date_str}_{model_run.cycle_hour:02d}z"
+
+    def get_run_dir(self, model_run: ModelRun) -> Path:
+        """Directory holding all files of a model run."""
+        return self.base_dir / self.get_run_name(model_run)
+
+    def get_regional_file_path(self, region: str, model_run: ModelRun, forecast_hour: int) -> Path:
+        """Generate the path for a regional GFS file."""
+        return self.get_run_dir(model_run) / f"{region}_f{forecast_hour:03d}.grib2"
+
+    @staticmethod
+    def parse_file_name(name: str) -> Optional[Tuple[str, int]]:
+        """Parse ``{region}_f{hour}.grib2`` into (region, hour)."""
+        if not name.endswith(".grib2"):
+            return None
+        region, sep, hour = name[:-len(".grib2")].rpartition("_f")
+        if not sep or not hour.isdigit():
+            return None
+        return region, int(hour)
+
+    def is_file_valid(self, file_path: Path) -> bool:
+        """Check if a file is recorded in its run manifest."""
+        parsed = self.parse_file_name(file_path.name)
+        if not parsed:
+            return file_path.exists()
+        region, hour = parsed
+        return hour in self._get_manifest(file_path.parent).get(region, set())
+
+    def _get_manifest(self, run_dir: Path) -> Dict[str, Set[int]]:
+        """Get the manifest for a run directory, scanning it once on first use."""
+        manifest = self._manifests.get(run_dir)
+        if manifest is not None:
+            return manifest
+
+        manifest = {}
+        try:
+            with os.scandir(run_dir) as entries:
+                for entry in entries:
+                    parsed = self.parse_file_name(entry.name)
+                    if parsed and entry.is_file():
+                        region, hour = parsed
+                        manifest.setdefault(region, set()).add(hour)
+        except FileNotFoundError:
+            pass
+
+        self._manifests[run_dir] = manifest
+        return manifest
+
+    def _touch(self, run_dir: Path) -> None:
+        """Record a run as recently used for budget eviction."""
+        self._last_access[run_dir] = time.time()
+
+    async def save_file(self, file_path: Path, content: bytes) -> bool:
+        """Save file content to storage."""
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial GRIB file
+            tmp_path = file_path.with_name(f".{file_path.name}.part")
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+
+            parsed = self.parse_file_name(file_path.name)
+            if parsed:
+                region, hour = parsed
+                self._get_manifest(file_path.parent).setdefault(region, set()).add(hour)
+            self._touch(file_path.parent)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving file {file_path}: {str(e)}")
+            return False
+
+    def get_missing_files(
+        self,
+        region: str,
+        model_run: ModelRun,
+        forecast_hours: List[int]
+    ) -> List[Tuple[int, Path]]:
+        """Get list of missing files for a region."""
+        available = self._get_manifest(self.get_run_dir(model_run)).get(region, set())
+        return [
+            (hour, self.get_regional_file_path(region, model_run, hour))
+            for hour in forecast_hours
+            if hour not in available
+        ]
+
+    def get_valid_files(
+        self,
+        region: str,
+        model_run: ModelRun,
+        forecast_hours: List[int]
+    ) -> List[Path]:
+        """Get list of valid files for a region."""
+        run_dir = self.get_run_dir(model_run)
+        available = self._get_manifest(run_dir).get(region, set())
+        self._touch(run_dir)
+        return [
+            self.get_regional_file_path(region, model_run, hour)
+            for hour in forecast_hours
+            if hour in available
+        ]
+
+    def list_runs(self) -> List[Path]:
+        """List run directories, oldest first."""
+        try:
+            with os.scandir(self.base_dir) as entries:
+                runs = [Path(entry.path) for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return []
+        # YYYYMMDD_HHz names sort chronologically
+        return sorted(runs, key=lambda p: p.name)
+
+    @staticmethod
+    def _dir_size(run_dir: Path) -> int:
+        """Total bytes of files in a run directory."""
+        total = 0
+        try:
+            with os.scandir(run_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        total += entry.stat().st_size
+        except FileNotFoundError:
+            pass
+        return total
+
+    def disk_usage(self) -> int:
+        """Total bytes used by all stored runs."""
+        return sum(self._dir_size(run_dir) for run_dir in self.list_runs())
+
+    def _remove_run(self, run_dir: Path) -> None:
+        """Delete a run directory and forget its manifest."""
+        shutil.rmtree(run_dir, ignore_errors=True)
+        self._manifests.pop(run_dir, None)
+        self._last_access.pop(run_dir, None)
+
+    def _remove_legacy_files(self) -> int:
+        """Delete files left over from the old flat directory layout."""
+        deleted = 0
+        for file_path in self.base_dir.glob("*.grib2"):
+            file_path.unlink(missing_ok=True)
+            deleted += 1
+        return deleted
+
+    def cleanup_old_files(self, current_run: ModelRun) -> None:
+        """Apply run retention and the disk byte budget.
+
+        Keeps the current run plus the most recent ``retention_runs - 1``
+        older runs, then evicts least recently used runs until the stored
+        bytes fit ``max_bytes``. The current run is never evicted.
+        """
+        try:
+            current_dir = self.get_run_dir(current_run)
+            deleted_runs = 0
+
+            older_runs = [r for r in self.list_runs() if r.name < current_dir.name]
+            keep_older = self.retention_runs - 1
+            expired = older_runs[:-keep_older] if keep_older > 0 else older_runs
+            for run_dir in expired:
+                self._remove_run(run_dir)
+                deleted_runs += 1
+
+            if self.max_bytes:
+                sizes = {r: self._dir_size(r) for r in self.list_runs()}
+                total = sum(sizes.values())
+                evictable = sorted(
+                    (r for r in sizes if r != current_dir),
+                    key=lambda r: self._last_access.get(r, r.stat().st_mtime)
+                )
+                for run_dir in evictable:
+                    if total <= self.max_bytes:
+                        break
+                    total -= sizes[run_dir]
+                    self._remove_run(run_dir)
+                    deleted_runs += 1
+                if total > self.max_bytes:
+                    logger.warning(
+                        f"⚠️ Current {self.label} run uses {total} bytes, "
+                        f"over the {self.max_bytes} byte budget"
+                    )
+
+            deleted_files = self._remove_legacy_files()
+
+            if deleted_runs > 0 or deleted_files > 0:
+                logger.info(
+                    f"Cleaned up {deleted_runs} {self.label} runs and "
+                    f"{deleted_files} legacy files from previous model runs"
+                )
+        except Exception as e:
+            logger.error(f"Error during cleanup: {str(e)}")
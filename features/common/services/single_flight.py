@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one computation.
+
+    The first caller for a key starts the computation; callers arriving
+    while it is in flight await the same result (or exception) instead of
+    starting their own. The computation runs as its own task, so a caller
+    that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+        _flights.append(self)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for a key, or join the run already in flight.
+
+        Args:
+            key: Cache key identifying the computation
+            fn: Zero-argument coroutine function computing the value
+
+        Returns:
+            The value computed by the single execution
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def is_in_flight(self, key: str) -> bool:
+        """Whether a computation for the key is running (a call would join it)."""
+        return key in self._in_flight
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+        waiters = self._waiters.pop(key, 0)
+        if waiters:
+            logger.debug(f"🔗 {self.name}: {waiters} concurrent calls for {key} coalesced")
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counters since startup."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "max_waiters": self.max_waiters,
+            "in_flight": len(self._in_flight)
+        }
+
+# Every SingleFlight created in this process, for reporting
+_flights: List[SingleFlight] = []
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Coalescing counters of every SingleFlight by name."""
+    return {flight.name: flight.stats() for flight in _flights}
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from aiocache import cached
+
+from features.common.services.metrics import CACHE_REQUESTS
+from features.common.services.single_flight import SingleFlight
+from features.common.services.tracing import start_background_task
+
+logger = logging.getLogger(__name__)
+
+class SWREntry(NamedTuple):
+    """Cached value with the wall-clock time it stops being fresh."""
+    value: Any
+    fresh_until: float
+
+class cached_swr(cached):
+    """``@cached`` with stale-while-revalidate semantics.
+
+    Entries live in the cache for the hard ``ttl``. Until ``soft_ttl`` has
+    passed they are served as usual. After that the stale value is still
+    returned immediately and one background refresh per key recomputes it,
+    so only a request after the hard TTL (or a cold miss) waits for the
+    computation. Concurrent misses and refreshes for a key share one
+    computation through a ``SingleFlight`` named after the function.
+
+    Args:
+        soft_ttl: Seconds an entry is fresh
+        ttl: Seconds an entry may be served at all; must be at least ``soft_ttl``
+        kwargs: Any other ``@cached`` argument
+    """
+
+    def __init__(self, soft_ttl: float, ttl: float, **kwargs: Any):
+        if ttl < soft_ttl:
+            raise ValueError(f"Hard TTL {ttl}s is shorter than soft TTL {soft_ttl}s")
+        super().__init__(ttl=ttl, **kwargs)
+        self.soft_ttl = soft_ttl
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.flight: Optional[SingleFlight] = None
+
+    def __call__(self, f):
+        self.flight = SingleFlight(f.__qualname__)
+        self.metric_namespace = self._namespace or f.__qualname__
+        wrapper = super().__call__(f)
+        wrapper.flight = self.flight
+        return wrapper
+
+    async def decorator(
+        self, f, *args, cache_read=True, cache_write=True, aiocache_wait_for_write=True, **kwargs
+    ):
+        key = self.get_cache_key(f, args, kwargs)
+
+        if cache_read:
+            entry = await self.get_from_cache(key)
+            if isinstance(entry, SWREntry):
+                if time.time() >= entry.fresh_until:
+                    CACHE_REQUESTS.inc(self.metric_namespace, "stale")
+                    self._schedule_refresh(key, f, args, kwargs)
+                else:
+                    CACHE_REQUESTS.inc(self.metric_namespace, "hit")
+                return entry.value
+
+        if not cache_write:
+            return await f(*args, **kwargs)
+        CACHE_REQUESTS.inc(self.metric_namespace, "coalesced" if self.flight.is_in_flight(key) else "miss")
+        return await self.flight.do(key, lambda: self._compute(key, f, args, kwargs))
+
+    async def _compute(self, key: str, f: Callable, args: tuple, kwargs: dict) -> Any:
+        """Run the function once and cache its result (joined by concurrent callers)."""
+        result = await f(*args, **kwargs)
+        if not self.skip_cache_func(result):
+            await self.set_in_cache(key, SWREntry(result, time.time() + self.soft_ttl))
+        return result
+
+    def _schedule_refresh(self, key: str, f: Callable, args: tuple, kwargs: dict):
+        """Start a background recompute unless one is already running for the key."""
+        if key in self._refreshing:
+            return
+        task = start_background_task(self._refresh(key, f, args, kwargs))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, f: Callable, args: tuple, kwargs: dict):
+        try:
+            await self.flight.do(key, lambda: self._compute(key, f, args, kwargs))
+        except Exception as e:
+            # Keep serving the stale value until the hard TTL
+            logger.warning(f"⚠️ Background refresh of {key} failed, serving stale value: {str(e)}")
@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import pickle
+import time
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from aiocache.base import BaseCache
+from aiocache.serializers import NullSerializer
+
+from features.common.services.cache_config import (
+    _generation_tag,
+    add_generation_listener,
+    current_generation
+)
+from core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Only the tiered cache backend needs redis
+    aioredis = None
+    RedisError = OSError
+
+logger = logging.getLogger(__name__)
+
+def redis_available() -> bool:
+    """Check whether the redis package is installed."""
+    return aioredis is not None
+
+def encode_value(value: Any, level: int = 6) -> bytes:
+    """Compact binary encoding for L2: pickled with the highest protocol, then zlib compressed."""
+    return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), level)
+
+def decode_value(data: bytes) -> Any:
+    """Inverse of ``encode_value``."""
+    return pickle.loads(zlib.decompress(data))
+
+class RedisLink:
+    """Redis connection and invalidation subscriber shared by every TieredCache in a process.
+
+    Overwrites, deletes and clears are published on one channel. Every other
+    instance drops the matching L1 entries, so no instance keeps serving a
+    value that was replaced or invalidated elsewhere; the next read fetches
+    the current value from Redis. Model run switches are not published:
+    keys carry the generation, so each instance stops reading the previous
+    run's entries when it switches itself.
+    """
+
+    RECONNECT_DELAY = 5
+
+    def __init__(self, url: str, prefix: str, client: Optional[Any] = None):
+        """Initialize the link.
+
+        Args:
+            url: Redis URL
+            prefix: Prefix for every Redis key and the invalidation channel
+            client: Ready ``redis.asyncio`` compatible client (e.g. fakeredis in tests)
+        """
+        self.url = url
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidate"
+        self.origin = uuid.uuid4().hex
+        self._client = client
+        self._caches: "weakref.WeakSet[TieredCache]" = weakref.WeakSet()
+        self._listener: Optional[asyncio.Task] = None
+        self._healthy = True
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = aioredis.from_url(
+                self.url,
+                socket_connect_timeout=1,
+                socket_timeout=1
+            )
+        return self._client
+
+    def key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def register(self, cache: "TieredCache"):
+        self._caches.add(cache)
+
+    def ok(self):
+        """Record a successful Redis call."""
+        if not self._healthy:
+            self._healthy = True
+            logger.info("✅ Redis cache reachable again")
+
+    def failed(self, error: Exception):
+        """Record a failed Redis call; requests keep being served from L1 and the source."""
+        if self._healthy:
+            self._healthy = False
+            logger.warning(f"⚠️ Redis cache unavailable, serving from memory only: {str(error)}")
+
+    def ensure_listening(self):
+        """Start the invalidation subscriber once an event loop is running."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def publish(self, message: Dict[str, Any]):
+        """Announce an invalidation to the other instances."""
+        try:
+            await self.client.publish(self.channel, json.dumps({**message, "origin": self.origin}))
+            self.ok()
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self.failed(e)
+
+    def reclaim_stale(self) -> int:
+        """Drop every registered cache's L1 entries of previous generations.
+
+        Returns:
+            int: Number of entries removed
+        """
+        return sum(cache.reclaim_stale() for cache in list(self._caches))
+
+    def _handle(self, message: Dict[str, Any]):
+        if message.get("origin") == self.origin:
+            return
+        op = message.get("op")
+        for cache in list(self._caches):
+            if op in ("set", "delete"):
+                cache.l1_pop(message.get("key", ""))
+            elif op == "clear":
+                cache.l1_clear(message.get("namespace"))
+
+    async def _listen(self):
+        """Apply invalidations published by other instances, reconnecting on errors."""
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                logger.info(f"📡 Listening for cache invalidations on {self.channel}")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self._handle(json.loads(message["data"]))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"⚠️ Ignoring malformed cache invalidation: {str(e)}")
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                self.failed(e)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def close(self):
+        """Stop the subscriber and close the connection."""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# One link per process, shared by every TieredCache
+_link: Optional[RedisLink] = None
+
+def get_redis_link() -> RedisLink:
+    """Get the process-wide Redis link, creating it from settings on first use."""
+    global _link
+    if _link is None:
+        configure_redis_link()
+    return _link
+
+def configure_redis_link(client: Optional[Any] = None, url: Optional[str] = None) -> RedisLink:
+    """Create the process-wide Redis link.
+
+    Args:
+        client: Ready client to use instead of connecting to ``url`` (e.g. fakeredis)
+        url: Redis URL, defaults to ``settings.redis_url``
+
+    Returns:
+        RedisLink: The new link
+    """
+    global _link
+    _link = RedisLink(
+        url or settings.redis_url,
+        settings.cache.get("prefix", "salty_ocean"),
+        client=client
+    )
+    add_generation_listener(_reclaim_generation)
+    return _link
+
+def _reclaim_generation(generation: str):
+    """Generation listener: free L1 memory held by the previous run right away."""
+    if _link is not None:
+        reclaimed = _link.reclaim_stale()
+        if reclaimed:
+            logger.info(f"🗑️ Dropped {reclaimed} in-memory cache entries of the previous generation")
+
+async def close_redis_link():
+    """Close the process-wide Redis link if one was created."""
+    if _link is not None:
+        await _link.close()
+
+class TieredCache(BaseCache):
+    """Bounded in-process LRU (L1) in front of Redis (L2).
+
+    L1 holds decoded objects, so hot keys cost a dictionary lookup. Misses
+    fall through to Redis, where values are stored compressed with the
+    Redis TTL set to the entry's TTL; a hit is copied into L1 with its
+    remaining TTL. Keys carry the model run generation, so Redis entries
+    are shared by every instance and restart serving the same run. Sets,
+    deletes and clears are announced through the ``RedisLink``, so other
+    instances drop their L1 copy instead of serving it until it expires. If
+    Redis is unreachable the cache degrades to L1 only.
+    """
+
+    def __init__(
+        self,
+        serializer=None,
+        max_entries: Optional[int] = None,
+        link: Optional[RedisLink] = None,
+        **kwargs: Any
+    ):
+        super().__init__(serializer=serializer or NullSerializer(), **kwargs)
+        self.max_entries = max_entries or int(settings.cache.get("l1_max_entries", 1024))
+        self.compression_level = int(settings.cache.get("compression_level", 6))
+        self._own_link = link
+        self._l1: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._generation = current_generation()
+
+    @property
+    def _link(self) -> RedisLink:
+        # Resolved per call so configure_redis_link also applies to caches created at import
+        link = self._own_link or get_redis_link()
+        link.register(self)
+        return link
+
+    def l1_pop(self, key: str):
+        self._l1.pop(key, None)
+
+    def l1_clear(self, namespace: Optional[str] = None):
+        if namespace is None:
+            self._l1.clear()
+            return
+        for key in [key for key in self._l1 if key.startswith(namespace)]:
+            del self._l1[key]
+
+    def _l1_put(self, key: str, value: Any, ttl: Optional[float]):
+        expires = time.monotonic() + ttl if ttl else None
+        self._l1[key] = (expires, value)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+
+    def _l1_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._l1[key]
+            return False, None
+        self._l1.move_to_end(key)
+        return True, value
+
+    def reclaim_stale(self) -> int:
+        """Drop L1 entries written under a previous generation.
+
+        Returns:
+            int: Number of entries removed
+        """
+        tag = _generation_tag(current_generation())
+        stale = [key for key in self._l1 if tag not in key]
+        for key in stale:
+            del self._l1[key]
+        self._generation = current_generation()
+        return len(stale)
+
+    async def _get(self, key, encoding="utf-8", _conn=None):
+        found, value = self._l1_get(key)
+        if found:
+            return value
+
+        self._link.ensure_listening()
+        redis_key = self._link.key(key)
+        try:
+            async with self._link.client.pipeline(transaction=False) as pipe:
+                pipe.get(redis_key)
+                pipe.pttl(redis_key)
+                data, pttl = await pipe.execute()
+            self._link.ok()
+        except (RedisError, OSError) as e:
+            self._link.failed(e)
+            return None
+        if data is None:
+            return None
+
+        value = decode_value(data)
+        self._l1_put(key, value, pttl / 1000 if pttl and pttl > 0 else None)
+        return value
+
+    async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        return [await self._get(key, encoding=encoding) for key in keys]
+
+    async def _set(self, key, value, ttl=None, _cas_token=None, _conn=None):
+        if self._generation != current_generation():
+            self.reclaim_stale()
+        self._l1_put(key, value, ttl)
+
+        self._link.ensure_listening()
+        try:
+            await self._link.client.set(
+                self._link.key(key),
+                encode_value(value, self.compression_level),
+                px=int(ttl * 1000) if ttl else None
+            )
+            self._link.ok()
+        except (RedisError, OSError) as e:
+            self._link.failed(e)
+            return True
+        # Other instances may hold the previous value in L1
+        await self._link.publish({"op": "set", "key": key})
+        return True
+
+    async def _multi_set(self, pairs, ttl=None, _conn=None):
+        for key, value in pairs:
+            await self._set(key, value, ttl=ttl)
+        return True
+
+    async def _add(self, key, value, ttl=None, _conn=None):
+        if await self._exists(key):
+            raise ValueError(f"Key {key} already exists, use .set to update the value")
+        return await self._set(key, value, ttl=ttl)
+
+    async def _exists(self, key, _conn=None):
+        found, _ = self._l1_get(key)
+        if found:
+            return True
+        try:
+            exists = bool(await self._link.client.exists(self._link.key(key)))
+            self._link.ok()
+            return exists
+        except (RedisError, OSError) as e:
+            self._link.failed(e)
+            return False
+
+    async def _delete(self, key, _conn=None):
+        deleted = int(key in self._l1)
+        self.l1_pop(key)
+        try:
+            deleted = max(deleted, int(await self._link.client.delete(self._link.key(key))))
+            self._link.ok()
+        except (RedisError, OSError) as e:
+            self._link.failed(e)
+        await self._link.publish({"op": "delete", "key": key})
+        return deleted
+
+    async def _clear(self, namespace=None, _conn=None):
+        self.l1_clear(namespace)
+        try:
+            keys = [key async for key in self._link.client.scan_iter(match=self._link.key(f"{namespace or ''}*"))]
+            if keys:
+                await self._link.client.delete(*keys)
+            self._link.ok()
+        except (RedisError, OSError) as e:
+            self._link.failed(e)
+        await self._link.publish({"op": "clear", "namespace": namespace})
+        return True
+
+    async def _close(self, *args, _conn=None, **kwargs):
+        # The Redis link is shared; close_redis_link closes it on shutdown
+        pass
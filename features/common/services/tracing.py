@@ -0,0 +1,332 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import random
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+
+from core.config import TracingConfig, settings
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace as otel_trace
+except ImportError:  # Only the otlp exporter needs OpenTelemetry
+    otel_context = None
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+def opentelemetry_available() -> bool:
+    """Check whether the OpenTelemetry API package is installed."""
+    return otel_trace is not None
+
+class NoopSpan:
+    """Span that records nothing; ``span()`` hands out one shared instance when tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+class UnsampledSpan(NoopSpan):
+    """Root of a trace that was not sampled; spans opened inside it stay no-ops."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> "UnsampledSpan":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            _current_span.set(None)
+        return False
+
+# Innermost open span of the running task or thread (tasks and to_thread copy it)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("salty_current_span", default=None)
+
+class Span:
+    """Timed operation of the built-in tracer, kept in a tree under its root span.
+
+    Entering makes the span current so spans opened inside it (in the same
+    task, tasks it creates and ``asyncio.to_thread`` workers) become its
+    children. The root hands the finished tree to its tracer.
+    """
+
+    __slots__ = ("tracer", "name", "attributes", "parent", "children", "sampled", "start", "duration", "_token")
+
+    def __init__(self, tracer: "LogTracer", name: str, attributes: Dict[str, Any], parent: Optional["Span"], sampled: bool):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.children: List[Span] = []
+        self.sampled = sampled
+        self.start = 0.0
+        self.duration: Optional[float] = None
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self.start
+        if exc is not None:
+            self.record_exception(exc)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in another context than entered (a generator closed elsewhere)
+            _current_span.set(self.parent)
+        if self.parent is not None:
+            self.parent.children.append(self)
+        else:
+            self.tracer.finish(self)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        self.attributes["error"] = type(exc).__name__
+
+    def format(self) -> str:
+        """The span and its finished children on one line."""
+        text = f"{self.name} {self.duration * 1000:.2f}ms"
+        if self.attributes:
+            text += " {" + ", ".join(f"{key}={value}" for key, value in self.attributes.items()) + "}"
+        if self.children:
+            children = sorted(self.children, key=lambda child: child.start)
+            text += " [" + "; ".join(child.format() for child in children) + "]"
+        return text
+
+class NoopTracer:
+    """Default tracer: every span is the shared no-op."""
+
+    def span(self, name: str, attributes: Dict[str, Any]):
+        return NOOP_SPAN
+
+    def shutdown(self):
+        pass
+
+class LogTracer:
+    """Built-in tracer logging the span tree of each sampled trace.
+
+    Sampling is decided at the root and inherited by its children. With a
+    slow threshold every trace is recorded and also logged when its root
+    took longer, so rare slow requests show up at a low sample ratio.
+    """
+
+    def __init__(self, sample_ratio: float, slow_threshold_ms: float = 0):
+        self.sample_ratio = sample_ratio
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.logged = 0
+
+    def span(self, name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        if isinstance(parent, UnsampledSpan):
+            return NOOP_SPAN
+        if parent is not None:
+            return Span(self, name, attributes, parent, parent.sampled)
+        sampled = random.random() < self.sample_ratio
+        if not sampled and not self.slow_threshold:
+            return UnsampledSpan()
+        return Span(self, name, attributes, None, sampled)
+
+    def finish(self, root: Span):
+        slow = self.slow_threshold and root.duration >= self.slow_threshold
+        if root.sampled or slow:
+            self.logged += 1
+            logger.info(f"{'🐢' if slow else '🔍'} trace {root.format()}")
+
+    def shutdown(self):
+        pass
+
+class OpenTelemetryTracer:
+    """Spans created through the OpenTelemetry API.
+
+    With the SDK and OTLP exporter installed and an endpoint configured, a
+    tracer provider sampling at the configured ratio (parent based) exports
+    to that collector. Otherwise spans go to whichever provider is already
+    set, e.g. by ``opentelemetry-instrument``.
+    """
+
+    def __init__(self, config: TracingConfig):
+        self.provider = None
+        if config.otlp_endpoint:
+            self.provider = self._configure_provider(config)
+        self.tracer = otel_trace.get_tracer(config.service_name)
+
+    @staticmethod
+    def _configure_provider(config: TracingConfig):
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.error(
+                "❌ tracing.otlp_endpoint needs opentelemetry-sdk and opentelemetry-exporter-otlp; "
+                "using the globally configured tracer provider"
+            )
+            return None
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": config.service_name}),
+            sampler=ParentBased(TraceIdRatioBased(config.sample_ratio))
+        )
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=config.otlp_endpoint)))
+        otel_trace.set_tracer_provider(provider)
+        return provider
+
+    def span(self, name: str, attributes: Dict[str, Any]):
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def shutdown(self):
+        if self.provider is not None:
+            self.provider.shutdown()
+
+_tracer = NoopTracer()
+
+def configure_tracing(config: Optional[TracingConfig] = None):
+    """Select the tracer for the configured exporter.
+
+    Args:
+        config: Tracing settings; defaults to ``settings.tracing``
+    """
+    global _tracer
+    config = config or settings.tracing
+    _tracer.shutdown()
+    if config.exporter == "log":
+        _tracer = LogTracer(config.sample_ratio, config.slow_threshold_ms)
+    elif config.exporter == "otlp":
+        if opentelemetry_available():
+            _tracer = OpenTelemetryTracer(config)
+        else:
+            logger.error("❌ Tracing exporter 'otlp' needs opentelemetry-api installed; tracing disabled")
+            _tracer = NoopTracer()
+    else:
+        if config.exporter != "none":
+            logger.error(f"❌ Unknown tracing exporter {config.exporter!r}; tracing disabled")
+        _tracer = NoopTracer()
+    if not isinstance(_tracer, NoopTracer):
+        logger.info(f"🔍 Tracing with the {config.exporter} exporter at sample ratio {config.sample_ratio}")
+
+def shutdown_tracing():
+    """Flush spans still buffered for export."""
+    _tracer.shutdown()
+
+def span(name: str, **attributes: Any):
+    """Context manager timing a block as a span (the shared no-op when tracing is off).
+
+    Args:
+        name: Span name, dotted by component (e.g. ``gfs_wind.extract``)
+        **attributes: Span attributes; None values are dropped
+
+    Returns:
+        Span context manager with ``set_attribute`` and ``record_exception``
+    """
+    return _tracer.span(name, {key: value for key, value in attributes.items() if value is not None})
+
+# Serialization span opened as the endpoint returns, closed by the route handler
+_serialize_span: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar("salty_serialize_span", default=None)
+
+class TracedRoute(APIRoute):
+    """Route timing its endpoint and the response serialization as separate spans.
+
+    FastAPI validates and JSON encodes the endpoint's return value inside the
+    route handler after the endpoint returns, so the endpoint wrapper opens a
+    ``route.serialize`` span on its way out and the handler closes it once
+    the response is built. Use as ``APIRouter(route_class=TracedRoute)``.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _wrap_endpoint(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with span("route.endpoint"):
+                result = await endpoint(*args, **kwargs)
+            serialize = span("route.serialize")
+            serialize.__enter__()
+            _serialize_span.set(serialize)
+            return result
+        return wrapper
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            token = _serialize_span.set(None)
+            try:
+                response = await handler(request)
+            except BaseException as e:
+                self._close_serialize(token, e)
+                raise
+            self._close_serialize(token, None)
+            return response
+        return traced_handler
+
+    @staticmethod
+    def _close_serialize(token: contextvars.Token, error: Optional[BaseException]):
+        serialize = _serialize_span.get()
+        if serialize is not None:
+            serialize.__exit__(type(error) if error else None, error, None)
+        _serialize_span.reset(token)
+
+def start_background_task(coro: Coroutine) -> asyncio.Task:
+    """Create a task whose spans start their own traces instead of joining the caller's.
+
+    For work that outlives the request or startup step that launched it
+    (prefetches, retry workers, cache refreshes).
+    """
+    context = contextvars.copy_context()
+    context.run(_current_span.set, None)
+    if otel_context is not None:
+        context.run(otel_context.attach, otel_context.Context())
+    return asyncio.create_task(coro, context=context)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator running every call of a function or coroutine function in a span.
+
+    Args:
+        name: Span name; defaults to the function's qualified name
+    """
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
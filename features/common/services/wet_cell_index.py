@@ -0,0 +1,123 @@
+import logging
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def _nearest_in_column(wet: np.ndarray) -> np.ndarray:
+    """Row of the nearest wet cell in the same column for every cell, -1 when the column is dry."""
+    n_rows, n_cols = wet.shape
+    above = np.empty(wet.shape, dtype=np.int64)
+    below = np.empty(wet.shape, dtype=np.int64)
+    last = np.full(n_cols, -1)
+    for row in range(n_rows):
+        last = np.where(wet[row], row, last)
+        above[row] = last
+    last = np.full(n_cols, -1)
+    for row in range(n_rows - 1, -1, -1):
+        last = np.where(wet[row], row, last)
+        below[row] = last
+
+    rows = np.arange(n_rows)[:, np.newaxis]
+    use_below = (below >= 0) & ((above < 0) | (below - rows < rows - above))
+    return np.where(use_below, below, above)
+
+def nearest_wet_cells(wet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact Euclidean distance transform returning the nearest wet cell of every cell.
+
+    Separable: first the nearest wet row within each column, then for
+    column offsets k = 1, 2, ... every cell compares k² plus that column
+    distance at c ± k, stopping once k² exceeds the largest distance found.
+
+    Args:
+        wet: Boolean mask with shape (lat, lon), True over ocean
+
+    Returns:
+        Tuple of (row, column) index arrays with shape (lat, lon); -1 when the grid has no wet cell
+    """
+    rows, cols = np.indices(wet.shape)
+    if wet.all() or not wet.any():
+        return np.where(wet, rows, -1), np.where(wet, cols, -1)
+
+    n_cols = wet.shape[1]
+    column_row = _nearest_in_column(wet)
+    column_dist = np.where(column_row >= 0, (rows - column_row) ** 2, np.inf)
+    dist = column_dist.copy()
+    src_row = column_row.copy()
+    src_col = cols.copy()
+    offset = 1
+    while offset < n_cols and offset * offset < dist.max():
+        # Cells [lo:hi] look at the column ``shift`` away, to the left and to the right
+        for lo, hi, shift in ((offset, n_cols, -offset), (0, n_cols - offset, offset)):
+            cand_dist = column_dist[:, lo + shift:hi + shift] + offset * offset
+            better = cand_dist < dist[:, lo:hi]
+            if better.any():
+                dist[:, lo:hi][better] = cand_dist[better]
+                src_row[:, lo:hi][better] = column_row[:, lo + shift:hi + shift][better]
+                src_col[:, lo:hi][better] = cols[:, lo + shift:hi + shift][better]
+        offset += 1
+    return src_row, src_col
+
+class WetCellIndex:
+    """Maps any location on a regular grid to its nearest ocean cell in O(1).
+
+    Coastal buoys often sit on a cell that is NaN over land; serving the
+    nearest wet cell instead keeps their forecasts from coming back empty.
+    """
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray, wet: np.ndarray):
+        self.lat0 = float(latitude[0])
+        self.lon0 = float(longitude[0])
+        self.lat_step = float(latitude[1] - latitude[0]) if len(latitude) > 1 else 1.0
+        self.lon_step = float(longitude[1] - longitude[0]) if len(longitude) > 1 else 1.0
+        self.shape = wet.shape
+        self.lon_360 = bool(longitude.max() > 180)
+        self.rows, self.cols = nearest_wet_cells(wet)
+        self.remapped = int((~wet).sum()) if wet.any() else 0
+
+    def grid_cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Nearest grid cell by arithmetic on the regular spacing."""
+        query_lon = lon % 360 if self.lon_360 else lon
+        row = int(np.clip(round((lat - self.lat0) / self.lat_step), 0, self.shape[0] - 1))
+        col = int(np.clip(round((query_lon - self.lon0) / self.lon_step), 0, self.shape[1] - 1))
+        return row, col
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Nearest wet cell to a location (the nearest cell itself when it is wet)."""
+        row, col = self.grid_cell(lat, lon)
+        wet_row, wet_col = int(self.rows[row, col]), int(self.cols[row, col])
+        if wet_row < 0:
+            return row, col
+        return wet_row, wet_col
+
+    def remap(self, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized ``nearest`` for cells that are already on the grid."""
+        wet_rows, wet_cols = self.rows[rows, cols], self.cols[rows, cols]
+        no_wet = wet_rows < 0
+        return np.where(no_wet, rows, wet_rows), np.where(no_wet, cols, wet_cols)
+
+# One index per grid geometry and land mask, shared across model runs. Every
+# new mask adds an index, so the least recently used ones are dropped past the
+# limit instead of accumulating for the life of the process.
+MAX_INDEXES = 16
+_indexes: "OrderedDict[Tuple, WetCellIndex]" = OrderedDict()
+
+def get_wet_cell_index(latitude: np.ndarray, longitude: np.ndarray, wet: np.ndarray) -> WetCellIndex:
+    """Get the index for a grid, building it the first time the geometry is seen."""
+    key = (
+        len(latitude), float(latitude[0]), float(latitude[-1]),
+        len(longitude), float(longitude[0]), float(longitude[-1]),
+        hash(np.packbits(wet).tobytes())
+    )
+    index = _indexes.get(key)
+    if index is not None:
+        _indexes.move_to_end(key)
+        return index
+
+    index = _indexes[key] = WetCellIndex(latitude, longitude, wet)
+    while len(_indexes) > MAX_INDEXES:
+        _indexes.popitem(last=False)
+    logger.info(f"🗺️ Built wet cell index for {wet.shape} grid ({index.remapped} land cells remapped)")
+    return index
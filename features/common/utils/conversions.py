@@ -3,16 +3,19 @@ from typing import Optional
 class UnitConversions:
     """Centralized utility for unit conversions across the application."""
     
+    METERS_TO_FEET = 3.28084
+    MS_TO_MPH = 2.23694  # 1 m/s = 2.23694 mph
+    
     @staticmethod
     def meters_to_feet(meters: Optional[float]) -> Optional[float]:
         """Convert meters to feet."""
         if meters is None:
             return None
-        return round(meters * 3.28084, 2)
+        return round(meters * UnitConversions.METERS_TO_FEET, 2)
     
     @staticmethod
     def ms_to_mph(ms: Optional[float]) -> Optional[float]:
         """Convert meters per second to miles per hour."""
         if ms is None:
             return None
-        return round(ms * 2.23694, 2)  # 1 m/s = 2.23694 mph 
\ No newline at end of file
+        return round(ms * UnitConversions.MS_TO_MPH, 2) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from features.common.models.station_types import Station
 
@@ -16,4 +16,9 @@ class ConditionSummaryResponse(BaseModel):
     generated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class AllConditionSummariesResponse(BaseModel):
+    """Condition summaries for every station with forecasts."""
+    generated_at: datetime
+    summaries: List[ConditionSummaryResponse]
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+class LeadScore(BaseModel):
+    """Forecast error statistics for one lead time bin."""
+    lead_hours: int  # Start of the bin, e.g. 6 for leads 6-11h
+    count: int
+    bias: Optional[float]   # Mean forecast - observation
+    rmse: Optional[float]
+    skill: Optional[float]  # 1 - MSE / MSE of persistence; > 0 beats persistence
+
+class VariableScores(BaseModel):
+    """Scores of one forecast variable by lead time."""
+    variable: str  # e.g. "wind_speed"
+    units: str
+    leads: List[LeadScore]
+
+class StationVerification(BaseModel):
+    """Verification scores of one station."""
+    station_id: str
+    variables: List[VariableScores]
+
+class VerificationResponse(BaseModel):
+    """Verification of archived model runs against NDBC observations."""
+    generated_at: datetime
+    runs: List[str]  # Model runs verified, e.g. "20250218_06Z"
+    lead_bin_hours: int
+    overall: List[VariableScores]
+    stations: List[StationVerification]
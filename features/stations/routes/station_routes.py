@@ -1,15 +1,25 @@
 from typing import Dict
-from fastapi import APIRouter, Depends, Request
-from features.stations.models.summary_types import ConditionSummaryResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from features.stations.models.summary_types import (
+    AllConditionSummariesResponse,
+    ConditionSummaryResponse
+)
+from features.stations.models.verification_types import (
+    StationVerification,
+    VerificationResponse
+)
 from features.waves.models.ndbc_types import NDBCStation
 from features.stations.services.station_service import StationService
 from features.stations.services.condition_summary_service import ConditionSummaryService
+from features.stations.services.verification_service import VerificationService
+from features.common.services.tracing import TracedRoute
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
     prefix="/stations",
-    tags=["Stations"]
+    tags=["Stations"],
+    route_class=TracedRoute
 )
 
 def get_service(request: Request) -> StationService:
@@ -20,6 +30,13 @@ def get_condition_service(request: Request) -> ConditionSummaryService:
     """Dependency to get the ConditionSummaryService instance."""
     return request.app.state.condition_summary_service
 
+def get_verification_service(request: Request) -> VerificationService:
+    """Dependency to get the VerificationService instance."""
+    service = getattr(request.app.state, "verification_service", None)
+    if service is None:
+        raise HTTPException(status_code=404, detail="Forecast verification is disabled")
+    return service
+
 @router.get(
     "/geojson",
     summary="Get all stations in GeoJSON format",
@@ -32,6 +49,32 @@ async def get_stations_geojson(
     """Get all stations in GeoJSON format."""
     return await service.get_stations_geojson()
 
+@router.get(
+    "/summaries",
+    response_model=AllConditionSummariesResponse,
+    summary="Get condition summaries for all stations",
+    description="Returns a human-readable summary of current conditions and trends for every station with wind and wave forecasts"
+)
+
+async def get_all_station_conditions(
+    service: ConditionSummaryService = Depends(get_condition_service)
+):
+    """Get condition summaries for every station in one batch."""
+    return await service.get_all_condition_summaries()
+
+@router.get(
+    "/verification",
+    response_model=VerificationResponse,
+    summary="Get forecast verification for all stations",
+    description="Returns bias, RMSE and skill against persistence of archived wind and wave forecasts versus NDBC observations, by lead time"
+)
+
+async def get_all_station_verification(
+    service: VerificationService = Depends(get_verification_service)
+):
+    """Get the precomputed verification table for every station."""
+    return service.get_verification()
+
 @router.get(
     "/{station_id}/observations",
     response_model=NDBCStation,
@@ -58,4 +101,18 @@ async def get_station_conditions(
     service: ConditionSummaryService = Depends(get_condition_service)
 ):
     """Get a human-readable summary of conditions for a specific station."""
-    return await service.get_station_condition_summary(station_id) 
\ No newline at end of file
+    return await service.get_station_condition_summary(station_id)
+
+@router.get(
+    "/{station_id}/verification",
+    response_model=StationVerification,
+    summary="Get station forecast verification",
+    description="Returns bias, RMSE and skill against persistence of archived forecasts for the specified station, by lead time"
+)
+
+async def get_station_verification(
+    station_id: str,
+    service: VerificationService = Depends(get_verification_service)
+):
+    """Get the precomputed verification scores for a specific station."""
+    return service.get_station_verification(station_id)
@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from features.wind.models.wind_categories import WindDirection, TrendType
+from features.waves.models.wave_categories import Conditions
+from features.common.models.station_types import Station
+from features.stations.services.nowcast_engine import NOWCAST_FIELDS, NowcastCorrection
+
+# Category codes index into these tuples
+WIND_DIRECTIONS: Tuple[WindDirection, ...] = tuple(WindDirection)
+CONDITIONS: Tuple[Conditions, ...] = tuple(Conditions)
+TRENDS: Tuple[TrendType, ...] = (TrendType.STEADY, TrendType.BUILDING, TrendType.DROPPING)
+
+# Wind quality by wind direction code (N, NE, E, SE, S, SW, W, NW)
+WIND_QUALITIES = ("offshore", "semi-offshore", "side-shore", "semi-onshore", "onshore")
+EAST_COAST_QUALITY = np.array([2, 3, 4, 3, 2, 1, 0, 1], dtype=np.int8)  # Offshore is W
+WEST_COAST_QUALITY = np.array([2, 1, 0, 1, 2, 3, 4, 3], dtype=np.int8)  # Offshore is E
+
+WIND_FIELDS = ("speed", "direction")
+WAVE_FIELDS = ("height", "period", "direction")
+
+class ConditionArrays(NamedTuple):
+    """Current conditions, trends and categories for S stations, each with shape (S,)."""
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray   # WIND_DIRECTIONS codes
+    wind_trend: np.ndarray       # TRENDS codes
+    wind_quality: np.ndarray     # WIND_QUALITIES codes
+    wave_height: np.ndarray
+    wave_period: np.ndarray
+    wave_trend: np.ndarray       # TRENDS codes
+    conditions: np.ndarray       # CONDITIONS codes
+
+def stack_forecasts(
+    forecasts: Sequence[Sequence[Any]],
+    fields: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stack per-station forecast points into padded arrays.
+
+    Missing values count as 0, like the per-station summary always did.
+
+    Args:
+        forecasts: Forecast points per station, sorted by time
+        fields: Point attributes to extract
+
+    Returns:
+        Tuple of (epoch seconds (S, T) padded with inf, values (F, S, T), point counts (S,))
+    """
+    counts = np.array([len(points) for points in forecasts], dtype=np.int64)
+    width = int(counts.max()) if len(counts) else 0
+    times = np.full((len(forecasts), width), np.inf)
+    values = np.zeros((len(fields), len(forecasts), width))
+    for s, points in enumerate(forecasts):
+        times[s, :len(points)] = [point.time.timestamp() for point in points]
+        for f, field in enumerate(fields):
+            values[f, s, :len(points)] = [getattr(point, field) or 0.0 for point in points]
+    return times, values, counts
+
+def current_and_future(
+    times: np.ndarray,
+    values: np.ndarray,
+    counts: np.ndarray,
+    future_time: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Values at the first point and at the first point at or after ``future_time``.
+
+    Stations without a point that late use their last point.
+
+    Returns:
+        Tuple of (current values (F, S), future values (F, S))
+    """
+    later = (times >= future_time) & np.isfinite(times)
+    future_idx = np.where(later.any(axis=1), later.argmax(axis=1), counts - 1)
+    stations = np.arange(times.shape[0])
+    return values[:, :, 0], values[:, stations, future_idx]
+
+def trend_codes(current: np.ndarray, future: np.ndarray, threshold: float) -> np.ndarray:
+    """TRENDS codes from the percent change between current and future values."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_change = (future - current) / current * 100
+    codes = np.where(percent_change > 0, 1, 2).astype(np.int8)
+    codes[(current <= 0) | (np.abs(percent_change) < threshold)] = 0
+    return codes
+
+def wind_quality_codes(directions: np.ndarray, longitudes: np.ndarray, coast_config: Dict) -> np.ndarray:
+    """WIND_QUALITIES codes relative to each station's coast (east coast table outside both ranges)."""
+    west = coast_config['west_coast']
+    east = coast_config['east_coast']
+    on_west = (longitudes >= west['min_lon']) & (longitudes <= west['max_lon'])
+    on_east = (longitudes >= east['min_lon']) & (longitudes <= east['max_lon'])
+    return np.where(on_west & ~on_east, WEST_COAST_QUALITY[directions], EAST_COAST_QUALITY[directions])
+
+class ConditionSummaryEngine:
+    """Computes condition summaries for many stations at once with NumPy.
+
+    Forecasts are stacked into (station, time) arrays so the +N hour lookup,
+    trends, categories and coast wind quality are a handful of array
+    operations regardless of the number of stations; only the final
+    sentence is formatted per station.
+    """
+
+    def __init__(self, trend_threshold: float, forecast_hours: int, coast_config: Dict):
+        self.trend_threshold = trend_threshold
+        self.forecast_hours = forecast_hours
+        self.coast_config = coast_config
+
+    def compute(
+        self,
+        stations: Sequence[Station],
+        wind_forecasts: Sequence[Sequence[Any]],
+        wave_forecasts: Sequence[Sequence[Any]],
+        now: datetime,
+        correction: Optional[NowcastCorrection] = None
+    ) -> ConditionArrays:
+        """Compute conditions for stations that all have wind and wave forecast points.
+
+        Args:
+            stations: Stations to summarize
+            wind_forecasts: Wind forecast points per station
+            wave_forecasts: Wave forecast points per station
+            now: Current time; trends compare against ``forecast_hours`` later
+            correction: Buoy observation corrections blended into the forecasts first
+
+        Returns:
+            ConditionArrays: Arrays with one entry per station
+        """
+        future_time = now.timestamp() + self.forecast_hours * 3600
+
+        wind_times, wind_values, wind_counts = stack_forecasts(wind_forecasts, WIND_FIELDS)
+        wave_times, wave_values, wave_counts = stack_forecasts(wave_forecasts, WAVE_FIELDS)
+        if correction is not None:
+            stacked = {"wind": (wind_times, wind_values, WIND_FIELDS), "wave": (wave_times, wave_values, WAVE_FIELDS)}
+            for f, nowcast_field in enumerate(NOWCAST_FIELDS):
+                times, values, fields = stacked[nowcast_field.kind]
+                i = fields.index(nowcast_field.field)
+                values[i] = correction.apply(f, times, values[i])
+
+        (wind_speed, wind_dir), (future_speed, _) = current_and_future(
+            wind_times, wind_values, wind_counts, future_time
+        )
+        (wave_height, wave_period, wave_dir), (future_height, _, _) = current_and_future(
+            wave_times, wave_values, wave_counts, future_time
+        )
+
+        directions = WindDirection.from_degrees_array(wind_dir)
+        longitudes = np.array([station.location.coordinates[0] for station in stations])
+        return ConditionArrays(
+            wind_speed=wind_speed,
+            wind_direction=directions,
+            wind_trend=trend_codes(wind_speed, future_speed, self.trend_threshold),
+            wind_quality=wind_quality_codes(directions, longitudes, self.coast_config),
+            wave_height=wave_height,
+            wave_period=wave_period,
+            wave_trend=trend_codes(wave_height, future_height, self.trend_threshold),
+            conditions=Conditions.from_wind_wave_array(wind_speed, wind_dir, wave_dir)
+        )
+
+    @staticmethod
+    def describe(arrays: ConditionArrays, i: int) -> str:
+        """Human-readable summary sentence for station ``i``."""
+        wave_height = float(arrays.wave_height[i])
+        wave_period = float(arrays.wave_period[i])
+        wave_trend = TRENDS[arrays.wave_trend[i]].value.lower()
+        wind_trend = TRENDS[arrays.wind_trend[i]].value.lower()
+        wind_dir = WIND_DIRECTIONS[arrays.wind_direction[i]]
+        wind_quality = WIND_QUALITIES[arrays.wind_quality[i]]
+        conditions = CONDITIONS[arrays.conditions[i]]
+
+        wave_desc = f"{wave_height:.1f}ft"
+        if wave_period > 0:
+            wave_desc += f" {wave_period:.0f}s"
+        wave_desc += " waves"
+        if wave_trend != "steady":
+            wave_desc += f" are {wave_trend}"
+
+        wind_desc = f"winds are {float(arrays.wind_speed[i]):.0f}mph {wind_quality} from the {wind_dir.description.lower()}"
+        if wind_trend != "steady":
+            wind_desc += f" and {wind_trend}"
+
+        return f"{wave_desc}, {wind_desc}, making for {conditions.value.lower()} conditions."
+
+    def summarize(
+        self,
+        stations: Sequence[Station],
+        wind_forecasts: Sequence[Sequence[Any]],
+        wave_forecasts: Sequence[Sequence[Any]],
+        now: datetime,
+        correction: Optional[NowcastCorrection] = None
+    ) -> List[str]:
+        """Summary sentences for every station, in order."""
+        if not stations:
+            return []
+        arrays = self.compute(stations, wind_forecasts, wave_forecasts, now, correction)
+        return [self.describe(arrays, i) for i in range(len(stations))]
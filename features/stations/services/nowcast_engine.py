@@ -0,0 +1,89 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from features.common.utils.conversions import UnitConversions
+
+class NowcastField(NamedTuple):
+    """A forecast field and the buoy observation it is corrected toward."""
+    kind: str         # "wind" or "wave" forecast
+    field: str        # Forecast point attribute
+    observation: str  # NDBC column
+    scale: float      # NDBC units to forecast units
+
+# Magnitudes with smooth, persistent model errors. Directions and periods are
+# not corrected: partitions and the buoy's dominant period can disagree by
+# whole swell trains, which no decaying offset fixes.
+NOWCAST_FIELDS = (
+    NowcastField("wind", "speed", "WSPD", UnitConversions.MS_TO_MPH),
+    NowcastField("wave", "height", "WVHT", UnitConversions.METERS_TO_FEET),
+)
+
+def values_at(times: np.ndarray, values: np.ndarray, at: np.ndarray) -> np.ndarray:
+    """Linearly interpolate each station's forecast at one time.
+
+    Args:
+        times: (S, T) epoch seconds, ascending, padded with inf
+        values: (S, T) forecast values
+        at: (S,) epoch seconds
+
+    Returns:
+        np.ndarray: (S,) values, NaN where ``at`` is outside the forecast
+    """
+    stations = np.arange(times.shape[0])
+    reached = times >= at[:, None]
+    upper = reached.argmax(axis=1)
+    t1, v1 = times[stations, upper], values[stations, upper]
+    lower = np.maximum(upper - 1, 0)
+    t0, v0 = times[stations, lower], values[stations, lower]
+    inside = reached.any(axis=1) & np.isfinite(t1) & ((upper > 0) | (t1 == at))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(t1 > t0, (at - t0) / (t1 - t0), 1.0)
+        # An exact hit takes the point's own value, even if the previous one is missing
+        interpolated = np.where(t1 == at, v1, v0 + fraction * (v1 - v0))
+    return np.where(inside, interpolated, np.nan)
+
+def decay_weights(
+    times: np.ndarray,
+    observed_at: np.ndarray,
+    decay_hours: float,
+    horizon_hours: float
+) -> np.ndarray:
+    """Weight of the observation correction at each forecast time.
+
+    Full weight up to the observation, then ``exp(-elapsed / decay_hours)``,
+    and none beyond ``horizon_hours``.
+
+    Args:
+        times: (S, T) epoch seconds (inf padding gets no weight)
+        observed_at: (S,) observation times
+
+    Returns:
+        np.ndarray: (S, T) weights in [0, 1]
+    """
+    elapsed = np.maximum(times - observed_at[:, None], 0) / 3600
+    with np.errstate(invalid="ignore"):
+        weights = np.exp(-elapsed / decay_hours)
+    return np.where(elapsed <= horizon_hours, weights, 0.0)
+
+class NowcastCorrection(NamedTuple):
+    """Observation corrections for S stations, by NOWCAST_FIELDS index."""
+    offsets: np.ndarray      # (S, F) observation - model at the observation time; NaN for none
+    observed_at: np.ndarray  # (S,) epoch seconds
+    decay_hours: float
+    horizon_hours: float
+
+    def apply(self, field: int, times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Blend the correction of one field into stacked forecasts.
+
+        Args:
+            field: NOWCAST_FIELDS index
+            times: (S, T) epoch seconds of the forecast points
+            values: (S, T) forecast values
+
+        Returns:
+            np.ndarray: (S, T) corrected values, never below 0
+        """
+        offsets = np.nan_to_num(self.offsets[:, field])
+        weights = decay_weights(times, self.observed_at, self.decay_hours, self.horizon_hours)
+        return np.maximum(values + offsets[:, None] * weights, 0.0)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from features.common.services.cache_config import current_generation
+from features.common.services.forecast_window import ForecastWindow
+from features.stations.services.condition_summary_engine import stack_forecasts
+from features.stations.services.nowcast_engine import NOWCAST_FIELDS, NowcastCorrection, values_at
+from features.stations.services.station_service import StationService
+from features.waves.services.ndbc_buoy_client import HISTORY_COLUMNS, NDBCBuoyClient
+from features.waves.services.wave_data_service_v2 import WaveDataServiceV2
+from features.wind.services.wind_data_service import WindDataService
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Hours of forecast around an observation used to find the model value at its time
+MATCH_WINDOW_HOURS = 3
+
+class NowcastService:
+    """Keeps a bias correction per station from its latest buoy observation.
+
+    The correction is the difference between the observation and the model
+    interpolated to the observation time. A background job polls NDBC's
+    latest observations file and only recomputes stations whose observation
+    is newer than the one their correction was built from (all of them
+    after a model run switch). Requests just look the corrections up and
+    blend them into the forecast arrays with ``NowcastCorrection.apply``.
+    """
+
+    def __init__(
+        self,
+        wind_service: WindDataService,
+        wave_service: WaveDataServiceV2,
+        station_service: StationService,
+        buoy_client: NDBCBuoyClient
+    ):
+        self.wind_service = wind_service
+        self.wave_service = wave_service
+        self.buoy_client = buoy_client
+        self.station_ids = [station.station_id for station in station_service.get_all_stations()]
+        self._positions = {station_id: i for i, station_id in enumerate(self.station_ids)}
+        self._offsets = np.full((len(self.station_ids), len(NOWCAST_FIELDS)), np.nan)
+        self._observed_at = np.zeros(len(self.station_ids))
+        self._generation: Optional[str] = None
+
+    def correction(self, station_ids: Sequence[str]) -> NowcastCorrection:
+        """Current corrections for the stations, in order (NaN offsets for none)."""
+        positions = np.array([self._positions.get(station_id, -1) for station_id in station_ids], dtype=np.int64)
+        known = positions >= 0
+        offsets = np.full((len(positions), len(NOWCAST_FIELDS)), np.nan)
+        observed_at = np.zeros(len(positions))
+        offsets[known] = self._offsets[positions[known]]
+        observed_at[known] = self._observed_at[positions[known]]
+        return NowcastCorrection(
+            offsets=offsets,
+            observed_at=observed_at,
+            decay_hours=settings.nowcast.decay_hours,
+            horizon_hours=settings.nowcast.horizon_hours
+        )
+
+    async def _forecast_points(self, service: Any, station_ids: List[str], times: np.ndarray) -> List[List[Any]]:
+        """Hourly forecast points around each observation time (empty on failure)."""
+        async def fetch(station_id: str, observed_at: float) -> List[Any]:
+            hour = datetime.fromtimestamp(observed_at, timezone.utc).replace(minute=0, second=0, microsecond=0)
+            window = ForecastWindow(
+                start=hour - timedelta(hours=MATCH_WINDOW_HOURS),
+                end=hour + timedelta(hours=MATCH_WINDOW_HOURS),
+                step=1
+            )
+            response = await service.get_station_forecast(station_id, window)
+            return response.forecasts if response else []
+
+        results = await asyncio.gather(
+            *(fetch(station_id, observed_at) for station_id, observed_at in zip(station_ids, times)),
+            return_exceptions=True
+        )
+        return [[] if isinstance(result, BaseException) else result for result in results]
+
+    async def _compute_offsets(self, positions: np.ndarray, times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Observation minus model for the stations, (S, F)."""
+        station_ids = [self.station_ids[p] for p in positions]
+        offsets = np.full((len(positions), len(NOWCAST_FIELDS)), np.nan)
+        for kind, service in (("wind", self.wind_service), ("wave", self.wave_service)):
+            fields = [f for f, nowcast_field in enumerate(NOWCAST_FIELDS) if nowcast_field.kind == kind]
+            points = await self._forecast_points(service, station_ids, times)
+            if not any(points):
+                continue
+            forecast_times, forecast_values, _ = stack_forecasts(points, [NOWCAST_FIELDS[f].field for f in fields])
+            for j, f in enumerate(fields):
+                model = values_at(forecast_times, forecast_values[j], times.astype(np.float64))
+                observed = values[:, HISTORY_COLUMNS.index(NOWCAST_FIELDS[f].observation)] * NOWCAST_FIELDS[f].scale
+                offsets[:, f] = observed - model
+        return offsets
+
+    async def refresh(self) -> int:
+        """Recompute corrections of stations with a new observation.
+
+        Returns:
+            int: Stations whose correction was recomputed
+        """
+        latest = await self.buoy_client.get_latest_observations()
+        if latest is None:
+            return 0
+
+        # Corrections are relative to the served model run
+        generation = current_generation()
+        if generation != self._generation:
+            self._offsets[:] = np.nan
+            self._observed_at[:] = 0
+            self._generation = generation
+
+        oldest = time.time() - settings.nowcast.max_observation_age_minutes * 60
+        stale = self._observed_at < oldest
+        self._offsets[stale] = np.nan
+
+        positions = np.array([self._positions.get(station_id, -1) for station_id in latest.station_ids], dtype=np.int64)
+        known = positions >= 0
+        positions, times, values = positions[known], latest.times[known], latest.values[known]
+        changed = (times >= oldest) & (times > self._observed_at[positions])
+        if not changed.any():
+            return 0
+
+        positions, times, values = positions[changed], times[changed], values[changed]
+        offsets = await self._compute_offsets(positions, times, values)
+        self._offsets[positions] = offsets
+        self._observed_at[positions] = times
+        return len(positions)
+
+    async def run_periodically(self):
+        """Poll for new observations on the configured interval."""
+        while True:
+            try:
+                updated = await self.refresh()
+                if updated:
+                    logger.info(f"✅ Nowcast corrections updated for {updated} stations")
+            except Exception as e:
+                logger.error(f"❌ Error updating nowcast corrections: {str(e)}")
+            await asyncio.sleep(settings.nowcast.refresh_seconds)
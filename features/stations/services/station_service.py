@@ -43,6 +43,10 @@ class StationService:
                 detail=f"Error loading station data: {str(e)}"
             )
 
+    def get_all_stations(self) -> List[Station]:
+        """Get all stations."""
+        return self._load_stations()
+
     def get_station(self, station_id: str) -> Station:
         """Get station by ID."""
         stations = self._load_stations()
@@ -0,0 +1,150 @@
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Observation keys join station position and time: position * KEY_STRIDE + epoch seconds
+KEY_STRIDE = 10 ** 10
+
+class ObservationTable(NamedTuple):
+    """Observations of every station in one sorted array."""
+    keys: np.ndarray    # (N,) int64, ascending
+    values: np.ndarray  # (N, C)
+
+class VerificationScores(NamedTuple):
+    """Scores per station, lead bin and variable, each with shape (S, L, V); NaN where undefined."""
+    count: np.ndarray
+    bias: np.ndarray    # Mean forecast - observation
+    rmse: np.ndarray
+    skill: np.ndarray   # 1 - MSE / MSE of persistence, on pairs where both exist
+
+def build_observation_table(
+    series: Sequence[Optional[Tuple[np.ndarray, np.ndarray]]],
+    columns: int
+) -> ObservationTable:
+    """Merge per-station observations into one table.
+
+    Args:
+        series: (epoch seconds (N,), values (N, C)) per station position, or None
+        columns: Number of value columns C
+
+    Returns:
+        ObservationTable: Observations sorted by station then time
+    """
+    keys, values = [], []
+    for position, observations in enumerate(series):
+        if observations is None or not len(observations[0]):
+            continue
+        times, station_values = observations
+        keys.append(position * KEY_STRIDE + np.asarray(times, dtype=np.int64))
+        values.append(station_values)
+    if not keys:
+        return ObservationTable(np.empty(0, dtype=np.int64), np.empty((0, columns)))
+
+    keys = np.concatenate(keys)
+    order = np.argsort(keys, kind="stable")
+    return ObservationTable(keys[order], np.concatenate(values)[order])
+
+def match_observations(
+    table: ObservationTable,
+    positions: np.ndarray,
+    times: np.ndarray,
+    tolerance: int
+) -> np.ndarray:
+    """Observation nearest each (station, time) within ``tolerance`` seconds.
+
+    Returns:
+        np.ndarray: (M, C) matched values, NaN rows where nothing is close enough
+    """
+    matched = np.full((len(positions), table.values.shape[1]), np.nan)
+    if not len(table.keys) or not len(positions):
+        return matched
+
+    query = positions.astype(np.int64) * KEY_STRIDE + times.astype(np.int64)
+    after = np.clip(np.searchsorted(table.keys, query), 0, len(table.keys) - 1)
+    before = np.clip(after - 1, 0, len(table.keys) - 1)
+    nearest = np.where(
+        np.abs(table.keys[before] - query) <= np.abs(table.keys[after] - query),
+        before,
+        after
+    )
+    # Keys of other stations are KEY_STRIDE away, far beyond any tolerance
+    close = np.abs(table.keys[nearest] - query) <= tolerance
+    matched[close] = table.values[nearest[close]]
+    return matched
+
+class VerificationAccumulator:
+    """Running sums of forecast errors per (station, lead bin, variable).
+
+    Pairs are added a whole model run at a time; every sum is updated with
+    one ``np.bincount`` per variable, so the cost scales with the number of
+    pairs, not with stations times leads.
+    """
+
+    def __init__(self, stations: int, lead_bins: int, lead_bin_hours: int, variables: int):
+        self.stations = stations
+        self.lead_bins = lead_bins
+        self.lead_bin_hours = lead_bin_hours
+        self.variables = variables
+        shape = (stations * lead_bins, variables)
+        self._count = np.zeros(shape)
+        self._error = np.zeros(shape)
+        self._squared = np.zeros(shape)
+        self._paired_squared = np.zeros(shape)    # Forecast errors where persistence exists too
+        self._persistence_squared = np.zeros(shape)
+
+    def add(
+        self,
+        positions: np.ndarray,
+        leads: np.ndarray,
+        forecast: np.ndarray,
+        observed: np.ndarray,
+        persistence: np.ndarray
+    ):
+        """Add forecast/observation pairs.
+
+        Args:
+            positions: (M,) station positions
+            leads: (M,) lead hours
+            forecast: (M, V) forecast values
+            observed: (M, V) observations at the valid times (NaN if none)
+            persistence: (M, V) observations at the run's cycle time (NaN if none)
+        """
+        bins = leads // self.lead_bin_hours
+        keep = (bins >= 0) & (bins < self.lead_bins) & (positions >= 0)
+        cells = (positions * self.lead_bins + bins)[keep]
+        error = (forecast - observed)[keep]
+        persistence_error = (persistence - observed)[keep]
+        size = self.stations * self.lead_bins
+
+        for v in range(self.variables):
+            valid = np.isfinite(error[:, v])
+            paired = valid & np.isfinite(persistence_error[:, v])
+            e, p = error[:, v], persistence_error[:, v]
+            self._count[:, v] += np.bincount(cells[valid], minlength=size)
+            self._error[:, v] += np.bincount(cells[valid], weights=e[valid], minlength=size)
+            self._squared[:, v] += np.bincount(cells[valid], weights=e[valid] ** 2, minlength=size)
+            self._paired_squared[:, v] += np.bincount(cells[paired], weights=e[paired] ** 2, minlength=size)
+            self._persistence_squared[:, v] += np.bincount(cells[paired], weights=p[paired] ** 2, minlength=size)
+
+    def _scores(self, count, error, squared, paired_squared, persistence_squared) -> VerificationScores:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bias = np.where(count > 0, error / count, np.nan)
+            rmse = np.where(count > 0, np.sqrt(squared / count), np.nan)
+            skill = np.where(persistence_squared > 0, 1 - paired_squared / persistence_squared, np.nan)
+        return VerificationScores(count=count.astype(np.int64), bias=bias, rmse=rmse, skill=skill)
+
+    def scores(self) -> VerificationScores:
+        """Scores per station, lead bin and variable."""
+        shape = (self.stations, self.lead_bins, self.variables)
+        return self._scores(*(
+            sums.reshape(shape)
+            for sums in (self._count, self._error, self._squared, self._paired_squared, self._persistence_squared)
+        ))
+
+    def overall(self) -> VerificationScores:
+        """Scores pooled over all stations, each with shape (1, L, V)."""
+        shape = (self.stations, self.lead_bins, self.variables)
+        return self._scores(*(
+            sums.reshape(shape).sum(axis=0, keepdims=True)
+            for sums in (self._count, self._error, self._squared, self._paired_squared, self._persistence_squared)
+        ))
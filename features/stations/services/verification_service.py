@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from features.common.services.forecast_archive import ArchiveDataset, format_run_id, run_start
+from features.common.utils.conversions import UnitConversions
+from features.stations.models.verification_types import (
+    LeadScore,
+    StationVerification,
+    VariableScores,
+    VerificationResponse
+)
+from features.stations.services.station_service import StationService
+from features.stations.services.verification_engine import (
+    VerificationAccumulator,
+    VerificationScores,
+    build_observation_table,
+    match_observations
+)
+from features.waves.services.ndbc_buoy_client import HISTORY_COLUMNS, NDBCBuoyClient, ObservationSeries
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class VerifiedVariable(NamedTuple):
+    """A forecast variable and the observation it is verified against."""
+    name: str
+    dataset: str      # Archive dataset, "wind" or "wave"
+    forecast: str     # Archived variable
+    observation: str  # NDBC column
+    scale: float      # NDBC units to forecast units
+    units: str
+
+# Directions are left out: they need circular statistics and calm or
+# multi-modal seas make them noisy to score
+VERIFIED_VARIABLES = (
+    VerifiedVariable("wind_speed", "wind", "speed", "WSPD", UnitConversions.MS_TO_MPH, "mph"),
+    VerifiedVariable("wind_gust", "wind", "gust", "GST", UnitConversions.MS_TO_MPH, "mph"),
+    VerifiedVariable("wave_height", "wave", "height", "WVHT", UnitConversions.METERS_TO_FEET, "ft"),
+    VerifiedVariable("wave_period", "wave", "period", "DPD", 1.0, "s"),
+)
+
+def _optional(value: float, digits: int = 2) -> Optional[float]:
+    return round(float(value), digits) if np.isfinite(value) else None
+
+class VerificationService:
+    """Scores archived station forecasts against NDBC buoy observations.
+
+    A scheduled job downloads each station's recent observation history,
+    matches every archived forecast to the observation nearest its valid
+    time and reduces the errors to bias, RMSE and skill against persistence
+    (the observation at the run's start carried forward) per station,
+    variable and lead time bin. The result is kept as a precomputed table
+    that the verification routes serve as is.
+    """
+
+    def __init__(
+        self,
+        station_service: StationService,
+        buoy_client: NDBCBuoyClient,
+        archives: Dict[str, Optional[ArchiveDataset]]
+    ):
+        self.station_service = station_service
+        self.buoy_client = buoy_client
+        self.archives = {name: dataset for name, dataset in archives.items() if dataset is not None}
+        self.variables = [v for v in VERIFIED_VARIABLES if v.dataset in self.archives]
+        self._result: Optional[VerificationResponse] = None
+        self._by_station: Dict[str, StationVerification] = {}
+
+    async def _fetch_observations(self, station_ids: List[str]) -> List[Optional[ObservationSeries]]:
+        semaphore = asyncio.Semaphore(settings.verification.concurrency)
+
+        async def fetch(station_id: str) -> Optional[ObservationSeries]:
+            async with semaphore:
+                return await self.buoy_client.get_observation_history(station_id)
+
+        return await asyncio.gather(*(fetch(station_id) for station_id in station_ids))
+
+    def compute(
+        self,
+        station_ids: List[str],
+        observations: List[Optional[ObservationSeries]]
+    ) -> VerificationResponse:
+        """Verify every archived run against the observations.
+
+        CPU-bound, meant to run in a worker thread.
+
+        Args:
+            station_ids: Stations to score, by position
+            observations: Observation history per station position (None if unavailable)
+
+        Returns:
+            VerificationResponse: Scores per station, variable and lead bin
+        """
+        config = settings.verification
+        lead_bins = settings.archive.max_lead_hours // config.lead_bin_hours + 1
+        columns = [HISTORY_COLUMNS.index(v.observation) for v in self.variables]
+        scales = np.array([v.scale for v in self.variables])
+        table = build_observation_table(
+            [(obs.times, obs.values[:, columns] * scales) if obs is not None else None for obs in observations],
+            len(self.variables)
+        )
+        position_of = {station_id: i for i, station_id in enumerate(station_ids)}
+        accumulator = VerificationAccumulator(len(station_ids), lead_bins, config.lead_bin_hours, len(self.variables))
+        tolerance = config.match_tolerance_minutes * 60
+        verified_runs = set()
+
+        for name, dataset in self.archives.items():
+            selected = [i for i, v in enumerate(self.variables) if v.dataset == name]
+            archived = [dataset.variables.index(self.variables[i].forecast) for i in selected]
+            # Archive station codes to positions, -1 for stations no longer served
+            positions_by_code = np.array(
+                [position_of.get(station_id, -1) for station_id in dataset.station_ids] or [-1],
+                dtype=np.int64
+            )
+            for run_id in dataset.runs():
+                rows = dataset.run_rows(run_id)
+                if rows is None:
+                    continue
+                codes, leads, values = rows
+                positions = positions_by_code[codes]
+                start = int(run_start(run_id).timestamp())
+                observed = match_observations(table, positions, start + leads * 3600, tolerance)
+                persistence = match_observations(table, positions, np.full(len(leads), start), tolerance)
+                if not np.isfinite(observed[:, selected]).any():
+                    continue
+
+                # Pairs only count for this dataset's variables
+                forecast = np.full((len(leads), len(self.variables)), np.nan)
+                forecast[:, selected] = values[:, archived]
+                accumulator.add(positions, leads, forecast, observed, persistence)
+                verified_runs.add(run_id)
+
+        scores, overall = accumulator.scores(), accumulator.overall()
+        stations = [
+            StationVerification(station_id=station_id, variables=self._variable_scores(scores, position))
+            for position, station_id in enumerate(station_ids)
+            if scores.count[position].any()
+        ]
+        return VerificationResponse(
+            generated_at=datetime.now(timezone.utc),
+            runs=[format_run_id(run_id) for run_id in sorted(verified_runs)],
+            lead_bin_hours=config.lead_bin_hours,
+            overall=self._variable_scores(overall, 0),
+            stations=stations
+        )
+
+    def _variable_scores(self, scores: VerificationScores, position: int) -> List[VariableScores]:
+        bin_hours = settings.verification.lead_bin_hours
+        return [
+            VariableScores(
+                variable=variable.name,
+                units=variable.units,
+                leads=[
+                    LeadScore(
+                        lead_hours=lead_bin * bin_hours,
+                        count=int(scores.count[position, lead_bin, v]),
+                        bias=_optional(scores.bias[position, lead_bin, v]),
+                        rmse=_optional(scores.rmse[position, lead_bin, v]),
+                        skill=_optional(scores.skill[position, lead_bin, v], 3)
+                    )
+                    for lead_bin in range(scores.count.shape[1])
+                    if scores.count[position, lead_bin, v]
+                ]
+            )
+            for v, variable in enumerate(self.variables)
+        ]
+
+    async def refresh(self) -> VerificationResponse:
+        """Recompute the verification table from the archive and fresh observations."""
+        station_ids = sorted({
+            station_id for dataset in self.archives.values() for station_id in dataset.station_ids
+        })
+        observations = await self._fetch_observations(station_ids)
+        result = await asyncio.to_thread(self.compute, station_ids, observations)
+        self._result = result
+        self._by_station = {station.station_id: station for station in result.stations}
+        logger.info(
+            f"✅ Verified {len(result.runs)} model runs at {len(result.stations)} stations "
+            f"({sum(obs is not None for obs in observations)}/{len(station_ids)} with observations)"
+        )
+        return result
+
+    async def run_periodically(self):
+        """Refresh the verification table on the configured interval."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Error verifying forecasts: {str(e)}")
+            await asyncio.sleep(settings.verification.interval_seconds)
+
+    def _require_result(self) -> VerificationResponse:
+        if self._result is None:
+            raise HTTPException(status_code=503, detail="Forecast verification has not been computed yet")
+        return self._result
+
+    def get_verification(self) -> VerificationResponse:
+        """Latest verification table for every station."""
+        return self._require_result()
+
+    def get_station_verification(self, station_id: str) -> StationVerification:
+        """Latest verification scores of one station."""
+        self._require_result()
+        station = self._by_station.get(station_id)
+        if station is None:
+            # Raises the usual 404 for unknown stations
+            self.station_service.get_station(station_id)
+            raise HTTPException(
+                status_code=404,
+                detail=f"No verified forecasts for station {station_id}"
+            )
+        return station
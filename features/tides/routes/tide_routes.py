@@ -7,10 +7,12 @@ from features.tides.models.tide_types import (
     GeoJSONResponse
 )
 from features.tides.services.tide_service import TideService
+from features.common.services.tracing import TracedRoute
 
 router = APIRouter(
     prefix="/tides",
-    tags=["Tides"]
+    tags=["Tides"],
+    route_class=TracedRoute
 )
 
 def get_service(request: Request) -> TideService:
@@ -13,6 +13,9 @@ from features.tides.models.tide_types import (
     GeoJSONFeature,
     TidePrediction
 )
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import span, traced
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +24,10 @@ class TideService:
     
     def __init__(self) -> None:
         """Initialize TideService."""
-        self.data_url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+        self.data_url = settings.coops_base_url
         self.stations_file = Path(__file__).parent.parent.parent.parent / "tide_stations.json"
         
+    @traced("tides.stations")
     async def get_all_stations(self) -> List[TideStation]:
         """Get list of all tide stations."""
         try:
@@ -43,6 +47,7 @@ class TideService:
             logger.error(f"Error getting tide stations: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @traced("tides.stations_geojson")
     async def get_stations_geojson(self) -> GeoJSONResponse:
         """Get tide stations in GeoJSON format."""
         try:
@@ -70,6 +75,7 @@ class TideService:
             logger.error(f"Error converting stations to GeoJSON: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @traced("tides.station_predictions")
     async def get_station_predictions(
         self,
         station_id: str,
@@ -90,19 +96,20 @@ class TideService:
                 end_date=date + timedelta(days=7) if date else None
             )
             
-            predictions = [
-                TidePrediction(
-                    time=p["t"],
-                    height=float(p["v"])
+            with span("tides.build_response", predictions=len(predictions_data)):
+                predictions = [
+                    TidePrediction(
+                        time=p["t"],
+                        height=float(p["v"])
+                    )
+                    for p in predictions_data
+                ]
+                
+                return TideStationPredictions(
+                    id=station_id,
+                    name=station["name"],
+                    predictions=predictions
                 )
-                for p in predictions_data
-            ]
-            
-            return TideStationPredictions(
-                id=station_id,
-                name=station["name"],
-                predictions=predictions
-            )
             
         except HTTPException:
             raise
@@ -110,6 +117,7 @@ class TideService:
             logger.error(f"Error getting predictions for station {station_id}: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @traced("tides.read_stations")
     def _get_stations_from_file(self) -> List[Dict[str, Any]]:
         """Get list of tide stations from local JSON file."""
         try:
@@ -133,6 +141,7 @@ class TideService:
             logger.error(f"Error reading tide stations from file: {str(e)}")
             raise
 
+    @traced("tides.fetch_predictions")
     async def _get_predictions(
         self,
         station_id: str,
@@ -161,7 +170,7 @@ class TideService:
                 "Accept": "application/json",
             }
 
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[upstream_trace_config()]) as session:
                 async with session.get(
                     self.data_url,
                     params=params,
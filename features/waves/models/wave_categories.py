@@ -1,5 +1,13 @@
 from enum import Enum
 
+import numpy as np
+
+def _bin_codes(values: np.ndarray, upper_bounds: np.ndarray) -> np.ndarray:
+    """Index of the first category whose inclusive upper bound holds each value; NaN maps to 0."""
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.digitize(values, upper_bounds, right=True)
+    return np.where(np.isnan(values), 0, codes).astype(np.int8)
+
 class WaveHeight(Enum):
     FLAT = (0, 0.5, "Flat")
     SMALL = (0.5, 2, "Small")
@@ -20,6 +28,11 @@ class WaveHeight(Enum):
                 return category
         return cls.HUGE if height > 8 else cls.FLAT
 
+    @classmethod
+    def from_height_array(cls, heights: np.ndarray) -> np.ndarray:
+        """Vectorized ``from_height`` returning codes that index ``tuple(WaveHeight)``."""
+        return _bin_codes(heights, np.array([category.max_height for category in cls][:-1]))
+
 class WavePeriod(Enum):
     SHORT = (0, 6, "Short")
     MEDIUM = (6, 10, "Medium")
@@ -38,6 +51,11 @@ class WavePeriod(Enum):
                 return category
         return cls.VERY_LONG if period > 14 else cls.SHORT
 
+    @classmethod
+    def from_period_array(cls, periods: np.ndarray) -> np.ndarray:
+        """Vectorized ``from_period`` returning codes that index ``tuple(WavePeriod)``."""
+        return _bin_codes(periods, np.array([category.max_period for category in cls][:-1]))
+
 class Conditions(Enum):
     CLEAN = "Clean"  # Light offshore winds, well-organized waves
     FAIR = "Fair"   # Light to moderate winds, slightly choppy
@@ -53,4 +71,18 @@ class Conditions(Enum):
         elif wind_speed > 15 or dir_diff < 45:  # Strong winds or onshore
             return cls.ROUGH
         else:
-            return cls.FAIR 
\ No newline at end of file
+            return cls.FAIR
+
+    @classmethod
+    def from_wind_wave_array(
+        cls,
+        wind_speed: np.ndarray,
+        wind_direction: np.ndarray,
+        wave_direction: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized ``from_wind_wave`` returning codes that index ``tuple(Conditions)``."""
+        wind_speed = np.asarray(wind_speed, dtype=np.float64)
+        dir_diff = np.abs(np.mod(np.asarray(wind_direction) - np.asarray(wave_direction) + 180, 360) - 180)
+        clean = (wind_speed < 10) & (dir_diff > 135)
+        rough = (wind_speed > 15) | (dir_diff < 45)
+        return np.where(clean, 0, np.where(rough, 2, 1)).astype(np.int8)
@@ -4,15 +4,29 @@ from pydantic import BaseModel
 
 from features.common.models.station_types import Location, Station
 
+class WaveForecastComponent(BaseModel):
+    """Single wave partition: wind waves or one swell train."""
+    kind: str  # "wind_waves", "swell_1", "swell_2" or "swell_3"
+    height: float  # feet
+    period: float  # seconds
+    direction: float  # degrees
+
 class WaveForecastPoint(BaseModel):
     """Single point in a wave forecast."""
     time: datetime
     height: Optional[float] = None  # meters
     period: Optional[float] = None  # seconds
     direction: Optional[float] = None  # degrees
+    components: List[WaveForecastComponent] = []  # Partitions sorted by height
 
 class WaveForecastResponse(BaseModel):
     """Complete wave forecast response for a station."""
     station: Station
     forecasts: List[WaveForecastPoint]
-    model_run: str  # e.g. "20250218 06z" c
\ No newline at end of file
+    model_run: str  # e.g. "20250218 06z" c
+
+class WavePointForecastResponse(BaseModel):
+    """Wave forecast interpolated to an arbitrary location."""
+    location: Location
+    forecasts: List[WaveForecastPoint]
+    model_run: str  # e.g. "20250218 06z"
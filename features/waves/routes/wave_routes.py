@@ -2,12 +2,14 @@ from fastapi import APIRouter, Depends, Request
 
 from features.waves.models.wave_types import WaveForecastResponse
 from features.waves.services.wave_data_service import WaveDataService
+from features.common.services.tracing import TracedRoute
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
     prefix="/waves",
-    tags=["Waves"]
+    tags=["Waves"],
+    route_class=TracedRoute
 )
 
 def get_service(request: Request) -> WaveDataService:
@@ -1,21 +1,41 @@
 from typing import Dict, Optional
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 
-from features.waves.models.wave_types import WaveForecastResponse
+from features.waves.models.wave_types import WaveForecastResponse, WavePointForecastResponse
 from features.waves.services.wave_data_service_v2 import WaveDataServiceV2
+from features.common.models.archive_types import ArchivedRunsResponse, RunDiffResponse
+from features.common.services.forecast_archive import parse_run_id, run_start
+from features.common.services.forecast_window import ForecastWindowQuery
+from features.common.services.tracing import TracedRoute
 
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
     prefix="/waves/v2",
-    tags=["Waves V2"]
+    tags=["Waves V2"],
+    route_class=TracedRoute
 )
 
 def get_service(request: Request) -> WaveDataServiceV2:
     """Dependency to get the WaveService instance."""
     return request.app.state.wave_service_v2
 
+@router.get(
+    "/point",
+    response_model=WavePointForecastResponse,
+    summary="Get wave forecast for any location",
+    description="Returns the latest GFS wave forecast bilinearly interpolated to a latitude/longitude"
+)
+async def get_point_wave_forecast(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=360, description="Longitude (-180 to 180 or 0 to 360)"),
+    window: ForecastWindowQuery = Depends(),
+    service: WaveDataServiceV2 = Depends(get_service)
+):
+    """Get wave model forecast for a latitude/longitude"""
+    return await service.get_point_forecast(lat, lon, window.resolve(service.forecast_days))
+
 @router.get(
     "/{station_id}/forecast",
     response_model=WaveForecastResponse,
@@ -24,8 +44,42 @@ def get_service(request: Request) -> WaveDataServiceV2:
 )
 async def get_station_wave_forecast(
     station_id: str,
+    window: ForecastWindowQuery = Depends(),
+    model_run: Optional[str] = Query(None, description="Model run to serve, e.g. 20250218_06Z; the window then starts at the run's cycle time"),
     service: WaveDataServiceV2 = Depends(get_service)
 ):
     """Get wave model forecast for a specific station using GRIB data"""
-    response = await service.get_station_forecast(station_id)
+    default_start = run_start(parse_run_id(model_run)) if model_run else None
+    response = await service.get_station_forecast(
+        station_id,
+        window.resolve(service.forecast_days, default_start=default_start),
+        model_run=model_run
+    )
     return response
+
+@router.get(
+    "/runs",
+    response_model=ArchivedRunsResponse,
+    summary="List archived wave model runs",
+    description="Returns the model runs whose station forecasts can be requested with model_run or compared"
+)
+async def get_wave_runs(
+    service: WaveDataServiceV2 = Depends(get_service)
+):
+    """List archived model runs"""
+    return service.get_archived_runs()
+
+@router.get(
+    "/{station_id}/diff",
+    response_model=RunDiffResponse,
+    summary="Compare wave forecasts of two model runs",
+    description="Returns both runs' values and their difference at every valid time they share, from the model run archive"
+)
+async def get_station_wave_diff(
+    station_id: str,
+    model_run: Optional[str] = Query(None, description="Run to compare, e.g. 20250218_12Z; defaults to the current run"),
+    base_run: Optional[str] = Query(None, description="Run to compare against; defaults to the archived run before model_run"),
+    service: WaveDataServiceV2 = Depends(get_service)
+):
+    """Compare a station's wave forecast between model runs"""
+    return service.get_run_diff(station_id, model_run, base_run)
@@ -0,0 +1,90 @@
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+
+# Data rows look like "| 19 06 |  2.04  3  |  1.62  6.4  47 |* 1.05 11.3 100 |    |"
+# (day of month, hour | combined Hs and partition count | one cell per partition)
+_ROW = re.compile(r"^\|\s*(\d{1,2})\s+(\d{1,2})\s*\|[^|\n]*\|([^\n]*)$", re.MULTILINE)
+# Height, period and direction of one partition; "*" flags the wind sea and is skipped.
+# \s never matches "|", so a match cannot span two cells.
+_COMPONENT = re.compile(r"(\d+(?:\.\d*)?)\s+(\d+(?:\.\d*)?)\s+(\d+(?:\.\d*)?)")
+
+class BulletinSeries(NamedTuple):
+    """Parsed station bulletin in compact array form."""
+    times: np.ndarray       # (T,) epoch seconds, ascending
+    components: np.ndarray  # (T, K, 3) height_m, period, direction sorted by height; NaN padded
+
+def empty_series() -> BulletinSeries:
+    return BulletinSeries(times=np.empty(0, dtype=np.int64), components=np.empty((0, 0, 3)))
+
+def month_starts(cycle_dt: datetime):
+    """Start of the cycle's month and of the next month."""
+    start = cycle_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+def parse_bulletin(text: str, cycle_dt: datetime) -> BulletinSeries:
+    """Parse a GFS wave ``.bull`` file into arrays in one pass over the text.
+
+    Rows are found with one multiline regex and their partitions with a
+    second; the numbers are converted and scattered into a padded array at
+    once, and partitions are sorted by height per row. Rows without any
+    partition are dropped. The day column is a day of month, so days before
+    the cycle's day belong to the next month.
+
+    Args:
+        text: Bulletin file contents
+        cycle_dt: Cycle start (timezone aware)
+
+    Returns:
+        BulletinSeries: Forecast times and wave partitions, sorted by time
+    """
+    days, hours, counts, values = [], [], [], []
+    for day, hour, cells in _ROW.findall(text):
+        components = _COMPONENT.findall(cells)
+        if not components:
+            continue
+        days.append(day)
+        hours.append(hour)
+        counts.append(len(components))
+        values.extend(components)
+    if not counts:
+        return empty_series()
+
+    days = np.array(days, dtype=np.int64)
+    hours = np.array(hours, dtype=np.int64)
+    this_month, next_month = month_starts(cycle_dt)
+    base = np.where(days < cycle_dt.day, int(next_month.timestamp()), int(this_month.timestamp()))
+    times = base + (days - 1) * 86400 + hours * 3600
+
+    counts = np.array(counts, dtype=np.int64)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    slots = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    components = np.full((len(counts), int(counts.max()), 3), np.nan)
+    components[rows, slots] = np.array(values, dtype=np.float64)
+
+    # Highest partition first; stable, so equal heights keep bulletin order
+    heights = np.where(np.isnan(components[:, :, 0]), -np.inf, components[:, :, 0])
+    order = np.argsort(-heights, axis=1, kind="stable")
+    components = np.take_along_axis(components, order[:, :, None], axis=1)
+
+    by_time = np.argsort(times, kind="stable")
+    return BulletinSeries(times=times[by_time], components=components[by_time])
+
+def concat_series(first: BulletinSeries, second: BulletinSeries) -> BulletinSeries:
+    """Join two series, padding partitions to the wider of the two."""
+    width = max(first.components.shape[1], second.components.shape[1])
+
+    def padded(components: np.ndarray) -> np.ndarray:
+        pad = width - components.shape[1]
+        return np.pad(components, ((0, 0), (0, pad), (0, 0)), constant_values=np.nan) if pad else components
+
+    return BulletinSeries(
+        times=np.concatenate([first.times, second.times]),
+        components=np.concatenate([padded(first.components), padded(second.components)])
+    )
+
+def slice_series(series: BulletinSeries, mask: np.ndarray) -> BulletinSeries:
+    """Rows of a series selected by a boolean mask over its times."""
+    return BulletinSeries(times=series.times[mask], components=series.components[mask])
@@ -5,17 +5,31 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from pydantic import BaseModel, Field
 import asyncio
 from fastapi import HTTPException
 
-from features.common.models.station_types import Station
+from features.common.models.station_types import Location, Station
 from features.common.utils.conversions import UnitConversions
 from features.common.services.rate_limiter import RateLimiter
 from core.config import settings
 from features.common.model_run import ModelRun
 from features.waves.services.file_storage import GFSWaveFileStorage
+from features.common.services.point_store import StationPointStore
+from features.common.services.grid_interpolation import bilinear_weights, interpolate_corners
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import span, traced
+from features.stations.services.station_service import StationService
+from features.waves.services.wave_cube import (
+    GRIB_FILTER_LEVELS,
+    GRIB_FILTER_VARIABLES,
+    WAVE_COMPONENTS,
+    WAVE_DIRECTION_VARIABLES,
+    WAVE_VARIABLES,
+    PackedWaveCube,
+    decode_wave_hour
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +41,7 @@ class WaveDataPoint(BaseModel):
 
 class GFSWaveComponent(BaseModel):
     """Individual wave component in GFS forecast."""
+    kind: str = Field("combined", description="combined, wind_waves or swell_1..3")
     height_m: float = Field(..., ge=0, description="Wave height in meters")
     height_ft: float = Field(..., ge=0, description="Wave height in feet")
     period: float = Field(..., ge=0, description="Wave period in seconds")
@@ -48,6 +63,12 @@ class GFSWaveForecast(BaseModel):
     cycle: GFSModelCycle
     forecasts: List[GFSForecastPoint]
 
+class GFSWavePointForecast(BaseModel):
+    """GFS wave forecast interpolated to an arbitrary location."""
+    location: Location
+    cycle: GFSModelCycle
+    forecasts: List[GFSForecastPoint]
+
 class GFSWaveClient:
     def __init__(self, model_run: Optional[ModelRun] = None):
         self._session: Optional[aiohttp.ClientSession] = None
@@ -60,6 +81,9 @@ class GFSWaveClient:
         self.regions = list(settings.models.keys())
         # Get forecast hours from config and create list
         self.forecast_hours = list(range(0, settings.forecast_hours + 1, 3))  # 0 to max by 3-hour steps
+        # Regional arrays, or only station cells per region when running in points mode
+        self._cubes: Dict[str, PackedWaveCube] = {}
+        self._points: Dict[str, StationPointStore] = {}
         
         # Use shared rate limiter
         self.rate_limiter = RateLimiter(
@@ -73,7 +97,9 @@ class GFSWaveClient:
         self.model_run = model_run
         self._is_initialized = False
         self._initialization_error = None
+        self.release_arrays()
         
+    @traced("gfs_wave.initialize")
     async def initialize(self):
         """Initialize the wave client by loading the latest model run data."""
         async with self._initialization_lock:
@@ -97,11 +123,12 @@ class GFSWaveClient:
                     # Download any missing files
                     # Convert run_date to datetime if needed
                     cycle_date = datetime.combine(self.model_run.run_date, datetime.min.time(), tzinfo=timezone.utc)
-                    file_paths = await self._download_regional_files(
-                        cycle_date,
-                        f"{self.model_run.cycle_hour:02d}",
-                        region
-                    )
+                    with span("gfs_wave.download_region", region=region):
+                        file_paths = await self._download_regional_files(
+                            cycle_date,
+                            f"{self.model_run.cycle_hour:02d}",
+                            region
+                        )
                     
                     if not file_paths:
                         error_msg = f"No data files available for {region}"
@@ -109,18 +136,17 @@ class GFSWaveClient:
                         logger.error(error_msg)
                         continue
                         
-                    # Try loading one file to verify data access
-                    test_ds = await self._load_grib_files(
-                        region,
-                        cycle_date,
-                        f"{self.model_run.cycle_hour:02d}"
-                    )
-                    if test_ds is None:
-                        error_msg = f"Failed to load test dataset for {region}"
+                    # Decode every forecast hour once, off the event loop; requests are served from memory
+                    with span("gfs_wave.decode_region", region=region, files=len(file_paths)):
+                        if settings.points_mode:
+                            loaded = await asyncio.to_thread(self._extract_points, region, file_paths)
+                        else:
+                            loaded = await asyncio.to_thread(self._load_cube, region, file_paths)
+                    if not loaded:
+                        error_msg = f"Failed to load wave data for {region}"
                         initialization_errors.append(error_msg)
                         logger.error(error_msg)
                         continue
-                    test_ds.close()
                         
                 except Exception as e:
                     error_msg = f"Error initializing {region} wave data: {str(e)}"
@@ -142,6 +168,70 @@ class GFSWaveClient:
                 f"{self.model_run.run_date.strftime('%Y%m%d')} {self.model_run.cycle_hour:02d}Z"
             )
 
+    def _decode_hour(self, file_path: Path) -> Optional[Tuple[np.datetime64, np.ndarray, np.ndarray, np.ndarray]]:
+        """Decode one forecast hour into (valid time, latitude, longitude, values (V, lat, lon))."""
+        try:
+            return decode_wave_hour(file_path)
+        except Exception as e:
+            logger.error(f"Error loading {file_path}: {str(e)}")
+            return None
+
+    def _load_cube(self, region: str, file_paths: List[Path]) -> bool:
+        """Decode all forecast hours of a region into one packed resident array.
+
+        Returns:
+            bool: True if at least one forecast hour was loaded
+        """
+        decoded = (self._decode_hour(fp) for fp in file_paths)
+        cube = PackedWaveCube.from_hours((hour for hour in decoded if hour is not None), len(file_paths))
+        if cube is None:
+            return False
+            
+        self._cubes[region] = cube
+        logger.info(
+            f"📦 Loaded {len(cube)} forecast hours x {len(WAVE_VARIABLES)} variables for {region} "
+            f"({cube.nbytes / 1e6:.1f} MB resident)"
+        )
+        return True
+
+    def _extract_points(self, region: str, file_paths: List[Path]) -> bool:
+        """Decode each forecast hour, keep only the station cells and drop the grid.
+
+        Returns:
+            bool: True if at least one forecast hour was extracted
+        """
+        points = StationPointStore(StationService().get_all_stations(), WAVE_VARIABLES)
+        extracted = 0
+        for fp in file_paths:
+            decoded = self._decode_hour(fp)
+            if decoded is None:
+                continue
+            points.add_hour(*decoded)
+            extracted += 1
+                
+        if extracted:
+            self._points[region] = points
+            logger.info(
+                f"📍 Extracted {extracted} forecast hours for {region} stations "
+                f"({points.resident_bytes() / 1e6:.2f} MB resident)"
+            )
+        return extracted > 0
+
+    def resident_bytes(self) -> Dict[str, int]:
+        """Resident bytes held per region."""
+        resident = {region: cube.nbytes for region, cube in self._cubes.items()}
+        for region, points in self._points.items():
+            resident[region] = resident.get(region, 0) + points.resident_bytes()
+        return resident
+
+    def release_arrays(self):
+        """Drop regional arrays and extracted station values."""
+        for points in self._points.values():
+            points.clear()
+        self._points = {}
+        self._cubes = {}
+
+    @traced("gfs_wave.ensure_initialized")
     async def _ensure_initialized(self):
         """Ensure the client is initialized before processing requests."""
         if not self._is_initialized:
@@ -162,6 +252,7 @@ class GFSWaveClient:
             self._session = aiohttp.ClientSession(
                 cookie_jar=cookie_jar,
                 timeout=aiohttp.ClientTimeout(total=300),
+                trace_configs=[upstream_trace_config()],
                 headers={
                     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
                 }
@@ -202,10 +293,8 @@ class GFSWaveClient:
         # Build params in the exact order expected by NOAA
         params = [
             ("file", f"gfswave.t{cycle_hour}z.{product}.f{forecast_hour:03d}.grib2"),
-            ("lev_surface", "on"),
-            ("var_DIRPW", "on"),
-            ("var_HTSGW", "on"),
-            ("var_PERPW", "on"),
+            *((f"lev_{level}", "on") for level in GRIB_FILTER_LEVELS),
+            *((f"var_{var}", "on") for var in GRIB_FILTER_VARIABLES),
             ("dir", f"/gfs.{self.model_run.date_str}/{cycle_hour}/wave/gridded")
         ]
         
@@ -217,6 +306,7 @@ class GFSWaveClient:
         """Apply rate limiting using the shared rate limiter."""
         await self.rate_limiter.limit()
 
+    @traced("gfs_wave.download")
     async def _download_grib_file(
         self,
         url: str,
@@ -301,128 +391,138 @@ class GFSWaveClient:
             logger.error(f"Error downloading files for {region}: {str(e)}")
             raise
 
-    def _load_and_combine_dataset(self, file_paths: List[Path]) -> xr.Dataset:
-        """Load and combine GRIB files into a single dataset."""
-        datasets = []
+    @traced("gfs_wave.build_points")
+    def _build_forecast_points(self, times: np.ndarray, values: np.ndarray) -> List[GFSForecastPoint]:
+        """Validate raw (T, V) values and build forecast points.
         
-        for fp in file_paths:
-            try:
-                if not fp.exists():
+        Hours without a valid combined sea state are skipped; partitions that
+        are missing or invalid are left out of that hour's components.
+        """
+        # Round in double precision for clean JSON output
+        values = np.round(values.astype(np.float64), 2)
+        values[:, WAVE_DIRECTION_VARIABLES] %= 360  # 359.996 rounds up to 360
+        
+        forecasts = []
+        for t, row in zip(times, values):
+            components = []
+            for kind, height, period, direction in WAVE_COMPONENTS:
+                try:
+                    # Extract known data types
+                    wave_data = WaveDataPoint(
+                        height=float(row[height]),
+                        period=float(row[period]),
+                        direction=float(row[direction])
+                    )
+                except ValueError:
+                    continue
+                if kind != "combined" and wave_data.height == 0:
                     continue
                     
-                ds = xr.open_dataset(
-                    fp,
-                    engine="cfgrib",
-                    backend_kwargs={
-                        'indexpath': '',
-                        'use_cftime': False,
-                        'decode_times': True,
-                        'decode_timedelta': False
-                    }
-                )
-                
-                valid_time = pd.to_datetime(ds.valid_time.values)
-                ds = ds.assign_coords(time=valid_time)
-                datasets.append(ds)
+                components.append(GFSWaveComponent(
+                    kind=kind,
+                    height_m=wave_data.height,
+                    height_ft=float(UnitConversions.meters_to_feet(wave_data.height)),
+                    period=wave_data.period,
+                    direction=wave_data.direction
+                ))
                 
-            except Exception as e:
-                logger.error(f"Error loading {fp}: {str(e)}")
+            if not components or components[0].kind != "combined":
                 continue
                 
-        if not datasets:
-            raise Exception("No valid datasets were loaded")
-            
-        return xr.concat(datasets, dim="time").sortby("time")
-
-    async def _load_grib_files(
-        self,
-        region: str,
-        cycle_date: datetime,
-        cycle_hour: str
-    ) -> Optional[xr.Dataset]:
-        """Load GRIB files for a region and combine them into a single dataset."""
-        try:
-            if not self.model_run:
-                logger.error("No model run available for loading files")
-                return None
+            # Combined sea state first, then partitions by height
+            components[1:] = sorted(components[1:], key=lambda c: c.height_m, reverse=True)
+            forecasts.append(GFSForecastPoint(
+                time=pd.Timestamp(t).tz_localize('UTC'),
+                waves=components
+            ))
                 
-            file_paths = self.file_storage.get_valid_files(
-                region,
-                self.model_run,  # This should be non-null at this point
-                self.forecast_hours
+        return sorted(forecasts, key=lambda x: x.time)
+
+    def _get_cube(self, region: str) -> PackedWaveCube:
+        """Resident array for a region."""
+        cube = self._cubes.get(region)
+        if cube is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"No data available for region {region}"
             )
-                    
-            if not file_paths:
-                logger.error(f"No GRIB files found for {region}")
-                return None
-                
-            return self._load_and_combine_dataset(file_paths)
-            
-        except Exception as e:
-            logger.error(f"Error loading GRIB files for {region}: {str(e)}")
-            return None
+        return cube
 
-    def _extract_station_forecast(
-        self,
-        dataset: xr.Dataset,
-        lat: float,
-        lon: float
-    ) -> List[GFSForecastPoint]:
-        """Extract forecast for a specific station from regional dataset."""
-        try:
-            # Convert to 0-360 longitude (we know dataset uses this)
-            query_lon = lon + 360 if lon < 0 else lon
-            
-            # Get nearest point data
-            point_data = dataset.sel(
-                latitude=lat, 
-                longitude=query_lon, 
-                method="nearest"
+    def _grid_station_forecast(self, region: str, lat: float, lon: float) -> List[GFSForecastPoint]:
+        """Forecast at the ocean cell nearest a station."""
+        cube = self._get_cube(region)
+        lat_idx, lon_idx = cube.wet_index.nearest(lat, lon)
+        forecasts = self._build_forecast_points(cube.times, cube.cells(lat_idx, lon_idx))
+        if not forecasts:
+            logger.warning(
+                f"No valid forecast points found for station at "
+                f"lat={lat:.3f}, lon={lon:.3f}"
             )
+        return forecasts
 
-            # Extract forecasts
-            forecasts = []
-            for t in point_data.time.values:
-                time_data = point_data.sel(time=t)
+    def _points_station_forecast(self, region: str, station_id: str) -> List[GFSForecastPoint]:
+        """Forecast for a station from the extracted station cells."""
+        points = self._points.get(region)
+        if points is None or not points.has_station(station_id):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Station {station_id} is not extracted in points mode"
+            )
+        times, values = points.series(station_id)
+        return self._build_forecast_points(times, values)
+
+    def _cycle(self) -> GFSModelCycle:
+        return GFSModelCycle(
+            date=self.model_run.run_date.strftime("%Y%m%d"),
+            hour=f"{self.model_run.cycle_hour:02d}"
+        )
+
+    async def get_point_forecast(self, lat: float, lon: float) -> GFSWavePointForecast:
+        """Get wave forecast bilinearly interpolated to any location in a region."""
+        try:
+            await self._ensure_initialized()
+            
+            if settings.points_mode:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Point forecasts are unavailable in points mode"
+                )
                 
+            region = self._get_region_for_station(lat, lon)
+            cube = self._get_cube(region)
+            with span("gfs_wave.interpolate", region=region):
                 try:
-                    # Extract known data types
-                    wave_data = WaveDataPoint(
-                        height=float(time_data.swh.item()),
-                        period=float(time_data.perpw.item()),
-                        direction=float(time_data.dirpw.item())
-                    )
-                    
-                    # Create forecast point with safe conversion
-                    height_m = wave_data.height
-                    height_ft = float(UnitConversions.meters_to_feet(height_m)) if height_m is not None else 0.0
-                    
-                    wave_component = GFSWaveComponent(
-                        height_m=height_m,
-                        height_ft=height_ft,
-                        period=wave_data.period,
-                        direction=wave_data.direction
-                    )
-                    
-                    forecasts.append(GFSForecastPoint(
-                        time=pd.Timestamp(t).tz_localize('UTC'),
-                        waves=[wave_component]
-                    ))
-                    
+                    lat_idx, lon_idx, weights = bilinear_weights(cube.latitude, cube.longitude, lat, lon)
                 except ValueError as e:
-                    continue
-            
-            if not forecasts:
-                logger.warning(
-                    f"No valid forecast points found for station at "
-                    f"lat={lat:.3f}, lon={lon:.3f}"
+                    raise HTTPException(status_code=400, detail=str(e))
+                    
+                # (T, V, 4) corners over the whole time axis in one gather
+                values = interpolate_corners(
+                    cube.cells(lat_idx, lon_idx),
+                    weights,
+                    circular=WAVE_DIRECTION_VARIABLES
                 )
+                
+                # All four corners on land: use the nearest ocean cell instead
+                land = np.isnan(values[:, 0])
+                if land.any():
+                    wet_lat, wet_lon = cube.wet_index.nearest(lat, lon)
+                    values[land] = cube.cells(wet_lat, wet_lon)[land]
             
-            return sorted(forecasts, key=lambda x: x.time)
+            return GFSWavePointForecast(
+                location=Location(type="Point", coordinates=[lon, lat]),
+                cycle=self._cycle(),
+                forecasts=self._build_forecast_points(cube.times, values)
+            )
             
-        except Exception as e:
-            logger.error(f"Error extracting forecast: {str(e)}")
+        except HTTPException:
             raise
+        except Exception as e:
+            logger.error(f"Error getting wave forecast at ({lat}, {lon}): {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error processing wave forecast: {str(e)}"
+            )
 
     async def get_station_forecast(self, station_id: str, station: Station) -> GFSWaveForecast:
         """Get wave forecast for a specific station."""
@@ -439,38 +539,19 @@ class GFSWaveClient:
             lat = station.location.coordinates[1]
             lon = station.location.coordinates[0]
             
-            # Determine region and get dataset
+            # Determine region
             region = self._get_region_for_station(lat, lon)
             
-            # Convert run_date to datetime if needed
-            cycle_date = datetime.combine(self.model_run.run_date, datetime.min.time(), tzinfo=timezone.utc)
-            
-            # Load dataset for this region
-            dataset = await self._load_grib_files(
-                region,
-                cycle_date,
-                f"{self.model_run.cycle_hour:02d}"
-            )
-            
-            if not dataset:
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"No data available for region {region}"
-                )
-            
-            # Extract forecast
-            forecasts = self._extract_station_forecast(dataset, lat, lon)
-            
-            # Close dataset after use
-            dataset.close()
+            with span("gfs_wave.extract", region=region):
+                if settings.points_mode:
+                    forecasts = self._points_station_forecast(region, station_id)
+                else:
+                    forecasts = self._grid_station_forecast(region, lat, lon)
             
             # Return forecast even if empty - let the service layer handle this
             return GFSWaveForecast(
                 station_info=station,
-                cycle=GFSModelCycle(
-                    date=self.model_run.run_date.strftime("%Y%m%d"),
-                    hour=f"{self.model_run.cycle_hour:02d}"
-                ),
+                cycle=self._cycle(),
                 forecasts=forecasts
             )
             
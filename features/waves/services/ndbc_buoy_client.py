@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import aiohttp
+import numpy as np
 from datetime import datetime, timezone
-from typing import Optional, Union, Dict
+from typing import NamedTuple, Optional, Tuple, Union, Dict
 from fastapi import HTTPException
 
 from features.waves.models.ndbc_types import (
@@ -12,17 +14,86 @@ from features.waves.models.ndbc_types import (
     NDBCObservation,
     NDBCStation
 )
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import traced
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Standard meteorological columns kept in observation histories (NDBC units)
+HISTORY_COLUMNS = ("WDIR", "WSPD", "GST", "WVHT", "DPD", "MWD")
+
+class ObservationSeries(NamedTuple):
+    """Observation history of a station."""
+    times: np.ndarray   # (N,) epoch seconds, ascending
+    values: np.ndarray  # (N, len(HISTORY_COLUMNS)) in NDBC units, NaN where missing
+
+class LatestObservations(NamedTuple):
+    """Latest observation of every NDBC station, from the latest_obs file."""
+    station_ids: np.ndarray  # (N,) str
+    times: np.ndarray        # (N,) epoch seconds
+    values: np.ndarray       # (N, len(HISTORY_COLUMNS)) in NDBC units, NaN where missing
+
+def _parse_table(text: str) -> Tuple[Dict[str, int], np.ndarray]:
+    """Split an NDBC text table into its column index and a string array of rows.
+
+    The first line holds the column names and the second their units.
+    """
+    lines = text.strip().split('\n')
+    headers = lines[0].lstrip('#').split() if lines else []
+    rows = [line.split() for line in lines[2:] if not line.startswith('#')]
+    rows = [row for row in rows if len(row) == len(headers)]
+    if not rows or not all(column in headers for column in ("MM", "DD", "hh", "mm")):
+        return {}, np.empty((0, len(headers)), dtype=str)
+    return {name: i for i, name in enumerate(headers)}, np.array(rows)
+
+def _row_times(table: np.ndarray, column: Dict[str, int]) -> np.ndarray:
+    """Epoch seconds of each row from its date and time columns."""
+    year = table[:, column.get("YY", column.get("YYYY", 0))]
+    stamps = np.char.add(np.char.add(np.char.add(year, "-"), table[:, column["MM"]]), "-")
+    stamps = np.char.add(np.char.add(stamps, table[:, column["DD"]]), "T")
+    stamps = np.char.add(np.char.add(np.char.add(stamps, table[:, column["hh"]]), ":"), table[:, column["mm"]])
+    return stamps.astype("datetime64[m]").astype("datetime64[s]").astype(np.int64)
+
+def _row_values(table: np.ndarray, column: Dict[str, int]) -> np.ndarray:
+    """HISTORY_COLUMNS of each row as floats; "MM" (missing) becomes NaN."""
+    values = np.full((len(table), len(HISTORY_COLUMNS)), np.nan)
+    for i, name in enumerate(HISTORY_COLUMNS):
+        if name in column:
+            raw = table[:, column[name]]
+            values[:, i] = np.where(raw == "MM", "nan", raw).astype(np.float64)
+    return values
+
+def parse_observation_history(text: str) -> ObservationSeries:
+    """Parse a realtime2 standard meteorological file into arrays.
+
+    Rows are newest first in the file and returned oldest first.
+    """
+    column, table = _parse_table(text)
+    if not len(table):
+        return ObservationSeries(np.empty(0, dtype=np.int64), np.empty((0, len(HISTORY_COLUMNS))))
+    table = table[::-1]
+    return ObservationSeries(_row_times(table, column), _row_values(table, column))
+
+def parse_latest_observations(text: str) -> LatestObservations:
+    """Parse the latest_obs file (one row per station) into arrays."""
+    column, table = _parse_table(text)
+    if not len(table) or "STN" not in column:
+        return LatestObservations(
+            np.empty(0, dtype=str), np.empty(0, dtype=np.int64), np.empty((0, len(HISTORY_COLUMNS)))
+        )
+    return LatestObservations(table[:, column["STN"]], _row_times(table, column), _row_values(table, column))
+
 class NDBCBuoyClient:
+    # Seconds allowed for one station's observation history
+    HISTORY_TIMEOUT = 30
+
     def __init__(self):
         self._session: Optional[aiohttp.ClientSession] = None
         
     async def _init_session(self) -> aiohttp.ClientSession:
         if not self._session:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(trace_configs=[upstream_trace_config()])
         return self._session
         
     async def close(self):
@@ -39,6 +110,7 @@ class NDBCBuoyClient:
         except (ValueError, TypeError):
             return None
 
+    @traced("ndbc.observation")
     async def get_observation(self, station_id: str, station_info: Dict) -> Optional[NDBCStation]:
         """Get latest observation data for a station."""
         try:
@@ -126,4 +198,43 @@ class NDBCBuoyClient:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error processing observation data: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+
+    @traced("ndbc.observation_history")
+    async def get_observation_history(self, station_id: str) -> Optional[ObservationSeries]:
+        """Get the recent observation history of a station (about 45 days).
+
+        Returns:
+            ObservationSeries: Observations oldest first, or None if the station has no realtime data
+        """
+        session = await self._init_session()
+        url = f"{settings.ndbc_base_url}{station_id}.{settings.ndbc_data_types['std']}"
+        try:
+            async with session.get(url, timeout=self.HISTORY_TIMEOUT, verify_ssl=False) as response:
+                if response.status == 404:
+                    return None
+                response.raise_for_status()
+                return parse_observation_history(await response.text())
+        except asyncio.TimeoutError:
+            # Not a ClientError; one slow buoy must not fail a whole verification refresh
+            logger.warning(f"⚠️ Timed out fetching observation history for station {station_id}")
+            return None
+        except (aiohttp.ClientError, ValueError) as e:
+            logger.warning(f"⚠️ Error fetching observation history for station {station_id}: {str(e)}")
+            return None
+
+    @traced("ndbc.latest_observations")
+    async def get_latest_observations(self) -> Optional[LatestObservations]:
+        """Get the latest observation of every station in one request.
+
+        Returns:
+            LatestObservations: One row per reporting station, or None on error
+        """
+        session = await self._init_session()
+        try:
+            async with session.get(settings.ndbc_latest_obs_url, timeout=30, verify_ssl=False) as response:
+                response.raise_for_status()
+                return parse_latest_observations(await response.text())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"⚠️ Error fetching latest observations: {str(e)}")
+            return None
@@ -1,14 +1,25 @@
+import asyncio
 import logging
+import time
 import aiohttp
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Sequence, Set, Tuple
 from pydantic import BaseModel, Field
 from fastapi import HTTPException
 
 from features.common.models.station_types import Station
 from features.common.utils.conversions import UnitConversions
 from core.config import settings
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import span, start_background_task, traced
 from features.common.model_run import ModelRun
+from features.waves.services.bulletin_parser import (
+    BulletinSeries,
+    concat_series,
+    month_starts,
+    parse_bulletin,
+    slice_series
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +71,7 @@ def parse_time_parts(parts: List[str], cycle_dt: datetime) -> Optional[datetime]
     """Parse forecast time parts into datetime.
     
     Args:
-        parts: List containing [days, hours] from the bulletin
+        parts: List containing [day of month, hour] from the bulletin
         cycle_dt: The cycle start datetime
         
     Returns:
@@ -71,11 +82,12 @@ def parse_time_parts(parts: List[str], cycle_dt: datetime) -> Optional[datetime]
         if not all(part.strip().isdigit() for part in parts):
             return None
             
-        days, hours = map(int, parts)
-        # Calculate total hours from cycle start, but ensure we start from cycle time
-        total_hours = (days * 24) + hours
-        forecast_time = cycle_dt + timedelta(hours=total_hours)
-        logger.debug(f"Parsed time parts: days={days}, hours={hours}, cycle={cycle_dt}, forecast={forecast_time}")
+        day, hour = map(int, parts)
+        # Days before the cycle's day are in the next month
+        this_month, next_month = month_starts(cycle_dt)
+        month_start = next_month if day < cycle_dt.day else this_month
+        forecast_time = month_start + timedelta(days=day - 1, hours=hour)
+        logger.debug(f"Parsed time parts: day={day}, hour={hour}, cycle={cycle_dt}, forecast={forecast_time}")
         return forecast_time
     except (ValueError, TypeError) as e:
         # Only log if parts look like they should be valid numbers
@@ -140,6 +152,19 @@ def parse_bulletin_line(line: str, cycle_dt: datetime) -> Optional[GFSForecastPo
         logger.warning(f"Error parsing bulletin line: {str(e)}")
         return None
 
+def parse_bulletin_lines(bulletin_text: str, cycle_dt: datetime) -> List[GFSForecastPoint]:
+    """Parse a bulletin line by line into forecast models.
+
+    Reference for ``bulletin_parser.parse_bulletin``, which the client uses.
+    """
+    valid_lines = [line for line in bulletin_text.splitlines() if not is_header_line(line)]
+    forecasts = []
+    for line in valid_lines:
+        forecast = parse_bulletin_line(line, cycle_dt)
+        if forecast:
+            forecasts.append(forecast)
+    return forecasts
+
 def filter_forecasts_by_date_range(
     forecasts: List[GFSForecastPoint],
     start_date: datetime,
@@ -151,21 +176,64 @@ def filter_forecasts_by_date_range(
         key=lambda x: x.timestamp
     )
 
+def unpack_series(series: BulletinSeries) -> List[GFSForecastPoint]:
+    """Rebuild forecast points from a BulletinSeries."""
+    forecasts = []
+    for epoch, components in zip(series.times.tolist(), series.components.tolist()):
+        forecasts.append(GFSForecastPoint(
+            timestamp=datetime.fromtimestamp(epoch, tz=timezone.utc),
+            waves=[
+                create_wave_component(height_m, period, direction)
+                for height_m, period, direction in components
+                if height_m == height_m  # Skip NaN padding
+            ]
+        ))
+    return forecasts
+
 class NOAAGFSClient:
+    """Client for GFS wave station bulletins.
+
+    Bulletins of the current cycle are prefetched for every known station
+    into a compact in-memory store, so requests are served without calling
+    NOMADS. Stations missing from the store are fetched on demand and added.
+    """
+
     def __init__(self, model_run: Optional[ModelRun] = None):
         self._session: Optional[aiohttp.ClientSession] = None
         self.model_run = model_run
+        self._store: Dict[str, BulletinSeries] = {}
+        self._missing: Set[str] = set()  # Stations NOMADS has no bulletin for this cycle
+        self._previous: Dict[str, BulletinSeries] = {}  # Previous cycle, fetched on demand
+        self._available_cycle: Optional[str] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
         
     def update_model_run(self, model_run: ModelRun):
-        """Update the current model run."""
+        """Update the current model run, dropping bulletins of the previous one."""
         self.model_run = model_run
+        self._store = {}
+        self._missing = set()
+        self._previous = {}
+        self._available_cycle = None
+
+    def _cycle(self) -> Tuple[str, str]:
+        """Date and hour strings of the current model run."""
+        if not self.model_run:
+            raise Exception("No model run available")
+        return self.model_run.run_date.strftime("%Y%m%d"), f"{self.model_run.cycle_hour:02d}"
         
     async def _init_session(self) -> aiohttp.ClientSession:
         if not self._session:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(trace_configs=[upstream_trace_config()])
         return self._session
         
     async def close(self):
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            try:
+                await self._prefetch_task
+            except asyncio.CancelledError:
+                pass
+            self._prefetch_task = None
         if self._session:
             await self._session.close()
             self._session = None
@@ -182,6 +250,16 @@ class NOAAGFSClient:
             logger.error(f"Error checking cycle availability: {str(e)}")
             return False
 
+    async def _ensure_cycle_available(self, date: str, hour: str) -> bool:
+        """Check cycle availability once; later calls for the same cycle return immediately."""
+        if self._available_cycle == f"{date}{hour}":
+            return True
+        if not await self._check_cycle_availability(date, hour):
+            return False
+        self._available_cycle = f"{date}{hour}"
+        return True
+
+    @traced("gfs_bulletin.fetch")
     async def _get_station_bulletin(self, station_id: str, date: str, hour: str) -> Optional[str]:
         """Fetch the wave bulletin for a specific station."""
         session = await self._init_session()
@@ -205,82 +283,167 @@ class NOAAGFSClient:
             logger.error(f"Error fetching bulletin for station {station_id}: {str(e)}")
             return None
 
-    def _parse_bulletin(self, bulletin_text: str, cycle_date: str, cycle_hour: str) -> List[GFSForecastPoint]:
-        """Parse a GFS wave bulletin into a list of forecasts."""
+    @traced("gfs_bulletin.parse")
+    def _parse_bulletin(self, bulletin_text: str, cycle_date: str, cycle_hour: str) -> BulletinSeries:
+        """Parse a GFS wave bulletin into arrays."""
         cycle_dt = datetime.strptime(f"{cycle_date} {cycle_hour}", "%Y%m%d %H")
-        cycle_dt = cycle_dt.replace(tzinfo=timezone.utc)
-        
-        # Filter out headers and parse valid lines
-        valid_lines = [line for line in bulletin_text.splitlines() if not is_header_line(line)]
-        
-        forecasts = []
-        for line in valid_lines:
-            forecast = parse_bulletin_line(line, cycle_dt)
-            if forecast:
-                forecasts.append(forecast)
-        
-        return forecasts
+        return parse_bulletin(bulletin_text, cycle_dt.replace(tzinfo=timezone.utc))
 
-    async def get_station_forecast(self, station_id: str, station: Station) -> GFSWaveForecast:
-        """Get wave forecast for a specific station."""
+    async def _load_series(self, station_id: str, date: str, hour: str) -> Optional[BulletinSeries]:
+        """Fetch and parse a station bulletin of the current cycle into the store.
+
+        Raises:
+            HTTPException: 404 if NOMADS has no bulletin for the station
+
+        Returns:
+            BulletinSeries: The stored series, or None if the fetch or parse failed
+        """
+        try:
+            bulletin = await self._get_station_bulletin(station_id, date, hour)
+        except HTTPException:
+            self._missing.add(station_id)
+            raise
+        if not bulletin:
+            return None
+        series = self._parse_bulletin(bulletin, date, hour)
+        if not len(series.times):
+            return None
+        if self._cycle() == (date, hour):
+            self._store[station_id] = series
+        return series
+
+    @traced("gfs_bulletin.prefetch")
+    async def prefetch(self, station_ids: Sequence[str]) -> int:
+        """Load the current cycle's bulletins for all stations into the store.
+
+        Args:
+            station_ids: Stations to fetch; ones already stored are skipped
+
+        Returns:
+            int: Number of stations in the store afterwards
+        """
+        date, hour = self._cycle()
+        if not await self._ensure_cycle_available(date, hour):
+            logger.warning(f"⚠️ GFS wave cycle {date} {hour}Z not yet available, bulletins will be fetched on demand")
+            return len(self._store)
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(settings.gfs_wave_bulletin_concurrency)
+
+        async def fetch(station_id: str):
+            async with semaphore:
+                try:
+                    await self._load_series(station_id, date, hour)
+                except HTTPException:
+                    pass
+                except Exception as e:
+                    logger.warning(f"⚠️ Error prefetching bulletin for station {station_id}: {str(e)}")
+
+        pending = [s for s in station_ids if s not in self._store and s not in self._missing]
+        await asyncio.gather(*(fetch(station_id) for station_id in pending))
+        logger.info(
+            f"📦 Prefetched {len(self._store)} wave bulletins for {date} {hour}Z "
+            f"({len(self._missing)} stations without bulletins) in {time.monotonic() - started:.1f}s"
+        )
+        return len(self._store)
+
+    def start_prefetch(self, station_ids: Sequence[str]):
+        """Run ``prefetch`` in the background; requests meanwhile fall back to on-demand fetches."""
+        async def run():
+            try:
+                await self.prefetch(station_ids)
+            except Exception as e:
+                logger.error(f"❌ Wave bulletin prefetch failed: {str(e)}")
+
+        self._prefetch_task = start_background_task(run())
+
+    async def _get_current_series(self, station_id: str) -> BulletinSeries:
+        """Current cycle series for a station, from the store or fetched on demand."""
+        series = self._store.get(station_id)
+        if series is not None:
+            return series
+        if station_id in self._missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Station {station_id} does not have GFS wave forecasts available"
+            )
+
+        date, cycle_hour = self._cycle()
+        if not await self._ensure_cycle_available(date, cycle_hour):
+            raise Exception(f"Latest GFS cycle not yet available: {date} {cycle_hour}Z")
+
+        series = await self._load_series(station_id, date, cycle_hour)
+        if series is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Station {station_id} does not have GFS wave forecasts available"
+            )
+        return series
+
+    async def _get_previous_series(self, station_id: str, date: str, cycle_hour: str) -> Optional[BulletinSeries]:
+        """Previous cycle series for a station, fetched once and kept."""
+        if station_id in self._previous:
+            return self._previous[station_id]
+        prev_date = (datetime.strptime(date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+        prev_hour = "18" if cycle_hour == "00" else f"{int(cycle_hour)-6:02d}"
+
+        try:
+            prev_bulletin = await self._get_station_bulletin(station_id, prev_date, prev_hour)
+        except HTTPException:
+            prev_bulletin = None
+        if not prev_bulletin:
+            return None
+        self._previous[station_id] = self._parse_bulletin(prev_bulletin, prev_date, prev_hour)
+        return self._previous[station_id]
+
+    @traced("gfs_bulletin.station_series")
+    async def get_station_series(self, station_id: str) -> Tuple[BulletinSeries, GFSModelCycle]:
+        """Get the wave forecast of a station as arrays, without building models.
+
+        Args:
+            station_id: Station ID
+
+        Raises:
+            HTTPException: 404 if the station has no bulletin
+
+        Returns:
+            Tuple of (forecast series, model cycle it comes from)
+        """
         try:
-            if not self.model_run:
-                raise Exception("No model run available")
-                
             # Use current model run data
-            date = self.model_run.run_date.strftime("%Y%m%d")
-            cycle_hour = f"{self.model_run.cycle_hour:02d}"
+            date, cycle_hour = self._cycle()
             logger.debug(f"Using forecast cycle: {date} {cycle_hour}Z")
             
-            # Get bulletin and parse forecasts from current cycle
-            if not await self._check_cycle_availability(date, cycle_hour):
-                raise Exception(f"Latest GFS cycle not yet available: {date} {cycle_hour}Z")
-                
-            bulletin = await self._get_station_bulletin(station_id, date, cycle_hour)
-            if not bulletin:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Station {station_id} does not have GFS wave forecasts available"
-                )
-                
-            current_forecasts = self._parse_bulletin(bulletin, date, cycle_hour)
-            if not current_forecasts:
-                raise Exception(f"Failed to parse forecast data for station {station_id}")
-            
-            # Sort current forecasts by timestamp
-            current_forecasts = sorted(current_forecasts, key=lambda x: x.timestamp)
-            logger.debug(f"Current cycle has {len(current_forecasts)} forecasts")
+            series = await self._get_current_series(station_id)
+            logger.debug(f"Current cycle has {len(series.times)} forecasts")
             
             # If current cycle starts tomorrow, get today's data from previous cycle
             now = datetime.now(timezone.utc)
             today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            if current_forecasts[0].timestamp.date() > today.date():
+            first = datetime.fromtimestamp(int(series.times[0]), tz=timezone.utc)
+            if first.date() > today.date():
                 logger.debug("Getting today's data from previous cycle")
-                prev_date = (datetime.strptime(date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
-                prev_hour = "18" if cycle_hour == "00" else f"{int(cycle_hour)-6:02d}"
-                
-                prev_bulletin = await self._get_station_bulletin(station_id, prev_date, prev_hour)
-                if prev_bulletin:
-                    prev_forecasts = self._parse_bulletin(prev_bulletin, prev_date, prev_hour)
-                    if prev_forecasts:
-                        prev_forecasts = filter_forecasts_by_date_range(
-                            prev_forecasts,
-                            today,
-                            current_forecasts[0].timestamp
-                        )
-                        logger.debug(f"Added {len(prev_forecasts)} forecasts from previous cycle")
-                        current_forecasts = prev_forecasts + current_forecasts
+                prev_series = await self._get_previous_series(station_id, date, cycle_hour)
+                if prev_series is not None:
+                    prev_series = slice_series(
+                        prev_series,
+                        (prev_series.times >= today.timestamp()) & (prev_series.times < series.times[0])
+                    )
+                    logger.debug(f"Added {len(prev_series.times)} forecasts from previous cycle")
+                    series = concat_series(prev_series, series)
             
-            return GFSWaveForecast(
-                station_info=station,
-                cycle=GFSModelCycle(date=date, hour=cycle_hour),
-                forecasts=current_forecasts
-            )
+            return series, GFSModelCycle(date=date, hour=cycle_hour)
             
         except Exception as e:
             logger.error(f"Error getting forecast for station {station_id}: {str(e)}")
             raise
-            
-        finally:
-            # Ensure we close the session
-            await self.close() 
\ No newline at end of file
+
+    async def get_station_forecast(self, station_id: str, station: Station) -> GFSWaveForecast:
+        """Get wave forecast for a specific station."""
+        series, cycle = await self.get_station_series(station_id)
+        with span("gfs_bulletin.build_response", steps=len(series.times)):
+            return GFSWaveForecast(
+                station_info=station,
+                cycle=cycle,
+                forecasts=unpack_series(series)
+            )
@@ -0,0 +1,215 @@
+import logging
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import cfgrib
+import numpy as np
+import xarray as xr
+
+from features.common.services.metrics import GRIB_DECODE_SECONDS
+from features.common.services.tracing import traced
+from features.common.services.wet_cell_index import WetCellIndex, get_wet_cell_index
+
+logger = logging.getLogger(__name__)
+
+# GRIB filter variables and levels: combined sea, wind waves and three swell partitions
+GRIB_FILTER_VARIABLES = ("DIRPW", "HTSGW", "PERPW", "SWDIR", "SWELL", "SWPER", "WVDIR", "WVHGT", "WVPER")
+GRIB_FILTER_LEVELS = ("surface", "1_in_sequence", "2_in_sequence", "3_in_sequence")
+
+SWELL_PARTITIONS = 3
+
+# Cube variables in array order, named after their cfgrib short names
+# (shts/mpts/swdir are swell height/period/direction per sequence number)
+WAVE_VARIABLES = (
+    "swh", "perpw", "dirpw",
+    "shww", "mpww", "wvdir",
+) + tuple(
+    f"{name}_{n}"
+    for n in range(1, SWELL_PARTITIONS + 1)
+    for name in ("shts", "mpts", "swdir")
+)
+
+# (kind, height index, period index, direction index) per wave component
+WAVE_COMPONENTS: Tuple[Tuple[str, int, int, int], ...] = (
+    ("combined", 0, 1, 2),
+    ("wind_waves", 3, 4, 5),
+) + tuple(
+    (f"swell_{n}", 6 + 3 * (n - 1), 7 + 3 * (n - 1), 8 + 3 * (n - 1))
+    for n in range(1, SWELL_PARTITIONS + 1)
+)
+
+# Direction variables, interpolated as unit vectors
+WAVE_DIRECTION_VARIABLES = tuple(direction for _, _, _, direction in WAVE_COMPONENTS)
+
+def open_wave_grib(file_path: Path) -> List[xr.Dataset]:
+    """Open every level group of a forecast hour GRIB file."""
+    return cfgrib.open_datasets(file_path, backend_kwargs={'indexpath': ''}, decode_timedelta=False)
+
+@traced("gfs_wave.decode_hour")
+@GRIB_DECODE_SECONDS.timed("wave")
+def decode_wave_hour(
+    file_path: Path,
+    opener: Callable[[Path], List[xr.Dataset]] = open_wave_grib
+) -> Tuple[np.datetime64, np.ndarray, np.ndarray, np.ndarray]:
+    """Decode one forecast hour into compact arrays and close the file.
+
+    Variables missing from the file (for example files fetched before the
+    partitions were requested) are filled with NaN.
+
+    Returns:
+        Tuple of (valid time, latitude, longitude, values with shape (V, lat, lon))
+    """
+    datasets = opener(file_path)
+    try:
+        if not datasets:
+            raise ValueError(f"No GRIB messages in {file_path}")
+        fields: Dict[str, np.ndarray] = {}
+        for ds in datasets:
+            for name, var in ds.data_vars.items():
+                if "orderedSequenceData" in var.dims:
+                    for n, level in enumerate(var.orderedSequenceData.values):
+                        fields[f"{name}_{int(level)}"] = var.isel(orderedSequenceData=n).values
+                elif "orderedSequenceData" in ds.coords:
+                    fields[f"{name}_{int(ds.orderedSequenceData.values)}"] = var.values
+                else:
+                    fields[name] = var.values
+
+        first = datasets[0]
+        latitude, longitude = first.latitude.values, first.longitude.values
+        missing = np.full((len(latitude), len(longitude)), np.nan, dtype=np.float32)
+        values = np.stack([fields.get(var, missing).astype(np.float32) for var in WAVE_VARIABLES])
+        return np.datetime64(first.valid_time.values, "ns"), latitude, longitude, values
+    finally:
+        for ds in datasets:
+            ds.close()
+
+class PackedWaveCube:
+    """All forecast hours of a region packed into one float16 array.
+
+    Each variable is stored as ``(value - offset) / scale`` with its offset
+    and scale taken from the first hour, so every variable uses the
+    precision of float16 over its own range (about 0.05% of the range).
+    When a later hour falls outside that range, the variable's range is
+    widened with some headroom and the hours packed so far are re-packed,
+    so values never overflow float16. Only the cells a request touches are
+    unpacked back to float32.
+    """
+
+    # Fraction of the widened span added past the new extreme, so a steady
+    # trend across the run only re-packs a few times
+    WIDEN_HEADROOM = 0.5
+    # Normalized values may stray this far outside [0, 1] before widening
+    WIDEN_TOLERANCE = 2 ** -10
+
+    def __init__(
+        self,
+        n_times: int,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        first_values: np.ndarray
+    ):
+        self.latitude = latitude
+        self.longitude = longitude
+        lows, highs = self._value_range(first_values)
+        # Variables missing from the file are all NaN and get a range once they appear
+        self._has_range = ~np.isnan(lows)
+        offsets = np.nan_to_num(lows)
+        spans = np.nan_to_num(highs) - offsets
+        self.offsets = offsets.astype(np.float32)
+        self.scales = np.where(spans > 0, spans, 1.0).astype(np.float32)
+        self.times = np.empty(n_times, dtype="datetime64[ns]")
+        self.data = np.empty((n_times, len(first_values), len(latitude), len(longitude)), dtype=np.float16)
+        self._filled = 0
+        self.wet_index: Optional[WetCellIndex] = None
+
+    def __len__(self) -> int:
+        return self._filled
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes)
+
+    @staticmethod
+    def _value_range(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-variable min and max of one hour, NaN for variables without data."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanmin(values, axis=(1, 2)), np.nanmax(values, axis=(1, 2))
+
+    def _widen(self, values: np.ndarray):
+        """Widen the range of every variable the hour falls outside of and re-pack earlier hours."""
+        lows, highs = self._value_range(values)
+        with np.errstate(invalid="ignore"):
+            below = (lows - self.offsets) / self.scales < -self.WIDEN_TOLERANCE
+            above = (highs - self.offsets) / self.scales > 1 + self.WIDEN_TOLERANCE
+        has_data = ~np.isnan(lows)
+        for var in np.flatnonzero(has_data & (below | above | ~self._has_range)):
+            if self._has_range[var]:
+                low = min(float(lows[var]), float(self.offsets[var]))
+                high = max(float(highs[var]), float(self.offsets[var] + self.scales[var]))
+                headroom = (high - low) * self.WIDEN_HEADROOM
+                low -= headroom if below[var] else 0.0
+                high += headroom if above[var] else 0.0
+            else:
+                low, high = float(lows[var]), float(highs[var])
+            old_offset, old_scale = self.offsets[var], self.scales[var]
+            self.offsets[var] = low
+            self.scales[var] = high - low if high > low else 1.0
+            # One hour at a time, so only one float32 slice is resident
+            for i in range(self._filled):
+                self.data[i, var] = (
+                    self.data[i, var].astype(np.float32) * old_scale + old_offset - self.offsets[var]
+                ) / self.scales[var]
+            if self._has_range[var] and self._filled:
+                logger.debug(
+                    f"↔️ Widened packed range of variable {var} to {low:.3f}..{high:.3f}, "
+                    f"re-packed {self._filled} hours"
+                )
+        self._has_range |= has_data
+
+    def append(self, valid_time: np.datetime64, values: np.ndarray):
+        """Pack one decoded hour with shape (V, lat, lon), widening ranges it falls outside of."""
+        self._widen(values)
+        i = self._filled
+        self.times[i] = valid_time
+        self.data[i] = (values - self.offsets[:, np.newaxis, np.newaxis]) / self.scales[:, np.newaxis, np.newaxis]
+        self._filled += 1
+
+    def finish(self):
+        """Trim unused slots, order by valid time and index the land mask."""
+        if self._filled < len(self.times):
+            self.times = self.times[:self._filled].copy()
+            self.data = self.data[:self._filled].copy()
+        order = np.argsort(self.times, kind="stable")
+        if (order != np.arange(len(order))).any():
+            self.times = self.times[order]
+            self.data = self.data[order]
+        self.wet_index = get_wet_cell_index(self.latitude, self.longitude, ~np.isnan(self.data[0, 0]))
+
+    def cells(self, lat_idx, lon_idx) -> np.ndarray:
+        """Unpack the values of one cell (T, V) or a few cells (T, V, K) over all hours."""
+        unpacked = self.data[:, :, lat_idx, lon_idx].astype(np.float32)
+        shape = (-1,) + (1,) * (unpacked.ndim - 2)
+        return unpacked * self.scales.reshape(shape) + self.offsets.reshape(shape)
+
+    @classmethod
+    def from_hours(
+        cls,
+        hours: Iterable[Tuple[np.datetime64, np.ndarray, np.ndarray, np.ndarray]],
+        n_hours: int
+    ) -> Optional["PackedWaveCube"]:
+        """Pack decoded hours one at a time, so only one float32 hour is ever resident.
+
+        Returns:
+            Optional[PackedWaveCube]: The cube, or None if no hour was decoded
+        """
+        cube = None
+        for valid_time, latitude, longitude, values in hours:
+            if cube is None:
+                cube = cls(n_hours, latitude, longitude, values)
+            cube.append(valid_time, values)
+        if cube is None or not len(cube):
+            return None
+        cube.finish()
+        return cube
@@ -9,6 +9,8 @@ from features.waves.models.wave_types import (
 from features.waves.services.noaa_gfs_client import NOAAGFSClient
 from features.waves.services.ndbc_buoy_client import NDBCBuoyClient
 from features.stations.services.station_service import StationService
+from features.common.utils.conversions import UnitConversions
+from features.common.services.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,7 @@ class WaveDataService:
         self.buoy_client = buoy_client
         self.station_service = station_service
 
+    @traced("wave_v1.station_forecast")
     async def get_station_forecast(self, station_id: str) -> WaveForecastResponse:
         """Get wave model forecast for a specific station."""
         try:
@@ -33,15 +36,8 @@ class WaveDataService:
                     detail=f"Station {station_id} not found"
                 )
                 
-            # Get forecast directly from GFS wave service
-            gfs_forecast = await self.gfs_client.get_station_forecast(station_id, station)
-            
-            if not gfs_forecast:
-                logger.error(f"No forecast data available for station {station_id}")
-                raise HTTPException(
-                    status_code=503,
-                    detail="Forecast data not available. Please try again later."
-                )
+            # Get forecast arrays directly from GFS wave service
+            series, cycle = await self.gfs_client.get_station_series(station_id)
             
             # Set time range for exactly 7 days
             now = datetime.now(timezone.utc)
@@ -51,22 +47,27 @@ class WaveDataService:
             now = now.replace(minute=0, second=0, microsecond=0)
             now = now.replace(hour=(now.hour // 3) * 3)
             
-            # Convert to API response format
-            forecast_points = []
-            for point in gfs_forecast.forecasts:
-                # Only include points within 7 day range and at 3-hour intervals
-                point_hour = point.timestamp.replace(minute=0, second=0, microsecond=0)
-                if (point_hour >= now and 
-                    point_hour <= end_time and 
-                    point_hour.hour % 3 == 0):
-                    # Get primary wave component (highest)
-                    primary_wave = point.waves[0] if point.waves else None
-                    forecast_points.append(WaveForecastPoint(
-                        time=point_hour,
-                        height=primary_wave.height_ft if primary_wave else None,
-                        period=primary_wave.period if primary_wave else None,
-                        direction=primary_wave.direction if primary_wave else None
-                    ))
+            # Only include points within 7 day range and at 3-hour intervals
+            point_hours = series.times - series.times % 3600
+            selected = (
+                (point_hours >= now.timestamp()) &
+                (point_hours <= end_time.timestamp()) &
+                ((point_hours // 3600) % 3 == 0)
+            )
+            
+            # Convert to API response format using the primary (highest) wave component
+            forecast_points = [
+                WaveForecastPoint(
+                    time=datetime.fromtimestamp(point_hour, tz=timezone.utc),
+                    height=UnitConversions.meters_to_feet(height_m),
+                    period=period,
+                    direction=direction
+                )
+                for point_hour, (height_m, period, direction) in zip(
+                    point_hours[selected].tolist(),
+                    series.components[selected, 0].tolist()
+                )
+            ]
             
             # Sort forecasts by time to ensure order
             forecast_points.sort(key=lambda x: x.time)
@@ -74,7 +75,7 @@ class WaveDataService:
             return WaveForecastResponse(
                 station=station,
                 forecasts=forecast_points,
-                model_run=f"{gfs_forecast.cycle.date} {gfs_forecast.cycle.hour}z"
+                model_run=f"{cycle.date} {cycle.hour}z"
             )
             
         except HTTPException:
@@ -1,22 +1,49 @@
 import logging
 from typing import Dict, List, Optional
 from fastapi import HTTPException
-from datetime import datetime, timedelta, timezone
-from aiocache import cached, SimpleMemoryCache
 
 from features.waves.models.wave_types import (
+    WaveForecastComponent,
     WaveForecastPoint,
-    WaveForecastResponse
+    WaveForecastResponse,
+    WavePointForecastResponse
 )
-from features.waves.services.gfs_wave_client import GFSWaveClient
+from features.waves.services.gfs_wave_client import GFSForecastPoint, GFSWaveClient
 from features.waves.services.ndbc_buoy_client import NDBCBuoyClient
 from features.stations.services.station_service import StationService
 from features.common.services.model_run_service import ModelRun
 from features.common.services.cache_config import (
     MODEL_FORECAST_EXPIRE,
+    MODEL_FORECAST_HARD_EXPIRE,
+    feature_cache_class,
+    bump_generation,
     feature_cache_key_builder,
+    point_cache_key_builder,
     get_cache
 )
+from features.common.services.grid_interpolation import snap_coordinate
+from features.common.services.forecast_window import (
+    ForecastSeries,
+    ForecastWindow,
+    build_series,
+    resolve_window,
+    select_window
+)
+from features.common.services.swr_cache import cached_swr
+from features.common.services.tracing import span, traced
+from features.common.models.archive_types import ArchivedRunsResponse, RunDiffResponse
+from features.common.models.station_types import Station
+from features.common.services.forecast_archive import (
+    ArchiveDataset,
+    ForecastArchive,
+    archived_points,
+    format_run_id,
+    parse_run_id,
+    record_run,
+    resolve_diff_runs,
+    run_diff,
+    run_id_for
+)
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,48 +51,202 @@ logger = logging.getLogger(__name__)
 class WaveDataServiceV2:
     # Default forecast range in days if not specified in settings
     DEFAULT_FORECAST_DAYS = 7
+    # Station forecast fields kept for past model runs
+    ARCHIVE_VARIABLES = ("height", "period", "direction")
     
     def __init__(
         self, 
         gfs_client: GFSWaveClient,
         buoy_client: NDBCBuoyClient,
-        station_service: StationService
+        station_service: StationService,
+        archive: Optional[ForecastArchive] = None
     ):
         self.gfs_client = gfs_client
         self.buoy_client = buoy_client
         self.station_service = station_service
+        self.archive: Optional[ArchiveDataset] = (
+            archive.dataset("wave", self.ARCHIVE_VARIABLES, circular=("direction",)) if archive else None
+        )
         self._cache = get_cache()
         # Get forecast days from settings or use default
         self.forecast_days = getattr(settings, 'wave_forecast_days', self.DEFAULT_FORECAST_DAYS)
         logger.info(f"Wave forecast range set to {self.forecast_days} days")
 
     async def handle_model_run_update(self, model_run: ModelRun):
-        """Handle model run update by clearing affected cache entries."""
+        """Handle model run update by invalidating cached forecasts."""
         logger.info(f"🔄 Updating wave data service to model run: {model_run}")
         
-        try:
-            # Get all cache keys matching the pattern
-            keys = await self._cache.raw("keys", "wave_forecast:*")
-            if keys:
-                logger.info(f"Found {len(keys)} wave forecast cache entries to invalidate")
-                for key in keys:
-                    await self._cache.delete(key)
-                logger.info(f"🗑️ Cleared {len(keys)} wave forecast cache entries for new model run")
-            else:
-                logger.info("No wave forecast cache entries to clear")
-        except Exception as e:
-            logger.error(f"Error clearing wave forecast cache: {str(e)}")
-            # Continue even if cache clearing fails - better to serve stale data than no data
+        # Keys carry the model run generation, so bumping it invalidates every cached forecast
+        bump_generation(model_run)
+
+    def _to_forecast_points(self, forecasts: List[GFSForecastPoint]) -> List[WaveForecastPoint]:
+        """Convert GFS points to the API response format."""
+        # Convert to API response format with proper null handling
+        forecast_points = []
+        for point in forecasts:
+            # Get primary wave component (highest) with null safety
+            primary_wave = point.waves[0] if point.waves else None
+            
+            # Create forecast point with safe null handling
+            forecast_points.append(WaveForecastPoint(
+                time=point.time.replace(minute=0, second=0, microsecond=0),
+                height=primary_wave.height_ft if primary_wave else 0.0,
+                period=primary_wave.period if primary_wave else 0.0,
+                direction=primary_wave.direction if primary_wave else 0.0,
+                components=[
+                    WaveForecastComponent(
+                        kind=wave.kind,
+                        height=wave.height_ft,
+                        period=wave.period,
+                        direction=wave.direction
+                    )
+                    for wave in point.waves[1:]
+                ]
+            ))
+        return forecast_points
+
+    @traced("wave.point_forecast")
+    async def get_point_forecast(
+        self,
+        lat: float,
+        lon: float,
+        window: Optional[ForecastWindow] = None
+    ) -> WavePointForecastResponse:
+        """Get wave forecast for any location, interpolated from the regional grid.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            window: Time range and step; defaults to the configured days at 3-hour steps
+        """
+        window = window or resolve_window(default_days=self.forecast_days)
+        step = settings.point_forecast_snap_degrees
+        series = await self._get_snapped_point_series(snap_coordinate(lat, step), snap_coordinate(lon, step))
+        return select_window(series, window)
+
+    @cached_swr(
+        soft_ttl=MODEL_FORECAST_EXPIRE,
+        ttl=MODEL_FORECAST_HARD_EXPIRE,
+        key_builder=point_cache_key_builder,
+        namespace="wave_point_forecast",
+        cache=feature_cache_class(),
+        noself=True
+    )
+    @traced("wave.point_series")
+    async def _get_snapped_point_series(self, lat: float, lon: float) -> ForecastSeries:
+        """Interpolated wave forecast at snapped coordinates over the whole run."""
+        gfs_forecast = await self.gfs_client.get_point_forecast(lat, lon)
+        
+        with span("wave.build_response", steps=len(gfs_forecast.forecasts)):
+            forecast_points = self._to_forecast_points(gfs_forecast.forecasts)
+            if not forecast_points:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No forecast data available at ({lat}, {lon})"
+                )
+                
+            return build_series(WavePointForecastResponse(
+                location=gfs_forecast.location,
+                forecasts=forecast_points,
+                model_run=f"{gfs_forecast.cycle.date} {gfs_forecast.cycle.hour}z"
+            ))
+
+    def _current_run_id(self) -> Optional[str]:
+        model_run = self.gfs_client.model_run
+        return run_id_for(model_run) if model_run else None
+
+    def _require_archive(self) -> ArchiveDataset:
+        if self.archive is None:
+            raise HTTPException(status_code=404, detail="Model run archive is disabled")
+        return self.archive
 
-    @cached(
-        ttl=MODEL_FORECAST_EXPIRE,
+    async def archive_run(self, model_run: ModelRun, stations: List[Station]) -> int:
+        """Record every station's forecast of the served model run.
+
+        Returns:
+            int: Rows written (0 if disabled or already archived)
+        """
+        if self.archive is None:
+            return 0
+
+        async def fetch(station: Station):
+            gfs_forecast = await self.gfs_client.get_station_forecast(station.station_id, station)
+            return self._to_forecast_points(gfs_forecast.forecasts)
+
+        return await record_run(
+            self.archive, run_id_for(model_run), stations, fetch, settings.archive.max_lead_hours, "wave"
+        )
+
+    def get_archived_runs(self) -> ArchivedRunsResponse:
+        """Model runs available through ``model_run`` and run diffs."""
+        current = self._current_run_id()
+        return ArchivedRunsResponse(
+            current_run=format_run_id(current) if current else None,
+            runs=[format_run_id(run_id) for run_id in self._require_archive().runs()]
+        )
+
+    def get_run_diff(
+        self,
+        station_id: str,
+        model_run: Optional[str] = None,
+        base_run: Optional[str] = None
+    ) -> RunDiffResponse:
+        """Change in a station's wave forecast between two model runs.
+        
+        Args:
+            station_id: Station identifier
+            model_run: Run to compare; defaults to the current run
+            base_run: Run to compare against; defaults to the archived run before ``model_run``
+        """
+        archive = self._require_archive()
+        self.station_service.get_station(station_id)
+        run_id, base_run_id = resolve_diff_runs(archive, model_run, base_run, self._current_run_id())
+        return run_diff(archive, station_id, run_id, base_run_id)
+
+    def _get_archived_forecast(self, station_id: str, run_id: str, window: ForecastWindow) -> WaveForecastResponse:
+        """Station forecast from an archived model run (combined sea state only)."""
+        archive = self._require_archive()
+        station = self.station_service.get_station(station_id)
+        response = WaveForecastResponse(
+            station=station,
+            forecasts=archived_points(archive, run_id, station_id, WaveForecastPoint),
+            model_run=f"{run_id[:8]} {run_id[8:]}z"
+        )
+        return select_window(build_series(response), window)
+
+    @traced("wave.station_forecast")
+    async def get_station_forecast(
+        self,
+        station_id: str,
+        window: Optional[ForecastWindow] = None,
+        model_run: Optional[str] = None
+    ) -> WaveForecastResponse:
+        """Get wave model forecast for a specific station.
+        
+        Args:
+            station_id: Station identifier
+            window: Time range and step; defaults to the configured days at 3-hour steps
+            model_run: Earlier model run to serve from the archive (e.g. 20250218_06Z)
+        """
+        window = window or resolve_window(default_days=self.forecast_days)
+        if model_run:
+            run_id = parse_run_id(model_run)
+            if run_id != self._current_run_id():
+                return self._get_archived_forecast(station_id, run_id, window)
+        series = await self._get_station_series(station_id)
+        return select_window(series, window)
+
+    @cached_swr(
+        soft_ttl=MODEL_FORECAST_EXPIRE,
+        ttl=MODEL_FORECAST_HARD_EXPIRE,
         key_builder=feature_cache_key_builder,
         namespace="wave_forecast",
-        cache=SimpleMemoryCache,
+        cache=feature_cache_class(),
         noself=True
     )
-    async def get_station_forecast(self, station_id: str) -> WaveForecastResponse:
-        """Get wave model forecast for a specific station."""
+    @traced("wave.station_series")
+    async def _get_station_series(self, station_id: str) -> ForecastSeries:
+        """Wave model forecast for a station over the whole run."""
         try:
             station = self.station_service.get_station(station_id)
             if not station:
@@ -85,54 +266,27 @@ class WaveDataServiceV2:
                         detail=f"No forecast data available for station {station_id}"
                     )
                 
-                # Set time range based on configuration
-                now = datetime.now(timezone.utc)
-                end_time = now + timedelta(days=self.forecast_days)
-                
-                # Round current time down to nearest 3-hour interval
-                now = now.replace(minute=0, second=0, microsecond=0)
-                now = now.replace(hour=(now.hour // 3) * 3)
-                
-                # Convert to API response format with proper null handling
-                forecast_points = []
-                for point in gfs_forecast.forecasts:
-                    # Only include points within configured day range and at 3-hour intervals
-                    point_hour = point.time.replace(minute=0, second=0, microsecond=0)
-                    if (point_hour >= now and 
-                        point_hour <= end_time and 
-                        point_hour.hour % 3 == 0):
-                        # Get primary wave component (highest) with null safety
-                        primary_wave = point.waves[0] if point.waves else None
-                        
-                        # Create forecast point with safe null handling
-                        forecast_points.append(WaveForecastPoint(
-                            time=point_hour,
-                            height=primary_wave.height_ft if primary_wave else 0.0,
-                            period=primary_wave.period if primary_wave else 0.0,
-                            direction=primary_wave.direction if primary_wave else 0.0
-                        ))
-                
-                # Sort forecasts by time to ensure order
-                forecast_points.sort(key=lambda x: x.time)
-                
-                # Get model run info from the forecast
-                model_run = f"{gfs_forecast.cycle.date} {gfs_forecast.cycle.hour}z"
-                
-                response = WaveForecastResponse(
-                    station=station,
-                    forecasts=forecast_points,
-                    model_run=model_run
-                )
+                with span("wave.build_response", steps=len(gfs_forecast.forecasts)):
+                    forecast_points = self._to_forecast_points(gfs_forecast.forecasts)
+                    
+                    # Get model run info from the forecast
+                    model_run = f"{gfs_forecast.cycle.date} {gfs_forecast.cycle.hour}z"
+                    
+                    response = WaveForecastResponse(
+                        station=station,
+                        forecasts=forecast_points,
+                        model_run=model_run
+                    )
                 
                 # Log cache key for debugging
                 cache_key = feature_cache_key_builder(
-                    self.get_station_forecast,
+                    self._get_station_series,
                     namespace="wave_forecast",
                     station_id=station_id
                 )
                 logger.info(f"Caching forecast for station {station_id} with key {cache_key}")
                 
-                return response
+                return build_series(response)
                 
             except Exception as e:
                 logger.error(f"Error getting GFS forecast for station {station_id}: {str(e)}")
@@ -145,4 +299,4 @@ class WaveDataServiceV2:
             raise
         except Exception as e:
             logger.error(f"Error in get_station_forecast for station {station_id}: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,7 @@
 from enum import Enum
+
+import numpy as np
+
 from .wind_types import WindDirectionEnum, TrendTypeEnum, WindDirectionModel
 
 
@@ -26,6 +29,17 @@ class WindDirection(Enum):
                 return direction
         return cls.N  # Default for 337.5-360 and 0-22.5
 
+    @classmethod
+    def from_degrees_array(cls, degrees: np.ndarray) -> np.ndarray:
+        """Vectorized ``from_degrees`` returning codes that index ``tuple(WindDirection)``.
+
+        Sectors are looked up by their start angle, so values next to a
+        sector edge land where ``from_degrees`` puts them; NaN maps to N.
+        """
+        degrees = np.nan_to_num(np.asarray(degrees, dtype=np.float64))
+        edges = np.array(sorted(direction.min_deg for direction in cls))
+        return (np.searchsorted(edges, np.mod(degrees, 360), side="right") % len(cls)).astype(np.int8)
+
 class WindCategory(Enum):
     """Wind speed categories."""
     LIGHT = ((0, 5), "light")  # 0-5 m/s
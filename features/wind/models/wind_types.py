@@ -3,7 +3,7 @@ from typing import List, Optional, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 
-from features.common.models.station_types import Station
+from features.common.models.station_types import Location, Station
 
 class WindDirectionEnum(str, Enum):
     N = "North"
@@ -39,4 +39,10 @@ class WindForecastResponse(BaseModel):
     forecasts: List[WindForecastPoint]
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class WindPointForecastResponse(BaseModel):
+    """Wind forecast interpolated to an arbitrary location."""
+    location: Location
+    model_run: str
+    forecasts: List[WindForecastPoint]
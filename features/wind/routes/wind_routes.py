@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, Request
-from features.wind.models.wind_types import WindForecastResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from features.wind.models.wind_types import WindForecastResponse, WindPointForecastResponse
 from features.wind.services.wind_data_service import WindDataService
+from features.common.models.archive_types import ArchivedRunsResponse, RunDiffResponse
+from features.common.services.forecast_archive import parse_run_id, run_start
+from features.common.services.forecast_window import ForecastWindowQuery
+from features.common.services.tracing import TracedRoute
 
 router = APIRouter(
     prefix="/wind",
@@ -8,7 +13,8 @@ router = APIRouter(
     responses={
         404: {"description": "Station not found"},
         503: {"description": "Forecast service unavailable"}
-    }
+    },
+    route_class=TracedRoute
 )
 
 def get_wind_service(request: Request) -> WindDataService:
@@ -19,11 +25,62 @@ def get_wind_service(request: Request) -> WindDataService:
     "/{station_id}/forecast",
     response_model=WindForecastResponse,
     summary="Get wind forecast for a station",
-    description="Returns a 7-day wind forecast at 3-hour intervals from GFS for the specified station"
+    description="Returns a GFS wind forecast for the specified station, 7 days at 3-hour intervals unless start, end/days or step say otherwise (up to 16 days)"
 )
 async def get_station_wind_forecast(
     station_id: str,
+    window: ForecastWindowQuery = Depends(),
+    model_run: Optional[str] = Query(None, description="Model run to serve, e.g. 20250218_06Z; the window then starts at the run's cycle time"),
     wind_service: WindDataService = Depends(get_wind_service)
 ) -> WindForecastResponse:
     """Get wind forecast for a specific station."""
-    return await wind_service.get_station_forecast(station_id)
\ No newline at end of file
+    default_start = run_start(parse_run_id(model_run)) if model_run else None
+    return await wind_service.get_station_forecast(
+        station_id,
+        window.resolve(WindDataService.DEFAULT_FORECAST_DAYS, default_start=default_start),
+        model_run=model_run
+    )
+
+@router.get(
+    "/runs",
+    response_model=ArchivedRunsResponse,
+    summary="List archived wind model runs",
+    description="Returns the model runs whose station forecasts can be requested with model_run or compared"
+)
+async def get_wind_runs(
+    wind_service: WindDataService = Depends(get_wind_service)
+) -> ArchivedRunsResponse:
+    """List archived model runs."""
+    return wind_service.get_archived_runs()
+
+@router.get(
+    "/{station_id}/diff",
+    response_model=RunDiffResponse,
+    summary="Compare wind forecasts of two model runs",
+    description="Returns both runs' values and their difference at every valid time they share, from the model run archive"
+)
+async def get_station_wind_diff(
+    station_id: str,
+    model_run: Optional[str] = Query(None, description="Run to compare, e.g. 20250218_12Z; defaults to the current run"),
+    base_run: Optional[str] = Query(None, description="Run to compare against; defaults to the archived run before model_run"),
+    wind_service: WindDataService = Depends(get_wind_service)
+) -> RunDiffResponse:
+    """Compare a station's wind forecast between model runs."""
+    return wind_service.get_run_diff(station_id, model_run, base_run)
+
+@router.get(
+    "/point",
+    response_model=WindPointForecastResponse,
+    summary="Get wind forecast for any location",
+    description="Returns a wind forecast bilinearly interpolated from the GFS grid, 7 days at 3-hour intervals unless start, end/days or step say otherwise"
+)
+async def get_point_wind_forecast(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=360, description="Longitude (-180 to 180 or 0 to 360)"),
+    window: ForecastWindowQuery = Depends(),
+    wind_service: WindDataService = Depends(get_wind_service)
+) -> WindPointForecastResponse:
+    """Get wind forecast for a latitude/longitude."""
+    return await wind_service.get_point_forecast(
+        lat, lon, window.resolve(WindDataService.DEFAULT_FORECAST_DAYS)
+    )
@@ -1,8 +1,6 @@
 import aiohttp
 import logging
 import numpy as np
-import xarray as xr
-import cfgrib
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -10,12 +8,18 @@ from typing import List, Optional, Tuple, Dict
 import asyncio
 from fastapi import HTTPException
 
-from features.wind.models.wind_types import WindForecastResponse, WindForecastPoint
-from features.common.models.station_types import Station
+from features.wind.models.wind_types import WindForecastResponse, WindForecastPoint, WindPointForecastResponse
+from features.common.models.station_types import Location, Station
 from features.common.utils.conversions import UnitConversions
 from features.wind.utils.file_storage import GFSFileStorage
 from features.common.services.model_run_service import ModelRun
 from features.common.services.rate_limiter import RateLimiter
+from features.common.services.retry_queue import DownloadRetryQueue
+from features.wind.services.wind_store import WIND_VARIABLES, WindRegionStore
+from features.common.services.point_store import StationPointStore
+from features.common.services.metrics import upstream_trace_config
+from features.common.services.tracing import span, start_background_task, traced
+from features.stations.services.station_service import StationService
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -30,7 +34,12 @@ class GFSWindClient:
         self._initialization_lock = asyncio.Lock()
         self._initialization_error: Optional[str] = None
         self.forecast_hours = settings.wind.forecast_hours
-        self._datasets: Dict[str, Dict[int, xr.Dataset]] = {}  # region -> {hour -> dataset}
+        self._stores: Dict[str, WindRegionStore] = {}  # region -> tiered forecast hours
+        self._region_runs: Dict[str, ModelRun] = {}  # region -> run, while a swap is in progress
+        self.retry_queue: Optional[DownloadRetryQueue] = None
+        self._retry_task: Optional[asyncio.Task] = None
+        self._retry_wakeup = asyncio.Event()
+        self._points_stations: Optional[List[Station]] = None  # Stations extracted in points mode
         
         # Use shared rate limiter
         self.rate_limiter = RateLimiter(
@@ -46,8 +55,10 @@ class GFSWindClient:
         self.file_storage.cleanup_old_files(model_run)
         self._is_initialized = False
         self._initialization_error = None
-        self._datasets.clear()  # Clear cached datasets
+        self.close_stores(self._stores)  # Drop resident forecast hours
+        self.retry_queue = None  # Retry worker exits once the queue is detached
         
+    @traced("gfs_wind.initialize")
     async def initialize(self):
         """Initialize the wind client by loading the latest model run data."""
         async with self._initialization_lock:
@@ -61,126 +72,16 @@ class GFSWindClient:
                     detail=self._initialization_error
                 )
             
-            # Calculate how long the model run has been available
-            hours_since_available = (datetime.now(timezone.utc) - self.model_run.available_time).total_seconds() / 3600
-            
-            # Determine maximum forecast hour based on availability time
-            # GFS files are published progressively, with early forecast hours first
-            # Typically, forecast hours up to ~120 are available within the first hour
-            # Higher forecast hours become available over the next 1-2 hours
-            max_forecast_hour = min(384, int(hours_since_available * 120))
-            
-            # Ensure we have at least some forecast hours (minimum 72 hours)
-            max_forecast_hour = max(72, max_forecast_hour)
-            
-            # Filter forecast hours to only include those likely to be available
-            available_forecast_hours = [h for h in self.forecast_hours if h <= max_forecast_hour]
-            
-            logger.info(
-                f"Model run {self.model_run.date_str} {self.model_run.cycle_hour:02d}Z has been available for "
-                f"{hours_since_available:.1f} hours. Using forecast hours up to {max_forecast_hour}"
-            )
-            
+            max_forecast_hour = self._prepare_run()
             initialization_errors = []
             
             # Initialize each region
-            for region_name, region_config in settings.wind.regions.items():
-                try:
-                    logger.info(f"🌎 Initializing {region_name} region wind data...")
-                    
-                    # Get list of missing files but sort by forecast hour
-                    missing_files = sorted(
-                        self.file_storage.get_missing_files(
-                            region_name,
-                            self.model_run,
-                            available_forecast_hours  # Use filtered forecast hours
-                        ),
-                        key=lambda x: x[0]  # Sort by forecast hour
-                    )
-                    
-                    if missing_files:
-                        logger.info(f"📥 Attempting to download {len(missing_files)} wind files for {region_name}...")
-                        
-                        # Calculate expected availability time for the first missing hour
-                        first_hour = missing_files[0][0]
-                        expected_time = self.model_run.available_time + timedelta(minutes=max(5, first_hour // 6))
-                        
-                        if datetime.now(timezone.utc) < expected_time:
-                            wait_mins = (expected_time - datetime.now(timezone.utc)).total_seconds() / 60
-                            logger.warning(
-                                f"⚠️ First missing hour {first_hour} not expected until "
-                                f"{expected_time.strftime('%H:%M:%S')} UTC "
-                                f"(in ~{wait_mins:.1f} minutes)"
-                            )
-                        
-                        downloaded, failed = await self._download_regional_files(region_name, missing_files)
-                        
-                        if downloaded == 0:
-                            error_msg = f"Failed to download any wind files for {region_name}"
-                            initialization_errors.append(error_msg)
-                            logger.error(f"❌ {error_msg}")
-                            continue
-                            
-                        logger.info(f"📊 {region_name} wind download summary: {downloaded} succeeded, {failed} failed")
-                        
-                        # If we have some successful downloads but not all, log a warning
-                        if failed > 0:
-                            logger.warning(
-                                f"⚠️ Some forecast hours not yet available for {region_name} "
-                                f"({failed} missing, will retry on next update)"
-                            )
-                    else:
-                        logger.info(f"✨ All wind files already available for {region_name}")
-                    
-                    # Load the dataset with available files
-                    valid_files = self.file_storage.get_valid_files(
-                        region_name,
-                        self.model_run,
-                        available_forecast_hours  # Use filtered forecast hours
-                    )
-                    
-                    if not valid_files:
-                        error_msg = f"No valid wind files available for {region_name}"
-                        initialization_errors.append(error_msg)
-                        logger.error(f"❌ {error_msg}")
-                        continue
-                        
-                    logger.info(f"🔄 Loading {len(valid_files)} wind files for {region_name}...")
-                    
-                    # Initialize region's dataset cache
-                    self._datasets[region_name] = {}
-                    
-                    # Load each file into a dataset
-                    loaded_files = 0
-                    for file_path in valid_files:
-                        try:
-                            forecast_hour = int(str(file_path).split('_f')[-1].split('.')[0])
-                            ds = xr.open_dataset(
-                                file_path,
-                                engine='cfgrib',
-                                decode_timedelta=False,
-                                backend_kwargs={'indexpath': ''}
-                            )
-                            self._datasets[region_name][forecast_hour] = ds
-                            loaded_files += 1
-                        except Exception as e:
-                            logger.error(f"❌ Error loading wind file {file_path}: {str(e)}")
-                            continue
-                            
-                    if loaded_files > 0:
-                        logger.info(f"✅ Successfully loaded {loaded_files} wind files for {region_name}")
-                    else:
-                        error_msg = f"Failed to load any wind files for {region_name}"
-                        initialization_errors.append(error_msg)
-                        logger.error(f"❌ {error_msg}")
-                        
-                except Exception as e:
-                    error_msg = f"Error initializing {region_name} wind data: {str(e)}"
+            for region_name in settings.wind.regions:
+                error_msg = await self._initialize_region(region_name, max_forecast_hour)
+                if error_msg:
                     initialization_errors.append(error_msg)
-                    logger.error(f"❌ {error_msg}")
-                    continue
             
-            if initialization_errors and not any(self._datasets.values()):
+            if initialization_errors and not any(len(store) for store in self._stores.values()):
                 # Only fail initialization if we have no data at all
                 self._initialization_error = "; ".join(initialization_errors)
                 logger.error(f"❌ Wind initialization errors: {self._initialization_error}")
@@ -197,7 +98,301 @@ class GFSWindClient:
                 f"✅ Wind client initialization complete with model run "
                 f"{self.model_run.date_str} {self.model_run.cycle_hour:02d}Z"
             )
+            
+            if len(self.retry_queue):
+                logger.info(f"🔁 {len(self.retry_queue)} wind forecast hours queued for background retry")
+                self.start_retry_worker()
+
+    async def load_region(self, region_name: str) -> bool:
+        """Load a single region without marking the client initialized.
+
+        Used by the model run swap controller to build a new run one region
+        at a time and hand each region over with ``adopt_region``.
+        """
+        async with self._initialization_lock:
+            max_forecast_hour = self._prepare_run()
+            error_msg = await self._initialize_region(region_name, max_forecast_hour)
+            return error_msg is None
+
+    def _prepare_run(self) -> int:
+        """Work out which forecast hours should be published and set up the retry queue.
+
+        Returns:
+            int: Highest forecast hour expected to be available now
+        """
+        # Calculate how long the model run has been available
+        hours_since_available = (datetime.now(timezone.utc) - self.model_run.available_time).total_seconds() / 3600
+        
+        # Determine maximum forecast hour based on availability time
+        # GFS files are published progressively, with early forecast hours first
+        # Typically, forecast hours up to ~120 are available within the first hour
+        # Higher forecast hours become available over the next 1-2 hours
+        max_forecast_hour = min(384, int(hours_since_available * 120))
+        
+        # Ensure we have at least some forecast hours (minimum 72 hours)
+        max_forecast_hour = max(72, max_forecast_hour)
+        
+        # Missing hours are filled in the background for the rest of this run
+        if self.retry_queue is None:
+            self.retry_queue = DownloadRetryQueue(
+                self.file_storage.get_run_dir(self.model_run) / "retry_queue.json",
+                base_delay=settings.wind.retry["base_delay"],
+                max_delay=settings.wind.retry["max_delay"],
+                max_attempts=int(settings.wind.retry["max_attempts"])
+            )
+        
+        logger.info(
+            f"Model run {self.model_run.date_str} {self.model_run.cycle_hour:02d}Z has been available for "
+            f"{hours_since_available:.1f} hours. Using forecast hours up to {max_forecast_hour}"
+        )
+        return max_forecast_hour
+
+    async def _initialize_region(self, region_name: str, max_forecast_hour: int) -> Optional[str]:
+        """Download and load one region's forecast hours.
+
+        Returns:
+            Optional[str]: Error message, or None when the region loaded
+        """
+        # Filter forecast hours to only include those likely to be available
+        available_forecast_hours = [h for h in self.forecast_hours if h <= max_forecast_hour]
+        
+        try:
+            logger.info(f"🌎 Initializing {region_name} region wind data...")
+            
+            # Get list of missing files but sort by forecast hour
+            missing_files = sorted(
+                self.file_storage.get_missing_files(
+                    region_name,
+                    self.model_run,
+                    available_forecast_hours  # Use filtered forecast hours
+                ),
+                key=lambda x: x[0]  # Sort by forecast hour
+            )
+            
+            if missing_files:
+                logger.info(f"📥 Attempting to download {len(missing_files)} wind files for {region_name}...")
+                
+                # Calculate expected availability time for the first missing hour
+                first_hour = missing_files[0][0]
+                expected_time = self.model_run.available_time + timedelta(minutes=max(5, first_hour // 6))
+                
+                if datetime.now(timezone.utc) < expected_time:
+                    wait_mins = (expected_time - datetime.now(timezone.utc)).total_seconds() / 60
+                    logger.warning(
+                        f"⚠️ First missing hour {first_hour} not expected until "
+                        f"{expected_time.strftime('%H:%M:%S')} UTC "
+                        f"(in ~{wait_mins:.1f} minutes)"
+                    )
+                
+                with span("gfs_wind.download_region", region=region_name, files=len(missing_files)):
+                    downloaded, failed = await self._download_regional_files(region_name, missing_files)
+                
+                if downloaded == 0:
+                    error_msg = f"Failed to download any wind files for {region_name}"
+                    logger.error(f"❌ {error_msg}")
+                    return error_msg
+                    
+                logger.info(f"📊 {region_name} wind download summary: {downloaded} succeeded, {failed} failed")
+                
+                # If we have some successful downloads but not all, log a warning
+                if failed > 0:
+                    logger.warning(
+                        f"⚠️ Some forecast hours not yet available for {region_name} "
+                        f"({failed} missing, queued for background retry)"
+                    )
+            else:
+                logger.info(f"✨ All wind files already available for {region_name}")
+            
+            # Hours not published yet are queued for when they should appear
+            unpublished = self.file_storage.get_missing_files(
+                region_name,
+                self.model_run,
+                [h for h in self.forecast_hours if h > max_forecast_hour]
+            )
+            self.retry_queue.add_many(region_name, [
+                (forecast_hour, file_path, self._expected_publish_time(forecast_hour).timestamp())
+                for forecast_hour, file_path in unpublished
+            ])
+            
+            # Load the dataset with available files
+            valid_files = self.file_storage.get_valid_files(
+                region_name,
+                self.model_run,
+                available_forecast_hours  # Use filtered forecast hours
+            )
+            
+            if not valid_files:
+                error_msg = f"No valid wind files available for {region_name}"
+                logger.error(f"❌ {error_msg}")
+                return error_msg
+                
+            logger.info(f"🔄 Loading {len(valid_files)} wind files for {region_name}...")
+            
+            # Decode near-term hours into the hot tier, register far-range hours for lazy loading
+            store = self._new_store(region_name)
+            with span("gfs_wind.decode_region", region=region_name, files=len(valid_files)):
+                loaded_files = await store.add_hours(
+                    (self.file_storage.parse_file_name(file_path.name)[1], file_path)
+                    for file_path in valid_files
+                )
+                    
+            if loaded_files == 0:
+                error_msg = f"Failed to load any wind files for {region_name}"
+                logger.error(f"❌ {error_msg}")
+                return error_msg
+                
+            self._stores[region_name] = store
+            resident = sum(store.resident_bytes().values())
+            logger.info(
+                f"✅ Successfully loaded {loaded_files} wind files for {region_name} "
+                f"({resident / 1e6:.1f} MB resident)"
+            )
+            return None
+                
+        except Exception as e:
+            error_msg = f"Error initializing {region_name} wind data: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            return error_msg
+
+    def _new_store(self, region_name: str) -> WindRegionStore:
+        """Create an empty tiered store for a region."""
+        points = None
+        if settings.points_mode:
+            if self._points_stations is None:
+                self._points_stations = StationService().get_all_stations()
+            points = StationPointStore(self._points_stations, WIND_VARIABLES)
+        return WindRegionStore(
+            region_name,
+            hot_horizon_hours=settings.wind.hot_horizon_hours,
+            cold_max_bytes=settings.wind.cold_cache_bytes,
+            points=points
+        )
+
+    def adopt_region(self, region_name: str, source: "GFSWindClient") -> Dict[str, WindRegionStore]:
+        """Take over a loaded region from another client.
+
+        The region is swapped in with a single assignment so requests see
+        either the old or the new run, never a mix of hours.
+
+        Returns:
+            Dict[str, WindRegionStore]: The replaced store, for the caller to release
+        """
+        previous = {region_name: self._stores[region_name]} if region_name in self._stores else {}
+        self._stores[region_name] = source._stores.pop(region_name)
+        self._region_runs[region_name] = source.model_run
+        return previous
+
+    def adopt_run(self, source: "GFSWindClient"):
+        """Finish a region-by-region handover by taking the source's model run state."""
+        # Regions that were not handed over keep serving (and labelling) the previous run
+        previous_run = self.model_run
+        self._region_runs = {
+            region: previous_run for region in self._stores if region not in self._region_runs
+        }
+        self.model_run = source.model_run
+        self.retry_queue = source.retry_queue
+        source.retry_queue = None
+        if self.retry_queue is not None:
+            # Their stores still hold the previous run, so new-run hours must not be inserted
+            for region in self._region_runs:
+                dropped = self.retry_queue.remove_region(region)
+                if dropped:
+                    logger.info(f"🔁 Dropped {dropped} queued {region} wind retries, region kept on the previous run")
+        self._is_initialized = True
+        self._initialization_error = None
+        if self.retry_queue is not None and len(self.retry_queue):
+            self.start_retry_worker()
+
+    def resident_bytes(self) -> Dict[str, int]:
+        """Resident bytes held per region across both tiers."""
+        return {
+            region: sum(store.resident_bytes().values())
+            for region, store in self._stores.items()
+        }
+
+    @staticmethod
+    def close_stores(stores: Dict[str, WindRegionStore]):
+        """Drop the arrays held by a set of region stores."""
+        for store in stores.values():
+            store.close()
+        stores.clear()
 
+    async def close(self):
+        """Stop background work and release every resident forecast hour."""
+        await self.stop_retry_worker()
+        self.close_stores(self._stores)
+        self._is_initialized = False
+
+    def _expected_publish_time(self, forecast_hour: int) -> datetime:
+        """Estimate when a forecast hour is published (~120 forecast hours per hour)."""
+        return self.model_run.available_time + timedelta(hours=forecast_hour / 120)
+
+    def start_retry_worker(self):
+        """Start the background task that fills missing forecast hours."""
+        if self._retry_task and not self._retry_task.done():
+            self._retry_wakeup.set()
+            return
+        self._retry_task = start_background_task(self._retry_missing_hours())
+
+    async def stop_retry_worker(self):
+        """Stop the background retry task."""
+        if self._retry_task:
+            self._retry_task.cancel()
+            try:
+                await self._retry_task
+            except asyncio.CancelledError:
+                pass
+            self._retry_task = None
+
+    async def _retry_missing_hours(self):
+        """Retry queued forecast hours with backoff and hot-insert recovered hours.
+
+        The queue is detached (or handed to another client) when the model run
+        changes; the worker then stops instead of inserting hours into stores
+        that belong to a different run.
+        """
+        queue = self.retry_queue
+        while queue is not None and len(queue):
+            for entry in queue.due():
+                url = self._build_grib_filter_url(entry.forecast_hour, entry.region)
+                file_path = Path(entry.file_path)
+                downloaded = await self._download_grib_file(url, file_path)
+                if self.retry_queue is not queue:
+                    logger.info("🔁 Wind retry queue detached; stopping retry worker")
+                    return
+                if not downloaded:
+                    queue.record_failure(entry, error="download failed")
+                    continue
+                    
+                # The store swaps its arrays in one assignment, so readers never see a half-updated region
+                store = self._stores.get(entry.region)
+                if store is None:
+                    store = self._stores[entry.region] = self._new_store(entry.region)
+                added = await store.add_hours([(entry.forecast_hour, file_path)])
+                if self.retry_queue is not queue:
+                    logger.info("🔁 Wind retry queue detached; stopping retry worker")
+                    return
+                if not added:
+                    queue.record_failure(entry, error="failed to decode GRIB file")
+                    continue
+                queue.remove(entry.region, entry.forecast_hour)
+                logger.info(f"✅ Recovered {entry.region} wind forecast hour {entry.forecast_hour}")
+                
+            wait = queue.seconds_until_next()
+            if wait is None:
+                break
+            self._retry_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._retry_wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+            if self.retry_queue is not queue:
+                logger.info("🔁 Wind retry queue detached; stopping retry worker")
+                return
+                
+        logger.info("✨ Wind retry queue drained")
+
+    @traced("gfs_wind.ensure_initialized")
     async def _ensure_initialized(self):
         """Ensure the client is initialized before processing requests."""
         if not self._is_initialized:
@@ -275,50 +470,61 @@ class GFSWindClient:
         )
         return url
             
-    def _calculate_wind(self, u: float, v: float) -> tuple[float, float]:
-        """Calculate wind speed and direction from U and V components."""
-        try:
-            speed = round((u * u + v * v) ** 0.5, 2)
-            direction = round((270 - (180 / 3.14159) * (v > 0) * 3.14159 + (180 / 3.14159) * (v < 0) * 3.14159) % 360, 2)
-            return speed, direction
-        except Exception as e:
-            logger.error(f"Error calculating wind: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error calculating wind data: {str(e)}"
-            )
-            
-    def _process_grib_data(
-        self,
-        ds: xr.Dataset,
-        lat: float,
-        lon: float
-    ) -> Optional[Tuple[datetime, float, float, float]]:
-        """Process GRIB2 dataset and extract wind data for location."""
-        try:
-            valid_time = pd.to_datetime(ds.valid_time.item()).to_pydatetime()
-            if not isinstance(valid_time, datetime):
-                logger.error(f"Invalid time format from GRIB: {valid_time}")
-                return None
-            
-            if valid_time.tzinfo is None:
-                valid_time = valid_time.replace(tzinfo=timezone.utc)
-            
-            lat_idx = abs(ds.latitude - lat).argmin().item()
-            lon_idx = abs(ds.longitude - lon).argmin().item()
-            
-            u = float(ds['u10'].values[lat_idx, lon_idx])
-            v = float(ds['v10'].values[lat_idx, lon_idx])
-            gust = float(ds['gust'].values[lat_idx, lon_idx])
-            
-            return valid_time, u, v, gust
-            
-        except Exception as e:
-            logger.error(f"Error processing GRIB data: {str(e)}")
+    @staticmethod
+    def _calculate_wind(u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate wind speed and direction (degrees the wind blows from) from U and V components."""
+        speed = np.round(np.hypot(u, v), 2)
+        direction = np.round((270 - np.degrees(np.arctan2(v, u))) % 360, 2)
+        return speed, direction
+
+    def _run_start(self, model_run: ModelRun) -> datetime:
+        """Cycle start time of a model run in UTC."""
+        return datetime.combine(model_run.run_date, datetime.min.time(), tzinfo=timezone.utc) + timedelta(
+            hours=model_run.cycle_hour
+        )
+
+    def _max_hour(self, region_run: ModelRun, end_time: Optional[datetime]) -> Optional[int]:
+        """Last forecast hour needed to reach end_time."""
+        if end_time is None:
             return None
+        return int(np.ceil((end_time - self._run_start(region_run)).total_seconds() / 3600))
+
+    def _build_forecast_points(self, times: np.ndarray, values: np.ndarray) -> List[WindForecastPoint]:
+        """Convert (T, V) u/v/gust values to forecast points, dropping missing steps."""
+        values = values.astype(np.float64)  # Round in double precision for clean JSON output
+        u, v, gust = values[:, 0], values[:, 1], values[:, 2]
+        speed, direction = self._calculate_wind(u, v)
+        speed_mph = np.round(speed * UnitConversions.MS_TO_MPH, 2)
+        gust_mph = np.round(np.nan_to_num(gust) * UnitConversions.MS_TO_MPH, 2)
+        valid = ~np.isnan(speed)
+        
+        return [
+            WindForecastPoint(
+                time=pd.Timestamp(t).tz_localize("UTC").to_pydatetime(),
+                speed=float(s),
+                direction=float(d),
+                gust=float(g)
+            )
+            for t, s, d, g in zip(times[valid], speed_mph[valid], direction[valid], gust_mph[valid])
+        ]
+
+    def resident_bytes_by_tier(self) -> Dict[str, Dict[str, int]]:
+        """Resident bytes per region and tier."""
+        return {region: store.resident_bytes() for region, store in self._stores.items()}
     
-    async def get_station_wind_forecast(self, station_id: str, station: Station) -> WindForecastResponse:
-        """Get wind forecast for a station using regional data."""
+    async def get_station_wind_forecast(
+        self,
+        station_id: str,
+        station: Station,
+        end_time: Optional[datetime] = None
+    ) -> WindForecastResponse:
+        """Get wind forecast for a station using regional data.
+        
+        Args:
+            station_id: Station identifier
+            station: Station metadata
+            end_time: Last valid time needed; far-range hours past it are never loaded
+        """
         try:
             await self._ensure_initialized()
             
@@ -332,63 +538,112 @@ class GFSWindClient:
             lon = station.location.coordinates[0]
             region = self._get_region_for_station(lat, lon)
             
-            if region not in self._datasets:
+            # Hold one region snapshot so a concurrent swap can't mix model runs
+            store = self._stores.get(region)
+            if store is None or not len(store):
                 raise HTTPException(
                     status_code=503,
                     detail=f"No data available for region {region}"
                 )
             
-            forecasts: List[WindForecastPoint] = []
-            total_hours = 0
-            failed_hours = 0
+            region_run = self._region_runs.get(region, self.model_run)
+            max_hour = self._max_hour(region_run, end_time)
             
-            for hour in range(0, 385, 3):
-                try:
-                    if hour not in self._datasets[region]:
-                        logger.warning(f"Missing dataset for hour {hour}")
-                        failed_hours += 1
-                        continue
-                        
-                    ds = self._datasets[region][hour]
-                    wind_data = self._process_grib_data(ds, lat, lon)
-                    
-                    if wind_data:
-                        valid_time, u, v, gust = wind_data
-                        speed, direction = self._calculate_wind(u, v)
-                        
-                        # Ensure speed and gust are not None before conversion
-                        speed_mph = UnitConversions.ms_to_mph(speed) if speed is not None else 0.0
-                        gust_mph = UnitConversions.ms_to_mph(gust) if gust is not None else 0.0
-                        
-                        forecasts.append(WindForecastPoint(
-                            time=valid_time,
-                            speed=speed_mph,
-                            direction=direction,
-                            gust=gust_mph
-                        ))
-                        total_hours += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing hour {hour}: {str(e)}")
-                    failed_hours += 1
-                    continue
+            with span("gfs_wind.extract", region=region, max_hour=max_hour):
+                if store.points is not None:
+                    if not store.points.has_station(station_id):
+                        raise HTTPException(
+                            status_code=404,
+                            detail=f"Station {station_id} is not extracted in points mode"
+                        )
+                    times, values = store.points.series(station_id)
+                    if max_hour is not None:
+                        last_time = self._run_start(region_run).replace(tzinfo=None) + timedelta(hours=max_hour)
+                        keep = times <= np.datetime64(last_time, "ns")
+                        times, values = times[keep], values[keep]
+                else:
+                    times, values = await store.point_series(lat, lon, max_hour=max_hour)
+            
+            with span("gfs_wind.build_response", steps=len(times)):
+                forecasts = self._build_forecast_points(times, values)
+                
+                if not forecasts:
+                    raise HTTPException(
+                        status_code=503,
+                        detail=f"No forecast data available for region {region}."
+                    )
+                
+                return WindForecastResponse(
+                    station=station,
+                    model_run=f"{region_run.date_str}_{region_run.cycle_hour:02d}Z",
+                    forecasts=forecasts
+                )
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting wind forecast for station {station.station_id}: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error processing wind forecast: {str(e)}"
+            )
+
+    async def get_point_wind_forecast(
+        self,
+        lat: float,
+        lon: float,
+        end_time: Optional[datetime] = None
+    ) -> WindPointForecastResponse:
+        """Get a wind forecast bilinearly interpolated to any location in a region.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude (-180 to 180 or 0 to 360)
+            end_time: Last valid time needed; far-range hours past it are never loaded
+        """
+        try:
+            await self._ensure_initialized()
             
-            if not forecasts:
+            if settings.points_mode:
                 raise HTTPException(
                     status_code=503,
-                    detail=f"No forecast data available. Failed to process {failed_hours} forecast hours."
+                    detail="Point forecasts are unavailable in points mode"
                 )
             
-            return WindForecastResponse(
-                station=station,
-                model_run=f"{self.model_run.date_str}_{self.model_run.cycle_hour:02d}Z",
-                forecasts=forecasts
-            )
+            region = self._get_region_for_station(lat, lon)
+            store = self._stores.get(region)
+            if store is None or not len(store):
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"No data available for region {region}"
+                )
+            
+            region_run = self._region_runs.get(region, self.model_run)
+            max_hour = self._max_hour(region_run, end_time)
+            with span("gfs_wind.interpolate", region=region, max_hour=max_hour):
+                try:
+                    times, values = await store.interpolated_series(lat, lon, max_hour=max_hour)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+            
+            with span("gfs_wind.build_response", steps=len(times)):
+                forecasts = self._build_forecast_points(times, values)
+                if not forecasts:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No forecast data available at ({lat}, {lon})"
+                    )
+                
+                return WindPointForecastResponse(
+                    location=Location(type="Point", coordinates=[lon, lat]),
+                    model_run=f"{region_run.date_str}_{region_run.cycle_hour:02d}Z",
+                    forecasts=forecasts
+                )
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Error getting wind forecast for station {station.station_id}: {str(e)}")
+            logger.error(f"Error getting wind forecast at ({lat}, {lon}): {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error processing wind forecast: {str(e)}"
@@ -399,6 +654,7 @@ class GFSWindClient:
         try:
             async with aiohttp.ClientSession(
                 cookies={'osCsid': 'dummy'},
+                trace_configs=[upstream_trace_config()],
                 headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
             ) as session:
                 timeout = aiohttp.ClientTimeout(total=timeout_seconds)
@@ -415,6 +671,7 @@ class GFSWindClient:
         """Apply rate limiting using the shared rate limiter."""
         await self.rate_limiter.limit()
 
+    @traced("gfs_wind.download")
     async def _download_grib_file(
         self,
         url: str,
@@ -430,6 +687,7 @@ class GFSWindClient:
             
             async with aiohttp.ClientSession(
                 cookies={'osCsid': 'dummy'},
+                trace_configs=[upstream_trace_config()],
                 headers={
                     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                     'Accept': '*/*'
@@ -503,8 +761,11 @@ class GFSWindClient:
         # Track consecutive failures to detect patterns
         consecutive_failures = 0
         max_consecutive_failures = 5
+
+        # Hours handed to the retry queue, saved in one write after the loop
+        deferred: List[Tuple[int, Path, Optional[float]]] = []
         
-        for forecast_hour, file_path in missing_files:
+        for index, (forecast_hour, file_path) in enumerate(missing_files):
             # Skip forecast hours that are likely not available yet
             if not self.model_run:
                 continue
@@ -516,10 +777,11 @@ class GFSWindClient:
             
             if current_time < expected_time:
                 logger.info(
-                    f"⏳ Skipping forecast hour {forecast_hour}, not expected until "
+                    f"⏳ Deferring forecast hour {forecast_hour}, not expected until "
                     f"{expected_time.strftime('%H:%M:%S')} UTC "
                     f"(in {(expected_time - current_time).total_seconds() / 60:.1f} minutes)"
                 )
+                deferred.append((forecast_hour, file_path, expected_time.timestamp()))
                 skipped += 1
                 continue
                 
@@ -537,34 +799,31 @@ class GFSWindClient:
             else:
                 failed += 1
                 consecutive_failures += 1
+                if self.retry_queue is not None:
+                    self.retry_queue.add(region, forecast_hour, file_path, error="download failed")
                 
-                # If we've had too many consecutive failures, skip ahead to avoid wasting time
+                # Upstream is likely still publishing; hand the remaining hours to the retry queue
                 if consecutive_failures >= max_consecutive_failures:
-                    next_range_start = (forecast_hour // 24 + 1) * 24  # Skip to next day's worth of forecasts
+                    remaining = missing_files[index + 1:]
                     logger.warning(
                         f"⚠️ {consecutive_failures} consecutive failures detected. "
-                        f"Skipping ahead to forecast hour {next_range_start}"
+                        f"Queueing {len(remaining)} remaining forecast hours for background retry"
                     )
-                    
-                    # Find the next forecast hour to try
-                    next_files = [(h, p) for h, p in missing_files if h >= next_range_start]
-                    if next_files:
-                        # Skip to the next range
-                        forecast_hour, file_path = next_files[0]
-                        consecutive_failures = 0
-                    else:
-                        # No more files to try in higher ranges
-                        logger.warning("No more files to try in higher forecast ranges")
-                        break
+                    deferred.extend((queued_hour, queued_path, None) for queued_hour, queued_path in remaining)
+                    skipped += len(remaining)
+                    break
                 
             # Respect rate limit between downloads
             await self._rate_limit()
                 
+        if self.retry_queue is not None and deferred:
+            self.retry_queue.add_many(region, deferred)
+            
         logger.info(
             f"Download summary for {region}:\n"
             f"  - Downloaded: {downloaded}\n"
             f"  - Failed: {failed}\n"
-            f"  - Skipped (not yet available): {skipped}\n"
+            f"  - Deferred to retry queue: {skipped}\n"
             f"  - Total files needed: {len(missing_files)}"
         )
                 
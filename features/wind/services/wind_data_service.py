@@ -1,32 +1,71 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from fastapi import HTTPException
 from datetime import datetime, timedelta, timezone
 import asyncio
-from aiocache import cached, SimpleMemoryCache
 
 from features.wind.models.wind_types import (
-    WindForecastResponse
+    WindForecastPoint,
+    WindForecastResponse,
+    WindPointForecastResponse
 )
 from features.wind.services.gfs_wind_client import GFSWindClient
 from features.stations.services.station_service import StationService
 from features.common.services.model_run_service import ModelRun
 from features.common.services.cache_config import (
     MODEL_FORECAST_EXPIRE,
+    MODEL_FORECAST_HARD_EXPIRE,
+    feature_cache_class,
+    bump_generation,
     feature_cache_key_builder,
+    point_cache_key_builder,
     get_cache
 )
+from features.common.services.grid_interpolation import snap_coordinate
+from features.common.services.forecast_window import (
+    ForecastSeries,
+    ForecastWindow,
+    build_series,
+    resolve_window,
+    select_window
+)
+from features.common.services.swr_cache import cached_swr
+from features.common.services.tracing import traced
+from features.common.models.archive_types import ArchivedRunsResponse, RunDiffResponse
+from features.common.models.station_types import Station
+from features.common.services.forecast_archive import (
+    ArchiveDataset,
+    ForecastArchive,
+    archived_points,
+    format_run_id,
+    parse_run_id,
+    record_run,
+    resolve_diff_runs,
+    run_diff,
+    run_id_for,
+    run_start
+)
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
 class WindDataService:
+    # Default window for station and point forecasts
+    DEFAULT_FORECAST_DAYS = 7
+    # Station forecast fields kept for past model runs
+    ARCHIVE_VARIABLES = ("speed", "direction", "gust")
+
     def __init__(
         self, 
         gfs_client: GFSWindClient,
-        station_service: StationService
+        station_service: StationService,
+        archive: Optional[ForecastArchive] = None
     ):
         self.gfs_client = gfs_client
         self.station_service = station_service
+        self.archive: Optional[ArchiveDataset] = (
+            archive.dataset("wind", self.ARCHIVE_VARIABLES, circular=("direction",)) if archive else None
+        )
         self._initialization_lock = asyncio.Lock()
         self._is_initialized = False
         self._cache = get_cache()
@@ -52,22 +91,164 @@ class WindDataService:
         self.gfs_client.update_model_run(model_run)
         self._is_initialized = False
         
-        # For now, just clear the entire cache on model run update
-        # This is safe because we're using SimpleMemoryCache
-        await self._cache.delete("wind_forecast:*")
-        logger.info("🗑️ Cleared wind forecast cache for new model run")
+        # Keys carry the model run generation, so bumping it invalidates every cached forecast
+        bump_generation(model_run)
         
         await self.initialize()
 
-    @cached(
-        ttl=MODEL_FORECAST_EXPIRE,
+    def _series_end_time(self, extended: bool) -> Optional[datetime]:
+        """Last valid time a cached series must cover.
+
+        Standard series reach the default window plus the hard TTL, so any
+        default-length window requested while the entry lives is covered
+        without loading far-range hours; extended series cover the whole run.
+        """
+        if extended:
+            return None
+        return datetime.now(timezone.utc) + timedelta(days=self.DEFAULT_FORECAST_DAYS, seconds=MODEL_FORECAST_HARD_EXPIRE)
+
+    def _is_extended(self, window: ForecastWindow) -> bool:
+        return window.end > datetime.now(timezone.utc) + timedelta(days=self.DEFAULT_FORECAST_DAYS)
+
+    @traced("wind.point_forecast")
+    async def get_point_forecast(
+        self,
+        lat: float,
+        lon: float,
+        window: Optional[ForecastWindow] = None
+    ) -> WindPointForecastResponse:
+        """Get wind forecast for any location, interpolated from the regional grid.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            window: Time range and step; defaults to 7 days at 3-hour steps
+        """
+        window = window or resolve_window(default_days=self.DEFAULT_FORECAST_DAYS)
+        step = settings.point_forecast_snap_degrees
+        series = await self._get_snapped_point_series(
+            snap_coordinate(lat, step),
+            snap_coordinate(lon, step),
+            self._is_extended(window)
+        )
+        return select_window(series, window)
+
+    @cached_swr(
+        soft_ttl=MODEL_FORECAST_EXPIRE,
+        ttl=MODEL_FORECAST_HARD_EXPIRE,
+        key_builder=point_cache_key_builder,
+        namespace="wind_point_forecast",
+        cache=feature_cache_class(),
+        noself=True
+    )
+    @traced("wind.point_series")
+    async def _get_snapped_point_series(self, lat: float, lon: float, extended: bool) -> ForecastSeries:
+        """Interpolated wind forecast at snapped coordinates over the cached range."""
+        if not self._is_initialized:
+            await self.initialize()
+            
+        forecast = await self.gfs_client.get_point_wind_forecast(
+            lat, lon, end_time=self._series_end_time(extended)
+        )
+        return build_series(forecast)
+
+    def _current_run_id(self) -> Optional[str]:
+        model_run = self.gfs_client.model_run
+        return run_id_for(model_run) if model_run else None
+
+    def _require_archive(self) -> ArchiveDataset:
+        if self.archive is None:
+            raise HTTPException(status_code=404, detail="Model run archive is disabled")
+        return self.archive
+
+    async def archive_run(self, model_run: ModelRun, stations: List[Station]) -> int:
+        """Record every station's forecast of the served model run.
+
+        Returns:
+            int: Rows written (0 if disabled or already archived)
+        """
+        if self.archive is None:
+            return 0
+        run_id = run_id_for(model_run)
+        end_time = run_start(run_id) + timedelta(hours=settings.archive.max_lead_hours)
+
+        async def fetch(station: Station):
+            forecast = await self.gfs_client.get_station_wind_forecast(station.station_id, station, end_time=end_time)
+            # Regions still on an older run after a partial swap are left out
+            return forecast.forecasts if forecast.model_run == format_run_id(run_id) else None
+
+        return await record_run(self.archive, run_id, stations, fetch, settings.archive.max_lead_hours, "wind")
+
+    def get_archived_runs(self) -> ArchivedRunsResponse:
+        """Model runs available through ``model_run`` and run diffs."""
+        current = self._current_run_id()
+        return ArchivedRunsResponse(
+            current_run=format_run_id(current) if current else None,
+            runs=[format_run_id(run_id) for run_id in self._require_archive().runs()]
+        )
+
+    def get_run_diff(
+        self,
+        station_id: str,
+        model_run: Optional[str] = None,
+        base_run: Optional[str] = None
+    ) -> RunDiffResponse:
+        """Change in a station's wind forecast between two model runs.
+        
+        Args:
+            station_id: Station identifier
+            model_run: Run to compare; defaults to the current run
+            base_run: Run to compare against; defaults to the archived run before ``model_run``
+        """
+        archive = self._require_archive()
+        self.station_service.get_station(station_id)
+        run_id, base_run_id = resolve_diff_runs(archive, model_run, base_run, self._current_run_id())
+        return run_diff(archive, station_id, run_id, base_run_id)
+
+    def _get_archived_forecast(self, station_id: str, run_id: str, window: ForecastWindow) -> WindForecastResponse:
+        """Station forecast from an archived model run."""
+        archive = self._require_archive()
+        station = self.station_service.get_station(station_id)
+        response = WindForecastResponse(
+            station=station,
+            model_run=format_run_id(run_id),
+            forecasts=archived_points(archive, run_id, station_id, WindForecastPoint)
+        )
+        return select_window(build_series(response), window)
+
+    @traced("wind.station_forecast")
+    async def get_station_forecast(
+        self,
+        station_id: str,
+        window: Optional[ForecastWindow] = None,
+        model_run: Optional[str] = None
+    ) -> WindForecastResponse:
+        """Get wind model forecast for a specific station.
+        
+        Args:
+            station_id: Station identifier
+            window: Time range and step; defaults to 7 days at 3-hour steps
+            model_run: Earlier model run to serve from the archive (e.g. 20250218_06Z)
+        """
+        window = window or resolve_window(default_days=self.DEFAULT_FORECAST_DAYS)
+        if model_run:
+            run_id = parse_run_id(model_run)
+            if run_id != self._current_run_id():
+                return self._get_archived_forecast(station_id, run_id, window)
+        series = await self._get_station_series(station_id, self._is_extended(window))
+        return select_window(series, window)
+
+    @cached_swr(
+        soft_ttl=MODEL_FORECAST_EXPIRE,
+        ttl=MODEL_FORECAST_HARD_EXPIRE,
         key_builder=feature_cache_key_builder,
         namespace="wind_forecast",
-        cache=SimpleMemoryCache,
+        cache=feature_cache_class(),
         noself=True
     )
-    async def get_station_forecast(self, station_id: str) -> WindForecastResponse:
-        """Get wind model forecast for a specific station."""
+    @traced("wind.station_series")
+    async def _get_station_series(self, station_id: str, extended: bool) -> ForecastSeries:
+        """Wind model forecast for a station over the cached range."""
         try:
             if not self._is_initialized:
                 await self.initialize()
@@ -80,8 +261,10 @@ class WindDataService:
                 )
                 
             try:
-                # Get forecast from GFS wind service
-                forecast = await self.gfs_client.get_station_wind_forecast(station_id, station)
+                # Far-range hours past the cached range stay unloaded
+                forecast = await self.gfs_client.get_station_wind_forecast(
+                    station_id, station, end_time=self._series_end_time(extended)
+                )
                 
                 if not forecast.forecasts:
                     logger.warning(f"No forecast data available for station {station_id}")
@@ -90,41 +273,22 @@ class WindDataService:
                         detail=f"No forecast data available for station {station_id}"
                     )
                 
-                # Set time range for exactly 7 days
-                now = datetime.now(timezone.utc)
-                end_time = now + timedelta(days=7)
-                
-                # Round current time down to nearest 3-hour interval
-                now = now.replace(minute=0, second=0, microsecond=0)
-                now = now.replace(hour=(now.hour // 3) * 3)
-                
-                # Filter forecasts to 7-day range and 3-hour intervals
-                filtered_forecasts = []
-                for point in forecast.forecasts:
-                    point_hour = point.time.replace(minute=0, second=0, microsecond=0)
-                    if (point_hour >= now and 
-                        point_hour <= end_time and 
-                        point_hour.hour % 3 == 0):
-                        filtered_forecasts.append(point)
-                
-                # Sort forecasts by time to ensure order
-                filtered_forecasts.sort(key=lambda x: x.time)
-                
                 response = WindForecastResponse(
                     station=station,
-                    forecasts=filtered_forecasts,
+                    forecasts=forecast.forecasts,
                     model_run=forecast.model_run
                 )
                 
                 # Log cache key for debugging
                 cache_key = feature_cache_key_builder(
-                    self.get_station_forecast,
-                    namespace="wind_forecast",
-                    station_id=station_id
+                    self._get_station_series,
+                    "wind_forecast",
+                    station_id,
+                    extended
                 )
                 logger.info(f"Caching forecast for station {station_id} with key {cache_key}")
                 
-                return response
+                return build_series(response)
                 
             except Exception as e:
                 logger.error(f"Error getting GFS forecast for station {station_id}: {str(e)}")
@@ -137,4 +301,4 @@ class WindDataService:
             raise
         except Exception as e:
             logger.error(f"Error in get_station_forecast for station {station_id}: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e)) 
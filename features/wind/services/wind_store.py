@@ -0,0 +1,304 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import xarray as xr
+
+from features.common.services.metrics import GRIB_DECODE_SECONDS
+from features.common.services.tracing import traced
+from features.common.services.point_store import StationPointStore
+from features.common.services.single_flight import SingleFlight
+from features.common.services.grid_interpolation import bilinear_weights, interpolate_corners
+
+logger = logging.getLogger(__name__)
+
+# Variables kept per forecast hour, in array order
+WIND_VARIABLES = ("u10", "v10", "gust")
+
+class HotTier(NamedTuple):
+    """Resident forecast hours stacked into one array."""
+    hours: np.ndarray   # (T,) forecast hours
+    times: np.ndarray   # (T,) datetime64[ns] valid times
+    values: np.ndarray  # (T, V, lat, lon) float32
+
+def empty_hot_tier() -> HotTier:
+    return HotTier(
+        hours=np.empty(0, dtype=np.int32),
+        times=np.empty(0, dtype="datetime64[ns]"),
+        values=np.empty((0, len(WIND_VARIABLES), 0, 0), dtype=np.float32)
+    )
+
+def open_wind_grib(file_path: Path) -> xr.Dataset:
+    """Open a single forecast hour GRIB file."""
+    return xr.open_dataset(
+        file_path,
+        engine='cfgrib',
+        decode_timedelta=False,
+        backend_kwargs={'indexpath': ''}
+    )
+
+@traced("gfs_wind.decode_hour")
+@GRIB_DECODE_SECONDS.timed("wind")
+def decode_wind_hour(
+    file_path: Path,
+    opener: Callable[[Path], xr.Dataset] = open_wind_grib
+) -> Tuple[np.datetime64, np.ndarray, np.ndarray, np.ndarray]:
+    """Decode one forecast hour into compact arrays and close the file.
+
+    Returns:
+        Tuple of (valid time, latitude, longitude, values with shape (V, lat, lon))
+    """
+    ds = opener(file_path)
+    try:
+        valid_time = np.datetime64(ds.valid_time.values, "ns")
+        values = np.stack([ds[var].values.astype(np.float32) for var in WIND_VARIABLES])
+        return valid_time, ds.latitude.values, ds.longitude.values, values
+    finally:
+        ds.close()
+
+# Cold-tier decodes in flight, keyed by GRIB path, shared by every region store
+_cold_decodes = SingleFlight("wind_cold_decode")
+
+class WindRegionStore:
+    """Wind forecast hours for one region, tiered by lead time.
+
+    Hours up to ``hot_horizon_hours`` are decoded once into a single
+    float32 array and stay resident. Later hours are only registered by
+    path and decoded on demand into an LRU bounded by ``cold_max_bytes``.
+
+    In points mode every hour is decoded straight into a
+    ``StationPointStore`` and the grid is dropped, so neither tier is used.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        hot_horizon_hours: int,
+        cold_max_bytes: int,
+        opener: Callable[[Path], xr.Dataset] = open_wind_grib,
+        points: Optional[StationPointStore] = None
+    ):
+        self.region = region
+        self.points = points
+        self.hot_horizon_hours = hot_horizon_hours
+        self.cold_max_bytes = cold_max_bytes
+        self._opener = opener
+        self.latitude: Optional[np.ndarray] = None
+        self.longitude: Optional[np.ndarray] = None
+        self._hot = empty_hot_tier()
+        self._cold_paths: Dict[int, Path] = {}
+        self._cold_cache: "OrderedDict[int, Tuple[np.datetime64, np.ndarray]]" = OrderedDict()
+        self._cold_bytes = 0
+        self._point_hours: set = set()
+
+    def __len__(self) -> int:
+        return len(self._hot.hours) + len(self._cold_paths) + len(self._point_hours)
+
+    @property
+    def hours(self) -> List[int]:
+        """All forecast hours available in either tier."""
+        return sorted(set(self._hot.hours.tolist()) | set(self._cold_paths) | self._point_hours)
+
+    def _set_grid(self, latitude: np.ndarray, longitude: np.ndarray):
+        if self.latitude is None:
+            self.latitude = latitude
+            self.longitude = longitude
+
+    async def add_hours(self, files: Iterable[Tuple[int, Path]]) -> int:
+        """Add forecast hours, decoding near-term hours into the hot tier.
+
+        Decoding runs in worker threads; the store itself is only changed on
+        the event loop, so readers never see a half-merged tier.
+
+        Returns:
+            int: Number of hours added
+        """
+        decoded: Dict[int, Tuple[np.datetime64, np.ndarray]] = {}
+        added = 0
+        for forecast_hour, file_path in files:
+            if self.points is not None:
+                try:
+                    valid_time, latitude, longitude, values = await asyncio.to_thread(
+                        decode_wind_hour, file_path, self._opener
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Error loading wind file {file_path}: {str(e)}")
+                    continue
+                self.points.add_hour(valid_time, latitude, longitude, values)
+                self._point_hours.add(forecast_hour)
+                added += 1
+                continue
+            if forecast_hour > self.hot_horizon_hours:
+                self._cold_paths[forecast_hour] = file_path
+                added += 1
+                continue
+            try:
+                valid_time, latitude, longitude, values = await asyncio.to_thread(
+                    decode_wind_hour, file_path, self._opener
+                )
+            except Exception as e:
+                logger.error(f"❌ Error loading wind file {file_path}: {str(e)}")
+                continue
+            self._set_grid(latitude, longitude)
+            decoded[forecast_hour] = (valid_time, values)
+            added += 1
+
+        if decoded:
+            self._merge_hot(decoded)
+        return added
+
+    def _merge_hot(self, decoded: Dict[int, Tuple[np.datetime64, np.ndarray]]):
+        """Merge decoded hours into the hot array, replacing it in one assignment."""
+        hot = self._hot
+        merged = {int(h): (t, v) for h, t, v in zip(hot.hours, hot.times, hot.values)}
+        merged.update(decoded)
+        hours = sorted(merged)
+        self._hot = HotTier(
+            hours=np.array(hours, dtype=np.int32),
+            times=np.array([merged[h][0] for h in hours], dtype="datetime64[ns]"),
+            values=np.stack([merged[h][1] for h in hours])
+        )
+
+    async def _load_cold(self, forecast_hour: int) -> Optional[Tuple[np.datetime64, np.ndarray]]:
+        """Get a far-range hour from the LRU, decoding it in a worker thread on a miss.
+
+        Concurrent misses for the same file share one decode.
+        """
+        cached = self._cold_cache.get(forecast_hour)
+        if cached is not None:
+            self._cold_cache.move_to_end(forecast_hour)
+            return cached
+
+        file_path = self._cold_paths.get(forecast_hour)
+        if file_path is None:
+            return None
+        try:
+            valid_time, latitude, longitude, values = await _cold_decodes.do(
+                str(file_path),
+                lambda: asyncio.to_thread(decode_wind_hour, file_path, self._opener)
+            )
+        except Exception as e:
+            logger.error(f"❌ Error loading wind file {file_path}: {str(e)}")
+            return None
+
+        if self._cold_paths.get(forecast_hour) != file_path:
+            # Closed or reloaded while decoding; serve the values without caching them
+            return valid_time, values
+        if forecast_hour in self._cold_cache:
+            return self._cold_cache[forecast_hour]
+        self._set_grid(latitude, longitude)
+        self._cold_cache[forecast_hour] = (valid_time, values)
+        self._cold_bytes += values.nbytes
+        while self._cold_bytes > self.cold_max_bytes and len(self._cold_cache) > 1:
+            _, (_, evicted) = self._cold_cache.popitem(last=False)
+            self._cold_bytes -= evicted.nbytes
+        return valid_time, values
+
+    def nearest_index(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Nearest grid cell for a location (longitude in either convention)."""
+        query_lon = lon % 360 if self.longitude.max() > 180 else lon
+        lat_idx = int(np.abs(self.latitude - lat).argmin())
+        lon_idx = int(np.abs(self.longitude - query_lon).argmin())
+        return lat_idx, lon_idx
+
+    async def _ensure_grid(self) -> bool:
+        """Make sure grid coordinates are known, decoding a cold hour if needed."""
+        if self.latitude is None and self._cold_paths:
+            await self._load_cold(min(self._cold_paths))
+        return self.latitude is not None
+
+    async def _cell_series(
+        self,
+        lat_idx: np.ndarray,
+        lon_idx: np.ndarray,
+        max_hour: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Values of a few grid cells across both tiers.
+
+        Returns:
+            Tuple of (valid times (T,), values (T, V, K) for the K cells)
+        """
+        hot = self._hot
+        keep = hot.hours <= max_hour if max_hour is not None else slice(None)
+        times = [hot.times[keep]]
+        if len(hot.hours):
+            values = [hot.values[:, :, lat_idx, lon_idx][keep]]
+        else:
+            # The empty hot tier has no grid to index yet
+            values = [np.empty((0, len(WIND_VARIABLES), len(lat_idx)), dtype=np.float32)]
+
+        for forecast_hour in sorted(self._cold_paths):
+            if max_hour is not None and forecast_hour > max_hour:
+                break
+            loaded = await self._load_cold(forecast_hour)
+            if loaded is None:
+                continue
+            valid_time, hour_values = loaded
+            times.append(np.array([valid_time], dtype="datetime64[ns]"))
+            values.append(hour_values[np.newaxis, :, lat_idx, lon_idx])
+
+        return np.concatenate(times), np.concatenate(values)
+
+    async def point_series(
+        self,
+        lat: float,
+        lon: float,
+        max_hour: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Time series at the nearest grid cell.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            max_hour: Last forecast hour to include; cold hours beyond it are never loaded
+
+        Returns:
+            Tuple of (valid times (T,), values (T, V))
+        """
+        if not await self._ensure_grid():
+            return np.empty(0, dtype="datetime64[ns]"), np.empty((0, len(WIND_VARIABLES)), dtype=np.float32)
+
+        lat_idx, lon_idx = self.nearest_index(lat, lon)
+        times, values = await self._cell_series(np.array([lat_idx]), np.array([lon_idx]), max_hour)
+        return times, values[:, :, 0]
+
+    async def interpolated_series(
+        self,
+        lat: float,
+        lon: float,
+        max_hour: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Bilinearly interpolated time series at an arbitrary location.
+
+        Raises:
+            ValueError: If the location is outside the region grid
+
+        Returns:
+            Tuple of (valid times (T,), float64 values (T, V))
+        """
+        if not await self._ensure_grid():
+            return np.empty(0, dtype="datetime64[ns]"), np.empty((0, len(WIND_VARIABLES)))
+
+        lat_idx, lon_idx, weights = bilinear_weights(self.latitude, self.longitude, lat, lon)
+        times, corners = await self._cell_series(lat_idx, lon_idx, max_hour)
+        return times, interpolate_corners(corners, weights)
+
+    def resident_bytes(self) -> Dict[str, int]:
+        """Resident bytes per tier."""
+        tiers = {"hot": int(self._hot.values.nbytes), "cold": int(self._cold_bytes)}
+        if self.points is not None:
+            tiers["points"] = self.points.resident_bytes()
+        return tiers
+
+    def close(self):
+        """Drop all resident arrays."""
+        self._hot = empty_hot_tier()
+        self._cold_cache.clear()
+        self._cold_bytes = 0
+        self._cold_paths.clear()
+        self._point_hours.clear()
+        if self.points is not None:
+            self.points.clear()
@@ -1,11 +1,12 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from pathlib import Path
 import os
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import asyncio
+import time
 from typing import Dict, Optional
 
 from core.config import settings
@@ -26,13 +27,31 @@ from features.waves.services.wave_data_service_v2 import WaveDataServiceV2
 from features.waves.services.ndbc_buoy_client import NDBCBuoyClient
 from features.stations.services.station_service import StationService
 from features.stations.services.condition_summary_service import ConditionSummaryService
+from features.stations.services.verification_service import VerificationService
+from features.stations.services.nowcast_service import NowcastService
 from features.wind.services.wind_data_service import WindDataService
 from features.wind.services.gfs_wind_client import GFSWindClient
 from features.common.services.model_run_service import ModelRunService
+from features.common.services.model_run_swap import ModelRunSwapController
+from features.common.services.cache_config import bump_generation
+from features.common.services.tiered_cache import close_redis_link
+from features.common.services.single_flight import single_flight_stats
+from features.common.services.forecast_archive import ForecastArchive
+from features.common.services.metrics import (
+    CONTENT_TYPE,
+    HTTP_REQUEST_SECONDS,
+    MODEL_RUN_AGE_SECONDS,
+    MODEL_RUN_INFO,
+    RESIDENT_BYTES,
+    add_collector,
+    render_metrics
+)
+from features.common.services.tracing import configure_tracing, shutdown_tracing, span, traced
 from features.tides.services.tide_service import TideService
 from features.common.model_run import ModelRun
 
 setup_logging()
+configure_tracing()
 logger = logging.getLogger(__name__)
 
 class ModelRunState:
@@ -43,21 +62,47 @@ class ModelRunState:
         self.gfs_wave_client_v2 = None
         self.gfs_wind_client = None
         
-    async def initialize(self, model_run: ModelRun):
-        """Initialize clients with model run."""
+    @traced("model_run_state.initialize")
+    async def initialize(self, model_run: ModelRun, load_wind: bool = True):
+        """Initialize clients with model run.
+        
+        Args:
+            model_run: Model run to load
+            load_wind: Load wind regions now; the swap controller loads them
+                one region at a time when memory is tight
+        """
         self.current_model_run = model_run
         self.gfs_client = NOAAGFSClient(model_run=model_run)
         self.gfs_wave_client_v2 = GFSWaveClient(model_run=model_run)
         self.gfs_wind_client = GFSWindClient(model_run=model_run)
         
+        # Bulletins for the v1 wave route load in the background
+        station_ids = [station.station_id for station in StationService().get_all_stations()]
+        self.gfs_client.start_prefetch(station_ids)
+        
         # Initialize wave and wind data
         await self.gfs_wave_client_v2.initialize()
-        await self.gfs_wind_client.initialize()
+        if load_wind:
+            await self.gfs_wind_client.initialize()
+        
+    def cleanup_old_files(self):
+        """Apply disk retention for the wave and wind GRIB stores."""
+        if not self.current_model_run:
+            return
+        for client in (self.gfs_wave_client_v2, self.gfs_wind_client):
+            if client:
+                client.file_storage.cleanup_old_files(self.current_model_run)
         
+    @traced("model_run_state.cleanup")
     async def cleanup(self):
-        """Cleanup clients."""
+        """Cleanup clients, closing sessions and every open dataset."""
+        if self.gfs_client:
+            await self.gfs_client.close()
         if self.gfs_wave_client_v2:
             await self.gfs_wave_client_v2.close()
+            self.gfs_wave_client_v2.release_arrays()
+        if self.gfs_wind_client:
+            await self.gfs_wind_client.close()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -75,19 +120,27 @@ async def lifespan(app: FastAPI):
         if not current_model_run:
             logger.error("❌ Failed to get initial model run")
             raise Exception("Failed to get initial model run")
+        
+        # Cache keys are tagged with the served model run
+        bump_generation(current_model_run)
             
         # Initialize active model run state
         active_state = ModelRunState()
         await active_state.initialize(current_model_run)
+        active_state.cleanup_old_files()
         
         # Store services in app state
         app.state.model_run_service = model_run_service
         app.state.active_state = active_state
-        app.state.prefetch_state = None  # Will hold prefetched state
             
         # Initialize services
         station_service = StationService()
         buoy_client = NDBCBuoyClient()
+        archive = (
+            ForecastArchive(settings.archive.directory, settings.archive.retention_days)
+            if settings.archive.enabled else None
+        )
+        app.state.archive = archive
         
         # Ensure clients are initialized before creating services
         if not active_state.gfs_client or not active_state.gfs_wave_client_v2 or not active_state.gfs_wind_client:
@@ -105,48 +158,71 @@ async def lifespan(app: FastAPI):
         app.state.wave_service_v2 = WaveDataServiceV2(
             gfs_client=active_state.gfs_wave_client_v2,
             buoy_client=buoy_client,
-            station_service=station_service
+            station_service=station_service,
+            archive=archive
         )
         app.state.wind_service = WindDataService(
             gfs_client=active_state.gfs_wind_client,
-            station_service=station_service
+            station_service=station_service,
+            archive=archive
         )
+        # Current conditions are corrected toward the latest buoy observations
+        nowcast_service = None
+        app.state.nowcast_task = None
+        if settings.nowcast.enabled:
+            nowcast_service = NowcastService(
+                wind_service=app.state.wind_service,
+                wave_service=app.state.wave_service_v2,
+                station_service=station_service,
+                buoy_client=buoy_client
+            )
+            app.state.nowcast_task = asyncio.create_task(nowcast_service.run_periodically())
+        app.state.nowcast_service = nowcast_service
         app.state.condition_summary_service = ConditionSummaryService(
             wind_service=app.state.wind_service,
             wave_service=app.state.wave_service_v2,
-            station_service=station_service
+            station_service=station_service,
+            nowcast=nowcast_service
         )
         
-        async def prefetch_new_model_run(new_model_run: ModelRun):
-            """Prefetch data for new model run in background."""
-            try:
-                logger.info(f"🔄 Prefetching data for new model run {new_model_run.date_str} {new_model_run.cycle_hour:02d}Z")
-                new_state = ModelRunState()
-                await new_state.initialize(new_model_run)
-                return new_state
-            except Exception as e:
-                logger.error(f"❌ Error prefetching new model run: {str(e)}")
-                return None
-                
-        async def switch_model_run(new_state: ModelRunState):
-            """Switch to new model run state."""
+        # Scores archived forecasts against buoy observations on a schedule
+        app.state.verification_service = None
+        app.state.verification_task = None
+        if archive is not None and settings.verification.enabled:
+            app.state.verification_service = VerificationService(
+                station_service=station_service,
+                buoy_client=buoy_client,
+                archives={
+                    "wind": app.state.wind_service.archive,
+                    "wave": app.state.wave_service_v2.archive
+                }
+            )
+            app.state.verification_task = asyncio.create_task(
+                app.state.verification_service.run_periodically()
+            )
+        
+        # Swaps in new model runs without downtime
+        swap_controller = ModelRunSwapController(app.state, state_factory=ModelRunState)
+        app.state.swap_controller = swap_controller
+        app.state.swap_task = None
+        
+        async def archive_model_run(model_run: ModelRun):
+            """Record the served run's station forecasts and apply archive retention."""
+            if archive is None:
+                return
             try:
-                old_state = app.state.active_state
-                
-                # Update services with new clients
-                app.state.wave_service.gfs_client = new_state.gfs_client
-                app.state.wave_service_v2.gfs_client = new_state.gfs_wave_client_v2
-                app.state.wind_service.gfs_client = new_state.gfs_wind_client
-                
-                # Switch active state
-                app.state.active_state = new_state
-                
-                # Cleanup old state
-                await old_state.cleanup()
-                logger.info("✅ Successfully switched to new model run")
-                
+                stations = station_service.get_all_stations()
+                await app.state.wind_service.archive_run(model_run, stations)
+                await app.state.wave_service_v2.archive_run(model_run, stations)
+                await asyncio.to_thread(archive.prune)
             except Exception as e:
-                logger.error(f"❌ Error switching model run: {str(e)}")
+                logger.error(f"❌ Error archiving model run: {str(e)}")
+        
+        async def swap_and_archive(new_model_run: ModelRun):
+            if await swap_controller.swap(new_model_run):
+                await archive_model_run(new_model_run)
+        
+        app.state.archive_task = asyncio.create_task(archive_model_run(current_model_run))
         
         # Task to check for new model runs
         async def check_model_runs():
@@ -157,15 +233,10 @@ async def lifespan(app: FastAPI):
                     
                     # Use the simplified comparison method
                     if new_model_run and model_run_service.is_newer_run(new_model_run, current_run):
-                        # Start prefetching if not already in progress
-                        if not app.state.prefetch_state:
-                            logger.info("🔄 New model run detected, starting prefetch...")
-                            app.state.prefetch_state = await prefetch_new_model_run(new_model_run)
-                            
-                            if app.state.prefetch_state:
-                                # Switch to new model run
-                                await switch_model_run(app.state.prefetch_state)
-                                app.state.prefetch_state = None
+                        # Swap in the background so checks keep running during a long prefetch
+                        if not swap_controller.is_swapping:
+                            logger.info("🔄 New model run detected, starting swap...")
+                            app.state.swap_task = asyncio.create_task(swap_and_archive(new_model_run))
                                 
                 except Exception as e:
                     logger.error(f"❌ Error checking for new model run: {str(e)}")
@@ -185,20 +256,25 @@ async def lifespan(app: FastAPI):
     finally:
         logger.info("\n🔄 Shutting down API...")
         # Cancel all background tasks
-        if hasattr(app.state, "model_run_task"):
-            app.state.model_run_task.cancel()
-            try:
-                await app.state.model_run_task
-            except asyncio.CancelledError:
-                pass
+        for task_name in ("model_run_task", "swap_task", "archive_task", "verification_task", "nowcast_task"):
+            task = getattr(app.state, task_name, None)
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
             
         # Cleanup active state
         if hasattr(app.state, "active_state"):
             await app.state.active_state.cleanup()
             
-        # Cleanup prefetch state if exists
-        if hasattr(app.state, "prefetch_state") and app.state.prefetch_state:
-            await app.state.prefetch_state.cleanup()
+        # Cleanup a partially built model run if a swap was interrupted
+        if hasattr(app.state, "swap_controller"):
+            await app.state.swap_controller.close()
+            
+        await close_redis_link()
+        shutdown_tracing()
             
         logger.info("👋 API shutdown complete")
 
@@ -220,6 +296,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Observe request latency by route template (not raw path, to bound label values)."""
+    if not settings.metrics_enabled:
+        return await call_next(request)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status)
+        )
+
+@app.middleware("http")
+async def track_model_run_generation(request: Request, call_next):
+    """Count in-flight requests per model run generation so swaps can drain them."""
+    swap_controller = getattr(request.app.state, "swap_controller", None)
+    if swap_controller is None:
+        return await call_next(request)
+    with swap_controller.track_request():
+        return await call_next(request)
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span of each request; service, decode and serialization spans nest under it."""
+    with span("http.request", method=request.method, path=request.url.path) as request_span:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        request_span.set_attribute("route", route.path if route is not None else "unmatched")
+        request_span.set_attribute("status", response.status_code)
+        return response
+
 # Include feature routers
 app.include_router(wave_router)
 app.include_router(wave_router_v2)
@@ -227,12 +342,51 @@ app.include_router(tide_router)
 app.include_router(wind_router)
 app.include_router(station_router)
 
+def collect_state_metrics():
+    """Refresh model run and resident memory gauges from the served state."""
+    active_state = getattr(app.state, "active_state", None)
+    model_run = active_state.current_model_run if active_state else None
+    if model_run is None:
+        return
+    cycle_time = datetime.combine(model_run.run_date, datetime.min.time(), tzinfo=timezone.utc) + timedelta(
+        hours=model_run.cycle_hour
+    )
+    MODEL_RUN_AGE_SECONDS.set((datetime.now(timezone.utc) - cycle_time).total_seconds())
+    MODEL_RUN_INFO.clear()
+    MODEL_RUN_INFO.set(1, f"{model_run.date_str}_{model_run.cycle_hour:02d}z")
+
+    RESIDENT_BYTES.clear()
+    if active_state.gfs_wave_client_v2:
+        for region, nbytes in active_state.gfs_wave_client_v2.resident_bytes().items():
+            RESIDENT_BYTES.set(nbytes, "wave", region, "points" if settings.points_mode else "hot")
+    if active_state.gfs_wind_client:
+        for region, tiers in active_state.gfs_wind_client.resident_bytes_by_tier().items():
+            for tier, nbytes in tiers.items():
+                RESIDENT_BYTES.set(nbytes, "wind", region, tier)
+
+add_collector(collect_state_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    active_state = getattr(app.state, "active_state", None)
+    wind_client = active_state.gfs_wind_client if active_state else None
+    wave_client = active_state.gfs_wave_client_v2 if active_state else None
     return {
         "status": "healthy",
-        "time": datetime.now().isoformat()
+        "time": datetime.now().isoformat(),
+        "points_mode": settings.points_mode,
+        "wind_resident_bytes": wind_client.resident_bytes_by_tier() if wind_client else {},
+        "wave_resident_bytes": wave_client.resident_bytes() if wave_client else {},
+        "single_flight": single_flight_stats(),
+        "archive": app.state.archive.stats() if getattr(app.state, "archive", None) else {}
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""Benchmark the columnar GFS wave bulletin parser against the line-by-line parser.
+
+Usage:
+    python scripts/benchmark_bulletin_parser.py [BULLETIN ...] [--cycle 20250219_06] [--repeat 50]
+    python scripts/benchmark_bulletin_parser.py --download fixtures/ --stations 41001 44098
+
+Bulletins are GFS wave station files (gfswave.<station>.bull). With
+--download the current cycle's bulletins are saved to the given directory
+and benchmarked. Without files a bulletin in the NOMADS layout is generated.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_fixtures import generate_bulletin
+from features.waves.services.bulletin_parser import parse_bulletin
+from features.waves.services.noaa_gfs_client import parse_bulletin_lines, unpack_series
+
+async def download(directory: Path, stations: List[str]) -> List[Path]:
+    """Save the latest available cycle's bulletins for the stations."""
+    from features.common.services.model_run_service import ModelRunService
+    from features.waves.services.noaa_gfs_client import NOAAGFSClient
+
+    model_run = await ModelRunService().get_latest_available_cycle()
+    client = NOAAGFSClient(model_run=model_run)
+    date, hour = model_run.run_date.strftime("%Y%m%d"), f"{model_run.cycle_hour:02d}"
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    try:
+        for station_id in stations:
+            text = await client._get_station_bulletin(station_id, date, hour)
+            if text:
+                path = directory / f"gfswave.{station_id}.{date}_{hour}.bull"
+                path.write_text(text)
+                paths.append(path)
+                print(f"Saved {path}")
+    finally:
+        await client.close()
+    return paths
+
+def time_it(fn: Callable[[], object], repeat: int) -> float:
+    """Best per-call time in milliseconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def compare(text: str, cycle_dt: datetime) -> Tuple[int, int]:
+    """Number of points and of points that differ between the two parsers."""
+    legacy = sorted(parse_bulletin_lines(text, cycle_dt), key=lambda x: x.timestamp)
+    columnar = unpack_series(parse_bulletin(text, cycle_dt))
+    mismatches = abs(len(legacy) - len(columnar)) + sum(
+        a.model_dump() != b.model_dump() for a, b in zip(legacy, columnar)
+    )
+    return len(columnar), mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bulletins", nargs="*", type=Path, help="Bulletin files to parse")
+    parser.add_argument("--cycle", help="Cycle as YYYYMMDD_HH (default: from the file name or now)")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per parser (best is reported)")
+    parser.add_argument("--download", type=Path, help="Download bulletins into this directory first")
+    parser.add_argument("--stations", nargs="+", default=["41001", "44098", "46042"], help="Stations to download")
+    args = parser.parse_args()
+
+    paths = list(args.bulletins)
+    if args.download:
+        paths += asyncio.run(download(args.download, args.stations))
+
+    fixtures = []
+    for path in paths:
+        cycle = args.cycle or path.name.split(".")[-2]
+        try:
+            cycle_dt = datetime.strptime(cycle, "%Y%m%d_%H").replace(tzinfo=timezone.utc)
+        except ValueError:
+            sys.exit(f"Cannot tell the cycle of {path}; pass --cycle YYYYMMDD_HH")
+        fixtures.append((path.name, path.read_text(), cycle_dt))
+    if not fixtures:
+        cycle_dt = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+        fixtures.append(("generated", generate_bulletin(cycle_dt), cycle_dt))
+        print("No bulletins given, using a generated one in the NOMADS layout")
+
+    print(f"\n{'bulletin':<36} {'points':>6} {'diff':>5} {'lines ms':>9} {'arrays ms':>10} {'+models ms':>11} {'speedup':>8}")
+    for name, text, cycle_dt in fixtures:
+        points, mismatches = compare(text, cycle_dt)
+        legacy_ms = time_it(lambda: parse_bulletin_lines(text, cycle_dt), args.repeat)
+        columnar_ms = time_it(lambda: parse_bulletin(text, cycle_dt), args.repeat)
+        models_ms = time_it(lambda: unpack_series(parse_bulletin(text, cycle_dt)), args.repeat)
+        print(
+            f"{name:<36} {points:>6} {mismatches:>5} {legacy_ms:>9.2f} {columnar_ms:>10.2f} "
+            f"{models_ms:>11.2f} {legacy_ms / columnar_ms:>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Synthetic upstream fixtures for benchmarks and offline testing.
+
+Generates regional GRIB2 forecast hours in the layout of the NOMADS GRIB
+filter responses (written with eccodes, decoded by the app through cfgrib),
+GFS wave station bulletins, NDBC realtime2 and latest_obs text files and
+CO-OPS tide predictions. Fields are smooth functions of position and time
+with a land mask, so station lookups, interpolation and wet cell snapping
+behave like they do on real files.
+
+Usage:
+    python scripts/benchmark_fixtures.py OUTPUT_DIR [--hours 0 1 2 3] [--region atlantic]
+"""
+import argparse
+import io
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.config import settings
+
+WAVE_RESOLUTION = 1 / 6  # atlocn.0p16 / wcoast.0p16
+WIND_RESOLUTION = 0.25   # gfs 0p25
+
+# GRIB2 (discipline, category, number) of each wave cube variable (cfgrib short names)
+WAVE_PARAMETERS = {
+    "swh": (10, 0, 3), "perpw": (10, 0, 11), "dirpw": (10, 0, 10),
+    "shww": (10, 0, 5), "mpww": (10, 0, 6), "wvdir": (10, 0, 4),
+    "shts": (10, 0, 8), "mpts": (10, 0, 9), "swdir": (10, 0, 7),
+}
+WIND_PARAMETERS = {"u10": (0, 2, 2), "v10": (0, 2, 3), "gust": (0, 2, 22)}
+MISSING = 9999.0
+
+def region_grid(region: str, resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitudes (north to south, as in the files) and 0-360 longitudes of a region."""
+    grid = settings.wind.regions[region].grid
+    latitude = np.round(np.arange(grid.lat.end, grid.lat.start - 1e-9, -resolution), 6)
+    longitude = np.round(np.arange(grid.lon.start, grid.lon.end + 1e-9, resolution), 6)
+    return latitude, longitude
+
+def land_mask(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """A continent in the north-west of the Atlantic grid and the north-east of the Pacific grid."""
+    lat, lon = np.meshgrid(latitude, longitude, indexing="ij")
+    atlantic = (lon >= 260) & (lon < 281 + (lat - 31) * 0.15) & (lat > 31)
+    pacific = (lon < 260) & (lon > 237 - (lat - 33) * 0.2) & (lat > 33)
+    return atlantic | pacific
+
+def _smooth(latitude: np.ndarray, longitude: np.ndarray, hour: int, phase: float) -> np.ndarray:
+    """A smooth field in [0, 1] drifting with forecast hour."""
+    lat, lon = np.meshgrid(np.radians(latitude), np.radians(longitude), indexing="ij")
+    return 0.5 + 0.25 * np.sin(6 * lat + hour / 9 + phase) + 0.25 * np.cos(5 * lon - hour / 13 + phase)
+
+def _write_message(
+    out: BinaryIO,
+    parameter: Tuple[int, int, int],
+    level: Tuple[str, int],
+    values: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    cycle_dt: datetime,
+    hour: int
+):
+    """Write one GRIB2 message of a regular lat/lon field (NaN becomes missing)."""
+    import eccodes
+
+    discipline, category, number = parameter
+    level_type, level_value = level
+    handle = eccodes.codes_grib_new_from_samples("GRIB2")
+    try:
+        # NCEP tables define the ordered sequence level of the swell partitions
+        for key, value in (
+            ("centre", "kwbc"),
+            ("discipline", discipline),
+            ("dataDate", int(cycle_dt.strftime("%Y%m%d"))),
+            ("dataTime", cycle_dt.hour * 100),
+            ("gridType", "regular_ll"),
+            ("Ni", len(longitude)),
+            ("Nj", len(latitude)),
+            ("latitudeOfFirstGridPointInDegrees", float(latitude[0])),
+            ("latitudeOfLastGridPointInDegrees", float(latitude[-1])),
+            ("longitudeOfFirstGridPointInDegrees", float(longitude[0])),
+            ("longitudeOfLastGridPointInDegrees", float(longitude[-1])),
+            ("iDirectionIncrementInDegrees", float(longitude[1] - longitude[0])),
+            ("jDirectionIncrementInDegrees", float(latitude[0] - latitude[1])),
+            ("productDefinitionTemplateNumber", 0),
+            ("parameterCategory", category),
+            ("parameterNumber", number),
+            ("typeOfLevel", level_type),
+            ("level", level_value),
+            ("stepUnits", 1),
+            ("forecastTime", hour),
+            ("bitmapPresent", 1),
+            ("missingValue", MISSING),
+            ("packingType", "grid_simple"),
+            ("bitsPerValue", 16),
+        ):
+            eccodes.codes_set(handle, key, value)
+        eccodes.codes_set_values(handle, np.where(np.isnan(values), MISSING, values).ravel())
+        out.write(eccodes.codes_get_message(handle))
+    finally:
+        eccodes.codes_release(handle)
+
+def wave_fields(latitude: np.ndarray, longitude: np.ndarray, hour: int) -> Dict[Tuple[str, int], np.ndarray]:
+    """Wave fields by (short name, swell partition or 0), NaN over land."""
+    land = land_mask(latitude, longitude)
+    fields = {}
+    for n, (name, low, high, phase) in enumerate((
+        ("swh", 0.3, 4.0, 0.0), ("perpw", 4.0, 16.0, 1.0), ("dirpw", 0.0, 359.0, 2.0),
+        ("shww", 0.1, 2.0, 0.5), ("mpww", 2.0, 8.0, 1.5), ("wvdir", 0.0, 359.0, 2.5),
+    )):
+        fields[(name, 0)] = low + (high - low) * _smooth(latitude, longitude, hour, phase)
+    for partition in range(1, 4):
+        for name, low, high, phase in (("shts", 0.1, 2.5, 3.0), ("mpts", 6.0, 18.0, 4.0), ("swdir", 0.0, 359.0, 5.0)):
+            fields[(name, partition)] = low + (high - low) * _smooth(latitude, longitude, hour, phase + partition)
+    for values in fields.values():
+        values[land] = np.nan
+    return fields
+
+def wave_hour_bytes(region: str, cycle_dt: datetime, hour: int) -> bytes:
+    """One forecast hour of a region as the NOMADS wave GRIB filter returns it."""
+    latitude, longitude = region_grid(region, WAVE_RESOLUTION)
+    out = io.BytesIO()
+    for (name, partition), values in wave_fields(latitude, longitude, hour).items():
+        level = ("orderedSequenceData", partition) if partition else ("surface", 0)
+        _write_message(out, WAVE_PARAMETERS[name], level, values, latitude, longitude, cycle_dt, hour)
+    return out.getvalue()
+
+def wind_hour_bytes(region: str, cycle_dt: datetime, hour: int) -> bytes:
+    """One forecast hour of a region as the NOMADS GFS GRIB filter returns it."""
+    latitude, longitude = region_grid(region, WIND_RESOLUTION)
+    speed = 2 + 14 * _smooth(latitude, longitude, hour, 0.0)
+    direction = np.radians(360 * _smooth(latitude, longitude, hour, 1.0))
+    out = io.BytesIO()
+    for name, values, level in (
+        ("u10", -speed * np.sin(direction), ("heightAboveGround", 10)),
+        ("v10", -speed * np.cos(direction), ("heightAboveGround", 10)),
+        ("gust", speed * 1.3, ("surface", 0)),
+    ):
+        _write_message(out, WIND_PARAMETERS[name], level, values, latitude, longitude, cycle_dt, hour)
+    return out.getvalue()
+
+def _write_file(path: Path, content: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+def write_run(
+    directory: Path,
+    cycle_dt: datetime,
+    hours: Iterable[int],
+    regions: Optional[List[str]] = None
+) -> Dict[str, List[Path]]:
+    """Write a model run in the app's storage layout (``{run}/{region}_f{hour:03d}.grib2``).
+
+    Returns:
+        Dict of "wave"/"wind" -> written paths
+    """
+    run_name = f"{cycle_dt:%Y%m%d}_{cycle_dt.hour:02d}z"
+    written = {"wave": [], "wind": []}
+    for region in regions or list(settings.wind.regions):
+        for hour in hours:
+            name = f"{region}_f{hour:03d}.grib2"
+            written["wave"].append(_write_file(directory / "gfs_wave" / run_name / name, wave_hour_bytes(region, cycle_dt, hour)))
+            written["wind"].append(_write_file(directory / "gfs_wind" / run_name / name, wind_hour_bytes(region, cycle_dt, hour)))
+    return written
+
+def generate_bulletin(cycle_dt: datetime, seed: int = 0, station_id: str = "41001") -> str:
+    """Bulletin in the NOMADS layout: hourly to 120h, then 3-hourly to 384h."""
+    rng = np.random.default_rng(seed)
+    lines = [
+        f" Location : {station_id:<10} (34.70N  72.73W)",
+        f" Model    : spectral resolution for points",
+        f" Cycle    : {cycle_dt:%Y%m%d} {cycle_dt.hour:2d} UTC",
+        "",
+        "+-------+-----------+" + "-----------------+" * 6,
+        "| day &  |  Hst  n x |" + "    Hs   Tp  dir |" * 6,
+        "|  hour  |  (m)      |" + "    (m)  (s) (d) |" * 6,
+        "+-------+-----------+" + "-----------------+" * 6,
+    ]
+    for lead in list(range(0, 121)) + list(range(123, 385, 3)):
+        valid = cycle_dt + timedelta(hours=lead)
+        partitions = int(rng.integers(1, 7))
+        heights = rng.uniform(0.1, 3.0, partitions)
+        cells = []
+        for k in range(6):
+            if k < partitions:
+                flag = "*" if k == 0 else " "
+                period = rng.uniform(3, 18)
+                direction = rng.integers(0, 360)
+                cells.append(f"{flag}{heights[k]:5.2f} {period:4.1f} {direction:3d} ")
+            else:
+                cells.append(" " * 17)
+        total = float(np.sqrt((heights ** 2).sum()))
+        lines.append(f"| {valid.day:2d} {valid.hour:02d} | {total:5.2f} {partitions:2d}  |" + "|".join(cells) + "|")
+    lines.append("+-------+-----------+" + "-----------------+" * 6)
+    return "\n".join(lines) + "\n"
+
+NDBC_HEADER = (
+    "#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP  VIS PTDY  TIDE\n"
+    "#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  nmi  hPa    ft\n"
+)
+
+def _ndbc_row(t: datetime, rng: np.random.Generator, waves: bool) -> str:
+    phase = t.timestamp() / 86400
+    speed = 4 + 3 * np.sin(phase) + rng.normal(0, 0.5)
+    wave = (
+        f"{1.2 + 0.5 * np.sin(phase / 2):5.1f} {8 + 2 * np.cos(phase / 3):5.0f} {6.5:5.1f} {int(phase * 40) % 360:3d}"
+        if waves else "   MM    MM    MM  MM"
+    )
+    return (
+        f"{t:%Y %m %d %H %M} {int(phase * 90) % 360:3d} {max(speed, 0):4.1f} {max(speed, 0) * 1.3:4.1f} {wave} "
+        f"{1015 + 5 * np.sin(phase):6.1f} {12.0:5.1f} {14.0:5.1f} {8.0:5.1f}   MM   MM    MM"
+    )
+
+def generate_ndbc_realtime(now: datetime, days: float = 45, seed: int = 0) -> str:
+    """realtime2 standard meteorological file: 10-minute rows, newest first, waves hourly."""
+    rng = np.random.default_rng(seed)
+    latest = now.replace(minute=now.minute // 10 * 10, second=0, microsecond=0)
+    rows = []
+    for i in range(int(days * 144)):
+        t = latest - timedelta(minutes=10 * i)
+        rows.append(_ndbc_row(t, rng, waves=t.minute == 40))
+    return NDBC_HEADER + "\n".join(rows) + "\n"
+
+def generate_latest_obs(stations: Iterable[Tuple[str, float, float]], now: datetime, seed: int = 0) -> str:
+    """latest_obs file with one row per (station ID, lat, lon)."""
+    rng = np.random.default_rng(seed)
+    rows = [
+        "#STN     LAT      LON  YYYY MM DD hh mm WDIR WSPD   GST WVHT  DPD APD MWD   PRES  PTDY  ATMP  WTMP  DEWP  VIS   TIDE",
+        "#text    deg      deg   yr mo day hr mn degT  m/s   m/s   m   sec sec degT   hPa   hPa  degC  degC  degC  nmi     ft",
+    ]
+    for station_id, lat, lon in stations:
+        t = now - timedelta(minutes=int(rng.integers(5, 60)))
+        t = t.replace(minute=t.minute // 10 * 10, second=0, microsecond=0)
+        rows.append(
+            f"{station_id:<6} {lat:7.3f} {lon:8.3f} {t:%Y %m %d %H %M} {int(rng.integers(0, 360)):3d} "
+            f"{rng.uniform(1, 12):4.1f} {rng.uniform(2, 15):5.1f} {rng.uniform(0.3, 3):4.1f} {int(rng.integers(4, 16)):3d} "
+            f"{rng.uniform(3, 8):3.1f} {int(rng.integers(0, 360)):3d} {rng.uniform(1005, 1030):6.1f}    MM    MM    MM    MM   MM     MM"
+        )
+    return "\n".join(rows) + "\n"
+
+def generate_tide_predictions(begin: datetime, end: datetime, seed: int = 0) -> Dict:
+    """CO-OPS hilo predictions (semi-diurnal, about every 6h12m) as the datagetter returns them."""
+    rng = np.random.default_rng(seed)
+    predictions = []
+    t = begin.replace(hour=0, minute=0) + timedelta(minutes=int(rng.integers(0, 372)))
+    high = bool(rng.integers(0, 2))
+    while t <= end + timedelta(days=1):
+        height = rng.uniform(3.5, 5.5) if high else rng.uniform(-0.5, 1.0)
+        predictions.append({"t": f"{t:%Y-%m-%d %H:%M}", "v": f"{height:.3f}", "type": "H" if high else "L"})
+        t += timedelta(minutes=372 + int(rng.integers(-15, 16)))
+        high = not high
+    return {"predictions": predictions}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", type=Path, help="Directory to write the fixtures into")
+    parser.add_argument("--cycle", help="Cycle as YYYYMMDD_HH (default: latest 6-hourly cycle)")
+    parser.add_argument("--hours", type=int, nargs="+", default=[0, 1, 2, 3], help="Forecast hours to write")
+    parser.add_argument("--region", action="append", help="Regions to write (default: all)")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    cycle_dt = (
+        datetime.strptime(args.cycle, "%Y%m%d_%H").replace(tzinfo=timezone.utc)
+        if args.cycle else now.replace(hour=now.hour // 6 * 6, minute=0, second=0, microsecond=0)
+    )
+    written = write_run(args.output, cycle_dt, args.hours, args.region)
+    (args.output / "gfswave.41001.bull").write_text(generate_bulletin(cycle_dt))
+    (args.output / "41001.txt").write_text(generate_ndbc_realtime(now))
+    (args.output / "latest_obs.txt").write_text(generate_latest_obs([("41001", 34.7, -72.73)], now))
+    (args.output / "predictions.json").write_text(json.dumps(generate_tide_predictions(now, now + timedelta(days=7))))
+    print(f"Wrote {len(written['wave'])} wave and {len(written['wind'])} wind GRIB files to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""Benchmark the hot paths on synthetic fixtures and report machine-readable JSON.
+
+Covers GRIB decoding and regional cube loading, station extraction for
+waves and wind, bulletin and NDBC parsing, station lookup and end-to-end
+route latency through the ASGI app (in process, no server or network).
+Fixtures are generated with scripts/benchmark_fixtures.py at the real grid
+resolutions.
+
+Usage:
+    python scripts/benchmark_suite.py [--output results.json] [--baseline previous.json]
+    python scripts/benchmark_suite.py --only wave. --hours 24 --repeat 20
+
+With --baseline, benchmarks whose median got slower by more than
+--threshold are listed and the exit status is 1.
+"""
+import argparse
+import asyncio
+import fnmatch
+import itertools
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_fixtures import (
+    generate_bulletin,
+    generate_latest_obs,
+    generate_ndbc_realtime,
+    write_run
+)
+from core.config import settings
+from features.common.model_run import ModelRun
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Statistics of per-call durations in milliseconds."""
+    ms = np.array(samples) * 1000
+    return {
+        "calls": len(ms),
+        "min_ms": round(float(ms.min()), 4),
+        "median_ms": round(float(np.median(ms)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+    }
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """Per-call durations in seconds, after ``warmup`` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+async def measure_async(fn: Callable[[], Awaitable[Any]], repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+async def asgi_get(app: Any, path: str, query: str = "") -> Tuple[int, bytes]:
+    """Send one GET request through an ASGI app in process."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    status, body = 0, []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(body)
+
+def latest_cycle(now: datetime) -> datetime:
+    """Latest 6-hourly cycle that would be published by ``now``."""
+    published = now - timedelta(hours=ModelRun.TYPICAL_PUBLISH_DELAY)
+    return published.replace(hour=published.hour // 6 * 6, minute=0, second=0, microsecond=0)
+
+class BenchmarkSuite:
+    """Builds the fixtures and clients once and runs every selected benchmark."""
+
+    def __init__(self, fixtures_dir: Path, hours: List[int], repeat: int, only: List[str]):
+        self.fixtures_dir = fixtures_dir
+        self.hours = hours
+        self.repeat = repeat
+        self.only = only
+        self.results: List[Dict[str, Any]] = []
+        self.now = datetime.now(timezone.utc)
+        self.cycle_dt = latest_cycle(self.now)
+        self.model_run = ModelRun(
+            run_date=self.cycle_dt.date(),
+            cycle_hour=self.cycle_dt.hour,
+            available_time=self.cycle_dt + timedelta(hours=ModelRun.TYPICAL_PUBLISH_DELAY)
+        )
+
+    def selected(self, name: str) -> bool:
+        return not self.only or any(fnmatch.fnmatch(name, f"{pattern}*") for pattern in self.only)
+
+    def record(self, name: str, samples: List[float], **details):
+        result = {"name": name, **summarize(samples), **details}
+        self.results.append(result)
+        print(
+            f"{name:<34} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms   "
+            f"({result['calls']} calls)",
+            file=sys.stderr
+        )
+
+    def build_fixtures(self) -> Dict[str, List[Path]]:
+        started = time.perf_counter()
+        written = write_run(self.fixtures_dir, self.cycle_dt, self.hours)
+        print(
+            f"Generated {len(written['wave'])} wave and {len(written['wind'])} wind GRIB files "
+            f"in {time.perf_counter() - started:.1f}s",
+            file=sys.stderr
+        )
+        return written
+
+    def region_paths(self, paths: List[Path], region: str) -> List[Path]:
+        return [path for path in paths if path.name.startswith(f"{region}_")]
+
+    async def run(self):
+        from features.stations.services.station_service import StationService
+        from features.waves.services.gfs_wave_client import GFSWaveClient
+        from features.waves.services.wave_cube import decode_wave_hour
+        from features.wind.services.gfs_wind_client import GFSWindClient
+        from features.wind.services.wind_store import decode_wind_hour
+        from features.wind.utils.file_storage import GFSFileStorage
+
+        written = self.build_fixtures()
+        station_service = StationService()
+        stations = station_service.get_all_stations()
+
+        # Decoding one forecast hour
+        wave_paths = self.region_paths(written["wave"], "atlantic")
+        wind_paths = self.region_paths(written["wind"], "atlantic")
+        if self.selected("wave.decode_hour"):
+            self.record("wave.decode_hour", measure(lambda: decode_wave_hour(wave_paths[0]), self.repeat))
+        if self.selected("wind.decode_hour"):
+            self.record("wind.decode_hour", measure(lambda: decode_wind_hour(wind_paths[0]), self.repeat))
+
+        # Loading whole regions (the resident arrays every request reads)
+        wave_client = GFSWaveClient(model_run=self.model_run)
+        wind_client = GFSWindClient(model_run=self.model_run)
+        for region in wave_client.regions:
+            paths = self.region_paths(written["wave"], region)
+            samples = measure(lambda: wave_client._load_cube(region, paths), max(1, self.repeat // 10), warmup=0)
+            if self.selected("wave.load_cube"):
+                self.record(f"wave.load_cube.{region}", samples, hours=len(paths))
+        wave_client._is_initialized = True
+
+        for region in settings.wind.regions:
+            paths = self.region_paths(written["wind"], region)
+            files = [(GFSFileStorage.parse_file_name(path.name)[1], path) for path in paths]
+
+            async def load_store():
+                store = wind_client._new_store(region)
+                await store.add_hours(files)
+                wind_client._stores[region] = store
+
+            samples = await measure_async(load_store, max(1, self.repeat // 10), warmup=0)
+            if self.selected("wind.load_region"):
+                self.record(f"wind.load_region.{region}", samples, hours=len(paths))
+        wind_client._is_initialized = True
+
+        # Extracting station forecasts from the resident arrays
+        def station_coordinates(station):
+            lat, lon = station.location.coordinates[1], station.location.coordinates[0]
+            return wave_client._get_region_for_station(lat, lon), lat, lon
+
+        located = [station_coordinates(station) for station in stations]
+        if self.selected("wave.station_forecast"):
+            cursor = itertools.cycle(located)
+            self.record(
+                "wave.station_forecast",
+                measure(lambda: wave_client._grid_station_forecast(*next(cursor)), self.repeat * 10),
+                stations=len(located)
+            )
+
+        if self.selected("wind.station_forecast"):
+            # A few stations (Alaska, the Aleutians) are outside every wind region
+            in_regions = [
+                station for station in stations
+                if any(
+                    region.grid.lat.start <= station.location.coordinates[1] <= region.grid.lat.end
+                    and region.grid.lon.start <= station.location.coordinates[0] % 360 <= region.grid.lon.end
+                    for region in settings.wind.regions.values()
+                )
+            ]
+            cursor = itertools.cycle(in_regions)
+
+            async def wind_station():
+                station = next(cursor)
+                await wind_client.get_station_wind_forecast(station.station_id, station)
+
+            self.record(
+                "wind.station_forecast",
+                await measure_async(wind_station, self.repeat * 10),
+                stations=len(in_regions)
+            )
+
+        # Text parsing
+        if self.selected("bulletin.parse"):
+            from features.waves.services.bulletin_parser import parse_bulletin
+            bulletin = generate_bulletin(self.cycle_dt)
+            self.record("bulletin.parse", measure(lambda: parse_bulletin(bulletin, self.cycle_dt), self.repeat * 5))
+
+        if self.selected("ndbc.parse"):
+            from features.waves.services.ndbc_buoy_client import parse_latest_observations, parse_observation_history
+            history = generate_ndbc_realtime(self.now)
+            latest = generate_latest_obs(
+                [(s.station_id, s.location.coordinates[1], s.location.coordinates[0]) for s in stations], self.now
+            )
+            self.record("ndbc.parse_history", measure(lambda: parse_observation_history(history), self.repeat))
+            self.record("ndbc.parse_latest", measure(lambda: parse_latest_observations(latest), self.repeat))
+
+        # Station lookup
+        if self.selected("stations.lookup"):
+            station_ids = [station.station_id for station in stations]
+            self.record(
+                "stations.lookup",
+                measure(lambda: [station_service.get_station(station_id) for station_id in station_ids], self.repeat),
+                stations=len(station_ids)
+            )
+
+        # End-to-end through the ASGI app, served from the clients above
+        if any(self.selected(f"route.{name}") for name in ("wind", "waves", "summary", "geojson")):
+            await self.run_routes(station_service, wave_client, wind_client, stations)
+
+        await wave_client.close()
+        await wind_client.close()
+
+    async def run_routes(self, station_service, wave_client, wind_client, stations):
+        import main
+        from features.stations.services.condition_summary_service import ConditionSummaryService
+        from features.waves.services.ndbc_buoy_client import NDBCBuoyClient
+        from features.waves.services.wave_data_service_v2 import WaveDataServiceV2
+        from features.wind.services.wind_data_service import WindDataService
+        from features.common.services.cache_config import bump_generation
+
+        # Route state without the lifespan, which would download a real model run
+        bump_generation(self.model_run)
+        state = main.app.state
+        state.station_service = station_service
+        state.archive = None
+        state.wind_service = WindDataService(gfs_client=wind_client, station_service=station_service)
+        state.wave_service_v2 = WaveDataServiceV2(
+            gfs_client=wave_client,
+            buoy_client=NDBCBuoyClient(),
+            station_service=station_service
+        )
+        state.condition_summary_service = ConditionSummaryService(
+            wind_service=state.wind_service,
+            wave_service=state.wave_service_v2,
+            station_service=station_service
+        )
+
+        routes = {
+            "wind": "/wind/{}/forecast",
+            "waves": "/waves/v2/{}/forecast",
+            "summary": "/stations/{}/summary",
+        }
+        for name, template in routes.items():
+            if not self.selected(f"route.{name}"):
+                continue
+            # First pass misses the forecast caches, later passes hit them
+            for phase in ("cold", "warm"):
+                samples, errors = [], 0
+                for station in stations:
+                    started = time.perf_counter()
+                    status, _ = await asgi_get(main.app, template.format(station.station_id))
+                    samples.append(time.perf_counter() - started)
+                    errors += status != 200
+                self.record(f"route.{name}.{phase}", samples, errors=errors)
+
+        if self.selected("route.geojson"):
+            async def geojson():
+                status, _ = await asgi_get(main.app, "/stations/geojson")
+                assert status == 200
+
+            self.record("route.geojson", await measure_async(geojson, self.repeat))
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Tuple[str, float, float]]:
+    """Benchmarks whose median got slower than the baseline by more than ``threshold``."""
+    previous = {result["name"]: result["median_ms"] for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if before and result["median_ms"] > before * (1 + threshold):
+            regressions.append((result["name"], before, result["median_ms"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="Write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown vs the baseline (0.2 = 20%%)")
+    parser.add_argument("--hours", type=int, default=48, help="Last forecast hour of the fixture run (3-hourly)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed calls per benchmark (more for cheap ones)")
+    parser.add_argument("--only", nargs="+", default=[], help="Run benchmarks whose names start with these patterns")
+    parser.add_argument("--fixtures", type=Path, help="Directory for the fixtures (default: a temporary directory)")
+    args = parser.parse_args()
+
+    # cfgrib's xarray merge warnings and the app's per-load log lines would drown the report
+    warnings.simplefilter("ignore", FutureWarning)
+    logging.disable(logging.ERROR)
+
+    with tempfile.TemporaryDirectory(prefix="salty-bench-") as scratch:
+        suite = BenchmarkSuite(
+            args.fixtures or Path(scratch),
+            list(range(0, args.hours + 1, 3)),
+            args.repeat,
+            args.only
+        )
+        asyncio.run(suite.run())
+
+    report = {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "model_run": f"{suite.model_run.date_str}_{suite.model_run.cycle_hour:02d}Z",
+            "forecast_hours": len(suite.hours),
+            "repeat": args.repeat,
+        },
+        "results": suite.results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(suite.results, json.loads(args.baseline.read_text())["results"], args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
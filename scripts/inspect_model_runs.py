@@ -44,7 +44,7 @@ class ModelRunInspector:
             self.session = None
 
     def get_url(self, model_run, date, hour):
-        base_url = "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod"
+        base_url = settings.gfs_wave_base_url
         return f"{base_url}/gfs.{date}/{model_run}/wave/gridded/gfswave.t{model_run}z.{settings.models['atlantic']['name']}.f{str(hour).zfill(3)}.grib2"
 
     async def download_file(self, url, output_path):
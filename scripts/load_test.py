@@ -0,0 +1,482 @@
+"""Load test the API against the local upstream stand-in.
+
+Starts scripts/upstream_standin.py and a single uvicorn worker of the app
+(with an event loop lag probe) as subprocesses in a scratch directory,
+then replays an open-loop mix of requests at a target rate and reports
+throughput, latency percentiles, status counts and event loop lag:
+
+    steady  the mix at --rps for --duration seconds
+    switch  the same load while the stand-in publishes the next cycle and
+            the app is made to swap to it, until the swap finishes
+
+Requests are sent on a fixed schedule whatever the response times, so a
+slow server shows up as latency instead of a lower request rate.
+
+Mix entries (name=weight):
+    waves    /waves/v2/{station}/forecast
+    wind     /wind/{station}/forecast
+    summary  /stations/{station}/summary
+    tides    /tides/stations/{station}/predictions
+    geojson  /stations/geojson
+    map      map view fan-out: /stations/geojson, then --fanout summaries at once
+
+Usage:
+    python scripts/load_test.py [--rps 500] [--duration 60] [--mix waves=30,wind=20,summary=25,tides=10,geojson=5,map=10]
+    python scripts/load_test.py --rps 200 --upstream-latency-ms 80 --upstream-error-rate 0.05 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+from core.config import settings
+
+DEFAULT_MIX = "waves=30,wind=20,summary=25,tides=10,geojson=5,map=10"
+# Event loop lag probe interval in the app process
+LAG_INTERVAL = 0.01
+
+# App process
+
+def serve(args: argparse.Namespace):
+    """Run the app in this process with a lag probe and load test control routes."""
+    import uvicorn
+    from fastapi import HTTPException, Query
+
+    # Fewer forecast hours keep startup and swaps short against the stand-in
+    settings.forecast_hours = args.forecast_hours
+    settings.wind.forecast_hours = list(range(0, args.forecast_hours + 1, 3))
+
+    import main
+    from features.common.model_run import ModelRun
+    from features.common.services.tracing import start_background_task
+
+    lags: deque = deque(maxlen=200_000)
+
+    async def probe_loop_lag():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            lags.append((time.time(), time.perf_counter() - started - LAG_INTERVAL))
+
+    async def get_lag(since: float = Query(0.0), until: float = Query(float("inf"))):
+        return [lag for at, lag in list(lags) if since <= at <= until]
+
+    async def get_status():
+        state = main.app.state
+        run = state.active_state.current_model_run
+        return {"model_run": f"{run.date_str}_{run.cycle_hour:02d}z", "swapping": state.swap_controller.is_swapping}
+
+    async def switch(cycle: str = Query(..., description="Cycle as YYYYMMDD_HH")):
+        # The upstream's Last-Modified drives which forecast hours are expected
+        cycle_dt = datetime.strptime(cycle, "%Y%m%d_%H")
+        model_run = await main.app.state.model_run_service.check_grib_file_for_cycle(cycle_dt.date(), cycle_dt.hour)
+        if model_run is None:
+            raise HTTPException(status_code=404, detail=f"Cycle {cycle} is not published upstream")
+        main.app.state.swap_task = start_background_task(main.app.state.swap_controller.swap(model_run))
+        return {"switching_to": cycle}
+
+    main.app.add_api_route("/_loadtest/lag", get_lag, methods=["GET"], include_in_schema=False)
+    main.app.add_api_route("/_loadtest/status", get_status, methods=["GET"], include_in_schema=False)
+    main.app.add_api_route("/_loadtest/switch", switch, methods=["POST"], include_in_schema=False)
+
+    async def run():
+        server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=args.port, log_level="warning"))
+        probe = asyncio.create_task(probe_loop_lag())
+        try:
+            await server.serve()
+        finally:
+            probe.cancel()
+
+    asyncio.run(run())
+
+# Load generation
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for entry in text.split(","):
+        name, _, weight = entry.partition("=")
+        if name not in REQUESTS:
+            raise SystemExit(f"Unknown mix entry {name!r}; choose from {', '.join(REQUESTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def station_pools() -> Dict[str, List[str]]:
+    """Station IDs each kind of request picks from."""
+    from features.stations.services.station_service import StationService
+
+    stations = StationService(ROOT / "ndbcStations.json").get_all_stations()
+    in_wind_regions = [
+        s.station_id for s in stations
+        if any(
+            r.grid.lat.start <= s.location.coordinates[1] <= r.grid.lat.end
+            and r.grid.lon.start <= s.location.coordinates[0] % 360 <= r.grid.lon.end
+            for r in settings.wind.regions.values()
+        )
+    ]
+    return {
+        "ndbc": [s.station_id for s in stations],
+        "wind": in_wind_regions,
+        "tides": [s["station_id"] for s in json.loads((ROOT / "tide_stations.json").read_text())],
+    }
+
+REQUESTS: Dict[str, Callable[[random.Random, Dict[str, List[str]]], List[Tuple[str, str]]]] = {
+    "waves": lambda rng, pools: [("waves", f"/waves/v2/{rng.choice(pools['ndbc'])}/forecast")],
+    "wind": lambda rng, pools: [("wind", f"/wind/{rng.choice(pools['wind'])}/forecast")],
+    "summary": lambda rng, pools: [("summary", f"/stations/{rng.choice(pools['ndbc'])}/summary")],
+    "tides": lambda rng, pools: [("tides", f"/tides/stations/{rng.choice(pools['tides'])}/predictions")],
+    "geojson": lambda rng, pools: [("geojson", "/stations/geojson")],
+    # Replaced with the fan-out of the configured size in LoadGenerator
+    "map": lambda rng, pools: [],
+}
+
+class PhaseResults:
+    """Latencies and outcomes of the requests started in one phase."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.started = time.time()
+        self.ended = self.started
+        self.scheduled = 0
+        self.dropped = 0
+        self.lag: List[float] = []
+
+    def record(self, kind: str, status: str, latency: float):
+        self.latencies[kind].append(latency)
+        self.statuses[kind][status] += 1
+
+    def report(self) -> Dict[str, Any]:
+        duration = max(self.ended - self.started, 1e-9)
+        routes = {}
+        for kind in sorted(self.latencies):
+            routes[kind] = summarize(self.latencies[kind], self.statuses[kind], duration)
+        every = [latency for latencies in self.latencies.values() for latency in latencies]
+        statuses = sum(self.statuses.values(), Counter())
+        lag_ms = np.array(self.lag) * 1000
+        return {
+            "duration_s": round(duration, 2),
+            "scheduled": self.scheduled,
+            "dropped": self.dropped,
+            "overall": summarize(every, statuses, duration) if every else {},
+            "routes": routes,
+            "loop_lag_ms": {
+                "samples": len(lag_ms),
+                "p50": round(float(np.percentile(lag_ms, 50)), 2),
+                "p99": round(float(np.percentile(lag_ms, 99)), 2),
+                "max": round(float(lag_ms.max()), 2),
+            } if len(lag_ms) else {},
+        }
+
+def summarize(latencies: List[float], statuses: Counter, duration: float) -> Dict[str, Any]:
+    ms = np.array(latencies) * 1000
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": len(ms),
+        "throughput_rps": round(len(ms) / duration, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p90_ms": round(float(np.percentile(ms, 90)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+        "error_rate": round(errors / len(ms), 4),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+class LoadGenerator:
+    """Open-loop request schedule against the app."""
+
+    def __init__(self, base_url: str, args: argparse.Namespace):
+        self.base_url = base_url
+        self.rps = args.rps
+        self.fanout = args.fanout
+        self.timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+        self.max_in_flight = args.max_in_flight
+        self.mix = parse_mix(args.mix)
+        self.pools = station_pools()
+        self.rng = random.Random(args.seed)
+        self.in_flight = 0
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "LoadGenerator":
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_in_flight))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def _next_requests(self) -> List[Tuple[str, str]]:
+        name = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if name == "map":
+            stations = self.rng.sample(self.pools["ndbc"], min(self.fanout, len(self.pools["ndbc"])))
+            return [("map.geojson", "/stations/geojson")] + [
+                ("map.summary", f"/stations/{station_id}/summary") for station_id in stations
+            ]
+        return REQUESTS[name](self.rng, self.pools)
+
+    async def _send(self, kind: str, path: str, results: PhaseResults):
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            async with self.session.get(self.base_url + path, timeout=self.timeout) as response:
+                await response.read()
+                status = str(response.status)
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        results.record(kind, status, time.perf_counter() - started)
+
+    async def run(self, results: PhaseResults, until: Callable[[], bool]):
+        """Send the mix at the target rate until ``until()`` is true."""
+        pending = set()
+        interval = 1 / self.rps
+        next_at = time.perf_counter()
+        while not until():
+            for kind, path in self._next_requests():
+                results.scheduled += 1
+                if self.in_flight >= self.max_in_flight:
+                    results.dropped += 1
+                    continue
+                task = asyncio.create_task(self._send(kind, path, results))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            next_at += interval
+            await asyncio.sleep(max(next_at - time.perf_counter(), 0))
+        results.ended = time.time()
+        if pending:
+            await asyncio.wait(pending)
+
+# Orchestration
+
+async def wait_until_up(session: aiohttp.ClientSession, url: str, timeout: float, process: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{url} exited with status {process.returncode} before becoming ready")
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if response.status == 200:
+                    return
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(1)
+    raise SystemExit(f"{url} was not ready after {timeout:.0f}s")
+
+async def fetch_lag(session: aiohttp.ClientSession, app_url: str, results: PhaseResults):
+    params = {"since": str(results.started), "until": str(results.ended)}
+    async with session.get(f"{app_url}/_loadtest/lag", params=params) as response:
+        results.lag = await response.json()
+
+async def watch_swap(
+    control: aiohttp.ClientSession,
+    app_url: str,
+    cycle: str,
+    timeout: float
+) -> Tuple[Optional[float], bool]:
+    """Poll the app until it stops swapping.
+
+    Returns:
+        Tuple of (seconds until the swap ended or None on timeout, whether it serves ``cycle``)
+    """
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        await asyncio.sleep(0.5)
+        async with control.get(f"{app_url}/_loadtest/status") as response:
+            status = await response.json()
+        if not status["swapping"]:
+            return time.monotonic() - started, status["model_run"] == f"{cycle}z"
+    return None, False
+
+async def run_switch_phase(
+    load: LoadGenerator,
+    control: aiohttp.ClientSession,
+    standin_url: str,
+    app_url: str,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Keep the load on while the next cycle is published and swapped in."""
+    async with control.post(f"{standin_url}/_standin/publish") as response:
+        cycle = (await response.json())["published_cycle"].rstrip("z")
+    results = PhaseResults("switch")
+    async with control.post(f"{app_url}/_loadtest/switch", params={"cycle": cycle}) as response:
+        response.raise_for_status()
+
+    swap = {"done_at": None}
+
+    async def watch():
+        swap["seconds"], swap["succeeded"] = await watch_swap(control, app_url, cycle, args.switch_timeout)
+        swap["done_at"] = time.time()
+
+    watcher = asyncio.create_task(watch())
+    await load.run(results, lambda: swap["done_at"] is not None and time.time() - swap["done_at"] >= args.switch_tail)
+    await watcher
+    await fetch_lag(control, app_url, results)
+    report = results.report()
+    report["cycle"] = cycle
+    report["swap_s"] = round(swap["seconds"], 1) if swap["seconds"] is not None else None
+    report["swap_succeeded"] = swap["succeeded"]
+    return report
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    from upstream_standin import latest_cycle, upstream_setting
+
+    workdir = Path(tempfile.mkdtemp(prefix="salty_load_"))
+    (workdir / "downloaded_data").mkdir()
+    (workdir / "ndbcStations.json").symlink_to(ROOT / "ndbcStations.json")
+
+    # The app starts on the cycle before the newest one so the switch phase can publish it
+    newest = latest_cycle(datetime.now(timezone.utc))
+    start_cycle = newest - timedelta(hours=6)
+    standin_url = f"http://127.0.0.1:{args.upstream_port}"
+    app_url = f"http://127.0.0.1:{args.port}"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "salty_upstream": upstream_setting("127.0.0.1", args.upstream_port),
+    }
+    logs = {name: open(workdir / f"{name}.log", "w") for name in ("standin", "app")}
+    standin = subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "scripts" / "upstream_standin.py"),
+            "--port", str(args.upstream_port),
+            "--cycle", f"{start_cycle:%Y%m%d_%H}",
+            "--latency-ms", str(args.upstream_latency_ms),
+            "--jitter-ms", str(args.upstream_latency_ms / 2),
+            "--error-rate", str(args.upstream_error_rate),
+        ],
+        cwd=workdir, env=env, stdout=logs["standin"], stderr=subprocess.STDOUT
+    )
+    app = subprocess.Popen(
+        [
+            sys.executable, str(Path(__file__).resolve()), "serve",
+            "--port", str(args.port),
+            "--forecast-hours", str(args.forecast_hours),
+        ],
+        cwd=workdir, env=env, stdout=logs["app"], stderr=subprocess.STDOUT
+    )
+    print(f"Scratch directory and logs: {workdir}")
+
+    report: Dict[str, Any] = {
+        "rps": args.rps,
+        "mix": parse_mix(args.mix),
+        "fanout": args.fanout,
+        "forecast_hours": args.forecast_hours,
+        "upstream": {"latency_ms": args.upstream_latency_ms, "error_rate": args.upstream_error_rate},
+        "phases": {},
+    }
+    try:
+        async with aiohttp.ClientSession() as control:
+            await wait_until_up(control, f"{standin_url}/_standin/stats", 60, standin)
+            started = time.monotonic()
+            await wait_until_up(control, f"{app_url}/health", args.startup_timeout, app)
+            report["startup_s"] = round(time.monotonic() - started, 1)
+            print(f"App ready after {report['startup_s']}s")
+
+            async with LoadGenerator(app_url, args) as load:
+                if args.warmup:
+                    warmup = PhaseResults("warmup")
+                    await load.run(warmup, lambda: time.time() - warmup.started >= args.warmup)
+
+                steady = PhaseResults("steady")
+                await load.run(steady, lambda: time.time() - steady.started >= args.duration)
+                await fetch_lag(control, app_url, steady)
+                report["phases"]["steady"] = steady.report()
+
+                if not args.skip_switch:
+                    report["phases"]["switch"] = await run_switch_phase(load, control, standin_url, app_url, args)
+
+            async with control.get(f"{standin_url}/_standin/stats") as response:
+                report["upstream_requests"] = (await response.json())["requests"]
+    finally:
+        for process in (app, standin):
+            process.send_signal(signal.SIGINT)
+        for process in (app, standin):
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for log in logs.values():
+            log.close()
+    return report
+
+def describe_swap(phase: Dict[str, Any]) -> str:
+    if phase["swap_s"] is None:
+        return "did not finish"
+    return f"{'took' if phase['swap_succeeded'] else 'failed after'} {phase['swap_s']}s"
+
+def print_report(report: Dict[str, Any]):
+    for name, phase in report["phases"].items():
+        overall, lag = phase["overall"], phase["loop_lag_ms"]
+        print(f"\n{name}: {phase['duration_s']}s, {overall.get('throughput_rps', 0)} rps, "
+              f"{phase['dropped']} dropped at the in-flight limit"
+              + (f", swap to {phase['cycle']}z {describe_swap(phase)}" if "cycle" in phase else ""))
+        if lag:
+            print(f"  event loop lag: p50 {lag['p50']} ms, p99 {lag['p99']} ms, max {lag['max']} ms")
+        print(f"  {'route':<14}{'requests':>9}{'rps':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+        for route, stats in [*phase["routes"].items(), ("all", overall)]:
+            if not stats:
+                continue
+            print(
+                f"  {route:<14}{stats['requests']:>9}{stats['throughput_rps']:>8}{stats['p50_ms']:>9}"
+                f"{stats['p90_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}{stats['error_rate']:>8.1%}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command")
+    serve_parser = subcommands.add_parser("serve", help="Run the app with load test probes (started by the harness)")
+    serve_parser.add_argument("--port", type=int, required=True)
+    serve_parser.add_argument("--forecast-hours", type=int, required=True)
+
+    parser.add_argument("--rps", type=float, default=500, help="Request batches started per second")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of steady load")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds of unreported load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma separated name=weight entries")
+    parser.add_argument("--fanout", type=int, default=20, help="Station summaries per map view")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Requests open at once before new ones are dropped")
+    parser.add_argument("--request-timeout", type=float, default=30)
+    parser.add_argument("--skip-switch", action="store_true", help="Skip the model run switch phase")
+    parser.add_argument("--switch-timeout", type=float, default=600, help="Longest switch phase in seconds")
+    parser.add_argument("--switch-tail", type=float, default=5, help="Seconds of load after the swap finished")
+    parser.add_argument("--forecast-hours", type=int, default=24, help="Forecast hours the app downloads per run")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=5011)
+    parser.add_argument("--upstream-port", type=int, default=8901)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+        return
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Local stand-in for the NOAA upstreams: NOMADS, NDBC and CO-OPS.
+
+Serves the paths the app requests (GFS wave and wind GRIB filters, gridded
+file checks, wave station bulletins, NDBC realtime2 and latest_obs files,
+CO-OPS tide predictions) with synthetic responses from
+scripts/benchmark_fixtures.py, so the app can run, be load tested and
+switch model runs without touching the real servers.
+
+Faults are injected on every upstream route: added latency with jitter, a
+token bucket rate limit answered with 429 + Retry-After, a random share of
+503 responses and forecast hours that 404 as if not yet published.
+
+Control endpoints:
+    GET  /_standin/stats    request counts by route and status
+    POST /_standin/publish  publish the next model cycle
+    POST /_standin/options  change fault options, e.g. {"error_rate": 0.1}
+
+Usage:
+    python scripts/upstream_standin.py [--port 8900] [--latency-ms 40 --jitter-ms 20]
+        [--rate-limit 50] [--error-rate 0.02] [--missing-hours 117 118]
+
+Start the app with the salty_upstream setting printed on startup.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import sys
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_fixtures import (
+    generate_bulletin,
+    generate_latest_obs,
+    generate_ndbc_realtime,
+    generate_tide_predictions,
+    wave_hour_bytes,
+    wind_hour_bytes
+)
+from core.config import settings
+
+logger = logging.getLogger("upstream_standin")
+
+GFS_PROD = "/pub/data/nccf/com/gfs/prod"
+WAVE_FILE = re.compile(r"gfswave\.t(\d{2})z\.([\w.]+)\.f(\d{3})\.grib2")
+WIND_FILE = re.compile(r"gfs\.t(\d{2})z\.pgrb2\.0p25\.f(\d{3})")
+RUN_DIR = re.compile(r"/gfs\.(\d{8})/(\d{2})/")
+# Minutes after the cycle time a run counts as published (Last-Modified)
+PUBLISH_DELAY_MINUTES = 210
+# Cycles kept on the server, like the NOMADS rolling window
+RETAINED_CYCLES = 40
+
+@dataclass
+class StandinOptions:
+    """Fault injection and fixture settings, changeable while running."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_limit: float = 0.0  # Requests per second over all upstream routes, 0 for none
+    burst: int = 20
+    error_rate: float = 0.0  # Share of requests answered with 503
+    missing_hours: Set[int] = field(default_factory=set)
+    seed: int = 0
+    grib_cache_entries: int = 64
+
+class TokenBucket:
+    """Rate limiter that refuses instead of waiting."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+def latest_cycle(now: datetime) -> datetime:
+    """Newest cycle that would be published by ``now``."""
+    published = now - timedelta(minutes=PUBLISH_DELAY_MINUTES)
+    return published.replace(hour=published.hour // 6 * 6, minute=0, second=0, microsecond=0)
+
+class UpstreamStandin:
+    """aiohttp application state and handlers of the stand-in."""
+
+    def __init__(self, options: StandinOptions, cycle: Optional[datetime] = None):
+        self.options = options
+        self.published = cycle or latest_cycle(datetime.now(timezone.utc))
+        self.bucket = TokenBucket(options.rate_limit, options.burst)
+        self.stats: Counter = Counter()
+        self.bytes_sent = 0
+        self.products = {config["name"]: region for region, config in settings.models.items()}
+        self._grib: "OrderedDict[Tuple, asyncio.Future]" = OrderedDict()
+        self._text: Dict[Tuple, Tuple[float, str]] = {}
+
+    # Model cycles
+
+    def _cycle(self, date: str, hour: str) -> Optional[datetime]:
+        """Cycle time if that cycle is published and still retained."""
+        try:
+            cycle_dt = datetime.strptime(f"{date}{hour}", "%Y%m%d%H").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+        oldest = self.published - timedelta(hours=6 * RETAINED_CYCLES)
+        if cycle_dt.hour % 6 or not oldest <= cycle_dt <= self.published:
+            return None
+        return cycle_dt
+
+    def _last_modified(self, cycle_dt: datetime) -> str:
+        published = min(cycle_dt + timedelta(minutes=PUBLISH_DELAY_MINUTES), datetime.now(timezone.utc))
+        return format_datetime(published, usegmt=True)
+
+    # Fixture caches
+
+    async def _grib_bytes(self, kind: str, region: str, cycle_dt: datetime, hour: int) -> bytes:
+        """Generate a GRIB forecast hour once; concurrent requests share the work."""
+        key = (kind, region, cycle_dt, hour)
+        future = self._grib.get(key)
+        if future is None:
+            writer = wave_hour_bytes if kind == "wave" else wind_hour_bytes
+            future = asyncio.ensure_future(asyncio.to_thread(writer, region, cycle_dt, hour))
+            self._grib[key] = future
+            while len(self._grib) > self.options.grib_cache_entries:
+                self._grib.popitem(last=False)
+        else:
+            self._grib.move_to_end(key)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._grib.pop(key, None)
+            raise
+
+    def _cached_text(self, key: Tuple, max_age: float, build: Callable[[], str]) -> str:
+        cached = self._text.get(key)
+        if cached is None or time.monotonic() - cached[0] > max_age:
+            cached = (time.monotonic(), build())
+            self._text[key] = cached
+        return cached[1]
+
+    def _station_seed(self, station_id: str) -> int:
+        return zlib.crc32(station_id.encode()) ^ self.options.seed
+
+    # Middleware
+
+    @web.middleware
+    async def faults(self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]):
+        """Count requests and apply latency, throttling and failure injection."""
+        if request.path.startswith("/_standin/"):
+            return await handler(request)
+
+        route = request.match_info.route.name or "unknown"
+        options = self.options
+        if options.latency_ms or options.jitter_ms:
+            delay = options.latency_ms + random.uniform(-options.jitter_ms, options.jitter_ms)
+            await asyncio.sleep(max(delay, 0) / 1000)
+
+        if options.rate_limit and not self.bucket.take():
+            response = web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+        elif options.error_rate and random.random() < options.error_rate:
+            response = web.Response(status=503, text="Service Unavailable")
+        else:
+            try:
+                response = await handler(request)
+            except web.HTTPException as e:
+                response = e
+        self.stats[f"{route} {response.status}"] += 1
+        if response.body is not None and isinstance(response.body, (bytes, bytearray)):
+            self.bytes_sent += len(response.body)
+        if isinstance(response, web.HTTPException):
+            raise response
+        return response
+
+    # NOMADS
+
+    async def wave_filter(self, request: web.Request) -> web.Response:
+        """filter_gfswave.pl: one forecast hour of a regional wave grid."""
+        match = WAVE_FILE.fullmatch(request.query.get("file", ""))
+        run = RUN_DIR.match(request.query.get("dir", "") + "/")
+        if not match or not run or match.group(2) not in self.products:
+            raise web.HTTPBadRequest(text="Invalid file or dir")
+        cycle_dt = self._cycle(run.group(1), run.group(2))
+        hour = int(match.group(3))
+        if cycle_dt is None or hour in self.options.missing_hours or hour > settings.forecast_hours:
+            raise web.HTTPNotFound(text="Data file is not present")
+        content = await self._grib_bytes("wave", self.products[match.group(2)], cycle_dt, hour)
+        return web.Response(body=content, content_type="application/octet-stream")
+
+    async def wind_filter(self, request: web.Request) -> web.Response:
+        """filter_gfs_0p25.pl: one forecast hour of a regional wind subgrid."""
+        match = WIND_FILE.fullmatch(request.query.get("file", ""))
+        run = RUN_DIR.match(request.query.get("dir", "").replace("%2F", "/") + "/")
+        if not match or not run:
+            raise web.HTTPBadRequest(text="Invalid file or dir")
+        region = next(
+            (
+                name for name, config in settings.wind.regions.items()
+                if float(request.query.get("leftlon", "nan")) == config.grid.lon.start
+                and float(request.query.get("toplat", "nan")) == config.grid.lat.end
+            ),
+            None
+        )
+        if region is None:
+            raise web.HTTPBadRequest(text="Subregion does not match a configured region")
+        cycle_dt = self._cycle(run.group(1), run.group(2))
+        hour = int(match.group(2))
+        if cycle_dt is None or hour in self.options.missing_hours or hour > 384:
+            raise web.HTTPNotFound(text="Data file is not present")
+        content = await self._grib_bytes("wind", region, cycle_dt, hour)
+        return web.Response(body=content, content_type="application/octet-stream")
+
+    async def gridded_file(self, request: web.Request) -> web.Response:
+        """A full gridded wave file; HEAD is what the model run check sends."""
+        cycle_dt = self._cycle(request.match_info["date"], request.match_info["cycle"])
+        match = WAVE_FILE.fullmatch(request.match_info["file"])
+        if cycle_dt is None or not match or match.group(2) not in self.products:
+            raise web.HTTPNotFound()
+        hour = int(match.group(3))
+        if hour in self.options.missing_hours:
+            raise web.HTTPNotFound()
+        headers = {"Last-Modified": self._last_modified(cycle_dt)}
+        if request.method == "HEAD":
+            # Size of a real file; the body is never generated for a HEAD
+            headers["Content-Length"] = "35000000"
+            return web.Response(headers=headers)
+        content = await self._grib_bytes("wave", self.products[match.group(2)], cycle_dt, hour)
+        return web.Response(body=content, headers=headers, content_type="application/octet-stream")
+
+    async def bulletin(self, request: web.Request) -> web.Response:
+        """gfswave.{station}.bull of a cycle."""
+        cycle_dt = self._cycle(request.match_info["date"], request.match_info["cycle"])
+        if cycle_dt is None or request.match_info["bull_cycle"] != request.match_info["cycle"]:
+            raise web.HTTPNotFound()
+        station_id = request.match_info["station_id"]
+        text = self._cached_text(
+            ("bulletin", station_id, cycle_dt), float("inf"),
+            lambda: generate_bulletin(cycle_dt, self._station_seed(station_id), station_id)
+        )
+        return web.Response(text=text, headers={"Last-Modified": self._last_modified(cycle_dt)})
+
+    # NDBC
+
+    async def ndbc_realtime(self, request: web.Request) -> web.Response:
+        """realtime2/{station}.txt, regenerated every 10 minutes."""
+        station_id = request.match_info["station_id"]
+        text = self._cached_text(
+            ("realtime", station_id), 600,
+            lambda: generate_ndbc_realtime(datetime.now(timezone.utc), seed=self._station_seed(station_id))
+        )
+        return web.Response(text=text)
+
+    async def ndbc_latest(self, request: web.Request) -> web.Response:
+        """latest_obs.txt for every station in ndbcStations.json."""
+        def build() -> str:
+            from features.stations.services.station_service import StationService
+            stations = StationService().get_all_stations()
+            return generate_latest_obs(
+                [(s.station_id, s.location.coordinates[1], s.location.coordinates[0]) for s in stations],
+                datetime.now(timezone.utc),
+                seed=self.options.seed
+            )
+        return web.Response(text=self._cached_text(("latest_obs",), 600, build))
+
+    # CO-OPS
+
+    async def tide_predictions(self, request: web.Request) -> web.Response:
+        """datagetter hilo predictions between begin_date and end_date."""
+        try:
+            begin = datetime.strptime(request.query["begin_date"], "%Y%m%d")
+            end = datetime.strptime(request.query["end_date"], "%Y%m%d")
+        except (KeyError, ValueError):
+            return web.json_response({"error": {"message": "Invalid begin_date or end_date"}})
+        station_id = request.query.get("station", "")
+        return web.json_response(generate_tide_predictions(begin, end, seed=self._station_seed(station_id)))
+
+    # Control
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "published_cycle": f"{self.published:%Y%m%d_%H}z",
+            "bytes_sent": self.bytes_sent,
+            "requests": dict(sorted(self.stats.items())),
+        })
+
+    async def publish(self, request: web.Request) -> web.Response:
+        """Publish the cycle after the current one."""
+        self.published += timedelta(hours=6)
+        logger.info(f"📦 Published cycle {self.published:%Y%m%d %H}Z")
+        return web.json_response({"published_cycle": f"{self.published:%Y%m%d_%H}z"})
+
+    async def set_options(self, request: web.Request) -> web.Response:
+        """Update fault options from a JSON object of StandinOptions fields."""
+        updates = await request.json()
+        unknown = set(updates) - set(asdict(self.options))
+        if unknown:
+            raise web.HTTPBadRequest(text=f"Unknown options: {', '.join(sorted(unknown))}")
+        for name, value in updates.items():
+            setattr(self.options, name, set(value) if name == "missing_hours" else value)
+        self.bucket = TokenBucket(self.options.rate_limit, self.options.burst)
+        options = asdict(self.options)
+        options["missing_hours"] = sorted(options["missing_hours"])
+        return web.json_response(options)
+
+def create_app(options: Optional[StandinOptions] = None, cycle: Optional[datetime] = None) -> web.Application:
+    """The stand-in as an aiohttp application (also used by the load test harness)."""
+    standin = UpstreamStandin(options or StandinOptions(), cycle)
+    app = web.Application(middlewares=[standin.faults])
+    app["standin"] = standin
+    run = r"/gfs.{date:\d{8}}/{cycle:\d{2}}/wave"
+    app.router.add_get("/cgi-bin/filter_gfswave.pl", standin.wave_filter, name="nomads.wave_filter")
+    app.router.add_get("/cgi-bin/filter_gfs_0p25.pl", standin.wind_filter, name="nomads.wind_filter")
+    app.router.add_get(f"{GFS_PROD}{run}/gridded/{{file}}", standin.gridded_file, name="nomads.gridded")
+    app.router.add_get(
+        rf"{GFS_PROD}{run}/station/bulls.t{{bull_cycle:\d{{2}}}}z/gfswave.{{station_id}}.bull",
+        standin.bulletin,
+        name="nomads.bulletin"
+    )
+    app.router.add_get("/data/realtime2/{station_id}.txt", standin.ndbc_realtime, name="ndbc.realtime2")
+    app.router.add_get("/data/latest_obs/latest_obs.txt", standin.ndbc_latest, name="ndbc.latest_obs")
+    app.router.add_get("/api/prod/datagetter", standin.tide_predictions, name="coops.datagetter")
+    app.router.add_get("/_standin/stats", standin.get_stats)
+    app.router.add_post("/_standin/publish", standin.publish)
+    app.router.add_post("/_standin/options", standin.set_options)
+    return app
+
+def upstream_setting(host: str, port: int) -> str:
+    """salty_upstream value that points every upstream at the stand-in."""
+    base = f"http://{host}:{port}"
+    return json.dumps({"nomads": base, "ndbc": base, "coops": base})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter of the latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429s (0: none)")
+    parser.add_argument("--burst", type=int, default=20, help="Requests allowed at once by the rate limit")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--missing-hours", type=int, nargs="*", default=[], help="Forecast hours that 404")
+    parser.add_argument("--cycle", help="Latest published cycle as YYYYMMDD_HH (default: by the clock)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    options = StandinOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        error_rate=args.error_rate,
+        missing_hours=set(args.missing_hours),
+        seed=args.seed
+    )
+    cycle = datetime.strptime(args.cycle, "%Y%m%d_%H").replace(tzinfo=timezone.utc) if args.cycle else None
+    app = create_app(options, cycle)
+    logger.info(f"🌊 Serving cycle {app['standin'].published:%Y%m%d %H}Z; start the app with:")
+    logger.info(f"   salty_upstream='{upstream_setting(args.host, args.port)}'")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from features.waves.services.bulletin_parser import parse_bulletin
+from features.waves.services.noaa_gfs_client import parse_bulletin_lines, unpack_series
+from scripts.benchmark_fixtures import generate_bulletin
+
+EMPTY_CELL = " " * 17
+
+def bulletin(*rows: str) -> str:
+    return "\n".join([
+        " Location : 41001      (34.70N  72.73W)",
+        "+-------+-----------+" + "-----------------+" * 3,
+        "| day &  |  Hst  n x |" + "    Hs   Tp  dir |" * 3,
+        "+-------+-----------+" + "-----------------+" * 3,
+        *rows,
+        "+-------+-----------+" + "-----------------+" * 3,
+    ]) + "\n"
+
+def row(day: int, hour: int, *cells: str) -> str:
+    cells = list(cells) + [EMPTY_CELL] * (3 - len(cells))
+    return f"| {day:2d} {hour:02d} |  1.00  {len(cells)}  |" + "|".join(cells) + "|"
+
+def cell(height: float, period: float, direction: int, wind_sea: bool = False) -> str:
+    return f"{'*' if wind_sea else ' '}{height:5.2f} {period:4.1f} {direction:3d} "
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_the_line_parser(seed):
+    cycle_dt = datetime(2026, 10, 2, 6, tzinfo=timezone.utc)
+    text = generate_bulletin(cycle_dt, seed=seed)
+    legacy = sorted(parse_bulletin_lines(text, cycle_dt), key=lambda point: point.timestamp)
+    columnar = unpack_series(parse_bulletin(text, cycle_dt))
+    assert len(columnar) == len(legacy) == 209
+    assert [point.model_dump() for point in columnar] == [point.model_dump() for point in legacy]
+
+@pytest.mark.parametrize("cycle_dt", [
+    datetime(2026, 10, 25, 18, tzinfo=timezone.utc),
+    datetime(2026, 12, 28, 0, tzinfo=timezone.utc),
+    datetime(2028, 2, 20, 12, tzinfo=timezone.utc),
+])
+def test_days_before_the_cycle_day_roll_into_the_next_month(cycle_dt):
+    series = parse_bulletin(generate_bulletin(cycle_dt), cycle_dt)
+    leads = list(range(0, 121)) + list(range(123, 385, 3))
+    expected = [int((cycle_dt + timedelta(hours=lead)).timestamp()) for lead in leads]
+    assert series.times.tolist() == expected
+
+def test_rows_without_partitions_are_dropped():
+    cycle_dt = datetime(2026, 10, 18, 0, tzinfo=timezone.utc)
+    series = parse_bulletin(bulletin(
+        row(18, 0, cell(1.5, 9.0, 90)),
+        f"| 18 01 |  0.00  0  |{EMPTY_CELL}|{EMPTY_CELL}|{EMPTY_CELL}|",
+        row(18, 2, cell(1.4, 9.1, 95)),
+    ), cycle_dt)
+    start = int(cycle_dt.timestamp())
+    assert series.times.tolist() == [start, start + 7200]
+    assert series.components.shape == (2, 1, 3)
+
+def test_partitions_sort_by_height_keeping_bulletin_order_for_ties():
+    cycle_dt = datetime(2026, 10, 18, 0, tzinfo=timezone.utc)
+    series = parse_bulletin(bulletin(
+        row(18, 0, cell(0.80, 4.0, 200, wind_sea=True), cell(1.20, 11.0, 90), cell(0.80, 7.0, 130)),
+        row(18, 1, cell(0.50, 5.0, 10)),
+    ), cycle_dt)
+    first, second = series.components
+    np.testing.assert_array_equal(first, [[1.2, 11.0, 90], [0.8, 4.0, 200], [0.8, 7.0, 130]])
+    np.testing.assert_array_equal(second[0], [0.5, 5.0, 10])
+    assert np.isnan(second[1:]).all()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from features.waves.models.wave_categories import Conditions, WaveHeight, WavePeriod
+from features.wind.models.wind_categories import WindDirection
+
+RNG = np.random.default_rng(39)
+
+def with_random(boundaries, low, high, count=2000):
+    """Boundary values, values just either side of them, NaN and random values."""
+    boundaries = np.asarray(boundaries, dtype=np.float64)
+    return np.concatenate([
+        boundaries,
+        np.nextafter(boundaries, -np.inf),
+        np.nextafter(boundaries, np.inf),
+        [np.nan],
+        RNG.uniform(low, high, count)
+    ])
+
+def assert_parity(array_fn, scalar_fn, enum_cls, *arrays):
+    members = tuple(enum_cls)
+    codes = array_fn(*arrays)
+    for i, code in enumerate(codes):
+        args = [float(values[i]) for values in arrays]
+        assert members[code] is scalar_fn(*args), args
+
+def test_wind_direction_array_matches_scalar():
+    sector_edges = np.arange(22.5, 360, 45)
+    degrees = with_random(
+        np.concatenate([sector_edges, sector_edges - 360, sector_edges + 360, [0, 360, -360, 720]]),
+        -720, 720
+    )
+    assert_parity(WindDirection.from_degrees_array, WindDirection.from_degrees, WindDirection, degrees)
+
+@pytest.mark.parametrize("enum_cls, array_fn, scalar_fn, boundaries", [
+    (WaveHeight, WaveHeight.from_height_array, WaveHeight.from_height, [0, 0.5, 2, 4, 6, 8, 999]),
+    (WavePeriod, WavePeriod.from_period_array, WavePeriod.from_period, [0, 6, 10, 14, 999]),
+])
+def test_wave_category_arrays_match_scalar(enum_cls, array_fn, scalar_fn, boundaries):
+    values = with_random(boundaries, -2, 1200)
+    assert_parity(array_fn, scalar_fn, enum_cls, values)
+
+def test_conditions_array_matches_scalar():
+    speeds = with_random([10, 15], -1, 30, count=3000)
+    diffs = with_random([45, 135, 180, 225, 315], -360, 360, count=len(speeds) - 16)
+    wave_direction = RNG.uniform(-360, 720, len(speeds))
+    wind_direction = wave_direction + diffs[:len(speeds)]
+    assert_parity(
+        Conditions.from_wind_wave_array, Conditions.from_wind_wave, Conditions,
+        speeds, wind_direction, wave_direction
+    )
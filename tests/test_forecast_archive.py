@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from features.common.services.forecast_archive import ArchiveDataset, points_to_columns, run_diff, run_start
+
+VARIABLES = ("speed", "direction")
+
+def run_series(run_index: int, stations=("41001", "44013", "46042")):
+    """Forecasts of a few stations with values derived from the run, station and lead."""
+    series = {}
+    for s, station_id in enumerate(stations):
+        leads = np.arange(0, 24, 3)[::-1]  # unsorted on purpose
+        values = np.stack([run_index * 100 + s * 10 + leads / 3, (leads * 15 + s) % 360], axis=1)
+        series[station_id] = (leads, values)
+    return series
+
+def open_dataset(path):
+    return ArchiveDataset(path, VARIABLES, circular=("direction",))
+
+def assert_station(dataset, run_id, station_id, expected):
+    leads, values = expected
+    order = np.argsort(leads)
+    found = dataset.series(run_id, station_id)
+    assert found is not None
+    np.testing.assert_array_equal(found.times, int(run_start(run_id).timestamp()) + leads[order] * 3600)
+    np.testing.assert_allclose(found.values, values[order].astype(np.float32))
+
+def test_append_and_reopen_round_trip(tmp_path):
+    dataset = open_dataset(tmp_path)
+    runs = {"2026101800": run_series(0), "2026101806": run_series(1, stations=("44013", "51001"))}
+    for run_id, series in runs.items():
+        assert dataset.append_run(run_id, series) == 8 * len(series)
+    assert dataset.append_run("2026101800", run_series(0)) == 0
+
+    reopened = open_dataset(tmp_path)
+    assert reopened.runs() == sorted(runs)
+    assert reopened.station_ids == ["41001", "44013", "46042", "51001"]
+    for opened in (dataset, reopened):
+        for run_id, series in runs.items():
+            for station_id, expected in series.items():
+                assert_station(opened, run_id, station_id, expected)
+        assert opened.series("2026101806", "41001") is None
+        assert opened.series("2026101812", "41001") is None
+
+    codes, leads, values = reopened.run_rows("2026101806")
+    assert codes.tolist() == [1] * 8 + [3] * 8
+    assert leads.tolist() == list(range(0, 24, 3)) * 2
+    assert values.shape == (16, 2)
+    assert reopened.run_rows("2026101812") is None
+
+def test_append_drops_bytes_of_an_interrupted_append(tmp_path):
+    dataset = open_dataset(tmp_path)
+    dataset.append_run("2026101800", run_series(0))
+    # Bytes of an append that crashed before its manifest was written
+    for path in tmp_path.glob("*.f4"):
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 12)
+
+    reopened = open_dataset(tmp_path)
+    reopened.append_run("2026101806", run_series(1))
+    assert_station(reopened, "2026101806", "46042", run_series(1)["46042"])
+    assert (tmp_path / "speed.f4").stat().st_size == 48 * 4
+
+def test_prune_keeps_newer_runs_and_readers_of_the_previous_manifest(tmp_path):
+    dataset = open_dataset(tmp_path)
+    for i, run_id in enumerate(["2026101800", "2026101806", "2026101812"]):
+        dataset.append_run(run_id, run_series(i))
+    previous = dataset._manifest
+    assert_station(dataset, "2026101800", "41001", run_series(0)["41001"])
+
+    assert dataset.prune("2026101806") == 1
+    assert dataset.prune("2026101806") == 0
+    assert dataset.runs() == ["2026101806", "2026101812"]
+    assert dataset.series("2026101800", "41001") is None
+    assert not (tmp_path / "speed.f4").exists()
+
+    # A request that read the manifest before the prune still gets its rows
+    start, stop = previous["runs"]["2026101800"]
+    np.testing.assert_allclose(dataset._open_columns(previous)["speed"][start:stop][:3], [0, 1, 2])
+
+    reopened = open_dataset(tmp_path)
+    for opened in (dataset, reopened):
+        assert_station(opened, "2026101806", "44013", run_series(1)["44013"])
+        assert_station(opened, "2026101812", "46042", run_series(2)["46042"])
+    reopened.append_run("2026101818", run_series(3))
+    assert_station(reopened, "2026101818", "41001", run_series(3)["41001"])
+    assert dataset.nbytes() == reopened.nbytes() - 24 * 12
+
+def test_prune_interrupted_before_the_manifest_switch(tmp_path, monkeypatch):
+    dataset = open_dataset(tmp_path)
+    for i, run_id in enumerate(["2026101800", "2026101806"]):
+        dataset.append_run(run_id, run_series(i))
+
+    def crash(manifest):
+        raise OSError("disk full")
+    monkeypatch.setattr(dataset, "_write_manifest", crash)
+    with pytest.raises(OSError):
+        dataset.prune("2026101806")
+
+    reopened = open_dataset(tmp_path)
+    assert reopened.runs() == ["2026101800", "2026101806"]
+    for i, run_id in enumerate(reopened.runs()):
+        for station_id, expected in run_series(i).items():
+            assert_station(reopened, run_id, station_id, expected)
+    assert not list(tmp_path.glob("*.g1.*"))
+
+    assert reopened.prune("2026101806") == 1
+    assert_station(open_dataset(tmp_path), "2026101806", "41001", run_series(1)["41001"])
+
+def test_points_to_columns_and_run_diff(tmp_path):
+    run_id = "2026101800"
+    start = run_start(run_id)
+    forecasts = [
+        SimpleNamespace(time=start + timedelta(hours=hour, minutes=1), speed=hour, direction=None)
+        for hour in (-3, 0, 3, 6, 9)
+    ]
+    leads, values = points_to_columns(forecasts, run_id, VARIABLES, max_lead_hours=6)
+    assert leads.tolist() == [0, 3, 6]
+    assert values[:, 0].tolist() == [0, 3, 6]
+    assert np.isnan(values[:, 1]).all()
+
+    dataset = open_dataset(tmp_path)
+    dataset.append_run("2026101800", {"41001": (np.array([6, 9]), np.array([[5.0, 350.0], [6.0, 10.0]]))})
+    dataset.append_run("2026101806", {"41001": (np.array([0, 3]), np.array([[7.5, 20.0], [8.0, 340.0]]))})
+    diff = run_diff(dataset, "41001", "2026101806", "2026101800")
+    assert diff.model_run == "20261018_06Z"
+    assert [point.time for point in diff.points] == [
+        datetime(2026, 10, 18, 6, tzinfo=timezone.utc), datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+    ]
+    assert [point.delta for point in diff.points] == [
+        {"speed": 2.5, "direction": 30.0}, {"speed": 2.0, "direction": -30.0}
+    ]
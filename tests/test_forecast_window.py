@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from features.common.services.forecast_window import STEP_HOURS, ForecastSeries, resolve_window, select_window
+
+NOW = datetime(2026, 10, 18, 17, 30, tzinfo=timezone.utc)
+
+class Response(SimpleNamespace):
+    def model_copy(self, update):
+        return Response(**{**vars(self), **update})
+
+def hourly_series(start: datetime, hours: int) -> ForecastSeries:
+    points = [SimpleNamespace(time=start + timedelta(hours=h)) for h in range(hours)]
+    times = np.array([int(point.time.timestamp()) for point in points], dtype=np.int64)
+    return ForecastSeries(response=Response(forecasts=points), times=times)
+
+@pytest.mark.parametrize("step", STEP_HOURS)
+def test_default_window_starts_on_a_selected_point(step):
+    window = resolve_window(step=step, days=2, now=NOW)
+    series = hourly_series(NOW.replace(hour=0, minute=0), 96)
+    forecasts = select_window(series, window).forecasts
+
+    assert forecasts[0].time == window.start
+    assert all(point.time.hour % step == 0 for point in forecasts)
+    assert all(b.time - a.time == timedelta(hours=step) for a, b in zip(forecasts, forecasts[1:]))
+
+@pytest.mark.parametrize("step", [0, 5, 7, 9, 25])
+def test_steps_that_do_not_divide_a_day_are_rejected(step):
+    with pytest.raises(HTTPException) as error:
+        resolve_window(step=step, now=NOW)
+    assert error.value.status_code == 400
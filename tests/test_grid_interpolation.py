@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from features.common.services.grid_interpolation import (
+    bilinear_weights,
+    interpolate_corners,
+    snap_coordinate
+)
+
+# GRIB style axes: latitudes descending, longitudes 0-360
+LATITUDE = np.array([40.0, 39.5, 39.0, 38.5])
+LONGITUDE = np.array([280.0, 280.5, 281.0, 281.5])
+GLOBAL_LONGITUDE = np.arange(0.0, 360.0, 0.25)
+
+def field(latitude, longitude):
+    """A field linear in both axes, which bilinear interpolation reproduces exactly."""
+    return 2.0 * latitude[:, None] + 3.0 * longitude[None, :]
+
+def interpolate(grid, latitude, longitude, lat, lon, circular=()):
+    lat_idx, lon_idx, weights = bilinear_weights(latitude, longitude, lat, lon)
+    corners = grid[lat_idx, lon_idx][np.newaxis, np.newaxis, :]
+    return interpolate_corners(corners, weights, circular)[0, 0]
+
+@pytest.mark.parametrize("lat, lon", [(40.0, 280.0), (39.5, 281.0), (38.5, 281.5), (39.0, -79.5)])
+def test_grid_node_gets_the_node_value(lat, lon):
+    grid = field(LATITUDE, LONGITUDE)
+    lat_idx, lon_idx, weights = bilinear_weights(LATITUDE, LONGITUDE, lat, lon)
+
+    assert weights.sum() == pytest.approx(1.0)
+    node = weights.argmax()
+    assert weights[node] == pytest.approx(1.0)
+    assert LATITUDE[lat_idx[node]] == lat
+    assert LONGITUDE[lon_idx[node]] == lon % 360
+    assert interpolate(grid, LATITUDE, LONGITUDE, lat, lon) == pytest.approx(grid[lat_idx[node], lon_idx[node]])
+
+def test_linear_field_is_reproduced_between_nodes():
+    grid = field(LATITUDE, LONGITUDE)
+    for lat, lon in [(39.8, 280.1), (38.6, 281.4), (39.25, -78.75)]:
+        assert interpolate(grid, LATITUDE, LONGITUDE, lat, lon) == pytest.approx(2 * lat + 3 * (lon % 360))
+
+def test_ascending_and_descending_latitudes_agree():
+    grid = field(LATITUDE, LONGITUDE)
+    flipped = interpolate(grid[::-1], LATITUDE[::-1], LONGITUDE, 39.2, 280.7)
+    assert flipped == pytest.approx(interpolate(grid, LATITUDE, LONGITUDE, 39.2, 280.7))
+
+@pytest.mark.parametrize("lat, lon", [(40.1, 280.5), (38.4, 280.5), (39.0, 279.9), (39.0, -78.4)])
+def test_outside_the_grid_raises(lat, lon):
+    with pytest.raises(ValueError):
+        bilinear_weights(LATITUDE, LONGITUDE, lat, lon)
+
+@pytest.mark.parametrize("lon", [359.9, -0.1, 359.75, 0.0, 360.0])
+def test_global_grid_wraps_across_zero_longitude(lon):
+    latitude = np.array([1.0, 0.0])
+    grid = np.cos(np.radians(GLOBAL_LONGITUDE))[None, :].repeat(2, axis=0)
+
+    lat_idx, lon_idx, weights = bilinear_weights(latitude, GLOBAL_LONGITUDE, 0.5, lon)
+
+    assert set(lon_idx[weights > 0]) <= {len(GLOBAL_LONGITUDE) - 1, 0}
+    assert weights.sum() == pytest.approx(1.0)
+    fraction = ((lon - 359.75) % 360) / 0.25
+    expected = (1 - fraction) * np.cos(np.radians(359.75)) + fraction
+    assert interpolate(grid, latitude, GLOBAL_LONGITUDE, 0.5, lon) == pytest.approx(expected)
+
+def test_global_grid_in_signed_longitudes_wraps_at_the_antimeridian():
+    longitude = np.arange(-180.0, 180.0, 0.5)
+    latitude = np.array([1.0, 0.0])
+
+    for lon in (179.8, -180.2, 539.8):
+        _, lon_idx, weights = bilinear_weights(latitude, longitude, 0.5, lon)
+        assert lon_idx[1] == 0 and lon_idx[0] == len(longitude) - 1
+        assert weights[1] + weights[3] == pytest.approx(0.6)
+
+def test_regional_grid_does_not_wrap():
+    with pytest.raises(ValueError):
+        bilinear_weights(LATITUDE, LONGITUDE, 39.0, 0.0)
+
+def test_nan_corners_are_dropped_and_weights_renormalized():
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    corners = np.array([[[1.0, np.nan, 3.0, 4.0]]])
+
+    result = interpolate_corners(corners, weights)
+
+    assert result[0, 0] == pytest.approx((0.4 * 1 + 0.2 * 3 + 0.1 * 4) / 0.7)
+
+def test_all_nan_corners_give_nan_per_step():
+    weights = np.full(4, 0.25)
+    corners = np.array([
+        [[np.nan] * 4, [1.0, 2.0, 3.0, 4.0]],
+        [[5.0, 5.0, np.nan, 5.0], [np.nan] * 4],
+    ])
+
+    result = interpolate_corners(corners, weights)
+
+    assert np.isnan(result[0, 0])
+    assert result[0, 1] == pytest.approx(2.5)
+    assert result[1, 0] == pytest.approx(5.0)
+    assert np.isnan(result[1, 1])
+
+def test_zero_weight_corner_does_not_count_as_valid():
+    weights = np.array([1.0, 0.0, 0.0, 0.0])
+    corners = np.array([[[np.nan, 2.0, 3.0, 4.0]]])
+
+    assert np.isnan(interpolate_corners(corners, weights)[0, 0])
+
+@pytest.mark.parametrize("directions, weights, expected", [
+    ([350.0, 10.0, 350.0, 10.0], [0.25] * 4, 0.0),
+    ([350.0, 10.0, 350.0, 10.0], [0.5, 0.0, 0.5, 0.0], 350.0),
+    ([80.0, 100.0, 80.0, 100.0], [0.25] * 4, 90.0),
+    ([270.0, 0.0, 270.0, 0.0], [0.25] * 4, 315.0),
+    ([350.0, np.nan, 10.0, np.nan], [0.25] * 4, 0.0),
+])
+def test_directions_use_the_circular_mean(directions, weights, expected):
+    corners = np.array([[directions, [10.0, 20.0, 30.0, 40.0]]])
+
+    result = interpolate_corners(corners, np.array(weights), circular=[0])
+
+    assert result[0, 0] == pytest.approx(expected, abs=1e-6)
+    assert 0 <= result[0, 0] < 360
+    # Variables not listed stay a plain weighted mean
+    assert result[0, 1] == pytest.approx(np.dot(weights, [10, 20, 30, 40]) / np.sum(weights))
+
+def test_snap_coordinate():
+    assert snap_coordinate(32.1234, 0.05) == 32.1
+    assert snap_coordinate(-79.97, 0.05) == -79.95
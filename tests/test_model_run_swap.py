@@ -0,0 +1,190 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from features.common.model_run import ModelRun
+from features.common.services import model_run_swap
+from features.common.services.model_run_swap import ModelRunSwapController
+from features.common.services.retry_queue import DownloadRetryQueue
+from features.wind.services.gfs_wind_client import GFSWindClient
+
+def model_run(days_ago: int, cycle_hour: int) -> ModelRun:
+    run_date = date.today() - timedelta(days=days_ago)
+    return ModelRun(
+        run_date=run_date,
+        cycle_hour=cycle_hour,
+        available_time=datetime(run_date.year, run_date.month, run_date.day, tzinfo=timezone.utc)
+    )
+
+OLD_RUN, NEW_RUN = model_run(1, 6), model_run(1, 12)
+
+class FakeStore:
+    """Region store recording the hours inserted into it."""
+
+    def __init__(self, region: str, run: ModelRun):
+        self.region = region
+        self.run = run
+        self.added = []
+        self.closed = False
+
+    async def add_hours(self, files):
+        files = list(files)
+        self.added.extend(hour for hour, _ in files)
+        return len(files)
+
+    def resident_bytes(self):
+        return {"hot": 1024}
+
+    def close(self):
+        self.closed = True
+
+class FakeWindClient(GFSWindClient):
+    """Wind client that loads regions without downloading, failing the ones listed."""
+
+    failing = set()
+
+    def __init__(self, model_run, queue_dir):
+        super().__init__(model_run=model_run)
+        self.retry_queue = DownloadRetryQueue(queue_dir / f"{model_run.cycle_hour}.json", base_delay=0)
+        self.started_workers = 0
+
+    async def load_region(self, region_name):
+        for hour in (126, 129):
+            self.retry_queue.add(region_name, hour, f"/tmp/{region_name}_{hour}.grib2", not_before=0)
+        if region_name in self.failing:
+            return False
+        self._stores[region_name] = FakeStore(region_name, self.model_run)
+        return True
+
+    def start_retry_worker(self):
+        self.started_workers += 1
+
+    async def _download_grib_file(self, url, file_path):
+        return True
+
+class FakeState:
+    queue_dir = None
+
+    def __init__(self):
+        self.current_model_run = None
+        self.gfs_client = self.gfs_wave_client_v2 = self.gfs_wind_client = None
+        self.cleaned_up = False
+
+    async def initialize(self, model_run, load_wind=True):
+        self.current_model_run = model_run
+        self.gfs_client = SimpleNamespace(run=model_run)
+        self.gfs_wave_client_v2 = SimpleNamespace(run=model_run)
+        self.gfs_wind_client = FakeWindClient(model_run, self.queue_dir)
+        if load_wind:
+            for region in ("atlantic", "pacific"):
+                await self.gfs_wind_client.load_region(region)
+            self.gfs_wind_client.retry_queue = None
+
+    def cleanup_old_files(self):
+        pass
+
+    async def cleanup(self):
+        self.cleaned_up = True
+        if self.gfs_wind_client:
+            await self.gfs_wind_client.close()
+
+@pytest.fixture
+def app_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(FakeState, "queue_dir", tmp_path)
+    monkeypatch.setattr(FakeWindClient, "failing", set())
+
+    async def build():
+        state = FakeState()
+        await state.initialize(OLD_RUN)
+        return SimpleNamespace(
+            active_state=state,
+            wave_service=SimpleNamespace(gfs_client=state.gfs_client),
+            wave_service_v2=SimpleNamespace(gfs_client=state.gfs_wave_client_v2),
+            wind_service=SimpleNamespace(gfs_client=state.gfs_wind_client)
+        )
+    return build
+
+@pytest.fixture
+def bumps(monkeypatch):
+    """Cache generation bumps with the run the wave services were bound to at the time."""
+    recorded = []
+
+    recorded_state = {}
+
+    def bump(run):
+        recorded.append((run, recorded_state["app"].wave_service.gfs_client.run))
+    monkeypatch.setattr(model_run_swap, "bump_generation", bump)
+    return recorded, recorded_state
+
+def test_fits_in_memory_against_the_ceiling(app_state):
+    async def scenario():
+        app = await app_state()
+        assert ModelRunSwapController(app, FakeState, memory_ceiling_bytes=0)._fits_in_memory(10 ** 12)
+        assert ModelRunSwapController(app, FakeState, memory_ceiling_bytes=1 << 50)._fits_in_memory(1 << 20)
+        assert not ModelRunSwapController(app, FakeState, memory_ceiling_bytes=1)._fits_in_memory(0)
+    asyncio.run(scenario())
+
+def test_full_swap_bumps_once_after_binding_and_drains_old_requests(app_state, bumps):
+    recorded, recorded_state = bumps
+
+    async def scenario():
+        app = recorded_state["app"] = await app_state()
+        old_state = app.active_state
+        controller = ModelRunSwapController(app, FakeState, memory_ceiling_bytes=0, drain_timeout=5)
+
+        with controller.track_request():
+            swap = asyncio.create_task(controller.swap(NEW_RUN))
+            await asyncio.sleep(0.1)
+            # Bound to the new run, while the old one stays open for the request still in flight
+            assert app.wave_service.gfs_client.run == NEW_RUN
+            assert not old_state.cleaned_up
+        assert await swap
+        assert old_state.cleaned_up
+        assert controller.generation.number == 1
+
+    asyncio.run(scenario())
+    assert recorded == [(NEW_RUN, NEW_RUN)]
+
+def test_region_swap_bumps_once_after_every_region(app_state, bumps):
+    recorded, recorded_state = bumps
+
+    async def scenario():
+        app = recorded_state["app"] = await app_state()
+        live_wind = app.active_state.gfs_wind_client
+        old_stores = dict(live_wind._stores)
+        controller = ModelRunSwapController(app, FakeState, memory_ceiling_bytes=1, drain_timeout=1)
+
+        assert await controller.swap(NEW_RUN)
+        assert app.active_state.gfs_wind_client is live_wind
+        assert all(store.run == NEW_RUN for store in live_wind._stores.values())
+        assert all(store.closed for store in old_stores.values())
+        # One drained generation per region, then one for the whole state
+        assert controller.generation.number == 3
+
+    asyncio.run(scenario())
+    assert recorded == [(NEW_RUN, NEW_RUN)]
+
+def test_regions_left_on_the_old_run_get_no_new_run_retries(app_state, bumps, monkeypatch):
+    recorded, recorded_state = bumps
+
+    async def scenario():
+        app = recorded_state["app"] = await app_state()
+        monkeypatch.setattr(FakeWindClient, "failing", {"pacific"})
+        live_wind = app.active_state.gfs_wind_client
+        old_pacific = live_wind._stores["pacific"]
+        controller = ModelRunSwapController(app, FakeState, memory_ceiling_bytes=1, drain_timeout=1)
+
+        assert await controller.swap(NEW_RUN)
+        assert live_wind._region_runs == {"pacific": OLD_RUN}
+        assert live_wind.started_workers == 1
+        assert {entry.region for entry in live_wind.retry_queue.due()} == {"atlantic"}
+
+        await live_wind._retry_missing_hours()
+        assert live_wind._stores["atlantic"].added == [126, 129]
+        assert live_wind._stores["pacific"] is old_pacific
+        assert old_pacific.added == []
+
+    asyncio.run(scenario())
+    assert recorded == [(NEW_RUN, NEW_RUN)]
@@ -0,0 +1,50 @@
+import asyncio
+
+from aiohttp import web
+
+from core.config import settings
+from features.stations.services.verification_service import VerificationService
+from features.waves.services.ndbc_buoy_client import NDBCBuoyClient
+
+HISTORY = """#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP  VIS PTDY  TIDE
+#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  nmi  hPa    ft
+2026 10 18 12 00 200  5.0  6.0   1.2     8    MM  190 1015.0  15.0  16.0    MM   MM   MM    MM
+2026 10 18 11 00 210  4.0  5.0    MM     9    MM  195 1015.2  15.1  16.0    MM   MM   MM    MM
+"""
+
+async def serve_stations():
+    async def station(request):
+        station_id = request.match_info["station"]
+        if station_id == "slow":
+            await asyncio.sleep(1)
+        if station_id == "gone":
+            raise web.HTTPNotFound()
+        return web.Response(text=HISTORY)
+
+    app = web.Application()
+    app.router.add_get("/{station}.txt", station)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+def test_one_slow_buoy_does_not_fail_the_refresh(monkeypatch):
+    async def scenario():
+        runner, base_url = await serve_stations()
+        monkeypatch.setattr(settings, "ndbc_base_url", base_url)
+        client = NDBCBuoyClient()
+        monkeypatch.setattr(client, "HISTORY_TIMEOUT", 0.3)
+        service = VerificationService(station_service=None, buoy_client=client, archives={})
+        try:
+            return await service._fetch_observations(["41001", "slow", "gone", "44013"])
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    fast, slow, gone, other = asyncio.run(scenario())
+    assert slow is None and gone is None
+    for series in (fast, other):
+        assert series.times.tolist() == [1792321200, 1792324800]
+        assert series.values[:, 1].tolist() == [4.0, 5.0]
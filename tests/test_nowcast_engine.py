@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from features.stations.services.nowcast_engine import NowcastCorrection, decay_weights, values_at
+
+HOUR = 3600.0
+T0 = 1_790_000_000.0
+
+# Two stations: one with four points every 3 hours, one with two points padded with inf
+TIMES = np.array([
+    [T0, T0 + 3 * HOUR, T0 + 6 * HOUR, T0 + 9 * HOUR],
+    [T0, T0 + 3 * HOUR, np.inf, np.inf],
+])
+VALUES = np.array([
+    [10.0, 16.0, 4.0, 7.0],
+    [2.0, 5.0, np.nan, np.nan],
+])
+
+def test_values_between_forecast_times_are_interpolated():
+    result = values_at(TIMES, VALUES, np.array([T0 + 1 * HOUR, T0 + 1.5 * HOUR]))
+    np.testing.assert_allclose(result, [12.0, 3.5])
+
+    result = values_at(TIMES, VALUES, np.array([T0 + 7.5 * HOUR, T0 + 2 * HOUR]))
+    np.testing.assert_allclose(result, [5.5, 4.0])
+
+@pytest.mark.parametrize("step", [0, 1, 2, 3])
+def test_exactly_on_a_forecast_time_gives_that_value(step):
+    at = np.array([TIMES[0, step], TIMES[1, min(step, 1)]])
+    result = values_at(TIMES, VALUES, at)
+    assert result.tolist() == [VALUES[0, step], VALUES[1, min(step, 1)]]
+
+def test_exact_hit_ignores_a_missing_previous_value():
+    values = np.array([[np.nan, 16.0, 4.0, 7.0], VALUES[1]])
+    result = values_at(TIMES, values, np.array([T0 + 3 * HOUR, T0 + 3 * HOUR]))
+    assert result.tolist() == [16.0, 5.0]
+
+def test_outside_the_forecast_is_nan():
+    before = values_at(TIMES, VALUES, np.array([T0 - 1, T0 - HOUR]))
+    after = values_at(TIMES, VALUES, np.array([T0 + 9 * HOUR + 1, T0 + 3 * HOUR + 1]))
+    assert np.isnan(before).all()
+    assert np.isnan(after).all()
+
+def test_station_without_forecast_points_is_nan():
+    times = np.full((1, 3), np.inf)
+    assert np.isnan(values_at(times, np.full((1, 3), np.nan), np.array([T0]))).all()
+
+def test_weights_are_full_up_to_the_observation_then_decay():
+    observed_at = np.array([T0 + 3 * HOUR, T0])
+
+    weights = decay_weights(TIMES, observed_at, decay_hours=6, horizon_hours=24)
+
+    np.testing.assert_allclose(weights[0], [1.0, 1.0, np.exp(-0.5), np.exp(-1.0)])
+    np.testing.assert_allclose(weights[1], [1.0, np.exp(-0.5), 0.0, 0.0])
+    assert ((weights >= 0) & (weights <= 1)).all()
+
+def test_weights_are_zero_beyond_the_horizon():
+    observed_at = np.array([T0, T0])
+
+    weights = decay_weights(TIMES, observed_at, decay_hours=6, horizon_hours=6)
+
+    assert weights[0, 2] == pytest.approx(np.exp(-1.0))
+    assert weights[0, 3] == 0.0
+    assert weights[1, 2:].tolist() == [0.0, 0.0]
+
+def test_missing_observation_time_gets_no_weight():
+    weights = decay_weights(TIMES, np.array([np.nan, T0]), decay_hours=6, horizon_hours=24)
+    assert weights[0].tolist() == [0.0] * 4
+
+def test_correction_blends_offsets_and_leaves_nan_offsets_alone():
+    correction = NowcastCorrection(
+        offsets=np.array([[2.0, np.nan], [np.nan, -3.0]]),
+        observed_at=np.array([T0, T0]),
+        decay_hours=6,
+        horizon_hours=6
+    )
+
+    speed = correction.apply(0, TIMES, VALUES)
+    height = correction.apply(1, TIMES, VALUES)
+
+    np.testing.assert_allclose(speed[0], [12.0, 16.0 + 2 * np.exp(-0.5), 4.0 + 2 * np.exp(-1.0), 7.0])
+    np.testing.assert_array_equal(speed[1], VALUES[1])
+    np.testing.assert_array_equal(height[0], VALUES[0])
+    # A negative offset never takes the forecast below zero
+    np.testing.assert_allclose(height[1, :2], [0.0, 5.0 - 3 * np.exp(-0.5)])
+    assert np.isnan(height[1, 2:]).all()
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from features.common.services.retry_queue import DownloadRetryQueue
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / "run" / "retry_queue.json"
+
+
+def test_first_attempt_waits_between_half_and_full_base_delay(state_file):
+    queue = DownloadRetryQueue(state_file, base_delay=60)
+    before = time.time()
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2")
+    after = time.time()
+
+    (entry,) = queue._entries.values()
+    assert before + 30 <= entry.next_attempt <= after + 60
+    assert queue.due(now=after) == []
+    assert queue.due(now=after + 60) == [entry]
+
+
+def test_not_before_wins_over_backoff(state_file):
+    queue = DownloadRetryQueue(state_file, base_delay=60)
+    publish_time = time.time() + 3600
+    queue.add("atlantic", 120, state_file.parent / "f120.grib2", not_before=publish_time)
+
+    assert queue._entries[("atlantic", 120)].next_attempt == publish_time
+    assert 3500 < queue.seconds_until_next() <= 3600
+
+
+def test_existing_entry_keeps_its_schedule(state_file):
+    queue = DownloadRetryQueue(state_file)
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2", not_before=time.time() + 10_000)
+    scheduled = queue._entries[("atlantic", 3)].next_attempt
+
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2", error="download failed")
+
+    assert len(queue) == 1
+    assert queue._entries[("atlantic", 3)].next_attempt == scheduled
+
+
+def test_failures_double_the_delay_up_to_the_cap_then_drop(state_file):
+    queue = DownloadRetryQueue(state_file, base_delay=10, max_delay=100, max_attempts=6)
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2")
+    entry = queue._entries[("atlantic", 3)]
+
+    for attempts, delay in enumerate([20, 40, 80, 100, 100], start=1):
+        before = time.time()
+        queue.record_failure(entry, error="timeout")
+        after = time.time()
+        assert entry.attempts == attempts
+        assert before + delay / 2 <= entry.next_attempt <= after + delay
+        assert entry.last_error == "timeout"
+
+    queue.record_failure(entry)
+    assert len(queue) == 0
+    assert DownloadRetryQueue(state_file)._entries == {}
+
+
+def test_reload_restores_entries_and_schedules(state_file):
+    queue = DownloadRetryQueue(state_file)
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2", error="download failed")
+    queue.add("pacific", 6, state_file.parent / "f006.grib2", not_before=time.time() + 600)
+    queue.record_failure(queue._entries[("atlantic", 3)], error="timeout")
+
+    reloaded = DownloadRetryQueue(state_file)
+
+    assert reloaded._entries == queue._entries
+    assert reloaded._entries[("atlantic", 3)].attempts == 1
+    assert reloaded._entries[("atlantic", 3)].file_path == str(state_file.parent / "f003.grib2")
+
+    reloaded.remove("atlantic", 3)
+    assert list(DownloadRetryQueue(state_file)._entries) == [("pacific", 6)]
+
+
+def test_corrupt_state_file_starts_empty(state_file):
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text("{not json")
+
+    assert len(DownloadRetryQueue(state_file)) == 0
+
+
+def test_add_many_saves_once(state_file, monkeypatch):
+    queue = DownloadRetryQueue(state_file)
+    queue.add("atlantic", 3, state_file.parent / "f003.grib2")
+    saves = []
+    monkeypatch.setattr(queue, "_save", lambda: saves.append(len(queue)))
+
+    publish_time = time.time() + 3600
+    added = queue.add_many("atlantic", [
+        (hour, state_file.parent / f"f{hour:03d}.grib2", publish_time)
+        for hour in range(0, 385, 3)
+    ])
+
+    assert added == 128
+    assert saves == [129]
+    assert queue.add_many("atlantic", [(3, state_file.parent / "f003.grib2", None)]) == 0
+    assert saves == [129]
@@ -0,0 +1,129 @@
+import asyncio
+import gc
+
+import pytest
+
+from features.common.services.single_flight import SingleFlight, single_flight_stats
+
+class Upstream:
+    """Coroutine function held on an event, counting how often it actually runs."""
+
+    def __init__(self, result="value", error=None):
+        self.runs = 0
+        self.finished = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        self.finished += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight("test_share")
+        upstream = Upstream(result=[1, 2, 3])
+
+        callers = [asyncio.create_task(flight.do("41001", upstream)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flight.is_in_flight("41001")
+        upstream.release.set()
+        results = await asyncio.gather(*callers)
+
+        assert upstream.runs == 1
+        assert all(result is results[0] for result in results)
+        assert not flight.is_in_flight("41001")
+        assert flight.stats() == {
+            "calls": 5,
+            "executions": 1,
+            "coalesced": 4,
+            "coalesced_ratio": 0.8,
+            "max_waiters": 4,
+            "in_flight": 0
+        }
+        assert single_flight_stats()["test_share"]["executions"] == 1
+
+    asyncio.run(scenario())
+
+def test_different_keys_and_later_calls_run_again():
+    async def scenario():
+        flight = SingleFlight("test_keys")
+        upstream = Upstream()
+        upstream.release.set()
+
+        await asyncio.gather(flight.do("41001", upstream), flight.do("41002", upstream))
+        await flight.do("41001", upstream)
+
+        assert upstream.runs == 3
+        assert flight.coalesced == 0
+
+    asyncio.run(scenario())
+
+def test_leader_exception_reaches_every_waiter():
+    async def scenario():
+        flight = SingleFlight("test_error")
+        upstream = Upstream(error=RuntimeError("upstream down"))
+
+        callers = [asyncio.create_task(flight.do("41001", upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert upstream.runs == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert results[0] is results[1] is results[2]
+        assert not flight.is_in_flight("41001")
+
+        # The failure is not cached
+        upstream.error = None
+        assert await flight.do("41001", upstream) == "value"
+        assert upstream.runs == 2
+
+    asyncio.run(scenario())
+
+@pytest.mark.parametrize("cancelled", [0, 1], ids=["leader", "waiter"])
+def test_cancelled_caller_does_not_cancel_the_shared_computation(cancelled):
+    async def scenario():
+        flight = SingleFlight("test_cancel")
+        upstream = Upstream()
+
+        callers = [asyncio.create_task(flight.do("41001", upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        callers[cancelled].cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert isinstance(results[cancelled], asyncio.CancelledError)
+        assert [r for i, r in enumerate(results) if i != cancelled] == ["value", "value"]
+        assert upstream.runs == upstream.finished == 1
+
+    asyncio.run(scenario())
+
+def test_failure_with_every_caller_gone_is_not_reported_as_unretrieved():
+    async def scenario():
+        reported = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: reported.append(context))
+        flight = SingleFlight("test_abandoned")
+        upstream = Upstream(error=RuntimeError("upstream down"))
+
+        caller = asyncio.create_task(flight.do("41001", upstream))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert upstream.finished == 1
+        assert not flight.is_in_flight("41001")
+        # The cancelled caller's traceback still references the task
+        del caller
+        gc.collect()
+        assert reported == []
+
+    asyncio.run(scenario())
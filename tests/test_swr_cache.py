@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from features.common.services import swr_cache
+from features.common.services.swr_cache import cached_swr
+
+class Clock:
+    """Wall clock for the soft TTL; the hard TTL runs on the event loop's real clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(swr_cache, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+class Source:
+    """Counts calls and hands out a new version per call, optionally held until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.fail = False
+
+    async def __call__(self, station_id):
+        self.calls += 1
+        version = self.calls
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"{station_id}@{version}"
+
+def make_cached(source, soft_ttl=60, ttl=3600):
+    @cached_swr(soft_ttl=soft_ttl, ttl=ttl)
+    async def get_forecast(station_id):
+        return await source(station_id)
+    return get_forecast
+
+async def drain():
+    """Let background refresh tasks run to completion."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_fresh_entry_is_served_from_cache(clock):
+    async def scenario():
+        source = Source()
+        get_forecast = make_cached(source)
+
+        assert await get_forecast("41001") == "41001@1"
+        clock.now += 59
+        assert await get_forecast("41001") == "41001@1"
+        assert await get_forecast("41002") == "41002@2"
+        assert source.calls == 2
+
+    asyncio.run(scenario())
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    async def scenario():
+        source = Source()
+        get_forecast = make_cached(source)
+        await get_forecast("41001")
+
+        clock.now += 61
+        source.release.clear()
+        stale = await asyncio.wait_for(asyncio.gather(*(get_forecast("41001") for _ in range(10))), 1)
+        await drain()
+
+        assert stale == ["41001@1"] * 10
+        assert source.calls == 2
+        assert len(get_forecast.flight._in_flight) == 1
+        # Later stale reads do not even start a refresh to join the running one
+        assert get_forecast.flight.coalesced == 0
+
+        source.release.set()
+        await drain()
+        assert await get_forecast("41001") == "41001@2"
+        assert source.calls == 2
+
+        # The refreshed entry is fresh for another soft TTL
+        clock.now += 59
+        assert await get_forecast("41001") == "41001@2"
+        await drain()
+        assert source.calls == 2
+
+    asyncio.run(scenario())
+
+def test_failed_refresh_keeps_serving_the_stale_value(clock, caplog):
+    async def scenario():
+        source = Source()
+        get_forecast = make_cached(source)
+        await get_forecast("41001")
+
+        clock.now += 61
+        source.fail = True
+        with caplog.at_level(logging.WARNING, logger=swr_cache.__name__):
+            assert await get_forecast("41001") == "41001@1"
+            await drain()
+        assert "Background refresh" in caplog.text
+        assert source.calls == 2
+
+        # The next stale read tries again
+        source.fail = False
+        assert await get_forecast("41001") == "41001@1"
+        await drain()
+        assert source.calls == 3
+        assert await get_forecast("41001") == "41001@3"
+
+    asyncio.run(scenario())
+
+def test_request_after_hard_ttl_waits_for_the_computation(clock):
+    async def scenario():
+        source = Source()
+        get_forecast = make_cached(source, soft_ttl=0.05, ttl=0.1)
+        await get_forecast("41001")
+
+        await asyncio.sleep(0.2)
+        clock.now += 1
+        source.release.clear()
+        pending = asyncio.create_task(get_forecast("41001"))
+        await drain()
+        assert not pending.done()
+
+        source.release.set()
+        assert await pending == "41001@2"
+
+    asyncio.run(scenario())
+
+def test_hard_ttl_shorter_than_soft_ttl_is_rejected():
+    with pytest.raises(ValueError):
+        cached_swr(soft_ttl=60, ttl=30)
+
+def test_concurrent_misses_share_one_computation(clock):
+    async def scenario():
+        source = Source()
+        get_forecast = make_cached(source)
+
+        source.release.clear()
+        callers = [asyncio.create_task(get_forecast("41001")) for _ in range(5)]
+        await drain()
+        source.release.set()
+        results = await asyncio.gather(*callers)
+
+        assert results == ["41001@1"] * 5
+        assert source.calls == 1
+        assert get_forecast.flight.coalesced == 4
+        assert await get_forecast("41001") == "41001@1"
+
+    asyncio.run(scenario())
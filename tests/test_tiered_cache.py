@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from features.common.services import cache_config
+from features.common.services.tiered_cache import RedisLink, TieredCache
+
+KEY = "wind_forecast:g2026101812:station:41001"
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def wait_until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+async def listening(link: RedisLink):
+    """Start a link's subscriber and wait until it receives messages."""
+    link.ensure_listening()
+    for _ in range(100):
+        if (await link.client.pubsub_numsub(link.channel))[0][1] >= 1:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("subscriber did not start")
+
+async def server_value(cache: TieredCache, key: str):
+    link = cache._own_link
+    return await link.client.get(link.key(key))
+
+def make_instance(server, **kwargs) -> TieredCache:
+    """One app instance: its own link and L1, sharing Redis through the server."""
+    link = RedisLink("redis://test", "test", client=fakeredis.FakeAsyncRedis(server=server))
+    return TieredCache(link=link, **kwargs)
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture(autouse=True)
+def generation(monkeypatch):
+    monkeypatch.setattr(cache_config, "_generation", "2026101812")
+
+def test_round_trip_through_l1_and_l2(server):
+    async def scenario():
+        a, b = make_instance(server), make_instance(server)
+        await a.set(KEY, {"v": 1}, ttl=60)
+        assert await a.get(KEY) == {"v": 1}
+        assert KEY not in b._l1
+        assert await b.get(KEY) == {"v": 1}
+        assert KEY in b._l1
+        await a._own_link.close()
+        await b._own_link.close()
+    run(scenario())
+
+def test_ttl_applies_to_both_tiers(server):
+    async def scenario():
+        a, b = make_instance(server), make_instance(server)
+        await a.set(KEY, "value", ttl=0.3)
+        assert await b.get(KEY) == "value"
+        await asyncio.sleep(0.4)
+        assert await a.get(KEY) is None
+        assert await b.get(KEY) is None
+        await a._own_link.close()
+        await b._own_link.close()
+    run(scenario())
+
+def test_overwrite_invalidates_other_instances(server):
+    async def scenario():
+        a, b = make_instance(server), make_instance(server)
+        await listening(b._own_link)
+        await a.set(KEY, {"v": 1}, ttl=60)
+        assert await b.get(KEY) == {"v": 1}
+        await a.set(KEY, {"v": 2}, ttl=60)
+        await wait_until(lambda: KEY not in b._l1)
+        assert await b.get(KEY) == {"v": 2}
+        await a._own_link.close()
+        await b._own_link.close()
+    run(scenario())
+
+def test_delete_and_clear_reach_other_instances(server):
+    async def scenario():
+        a, b = make_instance(server), make_instance(server)
+        await listening(b._own_link)
+        other = "wave_forecast:g2026101812:station:41001"
+        await a.set(KEY, 1, ttl=60)
+        await a.set(other, 2, ttl=60)
+        assert await b.get(KEY) == 1
+        assert await b.get(other) == 2
+
+        await a.delete(KEY)
+        await wait_until(lambda: KEY not in b._l1)
+        assert await b.get(KEY) is None
+        assert other in b._l1
+
+        await a.clear(namespace="wave_forecast")
+        await wait_until(lambda: other not in b._l1)
+        assert await b.get(other) is None
+        await a._own_link.close()
+        await b._own_link.close()
+    run(scenario())
+
+def test_generation_switch_frees_previous_run_from_l1(server, monkeypatch):
+    async def scenario():
+        cache = make_instance(server)
+        newer = "wind_forecast:g2026101818:station:41001"
+        await cache.set(KEY, "12z", ttl=60)
+
+        monkeypatch.setattr(cache_config, "_generation", "2026101818")
+        assert cache._own_link.reclaim_stale() == 1
+        assert KEY not in cache._l1
+        # Redis keeps the entry for instances still serving the 12Z run
+        assert await server_value(cache, KEY) is not None
+
+        await cache.set(newer, "18z", ttl=60)
+        assert cache._own_link.reclaim_stale() == 0
+        await cache._own_link.close()
+    run(scenario())
+
+def test_falls_back_to_l1_when_redis_is_down(server):
+    async def scenario():
+        cache = make_instance(server)
+        server.connected = False
+        assert await cache.set(KEY, "value", ttl=60)
+        assert await cache.get(KEY) == "value"
+        assert await cache.get("wind_forecast:g2026101812:station:missing") is None
+        assert await cache.delete(KEY) == 1
+        assert await cache.get(KEY) is None
+        assert not cache._own_link._healthy
+
+        server.connected = True
+        await cache.set(KEY, "again", ttl=60)
+        assert cache._own_link._healthy
+        await cache._own_link.close()
+    run(scenario())
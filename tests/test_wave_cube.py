@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from features.waves.services.wave_cube import PackedWaveCube
+
+LATITUDE = np.linspace(40.0, 35.0, 6)
+LONGITUDE = np.linspace(280.0, 284.0, 8)
+START = np.datetime64("2026-10-18T00:00", "ns")
+
+def hour(values, index):
+    return START + np.timedelta64(3 * index, "h"), LATITUDE, LONGITUDE, np.asarray(values, dtype=np.float32)
+
+def random_hour(rng, lows, highs):
+    shape = (len(lows), len(LATITUDE), len(LONGITUDE))
+    return rng.uniform(np.array(lows)[:, None, None], np.array(highs)[:, None, None], shape).astype(np.float32)
+
+def unpack_all(cube):
+    return cube.cells(*np.meshgrid(np.arange(len(LATITUDE)), np.arange(len(LONGITUDE)), indexing="ij"))
+
+def test_round_trip_error_is_within_float16_precision_of_each_range():
+    rng = np.random.default_rng(7)
+    # Heights in metres, periods in seconds, directions in degrees
+    lows, highs = [0.2, 4.0, 0.0], [6.5, 18.0, 359.9]
+    first = random_hour(rng, lows, highs)
+    first[:, 0, 0], first[:, 0, 1] = lows, highs
+    hours = [first] + [random_hour(rng, lows, highs) for _ in range(5)]
+
+    cube = PackedWaveCube.from_hours((hour(values, i) for i, values in enumerate(hours)), len(hours))
+
+    np.testing.assert_allclose(cube.offsets, lows, rtol=1e-6)
+    np.testing.assert_allclose(cube.scales, np.subtract(highs, lows), rtol=1e-6)
+    error = np.abs(unpack_all(cube) - np.stack(hours))
+    # One float16 step below 1.0: the rounding error plus float32 arithmetic
+    bound = cube.scales[np.newaxis, :, np.newaxis, np.newaxis] * 2 ** -11
+    assert (error <= bound).all()
+
+def test_hours_outside_the_first_range_widen_instead_of_overflowing():
+    first = np.full((2, len(LATITUDE), len(LONGITUDE)), 1.0, dtype=np.float32)
+    first[0, 0, 0] = 1.0001  # nearly constant, so the scale is tiny
+    first[1] = np.linspace(10.0, 12.0, first[1].size).reshape(first[1].shape)
+    later = first.copy()
+    later[0] = np.linspace(0.5, 9.0, later[0].size).reshape(later[0].shape)
+    later[1, 0, 0] = -3.0
+
+    cube = PackedWaveCube.from_hours([hour(first, 0), hour(later, 1)], 2)
+
+    unpacked = unpack_all(cube)
+    assert np.isfinite(cube.data).all()
+    assert cube.offsets[0] <= 0.5 and cube.offsets[0] + cube.scales[0] >= 9.0
+    assert cube.offsets[1] <= -3.0
+    bound = cube.scales[np.newaxis, :, np.newaxis, np.newaxis] * 2 ** -10
+    assert (np.abs(unpacked - np.stack([first, later])) <= bound).all()
+
+def test_steady_trend_repacks_only_a_few_times(monkeypatch):
+    repacks = []
+    original = PackedWaveCube._widen
+
+    def counting_widen(self, values):
+        before = self.scales.copy()
+        original(self, values)
+        if len(self) and (self.scales != before).any():
+            repacks.append(len(self))
+
+    monkeypatch.setattr(PackedWaveCube, "_widen", counting_widen)
+    # Heights building 5 cm per hour for 129 hours
+    hours = [np.full((1, len(LATITUDE), len(LONGITUDE)), 1.0 + 0.05 * i, dtype=np.float32) for i in range(129)]
+    hours[0][0, 0, 0] = 1.2
+
+    cube = PackedWaveCube.from_hours((hour(values, i) for i, values in enumerate(hours)), len(hours))
+
+    assert len(repacks) <= 12
+    assert (np.abs(unpack_all(cube) - np.stack(hours)) <= cube.scales[0] * 2 ** -10).all()
+
+def test_variable_missing_from_the_first_hour_gets_its_own_range():
+    first = np.full((2, len(LATITUDE), len(LONGITUDE)), np.nan, dtype=np.float32)
+    first[0] = 2.0
+    later = first.copy()
+    later[1] = np.linspace(100.0, 200.0, later[1].size).reshape(later[1].shape)
+
+    cube = PackedWaveCube.from_hours([hour(first, 0), hour(later, 1)], 2)
+
+    unpacked = unpack_all(cube)
+    assert np.isnan(unpacked[0, 1]).all()
+    assert cube.offsets[1] == pytest.approx(100.0)
+    assert cube.scales[1] == pytest.approx(100.0)
+    assert (np.abs(unpacked[1, 1] - later[1]) <= 100.0 * 2 ** -11).all()
+
+def test_land_cells_stay_nan_and_hours_are_ordered_by_time():
+    first = np.full((1, len(LATITUDE), len(LONGITUDE)), 1.5, dtype=np.float32)
+    first[0, :2, :3] = np.nan
+    second = first + 1.0
+
+    cube = PackedWaveCube.from_hours([hour(second, 1), hour(first, 0)], 3)
+
+    assert len(cube) == 2
+    assert cube.times.tolist() == sorted(cube.times.tolist())
+    unpacked = unpack_all(cube)
+    assert np.isnan(unpacked[:, 0, :2, :3]).all()
+    assert unpacked[0, 0, 5, 5] == pytest.approx(1.5, abs=1e-3)
+    assert unpacked[1, 0, 5, 5] == pytest.approx(2.5, abs=1e-3)
+
+def test_no_decoded_hours_gives_no_cube():
+    assert PackedWaveCube.from_hours([], 4) is None
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from features.common.services import wet_cell_index
+from features.common.services.wet_cell_index import WetCellIndex, get_wet_cell_index, nearest_wet_cells
+
+def brute_force_distances(wet: np.ndarray) -> np.ndarray:
+    """Squared distance from every cell to its nearest wet cell."""
+    wet_rows, wet_cols = np.nonzero(wet)
+    rows, cols = np.indices(wet.shape)
+    dist = (rows[..., np.newaxis] - wet_rows) ** 2 + (cols[..., np.newaxis] - wet_cols) ** 2
+    return dist.min(axis=-1)
+
+def assert_nearest(wet: np.ndarray):
+    src_row, src_col = nearest_wet_cells(wet)
+    assert wet[src_row, src_col].all()
+    rows, cols = np.indices(wet.shape)
+    # Compare distances; equally near wet cells are both correct
+    found = (rows - src_row) ** 2 + (cols - src_col) ** 2
+    np.testing.assert_array_equal(found, brute_force_distances(wet))
+
+def coastline_mask(n_rows: int, n_cols: int, rng: np.random.Generator) -> np.ndarray:
+    """Land to the west of a ragged coast, with islands offshore and a land-only row."""
+    coast = np.clip(np.cumsum(rng.integers(-2, 3, n_rows)) + n_cols // 3, 1, n_cols - 2)
+    wet = np.arange(n_cols)[np.newaxis, :] > coast[:, np.newaxis]
+    for _ in range(6):
+        row, col = rng.integers(0, n_rows), rng.integers(n_cols // 2, n_cols)
+        wet[max(0, row - 2):row + 2, max(0, col - 2):col + 2] = False
+    wet[n_rows // 2] = False
+    return wet
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("wet_fraction", [0.02, 0.3, 0.9])
+def test_matches_brute_force_on_random_masks(seed, wet_fraction):
+    rng = np.random.default_rng(seed)
+    wet = rng.random((37, 53)) < wet_fraction
+    wet[rng.integers(0, 37)] = False
+    if not wet.any():
+        wet[0, 0] = True
+    assert_nearest(wet)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_on_coastlines(seed):
+    assert_nearest(coastline_mask(64, 80, np.random.default_rng(seed)))
+
+def test_single_wet_cell_and_no_wet_cells():
+    wet = np.zeros((20, 30), dtype=bool)
+    wet[19, 0] = True
+    assert_nearest(wet)
+
+    src_row, src_col = nearest_wet_cells(np.zeros((4, 4), dtype=bool))
+    assert (src_row == -1).all() and (src_col == -1).all()
+
+def test_index_maps_locations_to_nearest_wet_cell():
+    latitude = np.arange(30.0, 40.0, 0.5)
+    longitude = np.arange(280.0, 290.0, 0.5)
+    wet = coastline_mask(len(latitude), len(longitude), np.random.default_rng(7))
+    index = WetCellIndex(latitude, longitude, wet)
+    distances = brute_force_distances(wet)
+
+    for row in range(len(latitude)):
+        for col in range(len(longitude)):
+            # Negative longitudes map onto the 0-360 grid
+            wet_row, wet_col = index.nearest(latitude[row], longitude[col] - 360)
+            assert wet[wet_row, wet_col]
+            assert (wet_row - row) ** 2 + (wet_col - col) ** 2 == distances[row, col]
+
+def test_index_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(wet_cell_index, "_indexes", type(wet_cell_index._indexes)())
+    monkeypatch.setattr(wet_cell_index, "MAX_INDEXES", 3)
+    latitude, longitude = np.arange(4.0), np.arange(4.0)
+    masks = [np.eye(4, k=k, dtype=bool) for k in range(-2, 3)]
+
+    first = get_wet_cell_index(latitude, longitude, masks[0])
+    assert get_wet_cell_index(latitude, longitude, masks[0]) is first
+    for wet in masks[1:]:
+        get_wet_cell_index(latitude, longitude, wet)
+    assert len(wet_cell_index._indexes) == 3
+    assert get_wet_cell_index(latitude, longitude, masks[0]) is not first
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from features.wind.services.wind_store import WIND_VARIABLES, WindRegionStore
+
+LATITUDE = np.array([30.0, 31.0, 32.0, 33.0])
+LONGITUDE = np.array([280.0, 281.0, 282.0, 283.0, 284.0])
+HOUR_BYTES = len(WIND_VARIABLES) * LATITUDE.size * LONGITUDE.size * 4
+
+class FakeOpener:
+    """Builds an in-memory forecast hour whose values all equal the hour in the file name."""
+
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self, file_path):
+        self.opened.append(file_path.name)
+        forecast_hour = int(file_path.stem.split("_f")[-1])
+        shape = (LATITUDE.size, LONGITUDE.size)
+        return xr.Dataset(
+            {var: (("latitude", "longitude"), np.full(shape, forecast_hour, dtype=np.float64)) for var in WIND_VARIABLES},
+            coords={
+                "latitude": LATITUDE,
+                "longitude": LONGITUDE,
+                "valid_time": np.datetime64("2026-10-18T00:00") + np.timedelta64(forecast_hour, "h")
+            }
+        )
+
+@pytest.fixture
+def opener():
+    return FakeOpener()
+
+def hour_files(tmp_path, hours, run="r1"):
+    # Paths are unique per test because cold decodes are coalesced by path across stores
+    return [(hour, tmp_path / f"{run}_f{hour:03d}.grib2") for hour in hours]
+
+def test_hours_split_between_hot_and_cold_tiers(tmp_path, opener):
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=6, cold_max_bytes=10 * HOUR_BYTES, opener=opener)
+        added = await store.add_hours(hour_files(tmp_path, [0, 3, 6, 9, 12]))
+
+        assert added == 5
+        assert len(store) == 5
+        assert store.hours == [0, 3, 6, 9, 12]
+        assert store._hot.hours.tolist() == [0, 3, 6]
+        assert sorted(store._cold_paths) == [9, 12]
+        # Cold hours are registered by path only
+        assert sorted(opener.opened) == ["r1_f000.grib2", "r1_f003.grib2", "r1_f006.grib2"]
+        assert store.resident_bytes() == {"hot": 3 * HOUR_BYTES, "cold": 0}
+
+        times, values = await store.point_series(32.0, -78.0)
+        assert values[:, 0].tolist() == [0, 3, 6, 9, 12]
+        assert (np.diff(times) == np.timedelta64(3, "h")).all()
+        assert store.resident_bytes() == {"hot": 3 * HOUR_BYTES, "cold": 2 * HOUR_BYTES}
+
+        # max_hour stops before decoding later cold hours
+        opener.opened.clear()
+        store._cold_cache.clear()
+        store._cold_bytes = 0
+        _, values = await store.point_series(32.0, -78.0, max_hour=9)
+        assert values[:, 0].tolist() == [0, 3, 6, 9]
+        assert opener.opened == ["r1_f009.grib2"]
+
+    asyncio.run(scenario())
+
+def test_cold_hours_only_store_decodes_grid_on_demand(tmp_path, opener):
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=0, cold_max_bytes=10 * HOUR_BYTES, opener=opener)
+        await store.add_hours(hour_files(tmp_path, [3, 6]))
+        assert store.latitude is None
+
+        _, values = await store.interpolated_series(31.5, 281.5)
+
+        assert store.latitude is not None
+        assert values[:, 0].tolist() == [3, 6]
+
+    asyncio.run(scenario())
+
+def test_cold_cache_evicts_least_recently_used_over_budget(tmp_path, opener):
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=0, cold_max_bytes=2 * HOUR_BYTES, opener=opener)
+        await store.add_hours(hour_files(tmp_path, [3, 6, 9]))
+
+        await store._load_cold(3)
+        await store._load_cold(6)
+        await store._load_cold(3)  # 3 becomes most recently used
+        await store._load_cold(9)
+
+        assert list(store._cold_cache) == [3, 9]
+        assert store._cold_bytes == 2 * HOUR_BYTES
+        assert opener.opened == ["r1_f003.grib2", "r1_f006.grib2", "r1_f009.grib2"]
+
+        # A cache hit does not decode again; the evicted hour does
+        await store._load_cold(3)
+        await store._load_cold(6)
+        assert opener.opened[3:] == ["r1_f006.grib2"]
+        assert list(store._cold_cache) == [3, 6]
+        assert store._cold_bytes == 2 * HOUR_BYTES
+
+    asyncio.run(scenario())
+
+def test_cold_cache_keeps_one_hour_larger_than_budget(tmp_path, opener):
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=0, cold_max_bytes=HOUR_BYTES // 2, opener=opener)
+        await store.add_hours(hour_files(tmp_path, [3, 6]))
+
+        await store._load_cold(3)
+        await store._load_cold(6)
+
+        assert list(store._cold_cache) == [6]
+        assert store._cold_bytes == HOUR_BYTES
+
+    asyncio.run(scenario())
+
+def test_concurrent_cold_misses_share_one_decode(tmp_path, opener):
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=0, cold_max_bytes=10 * HOUR_BYTES, opener=opener)
+        await store.add_hours(hour_files(tmp_path, [3]))
+
+        results = await asyncio.gather(*(store._load_cold(3) for _ in range(5)))
+
+        assert opener.opened == ["r1_f003.grib2"]
+        assert all(values is results[0][1] for _, values in results)
+        assert store._cold_bytes == HOUR_BYTES
+
+    asyncio.run(scenario())
+
+@pytest.mark.parametrize("reload", [False, True], ids=["closed", "reloaded"])
+def test_hour_replaced_while_decoding_is_served_but_not_cached(tmp_path, opener, reload):
+    decoding = threading.Event()
+    release = threading.Event()
+
+    def blocking_opener(file_path):
+        decoding.set()
+        release.wait(timeout=5)
+        return opener(file_path)
+
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=0, cold_max_bytes=10 * HOUR_BYTES, opener=blocking_opener)
+        await store.add_hours(hour_files(tmp_path, [3], run="old"))
+
+        load = asyncio.create_task(store._load_cold(3))
+        await asyncio.to_thread(decoding.wait, 5)
+        store.close()
+        if reload:
+            store._cold_paths.update(hour_files(tmp_path, [3], run="new"))
+        release.set()
+        valid_time, values = await load
+
+        assert valid_time == np.datetime64("2026-10-18T03:00")
+        assert (values == 3).all()
+        assert len(store._cold_cache) == 0
+        assert store._cold_bytes == 0
+        assert store.latitude is None
+
+    asyncio.run(scenario())
+
+def test_decode_failure_skips_the_hour(tmp_path, opener):
+    def flaky_opener(file_path):
+        if "f006" in file_path.name:
+            raise OSError("truncated GRIB message")
+        return opener(file_path)
+
+    async def scenario():
+        store = WindRegionStore("atlantic", hot_horizon_hours=3, cold_max_bytes=10 * HOUR_BYTES, opener=flaky_opener)
+        added = await store.add_hours(hour_files(tmp_path, [0, 3, 6, 9]))
+        assert added == 4
+
+        times, values = await store.point_series(31.0, 281.0)
+
+        assert values[:, 0].tolist() == [0, 3, 9]
+        assert len(times) == 3
+
+    asyncio.run(scenario())